@@ -0,0 +1,173 @@
+"""
+Measures an insert throughput of the `message` table with the random
+(UUIDv4) and the time-ordered (UUIDv7) primary keys.
+
+For every key scheme, the script creates the tables, inserts one DB
+user and fills the `message` table by the chunks, printing a throughput
+of the chunks as the table grows. By default, a temporary SQLite DB is
+used, but a difference between the schemes shows up more on InnoDB,
+which clusters rows by a primary key, so an another DB can be provided
+by the `--url` option. The tables are dropped there after the run, so a
+dedicated DB must be used.
+
+Usage::
+
+    python benchmarks/insert_throughput.py
+    python benchmarks/insert_throughput.py --rows 5000000
+    python benchmarks/insert_throughput.py --url mysql+pymysql://...
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from datetime import datetime
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import TYPE_CHECKING
+from uuid import uuid4, uuid7
+
+from sqlalchemy import create_engine, insert
+
+from message_sender_telegram_bot.libs.rdb.database_tables import (
+    Base,
+    Message,
+    User,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from uuid import UUID
+
+    from sqlalchemy import Engine
+
+CHUNK_SIZE: int = 10_000
+
+key_schemes: dict[str, Callable[[], UUID]] = {
+    "uuid4": uuid4,
+    "uuid7": uuid7,
+}
+
+
+def run(
+    engine: Engine,
+    scheme: str,
+    rows: int,
+    report_every: int,
+) -> float:
+    """
+    Fills the `message` table with the keys of one scheme and prints a
+    throughput of the inserts.
+
+    :param engine: A DB engine.
+    :type engine: Engine
+    :param scheme: A name of a key scheme.
+    :type scheme: str
+    :param rows: A number of rows to insert.
+    :type rows: int
+    :param report_every: A number of rows, after which a throughput is
+                         printed.
+    :type report_every: int
+    :return: An overall throughput in rows per second.
+    :rtype: float
+    """
+    generate_key: Callable[[], UUID] = key_schemes[scheme]
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    total_elapsed: float = 0.0
+    window_elapsed: float = 0.0
+    window_rows: int = 0
+
+    with engine.connect() as connection:
+        sender_id: UUID = generate_key()
+        # A connection executes the statements in Core, so the rows are
+        # keyed by the column names instead of the attribute names
+        connection.execute(
+            insert(User),
+            {
+                "id": sender_id,
+                "user_id": 1,
+                "is_authorizing": False,
+                "token_id": None,
+                "is_owner": False,
+                "last_send_date": None,
+            },
+        )
+        connection.commit()
+
+        for start in range(0, rows, CHUNK_SIZE):
+            end: int = min(start + CHUNK_SIZE, rows)
+            # The keys are generated before a measure to compare only
+            # the inserts
+            message_rows: list[dict[str, object]] = [
+                {
+                    "id": generate_key(),
+                    "message_id": message_id,
+                    "sender_id": sender_id,
+                    "text": "Text",
+                    "sent_date": datetime.now(),
+                }
+                for message_id in range(start, end)
+            ]
+
+            started: float = perf_counter()
+            connection.execute(insert(Message), message_rows)
+            connection.commit()
+            elapsed: float = perf_counter() - started
+
+            total_elapsed += elapsed
+            window_elapsed += elapsed
+            window_rows += end - start
+
+            if end % report_every == 0 or end == rows:
+                print(
+                    f"{scheme:<6} {end:>10} "
+                    f"{window_rows / window_elapsed:>14.0f}"
+                )
+                window_elapsed = 0.0
+                window_rows = 0
+
+    Base.metadata.drop_all(engine)
+
+    return rows / total_elapsed
+
+
+def main() -> None:
+    parser: ArgumentParser = ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--url",
+        help="A DB URL. A temporary SQLite DB is used by default",
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=2_000_000,
+        help="A number of rows to insert into the `message` table",
+    )
+    parser.add_argument(
+        "--report-every",
+        type=int,
+        default=250_000,
+        help="A number of rows, after which a throughput is printed",
+    )
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as temp_dir:
+        url: str = args.url or f"sqlite:///{temp_dir}/benchmark.db"
+        engine: Engine = create_engine(url)
+
+        print(f"{'scheme':<6} {'rows':>10} {'rows/s':>14}")
+        overall: dict[str, float] = {
+            scheme: run(engine, scheme, args.rows, args.report_every)
+            for scheme in key_schemes
+        }
+
+        engine.dispose()
+
+    for scheme, throughput in overall.items():
+        print(f"{scheme:<6} {'overall':>10} {throughput:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+"""
+Measures a latency of the lookups, which the bot does on every update,
+before and after a creation of the lookup indexes.
+
+The script creates the tables, fills them with generated rows, runs the
+lookups without the indexes, creates the indexes and runs the lookups
+again. By default, a temporary SQLite DB is used. An another DB can be
+provided by the `--url` option, but the tables are dropped there after
+the run, so a dedicated DB must be used.
+
+Usage::
+
+    python benchmarks/lookup_latency.py
+    python benchmarks/lookup_latency.py --sizes 10000 100000
+    python benchmarks/lookup_latency.py --url mysql+pymysql://...
+"""
+
+from __future__ import annotations
+
+import random
+import statistics
+from argparse import ArgumentParser
+from datetime import datetime
+from secrets import token_hex
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import TYPE_CHECKING
+from uuid import uuid4
+
+from sqlalchemy import create_engine, insert, select
+
+from message_sender_telegram_bot.libs.rdb.database_tables import (
+    Base,
+    Message,
+    Token,
+    User,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from sqlalchemy import Connection, Engine, Select
+
+INSERT_CHUNK_SIZE: int = 10_000
+
+
+def fill(connection: Connection, size: int) -> tuple[list[int], list[str]]:
+    """
+    Fills the tables with generated rows.
+
+    :param connection: A DB connection.
+    :type connection: Connection
+    :param size: A number of rows in every table.
+    :type size: int
+    :return: The generated user IDs and tokens.
+    :rtype: tuple[list[int], list[str]]
+    """
+    user_ids: list[int] = random.sample(range(10**9, 10**10), size)
+    tokens: list[str] = [token_hex(32) for _ in range(size)]
+
+    # A connection executes the statements in Core, so the rows are keyed
+    # by the column names instead of the attribute names
+    for start in range(0, size, INSERT_CHUNK_SIZE):
+        end: int = min(start + INSERT_CHUNK_SIZE, size)
+        token_rows: list[dict[str, object]] = [
+            {"id": uuid4(), "token": token} for token in tokens[start:end]
+        ]
+        user_rows: list[dict[str, object]] = [
+            {
+                "id": uuid4(),
+                "user_id": user_id,
+                "is_authorizing": False,
+                "token_id": token_row["id"],
+                "is_owner": False,
+                "last_send_date": None,
+            }
+            for user_id, token_row in zip(
+                user_ids[start:end],
+                token_rows,
+                strict=True,
+            )
+        ]
+        message_rows: list[dict[str, object]] = [
+            {
+                "id": uuid4(),
+                "message_id": message_id,
+                "sender_id": user_row["id"],
+                "text": "Text",
+                "sent_date": datetime.now(),
+            }
+            for message_id, user_row in enumerate(user_rows, start=start)
+        ]
+        connection.execute(insert(Token), token_rows)
+        connection.execute(insert(User), user_rows)
+        connection.execute(insert(Message), message_rows)
+
+    connection.commit()
+
+    return user_ids, tokens
+
+
+def measure(
+    connection: Connection,
+    stmt_factory: Callable[[object], Select],
+    keys: list[object],
+) -> tuple[float, float]:
+    """
+    Measures a latency of the lookups.
+
+    :param connection: A DB connection.
+    :type connection: Connection
+    :param stmt_factory: A function, which creates a lookup statement by
+                         a key.
+    :type stmt_factory: Callable[[object], Select]
+    :param keys: The keys to look up.
+    :type keys: list[object]
+    :return: A median and a 95th percentile of the latency in
+             microseconds.
+    :rtype: tuple[float, float]
+    """
+    timings: list[float] = []
+
+    for key in keys:
+        stmt: Select = stmt_factory(key)
+        started: float = perf_counter()
+        connection.execute(stmt).first()
+        timings.append((perf_counter() - started) * 1_000_000)
+
+    percentiles: list[float] = statistics.quantiles(timings, n=20)
+
+    return statistics.median(timings), percentiles[-1]
+
+
+def run(engine: Engine, size: int, lookups: int) -> None:
+    """
+    Runs the benchmark for one size of the tables and prints a result.
+
+    :param engine: A DB engine.
+    :type engine: Engine
+    :param size: A number of rows in every table.
+    :type size: int
+    :param lookups: A number of lookups for every query.
+    :type lookups: int
+    """
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    with engine.connect() as connection:
+        # The indexes are dropped to measure the lookups before the
+        # migration
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.drop(connection)
+        connection.commit()
+
+        user_ids, tokens = fill(connection, size)
+        message_ids: list[int] = list(range(size))
+
+        queries: dict[str, tuple[Callable[[object], Select], list[object]]] = {
+            "user.user_id": (
+                lambda key: select(User).where(User.user_id == key),
+                random.choices(user_ids, k=lookups),
+            ),
+            "token.token": (
+                lambda key: select(Token).where(Token.token == key),
+                random.choices(tokens, k=lookups),
+            ),
+            "message.message_id": (
+                lambda key: select(Message).where(Message.message_id == key),
+                random.choices(message_ids, k=lookups),
+            ),
+        }
+
+        before: dict[str, tuple[float, float]] = {
+            name: measure(connection, stmt_factory, keys)
+            for name, (stmt_factory, keys) in queries.items()
+        }
+
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(connection)
+        connection.commit()
+
+        after: dict[str, tuple[float, float]] = {
+            name: measure(connection, stmt_factory, keys)
+            for name, (stmt_factory, keys) in queries.items()
+        }
+
+    for name in queries:
+        before_median, before_p95 = before[name]
+        after_median, after_p95 = after[name]
+        print(
+            f"{size:>9} {name:<20} "
+            f"{before_median:>12.1f} {before_p95:>12.1f} "
+            f"{after_median:>12.1f} {after_p95:>12.1f}"
+        )
+
+    Base.metadata.drop_all(engine)
+
+
+def main() -> None:
+    parser: ArgumentParser = ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--url",
+        help="A DB URL. A temporary SQLite DB is used by default",
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10_000, 100_000, 1_000_000],
+        help="Numbers of rows in every table",
+    )
+    parser.add_argument(
+        "--lookups",
+        type=int,
+        default=200,
+        help="A number of lookups for every query",
+    )
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as temp_dir:
+        url: str = args.url or f"sqlite:///{temp_dir}/benchmark.db"
+        engine: Engine = create_engine(url)
+
+        print(
+            f"{'rows':>9} {'lookup':<20} "
+            f"{'before p50':>12} {'before p95':>12} "
+            f"{'after p50':>12} {'after p95':>12}  (us)"
+        )
+        for size in args.sizes:
+            run(engine, size, args.lookups)
+
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
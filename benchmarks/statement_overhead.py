@@ -0,0 +1,176 @@
+"""
+Measures an overhead of the lookup statements, which are built on every
+call, and of the precompiled statements, which the DB manipulators
+reuse with the bound parameters.
+
+A built statement is constructed and hashed into a cache key again on
+every execute, even if its compiled form is cached, while a precompiled
+statement skips both. For every lookup, the script executes both
+statements against an empty table and prints a minimum time of an
+execute. By default, a temporary SQLite DB is used, but an another DB
+can be provided by the `--url` option. The tables are dropped there
+after the run, so a dedicated DB must be used.
+
+Usage::
+
+    python benchmarks/statement_overhead.py
+    python benchmarks/statement_overhead.py --number 1000 --repeat 10
+    python benchmarks/statement_overhead.py --url mysql+pymysql://...
+"""
+
+from __future__ import annotations
+
+from argparse import ArgumentParser
+from tempfile import TemporaryDirectory
+from timeit import repeat
+from typing import TYPE_CHECKING, Any
+from uuid import uuid4
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, joinedload
+
+from message_sender_telegram_bot.libs import MessageDraft, Token, User
+from message_sender_telegram_bot.libs.rdb.database_tables import Base
+from message_sender_telegram_bot.libs.rdb.manipulators import (
+    db_message_manipulator,
+    db_token_manipulator,
+    db_user_manipulator,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from uuid import UUID
+
+    from sqlalchemy import Engine, Executable
+
+
+def measure(
+    execute: Callable[[], Any],
+    number: int,
+    repetitions: int,
+) -> float:
+    """
+    Measures a time of an execute.
+
+    :param execute: A function, which executes a statement.
+    :type execute: Callable[[], Any]
+    :param number: A number of the executes in one measure.
+    :type number: int
+    :param repetitions: A number of the measures.
+    :type repetitions: int
+    :return: A minimum time of an execute in microseconds.
+    :rtype: float
+    """
+    # A first execute compiles a statement and puts it into a cache
+    execute()
+
+    # A minimum of the measures excludes a noise
+    return (
+        min(repeat(execute, number=number, repeat=repetitions))
+        / number
+        * 1_000_000
+    )
+
+
+def run(engine: Engine, number: int, repetitions: int) -> None:
+    """
+    Runs the benchmark and prints a result.
+
+    :param engine: A DB engine.
+    :type engine: Engine
+    :param number: A number of the executes in one measure.
+    :type number: int
+    :param repetitions: A number of the measures.
+    :type repetitions: int
+    """
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    sender_id: UUID = uuid4()
+    lookups: dict[
+        str, tuple[Callable[[], Executable], Executable, dict[str, Any]]
+    ] = {
+        "user": (
+            lambda: (
+                select(User)
+                .options(joinedload(User.token))
+                .where(User.user_id == 6573920184)
+            ),
+            db_user_manipulator.select_user_stmt,
+            {"user_id": 6573920184},
+        ),
+        "token": (
+            lambda: (
+                select(Token)
+                .options(joinedload(Token.user))
+                .where(Token.token == "TOKEN")
+            ),
+            db_token_manipulator.select_token_stmt,
+            {"token": "TOKEN"},
+        ),
+        "message": (
+            lambda: select(MessageDraft).where(
+                MessageDraft.message_id == 1,
+                MessageDraft.sender_id == sender_id,
+            ),
+            db_message_manipulator.select_draft_stmt,
+            {"message_id": 1, "sender_id": sender_id},
+        ),
+    }
+
+    with Session(engine) as db_session:
+        for name, (
+            build_stmt,
+            precompiled_stmt,
+            parameters,
+        ) in lookups.items():
+            built_stmt_time: float = measure(
+                lambda: db_session.execute(build_stmt()).all(),
+                number,
+                repetitions,
+            )
+            precompiled_stmt_time: float = measure(
+                lambda: db_session.execute(precompiled_stmt, parameters).all(),
+                number,
+                repetitions,
+            )
+            print(
+                f"{name:<10} {built_stmt_time:>12.1f} "
+                f"{precompiled_stmt_time:>12.1f}"
+            )
+
+    Base.metadata.drop_all(engine)
+
+
+def main() -> None:
+    parser: ArgumentParser = ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--url",
+        help="A DB URL. A temporary SQLite DB is used by default",
+    )
+    parser.add_argument(
+        "--number",
+        type=int,
+        default=200,
+        help="A number of the executes in one measure",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="A number of the measures",
+    )
+    args = parser.parse_args()
+
+    with TemporaryDirectory() as temp_dir:
+        url: str = args.url or f"sqlite:///{temp_dir}/benchmark.db"
+        engine: Engine = create_engine(url)
+
+        print(f"{'lookup':<10} {'built':>12} {'precompiled':>12}  (us)")
+        run(engine, args.number, args.repeat)
+
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Measures a storage size and a cost of the writes and the reads of the
+message texts, which are stored as plain strings and as compressed
+texts.
+
+For every storage, the script creates a table with a text column,
+inserts a corpus of the texts, reads them back and prints a size of the
+stored texts and a time of the inserts and the reads. A corpus is a
+UTF-8 file, in which the texts are separated by the blank lines, and
+can be provided by the `--corpus` option. By default, a corpus of the
+generated prose is used. By default, a temporary SQLite DB is used, but
+an another DB can be provided by the `--url` option. The tables are
+dropped there after the run, so a dedicated DB must be used.
+
+Usage::
+
+    python benchmarks/text_compression.py
+    python benchmarks/text_compression.py --corpus messages.txt
+    python benchmarks/text_compression.py --url mysql+pymysql://...
+"""
+
+from __future__ import annotations
+
+import random
+from argparse import ArgumentParser
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    create_engine,
+    insert,
+    select,
+)
+
+from message_sender_telegram_bot.libs.rdb.column_types import CompressedText
+
+if TYPE_CHECKING:
+    from sqlalchemy import Engine
+    from sqlalchemy.types import TypeEngine
+
+# A maximum length of a Telegram message
+MAX_TEXT_LENGTH: int = 4096
+
+SENTENCES: tuple[str, ...] = (
+    "Thank you for the quick reply to my previous message.",
+    "I would like to ask about the schedule for the next week.",
+    "Could you please send me the documents, which we discussed?",
+    "The meeting is moved to Thursday at ten o'clock in the morning.",
+    "Please let me know, if anything else is needed from my side.",
+    "I have checked the report and found a few small mistakes.",
+    "The delivery will arrive a bit later than it was planned.",
+    "We are still waiting for a confirmation from the other team.",
+    "Have a nice day, and thank you again for your help.",
+    "The invoice is attached, and the payment is due next month.",
+)
+
+storages: dict[str, TypeEngine[str]] = {
+    "plain": String(MAX_TEXT_LENGTH),
+    "compressed": CompressedText(),
+    "compressed-0": CompressedText(threshold=0),
+    "compressed-1024": CompressedText(threshold=1024),
+}
+
+
+def generate_corpus(size: int) -> list[str]:
+    """
+    Generates a corpus of the prose, which repeats the sentences like a
+    usual correspondence.
+
+    :param size: A number of the texts.
+    :type size: int
+    :return: The generated texts.
+    :rtype: list[str]
+    """
+    random_generator: random.Random = random.Random(0)
+    corpus: list[str] = []
+
+    for _ in range(size):
+        # Most of the messages are short, but a long one takes the most
+        # of a space
+        sentence_count: int = min(
+            int(random_generator.paretovariate(1.2)),
+            MAX_TEXT_LENGTH // 64,
+        )
+        text: str = " ".join(
+            random_generator.choices(SENTENCES, k=sentence_count)
+        )
+        corpus.append(text[:MAX_TEXT_LENGTH])
+
+    return corpus
+
+
+def read_corpus(path: Path) -> list[str]:
+    """
+    Reads a corpus of the texts from a file.
+
+    :param path: A path to a UTF-8 file, in which the texts are
+                 separated by the blank lines.
+    :type path: Path
+    :return: The read texts.
+    :rtype: list[str]
+    """
+    return [
+        text.strip()[:MAX_TEXT_LENGTH]
+        for text in path.read_text(encoding="utf-8").split("\n\n")
+        if text.strip()
+    ]
+
+
+def run(
+    engine: Engine,
+    name: str,
+    text_type: TypeEngine[str],
+    corpus: list[str],
+) -> None:
+    """
+    Runs the benchmark for one storage and prints a result.
+
+    :param engine: A DB engine.
+    :type engine: Engine
+    :param name: A name of a storage.
+    :type name: str
+    :param text_type: A type of a text column.
+    :type text_type: TypeEngine[str]
+    :param corpus: The texts.
+    :type corpus: list[str]
+    """
+    metadata: MetaData = MetaData()
+    table: Table = Table(
+        "text_compression_benchmark",
+        metadata,
+        Column("id", Integer, primary_key=True),
+        Column("text", text_type, nullable=False),
+    )
+    metadata.drop_all(engine)
+    metadata.create_all(engine)
+
+    rows: list[dict[str, object]] = [
+        {"id": id_, "text": text} for id_, text in enumerate(corpus)
+    ]
+    # A size of a stored text is a size of a value, which is bound to a
+    # statement
+    bind_processor = text_type.bind_processor(engine.dialect)
+    stored_size: int = sum(
+        len(
+            (
+                bind_processor(text)
+                if bind_processor is not None
+                else text.encode()
+            )
+        )
+        for text in corpus
+    )
+
+    with engine.connect() as connection:
+        started: float = perf_counter()
+        connection.execute(insert(table), rows)
+        connection.commit()
+        write_time: float = perf_counter() - started
+
+        started = perf_counter()
+        read_texts: list[str] = list(
+            connection.execute(select(table.c.text)).scalars()
+        )
+        read_time: float = perf_counter() - started
+
+    assert read_texts == corpus
+
+    print(
+        f"{name:<16} {stored_size:>14} "
+        f"{write_time * 1_000_000 / len(corpus):>12.1f} "
+        f"{read_time * 1_000_000 / len(corpus):>12.1f}"
+    )
+
+    metadata.drop_all(engine)
+
+
+def main() -> None:
+    parser: ArgumentParser = ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--url",
+        help="A DB URL. A temporary SQLite DB is used by default",
+    )
+    parser.add_argument(
+        "--corpus",
+        type=Path,
+        help="A file with the texts. A generated prose is used by default",
+    )
+    parser.add_argument(
+        "--size",
+        type=int,
+        default=50_000,
+        help="A number of the generated texts",
+    )
+    args = parser.parse_args()
+
+    corpus: list[str] = (
+        read_corpus(args.corpus)
+        if args.corpus is not None
+        else generate_corpus(args.size)
+    )
+
+    with TemporaryDirectory() as temp_dir:
+        url: str = args.url or f"sqlite:///{temp_dir}/benchmark.db"
+        engine: Engine = create_engine(url)
+
+        print(
+            f"{len(corpus)} texts, "
+            f"{sum(len(text.encode()) for text in corpus)} bytes of UTF-8"
+        )
+        print(
+            f"{'storage':<16} {'stored bytes':>14} "
+            f"{'write/text':>12} {'read/text':>12}  (us)"
+        )
+        for name, text_type in storages.items():
+            run(engine, name, text_type, corpus)
+
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
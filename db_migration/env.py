@@ -1,8 +1,12 @@
+from datetime import timedelta
 from logging.config import fileConfig
 
 from alembic import context
 from sqlalchemy import engine_from_config, pool
 
+from message_sender_telegram_bot.libs.rdb.chunked_migration import (
+    ChunkedMigration,
+)
 from message_sender_telegram_bot.libs.rdb.database_tables import Base
 
 # this is the Alembic Config object, which provides
@@ -25,6 +29,17 @@ target_metadata = Base.metadata
 # my_important_option = config.get_main_option("my_important_option")
 # ... etc.
 
+# The revisions change the rows of the large tables in batches, so the
+# bot keeps working during a migration. A size of a batch and a pause
+# between the batches in seconds can be tuned by the `-x` options:
+#
+#     alembic -x batch_size=5000 -x batch_pause=0.5 upgrade head
+x_arguments: dict[str, str] = context.get_x_argument(as_dictionary=True)
+config.attributes["chunked_migration"] = ChunkedMigration(
+    batch_size=int(x_arguments.get("batch_size", 1000)),
+    batch_pause=timedelta(seconds=float(x_arguments.get("batch_pause", 0.1))),
+)
+
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
@@ -44,6 +59,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
+        render_as_batch=True,
     )
 
     with context.begin_transaction():
@@ -64,8 +80,18 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
+        # SQLite can't alter the most of the table's properties, so the
+        # generated revisions alter the tables in batches, which recreate
+        # a table in SQLite and alter it in place in other dialects
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=True,
+            # A chunked change commits a transaction of a migration
+            # before its batches, so every revision runs in its own
+            # transaction and a failed revision doesn't roll back the
+            # committed ones
+            transaction_per_migration=True,
         )
 
         with context.begin_transaction():
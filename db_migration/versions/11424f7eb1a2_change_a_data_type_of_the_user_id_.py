@@ -21,9 +21,13 @@ depends_on: str | Sequence[str] | None = None
 
 def upgrade() -> None:
     """Upgrade schema."""
-    op.alter_column("user", "user_id", type_=sa.BigInteger)
+    # SQLite can't change a type of a column, so a batch recreates the
+    # table there. Other dialects alter the table in place
+    with op.batch_alter_table("user") as batch_op:
+        batch_op.alter_column("user_id", type_=sa.BigInteger)
 
 
 def downgrade() -> None:
     """Downgrade schema."""
-    op.alter_column("user", "user_id", type_=sa.Integer)
+    with op.batch_alter_table("user") as batch_op:
+        batch_op.alter_column("user_id", type_=sa.Integer)
@@ -20,33 +20,35 @@ depends_on: str | Sequence[str] | None = None
 
 def upgrade() -> None:
     """Upgrade schema."""
-    op.drop_constraint(
-        "fk_user_token_id_valid_token",
-        "user",
-        "foreignkey",
-    )
+    # SQLite can't alter a constraint of an existing table, so a batch
+    # recreates the table there. Other dialects alter the table in place
+    with op.batch_alter_table("user") as batch_op:
+        batch_op.drop_constraint(
+            "fk_user_token_id_valid_token",
+            "foreignkey",
+        )
     op.rename_table("valid_token", "token")
-    op.create_foreign_key(
-        None,
-        "user",
-        "token",
-        ["token_id"],
-        ["id"],
-    )
+    with op.batch_alter_table("user") as batch_op:
+        batch_op.create_foreign_key(
+            "fk_user_token_id_token",
+            "token",
+            ["token_id"],
+            ["id"],
+        )
 
 
 def downgrade() -> None:
     """Downgrade schema."""
-    op.drop_constraint(
-        "fk_user_token_id_token",
-        "user",
-        "foreignkey",
-    )
+    with op.batch_alter_table("user") as batch_op:
+        batch_op.drop_constraint(
+            "fk_user_token_id_token",
+            "foreignkey",
+        )
     op.rename_table("token", "valid_token")
-    op.create_foreign_key(
-        None,
-        "user",
-        "valid_token",
-        ["token_id"],
-        ["id"],
-    )
+    with op.batch_alter_table("user") as batch_op:
+        batch_op.create_foreign_key(
+            "fk_user_token_id_valid_token",
+            "valid_token",
+            ["token_id"],
+            ["id"],
+        )
@@ -0,0 +1,206 @@
+"""Move the message drafts to a `message_draft` table and keep only the
+sent messages in the `message` table
+
+Revision ID: 3f1c9a7d2e84
+Revises: 714afc81b705
+Create Date: 2026-10-18 18:05:41.382916
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import context, op
+
+from message_sender_telegram_bot.libs.rdb.chunked_migration import (
+    ChunkedMigration,
+)
+from message_sender_telegram_bot.libs.rdb.column_types import BinaryUUID
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1c9a7d2e84"
+down_revision: str | Sequence[str] | None = "714afc81b705"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# The lightweight tables, which are used only to move the rows
+message_table = sa.table(
+    "message",
+    sa.column("id", BinaryUUID),
+    sa.column("message_id", sa.BigInteger),
+    sa.column("sender_id", BinaryUUID),
+    sa.column("text", sa.String(4096)),
+    sa.column("is_sent", sa.Boolean),
+    sa.column("sent_date", sa.DateTime),
+)
+message_draft_table = sa.table(
+    "message_draft",
+    sa.column("id", BinaryUUID),
+    sa.column("message_id", sa.BigInteger),
+    sa.column("sender_id", BinaryUUID),
+    sa.column("text", sa.String(4096)),
+    sa.column("created_date", sa.DateTime),
+)
+
+
+def has_table(table_name: str) -> bool:
+    # A schema can't be inspected in an offline mode, so a DB is assumed
+    # to be not migrated there
+    if context.is_offline_mode():
+        return False
+
+    return sa.inspect(op.get_bind()).has_table(table_name)
+
+
+def has_index(table_name: str, index_name: str) -> bool:
+    if context.is_offline_mode():
+        return False
+
+    return index_name in {
+        index["name"]
+        for index in sa.inspect(op.get_bind()).get_indexes(table_name)
+    }
+
+
+def has_column(table_name: str, column_name: str) -> bool:
+    if context.is_offline_mode():
+        return False
+
+    return column_name in {
+        column["name"]
+        for column in sa.inspect(op.get_bind()).get_columns(table_name)
+    }
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The batches are committed outside of a transaction of the
+    # migration, and the DDL isn't transactional in MySQL, so a failed
+    # upgrade keeps a part of its changes. Every schema step is skipped,
+    # if it's done, and every batch changes only the not moved rows, so
+    # the failed upgrade is resumed by running it again
+    if not has_table("message_draft"):
+        op.create_table(
+            "message_draft",
+            sa.Column("id", BinaryUUID, primary_key=True),
+            sa.Column("message_id", sa.BigInteger, nullable=False),
+            sa.Column(
+                "sender_id",
+                BinaryUUID,
+                sa.ForeignKey(
+                    "user.id",
+                    onupdate="CASCADE",
+                    ondelete="CASCADE",
+                ),
+                nullable=False,
+            ),
+            sa.Column("text", sa.String(4096), nullable=False),
+            sa.Column("created_date", sa.DateTime, nullable=False),
+        )
+    if not has_index("message_draft", "ix_message_draft_message_id_sender_id"):
+        op.create_index(
+            "ix_message_draft_message_id_sender_id",
+            "message_draft",
+            ["message_id", "sender_id"],
+        )
+
+    # A last step drops the `is_sent` column, so the rows are moved
+    # already, if the column is absent
+    if not context.is_offline_mode() and not has_column("message", "is_sent"):
+        return
+
+    # The rows of the `message` table are changed in batches, so the
+    # table isn't locked for a whole backfill
+    chunked_migration: ChunkedMigration = context.config.attributes[
+        "chunked_migration"
+    ]
+
+    # A send time of the existing messages is unknown, so a time of the
+    # migration is used
+    if not has_column("message", "sent_date"):
+        with op.batch_alter_table("message") as batch_op:
+            batch_op.add_column(sa.Column("sent_date", sa.DateTime))
+    chunked_migration.update(
+        message_table,
+        message_table.c.id,
+        {"sent_date": sa.func.current_timestamp()},
+        sa.and_(
+            message_table.c.is_sent == sa.true(),
+            message_table.c.sent_date.is_(None),
+        ),
+    )
+
+    # A draft is deleted from the `message` table only after it's copied,
+    # so a draft is either in one of the tables or in both of them
+    is_draft_copied: sa.Exists = sa.exists().where(
+        message_draft_table.c.id == message_table.c.id
+    )
+    chunked_migration.copy(
+        message_draft_table,
+        ["id", "message_id", "sender_id", "text", "created_date"],
+        sa.select(
+            message_table.c.id,
+            message_table.c.message_id,
+            message_table.c.sender_id,
+            message_table.c.text,
+            sa.func.current_timestamp(),
+        ).where(
+            message_table.c.is_sent == sa.false(),
+            sa.not_(is_draft_copied),
+        ),
+        message_table.c.id,
+    )
+    chunked_migration.delete(
+        message_table,
+        message_table.c.id,
+        sa.and_(message_table.c.is_sent == sa.false(), is_draft_copied),
+    )
+
+    # SQLite can't alter a column of an existing table, so a batch
+    # recreates the table there. Other dialects alter the table in place
+    with op.batch_alter_table("message") as batch_op:
+        batch_op.alter_column(
+            "sent_date",
+            existing_type=sa.DateTime,
+            nullable=False,
+        )
+        batch_op.drop_column("is_sent")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    chunked_migration: ChunkedMigration = context.config.attributes[
+        "chunked_migration"
+    ]
+
+    with op.batch_alter_table("message") as batch_op:
+        batch_op.add_column(sa.Column("is_sent", sa.Boolean))
+    chunked_migration.update(
+        message_table,
+        message_table.c.id,
+        {"is_sent": sa.true()},
+    )
+
+    with op.batch_alter_table("message") as batch_op:
+        batch_op.alter_column(
+            "is_sent",
+            existing_type=sa.Boolean,
+            nullable=False,
+        )
+        batch_op.drop_column("sent_date")
+
+    op.execute(
+        message_table.insert().from_select(
+            ["id", "message_id", "sender_id", "text", "is_sent"],
+            sa.select(
+                message_draft_table.c.id,
+                message_draft_table.c.message_id,
+                message_draft_table.c.sender_id,
+                message_draft_table.c.text,
+                sa.false(),
+            ),
+        )
+    )
+
+    op.drop_index("ix_message_draft_message_id_sender_id", "message_draft")
+    op.drop_table("message_draft")
@@ -41,5 +41,8 @@ def upgrade() -> None:
 
 def downgrade() -> None:
     """Downgrade schema."""
-    op.drop_constraint("fk_message_sender_id_user", "message", "foreignkey")
+    # SQLite can't drop a constraint of an existing table, so a batch
+    # recreates the table there. Other dialects alter the table in place
+    with op.batch_alter_table("message") as batch_op:
+        batch_op.drop_constraint("fk_message_sender_id_user", "foreignkey")
     op.drop_table("message")
@@ -0,0 +1,120 @@
+"""Store UUIDs as `BINARY(16)` instead of `CHAR(32)` in MySQL
+
+Revision ID: 714afc81b705
+Revises: b52d9ec1f1cc
+Create Date: 2026-10-18 14:21:52.604117
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "714afc81b705"
+down_revision: str | Sequence[str] | None = "b52d9ec1f1cc"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Other dialects store UUIDs natively or keep them in the format of the
+# `Uuid` type, so the revision changes only these ones.
+#
+# The revision isn't optional. A `BinaryUUID` type of the models reads
+# and writes `BINARY(16)` values on these dialects, so a schema with the
+# `CHAR(32)` columns wouldn't match any lookup by a key. To keep the
+# hexadecimal columns, stay on the previous revision together with the
+# previous version of the bot
+binary_uuid_dialects: frozenset[str] = frozenset({"mysql", "mariadb"})
+
+# Tables and their UUID columns with a nullability of the columns
+uuid_columns: tuple[tuple[str, str, bool], ...] = (
+    ("token", "id", False),
+    ("user", "id", False),
+    ("user", "token_id", True),
+    ("message", "id", False),
+    ("message", "sender_id", False),
+)
+
+
+def drop_foreign_keys() -> None:
+    # Both sides of a foreign key must have the same type, so the foreign
+    # keys are dropped during a change of the types
+    op.drop_constraint("fk_user_token_id_token", "user", "foreignkey")
+    op.drop_constraint("fk_message_sender_id_user", "message", "foreignkey")
+
+
+def create_foreign_keys() -> None:
+    op.create_foreign_key(
+        "fk_user_token_id_token",
+        "user",
+        "token",
+        ["token_id"],
+        ["id"],
+    )
+    op.create_foreign_key(
+        "fk_message_sender_id_user",
+        "message",
+        "user",
+        ["sender_id"],
+        ["id"],
+        onupdate="CASCADE",
+        ondelete="RESTRICT",
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_context().dialect.name not in binary_uuid_dialects:
+        return None
+
+    drop_foreign_keys()
+
+    for table, column, nullable in uuid_columns:
+        # A hexadecimal UUID is kept as bytes in a `VARBINARY(32)`
+        # column, converted to a binary one and then the column is
+        # shrunk
+        op.alter_column(
+            table,
+            column,
+            existing_type=sa.CHAR(32),
+            type_=sa.VARBINARY(32),
+            existing_nullable=nullable,
+        )
+        op.execute(f"UPDATE `{table}` SET `{column}` = UNHEX(`{column}`)")
+        op.alter_column(
+            table,
+            column,
+            existing_type=sa.VARBINARY(32),
+            type_=sa.BINARY(16),
+            existing_nullable=nullable,
+        )
+
+    create_foreign_keys()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_context().dialect.name not in binary_uuid_dialects:
+        return None
+
+    drop_foreign_keys()
+
+    for table, column, nullable in uuid_columns:
+        op.alter_column(
+            table,
+            column,
+            existing_type=sa.BINARY(16),
+            type_=sa.VARBINARY(32),
+            existing_nullable=nullable,
+        )
+        op.execute(f"UPDATE `{table}` SET `{column}` = LOWER(HEX(`{column}`))")
+        op.alter_column(
+            table,
+            column,
+            existing_type=sa.VARBINARY(32),
+            type_=sa.CHAR(32),
+            existing_nullable=nullable,
+        )
+
+    create_foreign_keys()
@@ -0,0 +1,33 @@
+"""Add indexes for the columns, by which the expired messages are purged
+
+Revision ID: 9d2b6e41c7a3
+Revises: 3f1c9a7d2e84
+Create Date: 2026-10-18 20:12:09.534871
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9d2b6e41c7a3"
+down_revision: str | Sequence[str] | None = "3f1c9a7d2e84"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_message_sent_date", "message", ["sent_date"])
+    op.create_index(
+        "ix_message_draft_created_date",
+        "message_draft",
+        ["created_date"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_message_draft_created_date", "message_draft")
+    op.drop_index("ix_message_sent_date", "message")
@@ -0,0 +1,35 @@
+"""Add indexes for the columns, by which the bot looks up rows
+
+Revision ID: b52d9ec1f1cc
+Revises: 39e3c833989e
+Create Date: 2026-10-18 12:04:37.215846
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b52d9ec1f1cc"
+down_revision: str | Sequence[str] | None = "39e3c833989e"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_user_user_id", "user", ["user_id"], unique=True)
+    op.create_index("ix_token_token", "token", ["token"], unique=True)
+    op.create_index(
+        "ix_message_message_id_sender_id",
+        "message",
+        ["message_id", "sender_id"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_message_message_id_sender_id", "message")
+    op.drop_index("ix_token_token", "token")
+    op.drop_index("ix_user_user_id", "user")
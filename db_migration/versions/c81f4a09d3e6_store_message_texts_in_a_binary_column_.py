@@ -0,0 +1,78 @@
+"""Store the texts of the sent messages in a binary column to compress the
+long ones
+
+Revision ID: c81f4a09d3e6
+Revises: 9d2b6e41c7a3
+Create Date: 2026-10-18 21:37:26.118453
+
+"""
+
+import zlib
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import context, op
+
+from message_sender_telegram_bot.libs.rdb.column_types import BinaryUUID
+
+# revision identifiers, used by Alembic.
+revision: str = "c81f4a09d3e6"
+down_revision: str | Sequence[str] | None = "9d2b6e41c7a3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# A copy of `COMPRESSED_TEXT_MARKER`, so the revision doesn't change with
+# the column types
+compressed_text_marker: bytes = b"\xff"
+
+message_table = sa.table(
+    "message",
+    sa.column("id", BinaryUUID),
+    sa.column("text", sa.LargeBinary),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A text is converted to its UTF-8 bytes, which are read as a not
+    # compressed text. The existing texts stay not compressed, and the
+    # new long ones are compressed on an insert
+    with op.batch_alter_table("message") as batch_op:
+        batch_op.alter_column(
+            "text",
+            existing_type=sa.String(4096),
+            type_=sa.LargeBinary,
+            existing_nullable=False,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # The compressed texts must be decompressed by Python, so the
+    # downgrade can't be rendered as a SQL script
+    if context.is_offline_mode():
+        raise RuntimeError(
+            "The revision can't be downgraded in an offline mode"
+        )
+
+    connection: sa.Connection = op.get_bind()
+    rows: sa.Result[tuple[object, bytes]] = connection.execute(
+        sa.select(message_table.c.id, message_table.c.text).where(
+            sa.func.substr(message_table.c.text, 1, 1)
+            == compressed_text_marker
+        )
+    )
+    for id_, text in rows.all():
+        connection.execute(
+            message_table.update()
+            .where(message_table.c.id == id_)
+            .values(text=zlib.decompress(text[len(compressed_text_marker) :]))
+        )
+
+    with op.batch_alter_table("message") as batch_op:
+        batch_op.alter_column(
+            "text",
+            existing_type=sa.LargeBinary,
+            type_=sa.String(4096),
+            existing_nullable=False,
+        )
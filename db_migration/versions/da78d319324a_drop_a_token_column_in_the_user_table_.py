@@ -22,18 +22,24 @@ depends_on: str | Sequence[str] | None = None
 
 def upgrade() -> None:
     """Upgrade schema."""
-    op.add_column(
-        "user",
-        sa.Column(
-            "token_id",
-            sa.Uuid,
-            sa.ForeignKey("valid_token.id", ondelete="SET NULL"),
-            nullable=True,
-        ),
-    )
+    # SQLite can't add a constraint to an existing table, so a batch
+    # recreates the table there. Other dialects alter the table in place
+    with op.batch_alter_table("user") as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "token_id",
+                sa.Uuid,
+                sa.ForeignKey("valid_token.id", ondelete="SET NULL"),
+                nullable=True,
+            ),
+        )
 
 
 def downgrade() -> None:
     """Downgrade schema."""
-    op.drop_constraint("fk_user_token_id_valid_token", "user", "foreignkey")
-    op.drop_column("user", "token_id")
+    with op.batch_alter_table("user") as batch_op:
+        batch_op.drop_constraint(
+            "fk_user_token_id_valid_token",
+            "foreignkey",
+        )
+        batch_op.drop_column("token_id")
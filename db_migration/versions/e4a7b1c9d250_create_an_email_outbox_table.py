@@ -0,0 +1,54 @@
+"""Create an `email_outbox` table for the deliveries of the emails
+
+Revision ID: e4a7b1c9d250
+Revises: c81f4a09d3e6
+Create Date: 2026-10-18 23:04:17.652390
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+from message_sender_telegram_bot.libs.rdb.column_types import BinaryUUID
+
+# revision identifiers, used by Alembic.
+revision: str = "e4a7b1c9d250"
+down_revision: str | Sequence[str] | None = "c81f4a09d3e6"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The emails of the existing messages are sent already, so the
+    # table is created empty
+    op.create_table(
+        "email_outbox",
+        sa.Column(
+            "id",
+            BinaryUUID,
+            sa.ForeignKey(
+                "message.id",
+                onupdate="CASCADE",
+                ondelete="CASCADE",
+            ),
+            primary_key=True,
+        ),
+        sa.Column("sender_name", sa.String(255), nullable=False),
+        sa.Column("attempt_count", sa.Integer, nullable=False),
+        sa.Column("next_attempt_date", sa.DateTime),
+        sa.Column("delivered_date", sa.DateTime),
+    )
+    op.create_index(
+        "ix_email_outbox_next_attempt_date",
+        "email_outbox",
+        ["next_attempt_date"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_email_outbox_next_attempt_date", "email_outbox")
+    op.drop_table("email_outbox")
@@ -0,0 +1,39 @@
+"""Add an `is_urgent` column to the `email_outbox` table
+
+Revision ID: f2b8c6d4a1e7
+Revises: e4a7b1c9d250
+Create Date: 2026-10-19 00:21:45.903176
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2b8c6d4a1e7"
+down_revision: str | Sequence[str] | None = "e4a7b1c9d250"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The enqueued deliveries weren't marked urgent, so they get a
+    # default value without a rewrite of the rows
+    with op.batch_alter_table("email_outbox") as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "is_urgent",
+                sa.Boolean,
+                nullable=False,
+                server_default=sa.false(),
+            )
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("email_outbox") as batch_op:
+        batch_op.drop_column("is_urgent")
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from .authorizations import TokenAuthorization
+from .caches import UserAuthStateCache
 from .cooldown_checkers import MessageSendCooldownChecker
 from .handlers import Handlers
 from .helpers import Helpers
@@ -8,26 +9,60 @@ from .rdb import (
     DBMessageManipulator,
     DBTokenManipulator,
     DBUserManipulator,
+    EmailOutbox,
+    EmailOutboxWorker,
+    LazyLoadGuard,
     Message,
+    MessageDraft,
+    PoolTelemetry,
+    QueryTelemetry,
+    RetentionPurger,
+    RoutingSession,
+    SessionScope,
+    SQLitePragmas,
+    TelemetryAsyncAdaptedQueuePool,
     Token,
     User,
 )
-from .senders import EmailSender
+from .senders import (
+    CircuitOpenError,
+    DeliveryPolicy,
+    EmailDigestSender,
+    EmailSender,
+)
 from .settings import Settings
-from .smtp_creators import GmailSMTPCreator
+from .smtp_creators import GmailSMTPCreator, SMTPConnectionPool
+from .update_processors import UserUpdateProcessor
 
 __all__ = [
     "TokenAuthorization",
+    "UserAuthStateCache",
     "MessageSendCooldownChecker",
     "Handlers",
     "Helpers",
     "DBMessageManipulator",
     "DBTokenManipulator",
     "DBUserManipulator",
+    "EmailOutbox",
+    "EmailOutboxWorker",
+    "LazyLoadGuard",
     "Message",
+    "MessageDraft",
+    "PoolTelemetry",
+    "QueryTelemetry",
+    "RetentionPurger",
+    "RoutingSession",
+    "SessionScope",
+    "SQLitePragmas",
+    "TelemetryAsyncAdaptedQueuePool",
     "Token",
     "User",
+    "CircuitOpenError",
+    "DeliveryPolicy",
+    "EmailDigestSender",
     "EmailSender",
     "Settings",
     "GmailSMTPCreator",
+    "SMTPConnectionPool",
+    "UserUpdateProcessor",
 ]
@@ -0,0 +1,7 @@
+from __future__ import annotations
+
+from .user_auth_state_cache import UserAuthStateCache
+
+__all__ = [
+    "UserAuthStateCache",
+]
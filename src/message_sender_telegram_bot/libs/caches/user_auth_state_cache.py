@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import timedelta
+from logging import getLogger
+from time import monotonic
+from typing import TYPE_CHECKING, override
+
+from ..interfaces import AbstractUserAuthStateCache
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from logging import Logger
+    from typing import Self
+
+    from ..types import UserAuthState
+
+logger: Logger = getLogger(__name__)
+
+
+class UserAuthStateCache(AbstractUserAuthStateCache):
+    """
+    An in-process cache of the users' authorization states with an LRU
+    eviction and a TTL.
+
+    A TTL bounds a staleness of a state, which was changed not by the
+    bot or was cached by a concurrent update before a commit of a
+    change.
+
+    :param AbstractUserAuthStateCache: A user's authorization state
+                                       cache interface.
+    :type AbstractUserAuthStateCache: class
+    """
+
+    def __init__(
+        self: Self,
+        max_size: int = 1024,
+        ttl: timedelta = timedelta(seconds=30),
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        """
+        Creates a user's authorization state cache.
+
+        :param max_size: A maximum number of the cached states, defaults
+                         to 1024. The least recently used state is
+                         evicted, when the number is exceeded.
+        :type max_size: int, optional
+        :param ttl: A time, during which a state is cached, defaults to
+                    30 seconds.
+        :type ttl: timedelta, optional
+        :param clock: A function, which returns a current time in
+                      seconds, defaults to `time.monotonic`.
+        :type clock: Callable[[], float], optional
+        :raises ValueError: A maximum size is less than one.
+        """
+        logger.debug("Initializing `%s`...", self.__class__.__name__)
+
+        logger.debug("Checking a maximum size...")
+        if max_size < 1:
+            logger.critical(
+                (
+                    "A maximum size is less than one. Raising a "
+                    "`ValueError` exception..."
+                ),
+            )
+            raise ValueError("A maximum size must be at least one")
+        logger.debug("The maximum size is valid")
+
+        logger.debug(
+            "Setting the arguments to the corresponding instance attributes..."
+        )
+        self.__max_size: int = max_size
+        self.__ttl: float = ttl.total_seconds()
+        self.__clock: Callable[[], float] = clock
+        logger.debug("Set")
+
+        # A state is stored with a time, when it will expire. The
+        # recently used states are moved to the end
+        self.__states: OrderedDict[int, tuple[float, UserAuthState]] = (
+            OrderedDict()
+        )
+        self.__hit_count: int = 0
+        self.__miss_count: int = 0
+
+        logger.debug("Initialized")
+
+    @override
+    def get(self: Self, user_id: int) -> UserAuthState | None:
+        """
+        Gets a cached authorization state of a user.
+
+        :param user_id: A user ID.
+        :type user_id: int
+        :return: A cached authorization state of a user or None, if the
+                 state is not cached or is expired.
+        :rtype: UserAuthState | None
+        """
+        cached: tuple[float, UserAuthState] | None = self.__states.get(user_id)
+
+        if cached is None:
+            self.__miss_count += 1
+            logger.debug("A state of the %s user is not cached", user_id)
+            return None
+
+        expiration_time, auth_state = cached
+
+        if expiration_time <= self.__clock():
+            del self.__states[user_id]
+            self.__miss_count += 1
+            logger.debug("A state of the %s user is expired", user_id)
+            return None
+
+        self.__states.move_to_end(user_id)
+        self.__hit_count += 1
+        logger.debug("A state of the %s user is got from a cache", user_id)
+
+        return auth_state
+
+    @override
+    def set(self: Self, user_id: int, auth_state: UserAuthState) -> None:
+        """
+        Caches an authorization state of a user.
+
+        :param user_id: A user ID.
+        :type user_id: int
+        :param auth_state: An authorization state of a user.
+        :type auth_state: UserAuthState
+        """
+        self.__states[user_id] = (self.__clock() + self.__ttl, auth_state)
+        self.__states.move_to_end(user_id)
+        logger.debug("A state of the %s user is cached", user_id)
+
+        if len(self.__states) > self.__max_size:
+            evicted_user_id, _ = self.__states.popitem(last=False)
+            logger.debug("A state of the %s user is evicted", evicted_user_id)
+
+    @override
+    def invalidate(self: Self, user_id: int) -> None:
+        """
+        Removes a cached authorization state of a user.
+
+        :param user_id: A user ID.
+        :type user_id: int
+        """
+        self.__states.pop(user_id, None)
+        logger.debug("A state of the %s user is invalidated", user_id)
+
+    def get_hit_count(self: Self) -> int:
+        """
+        Gets a number of the gets, which found a cached state.
+
+        :return: A number of the cache hits.
+        :rtype: int
+        """
+        return self.__hit_count
+
+    def get_miss_count(self: Self) -> int:
+        """
+        Gets a number of the gets, which didn't find a cached state.
+
+        :return: A number of the cache misses.
+        :rtype: int
+        """
+        return self.__miss_count
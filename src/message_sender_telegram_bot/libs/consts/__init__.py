@@ -1,11 +1,13 @@
 from .answers import Answers
 from .button_texts import ButtonTexts
+from .circuit_states import CircuitStates
 from .commands import Commands
 from .gmail_smtp_server import GmailSMTPServer
 
 __all__ = [
     "Answers",
     "ButtonTexts",
+    "CircuitStates",
     "Commands",
     "GmailSMTPServer",
 ]
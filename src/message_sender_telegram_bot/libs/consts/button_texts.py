@@ -1,4 +1,5 @@
 class ButtonTexts:
     YES = "Yes"
+    URGENT = "Urgent"
     NO = "No"
     GENERATE_TOKEN = "Generate a token"
@@ -0,0 +1,4 @@
+class CircuitStates:
+    CLOSED: str = "closed"
+    OPEN: str = "open"
+    HALF_OPEN: str = "half-open"
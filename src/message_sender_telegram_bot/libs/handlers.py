@@ -16,25 +16,31 @@ from .rdb import (
     DBUserManipulator,
     database_tables,
 )
-from .types import Token
+from .types import MessageState, Token, UserAuthState
 
 if TYPE_CHECKING:
     from typing import Self
 
-    from sqlalchemy.orm import Session, sessionmaker
+    from sqlalchemy.ext.asyncio import AsyncSession
     from telegram.ext import ContextTypes
 
     from .helpers import Helpers
+    from .interfaces import AbstractUserAuthStateCache
+    from .rdb import SessionScope
 
 
 class Handlers:
     def __init__(
         self: Self,
-        compiled_session: sessionmaker[Session],
+        session_scope: SessionScope,
         helpers: Helpers,
+        user_auth_state_cache: AbstractUserAuthStateCache,
     ) -> None:
-        self.__compiled_session: sessionmaker[Session] = compiled_session
+        self.__session_scope: SessionScope = session_scope
         self.__helpers: Helpers = helpers
+        self.__user_auth_state_cache: AbstractUserAuthStateCache = (
+            user_auth_state_cache
+        )
 
     # Handler that starts an authorization process
     async def start(
@@ -54,62 +60,50 @@ class Handlers:
 
             return None
 
-        with self.__compiled_session() as session:
-            db_user: database_tables.User | None = DBUserManipulator(
-                session,
-                user_id=user.id,
-            ).get()
+        session: AsyncSession = self.__session_scope.session
+        db_user_manipulator: DBUserManipulator = DBUserManipulator(
+            session,
+            user_id=user.id,
+            auth_state_cache=self.__user_auth_state_cache,
+        )
 
-        # If a DB user is not exist, starting an authorization process
-        if db_user is None:
-            with self.__compiled_session() as session:
-                # A creating of a DB user starts an authorization process
-                new_db_user: database_tables.User = DBUserManipulator(
-                    session,
-                    user_id=user.id,
-                ).create()
+        # The checks only read a DB user, so the handler gets an
+        # authorization state of the DB user instead of an ORM instance
+        auth_state: (
+            UserAuthState | None
+        ) = await db_user_manipulator.get_auth_state()
 
-                session.add(new_db_user)
+        # If a DB user is not exist, starting an authorization process
+        if auth_state is None:
+            # A creating of a DB user starts an authorization process
+            new_db_user: database_tables.User = db_user_manipulator.create()
 
-                session.commit()
+            session.add(new_db_user)
 
             await chat.send_message(consts.Answers.ENTER_TOKEN)
 
             return None
 
-        with self.__compiled_session() as session:
-            session.add(db_user)
-
-            is_user_authorizing: bool = DBUserManipulator(
-                session,
-                db_user=db_user,
-            ).get_authorizing_status()
-
-        if is_user_authorizing:
+        if auth_state.is_authorizing:
             await chat.send_message(consts.Answers.ENTER_TOKEN)
 
             return None
 
-        with self.__compiled_session() as session:
-            session.add(db_user)
-
-            token: database_tables.Token | None = DBUserManipulator(
-                session,
-                db_user=db_user,
-            ).get_token()
-
         # If a DB user is authorized and a DB token is not exist, then
         # the token is expired and the user must enter a new token
-        if token is None:
-            with self.__compiled_session() as session:
-                session.add(db_user)
+        if not auth_state.has_token:
+            # A change of an authorizing status changes a DB user, so
+            # the DB user is loaded only in this case
+            db_user: (
+                database_tables.User | None
+            ) = await db_user_manipulator.get()
+
+            if db_user is None:
+                await chat.send_message(consts.Answers.UNKNOWN_ERROR_OCCURS)
 
-                DBUserManipulator(
-                    session,
-                    db_user=db_user,
-                ).set_authorizing_status(True)
+                return None
 
-                session.commit()
+            db_user_manipulator.set_authorizing_status(True)
 
             await chat.send_message(
                 consts.Answers.TOKEN_EXPIRED_ENTER_NEW_TOKEN,
@@ -151,45 +145,51 @@ class Handlers:
 
             return None
 
-        with self.__compiled_session() as session:
-            db_user: database_tables.User | None = DBUserManipulator(
-                session,
-                user_id=user.id,
-            ).get()
+        session: AsyncSession = self.__session_scope.session
+        db_user_manipulator: DBUserManipulator = DBUserManipulator(
+            session,
+            user_id=user.id,
+            auth_state_cache=self.__user_auth_state_cache,
+        )
+
+        # A message of an authorized user is the most frequent case, so
+        # the handler gets only an authorization state of a DB user in
+        # one query instead of a whole DB user
+        auth_state: (
+            UserAuthState | None
+        ) = await db_user_manipulator.get_auth_state()
 
         # If a DB user is not exists, then the user is not authorized
-        if db_user is None:
+        if auth_state is None:
             await chat.send_message(consts.Answers.NOT_AUTHORIZED)
 
             return None
 
-        with self.__compiled_session() as session:
-            session.add(db_user)
+        if auth_state.is_authorizing:
+            # An authorization changes a DB user, so the DB user is
+            # loaded only in this case
+            db_user: (
+                database_tables.User | None
+            ) = await db_user_manipulator.get()
+
+            if db_user is None:
+                await chat.send_message(consts.Answers.NOT_AUTHORIZED)
 
-            is_user_authorizing: bool = DBUserManipulator(
-                session,
-                db_user=db_user,
-            ).get_authorizing_status()
+                return None
 
-        if is_user_authorizing:
             await self.__helpers.authorize(chat, message_text, db_user)
 
             return None
 
-        with self.__compiled_session() as session:
-            session.add(db_user)
+        if not auth_state.has_token:
+            await chat.send_message(consts.Answers.TOKEN_EXPIRED_SEND_START)
 
-            if db_user.token is None:
-                await chat.send_message(
-                    consts.Answers.TOKEN_EXPIRED_SEND_START,
-                )
-
-                return None
+            return None
 
         (
             is_cooldown_passed,
             remaining_time,
-        ) = await self.__helpers.check_cooldown(db_user)
+        ) = await self.__helpers.check_cooldown(auth_state.last_send_date)
 
         if not is_cooldown_passed:
             await chat.send_message(
@@ -200,18 +200,13 @@ class Handlers:
 
             return None
 
-        with self.__compiled_session() as session:
-            session.add(db_user)
-
-            db_message = DBMessageManipulator(
-                session,
-                message.id,
-                sender=db_user,
-                text=message_text,
-            ).create()
-            session.add(db_message)
-
-            session.commit()
+        db_message_draft: database_tables.MessageDraft = DBMessageManipulator(
+            session,
+            message.id,
+            sender_id=auth_state.id_,
+            text=message_text,
+        ).create()
+        session.add(db_message_draft)
 
         await self.__helpers.show_message_confirmation_panel(chat, message.id)
 
@@ -236,25 +231,24 @@ class Handlers:
 
             return None
 
-        with self.__compiled_session() as session:
-            db_user: database_tables.User | None = DBUserManipulator(
-                session, user_id=user.id
-            ).get()
+        session: AsyncSession = self.__session_scope.session
+        db_user_manipulator: DBUserManipulator = DBUserManipulator(
+            session,
+            user_id=user.id,
+            auth_state_cache=self.__user_auth_state_cache,
+        )
+
+        auth_state: (
+            UserAuthState | None
+        ) = await db_user_manipulator.get_auth_state()
 
         # If a DB user is not exists, then the user is not authorized
-        if db_user is None:
+        if auth_state is None:
             await chat.send_message(consts.Answers.NOT_AUTHORIZED)
 
             return None
 
-        with self.__compiled_session() as session:
-            session.add(db_user)
-
-            is_user_authorizing: bool = DBUserManipulator(
-                session, db_user=db_user
-            ).get_authorizing_status()
-
-        if is_user_authorizing:
+        if auth_state.is_authorizing:
             await chat.send_message(consts.Answers.SEND_TOKEN)
 
             return None
@@ -262,7 +256,7 @@ class Handlers:
         (
             is_cooldown_passed,
             remaining_time,
-        ) = await self.__helpers.check_cooldown(db_user)
+        ) = await self.__helpers.check_cooldown(auth_state.last_send_date)
 
         if not is_cooldown_passed:
             await chat.send_message(
@@ -287,41 +281,65 @@ class Handlers:
 
             return None
 
-        # A message ID will be always a third item after the split
-        assigned_message_id = int(callback_data.split(",")[2])
+        callback_data_items: list[str] = callback_data.split(",")
+        # An urgency will be always a second item and a message ID will be
+        # always a third item after the split
+        is_urgent: bool = callback_data_items[1] == "urgent"
+        assigned_message_id = int(callback_data_items[2])
 
-        with self.__compiled_session() as session:
-            db_message: database_tables.Message | None = DBMessageManipulator(
-                session,
-                assigned_message_id,
-            ).get()
+        db_message_manipulator: DBMessageManipulator = DBMessageManipulator(
+            session,
+            assigned_message_id,
+            sender_id=auth_state.id_,
+        )
+
+        # A state of a DB message is got from a draft or, if the message
+        # was sent, from the archive to get its text or to find out, why
+        # the message can't be sent
+        message_state: (
+            MessageState | None
+        ) = await db_message_manipulator.get_state()
 
-        if db_message is None:
+        if message_state is None:
             await chat.send_message(consts.Answers.UNKNOWN_ERROR_OCCURS)
 
             return None
 
-        if db_message.sender_id != db_user.id_:
+        if message_state.sender_id != auth_state.id_:
             await chat.send_message(consts.Answers.NOT_SENDER_OF_MESSAGE)
 
             return None
 
-        if db_message.is_sent:
+        # Two fast confirmations of the same message can pass any check
+        # before a send, so the draft is moved to the archive by one
+        # conditional delete and only a handle, which claimed the
+        # message, enqueues it. The deleted row stays locked till the
+        # commit, so a concurrent claim waits for it
+        if (
+            message_state.is_sent
+            or not await db_message_manipulator.claim_send()
+        ):
+            # A lock isn't held during a call of a Telegram API
+            await self.__session_scope.commit()
+
             await message.edit_text(consts.Answers.MESSAGE_ALREADY_WAS_SENT)
             await callback_query.answer()
 
             return None
 
-        await self.__helpers.send_email(user.name, db_message.text)
-
-        with self.__compiled_session() as session:
-            session.add(db_message)
-            session.add(db_user)
+        # An email is only enqueued with the claim, so a confirmation
+        # doesn't wait for a SMTP server. A worker delivers it after the
+        # commit
+        await db_message_manipulator.enqueue_email(
+            user.name,
+            is_urgent=is_urgent,
+        )
 
-            db_message.is_sent = True
-            db_user.last_send_date = datetime.now()
+        await db_user_manipulator.update_last_send_date(datetime.now())
 
-            session.commit()
+        # A send is reported only after its commit, and the locks aren't
+        # held during the calls of a Telegram API
+        await self.__session_scope.commit()
 
         await message.edit_text(consts.Answers.MESSAGE_SENT)
         await callback_query.answer()
@@ -345,34 +363,37 @@ class Handlers:
 
             return None
 
-        with self.__compiled_session() as session:
-            db_user: database_tables.User | None = DBUserManipulator(
-                session, user_id=user.id
-            ).get()
+        session: AsyncSession = self.__session_scope.session
+        db_user_manipulator: DBUserManipulator = DBUserManipulator(
+            session,
+            user_id=user.id,
+            auth_state_cache=self.__user_auth_state_cache,
+        )
+
+        auth_state: (
+            UserAuthState | None
+        ) = await db_user_manipulator.get_auth_state()
 
         # If the user exists, then the bot must check, that the user is
         # authorizing or not and, if the user is authorizing, cancel the
         # authorization process
-        if db_user is not None:
-            with self.__compiled_session() as session:
-                session.add(db_user)
-
-                is_user_authorizing: bool = DBUserManipulator(
-                    session, db_user=db_user
-                ).get_authorizing_status()
-
+        if auth_state is not None and auth_state.is_authorizing:
             # If the user is authorizing, then the user want to cancel
             # an authorization process. Therefore, the bot will delete
-            # the DB user
-            if is_user_authorizing:
-                with self.__compiled_session() as session:
-                    session.delete(db_user)
+            # the DB user. A deletion changes a DB user, so the DB user
+            # is loaded only in this case
+            db_user: (
+                database_tables.User | None
+            ) = await db_user_manipulator.get()
 
-                    session.commit()
+            if db_user is not None:
+                await db_user_manipulator.delete()
 
-                await chat.send_message(consts.Answers.AUTHORIZATION_CANCELED)
+            await self.__session_scope.commit()
 
-                return None
+            await chat.send_message(consts.Answers.AUTHORIZATION_CANCELED)
+
+            return None
 
         callback_query: telegram.CallbackQuery | None = update.callback_query
 
@@ -386,30 +407,54 @@ class Handlers:
 
                 return None
 
+            # A message ID is unique only in a chat, so a DB message is
+            # looked up by its sender, which must exist
+            if auth_state is None:
+                await chat.send_message(consts.Answers.NOT_SENDER_OF_MESSAGE)
+
+                return None
+
             # A message ID will be always a third item after the split
             assigned_message_id = int(callback_data.split(",")[2])
 
-            with self.__compiled_session() as session:
-                db_message: database_tables.Message | None = (
-                    DBMessageManipulator(
-                        session,
-                        assigned_message_id,
-                    ).get()
+            db_message_manipulator: DBMessageManipulator = (
+                DBMessageManipulator(
+                    session,
+                    assigned_message_id,
+                    sender_id=auth_state.id_,
                 )
+            )
+
+            message_state: (
+                MessageState | None
+            ) = await db_message_manipulator.get_state()
 
-            if db_message is None:
+            if message_state is None:
                 await chat.send_message(consts.Answers.UNKNOWN_ERROR_OCCURS)
 
                 return None
 
-            if db_user is None or db_message.sender_id != db_user.id_:
+            if message_state.sender_id != auth_state.id_:
                 await chat.send_message(consts.Answers.NOT_SENDER_OF_MESSAGE)
 
                 return None
 
             # Because a bug can occur and the message can be sent again,
-            # the bot checks, that the message was sent or not
-            if db_message.is_sent:
+            # the bot checks, that the message was sent or not. A
+            # concurrent send can mark the message as a sent one after
+            # the check, so the message is deleted only, if it's not sent
+            # yet
+            is_deleted: bool = (
+                not message_state.is_sent
+                and await db_message_manipulator.delete_unsent()
+            )
+
+            # A cancel is reported only after its commit, and a lock of
+            # the deleted draft isn't held during the calls of a
+            # Telegram API
+            await self.__session_scope.commit()
+
+            if not is_deleted:
                 await message.edit_text(
                     consts.Answers.MESSAGE_ALREADY_WAS_SENT,
                 )
@@ -417,12 +462,6 @@ class Handlers:
 
                 return None
 
-            # Rejecting the message by deleting it from DB
-            with self.__compiled_session() as session:
-                session.delete(db_message)
-
-                session.commit()
-
             await message.edit_text(consts.Answers.MESSAGE_SEND_CANCELED)
             await callback_query.answer()
 
@@ -518,15 +557,13 @@ class Handlers:
 
         hex_token: Token = Token(token_hex())
 
-        with self.__compiled_session() as session:
-            new_token: database_tables.Token = DBTokenManipulator(
-                session,
-                hex_token,
-            ).create()
-
-            session.add(new_token)
+        session: AsyncSession = self.__session_scope.session
+        new_token: database_tables.Token = DBTokenManipulator(
+            session,
+            hex_token,
+        ).create()
 
-            session.commit()
+        session.add(new_token)
 
         if chat.type != ChatType.PRIVATE:
             await chat.send_message(consts.Answers.SENT_TOKEN_TO_DM)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import datetime, timedelta
 from typing import TYPE_CHECKING
 
@@ -9,30 +10,50 @@ from . import types
 from .consts import Answers, ButtonTexts
 from .cooldown_checkers import MessageSendCooldownChecker
 from .rdb import DBTokenManipulator, DBUserManipulator, User, database_tables
+from .senders.email_digest_sender import EmailDigestSender
 from .senders.email_sender import EmailSender
-from .smtp_creators.gmail_smtp_creator import GmailSMTPCreator
 from .types import CooldownCheckResult
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+    from concurrent.futures import Executor
+    from smtplib import SMTP
     from typing import Self
 
-    from sqlalchemy.orm import Session, sessionmaker
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from .interfaces import AbstractUserAuthStateCache
+    from .rdb import SessionScope
+    from .senders import DeliveryPolicy
+    from .smtp_creators import SMTPConnectionPool
+    from .types import DigestEntry
 
 
 class Helpers:
     def __init__(
         self: Self,
-        gmail_smtp_login: str,
-        gmail_smtp_password: str,
+        smtp_pool: SMTPConnectionPool,
+        email_executor: Executor,
         email_from_addr: str,
         email_to_addr: str,
-        compiled_session: sessionmaker[Session],
+        session_scope: SessionScope,
+        user_auth_state_cache: AbstractUserAuthStateCache,
+        *,
+        is_urgency_offered: bool = False,
+        delivery_policy: DeliveryPolicy | None = None,
     ) -> None:
-        self.__gmail_smtp_login: str = gmail_smtp_login
-        self.__gmail_smtp_password: str = gmail_smtp_password
+        self.__smtp_pool: SMTPConnectionPool = smtp_pool
+        self.__email_executor: Executor = email_executor
         self.__email_from_addr: str = email_from_addr
         self.__email_to_addr: str = email_to_addr
-        self.__compiled_session: sessionmaker[Session] = compiled_session
+        self.__session_scope: SessionScope = session_scope
+        self.__user_auth_state_cache: AbstractUserAuthStateCache = (
+            user_auth_state_cache
+        )
+        # An urgency matters only, if the emails are sent in digests
+        self.__is_urgency_offered: bool = is_urgency_offered
+        # If a policy is absent, then a send is attempted once
+        self.__delivery_policy: DeliveryPolicy | None = delivery_policy
 
     async def authorize(
         self: Self,
@@ -44,12 +65,13 @@ class Helpers:
         # message contains an authorization token
         token: types.Token = types.Token(message_text)
 
-        with self.__compiled_session() as session:
-            session.add(db_user)
-            token: database_tables.Token | None = DBTokenManipulator(
-                session,
-                token,
-            ).get()
+        # A DB token stays locked till the commit, so an another user
+        # can't claim it concurrently
+        session: AsyncSession = self.__session_scope.session
+        token: database_tables.Token | None = await DBTokenManipulator(
+            session,
+            token,
+        ).get_for_update()
 
         # If a DB token with a user-provided token is not exist, then
         # the token is expired or invalid
@@ -60,35 +82,30 @@ class Helpers:
 
         # If a token has a user, then a token is using by an another
         # user
-        with self.__compiled_session() as session:
-            session.add(token)
+        if token.user is not None:
+            await chat.send_message(Answers.TOKEN_WAS_USED)
 
-            if token.user is not None:
-                await chat.send_message(Answers.TOKEN_WAS_USED)
-
-                return None
+            return None
 
         # On this step, the user is pass the challenges, so the user is
-        # authorized
-        with self.__compiled_session() as session:
-            session.add(db_user)
-            db_user_manipulator: DBUserManipulator = DBUserManipulator(
-                session,
-                db_user=db_user,
-            )
-            db_user_manipulator.set_token(token)
-            db_user_manipulator.set_authorizing_status(False)
-            session.commit()
+        # authorized. The changes are committed at the end of the session
+        # scope
+        db_user_manipulator: DBUserManipulator = DBUserManipulator(
+            session,
+            db_user=db_user,
+            auth_state_cache=self.__user_auth_state_cache,
+        )
+        db_user_manipulator.set_token(token)
+        db_user_manipulator.set_authorizing_status(False)
 
         await chat.send_message(Answers.AUTHORIZED)
 
         return None
 
     async def send_email(self: Self, name: str, text: str) -> None:
-        with GmailSMTPCreator(
-            self.__gmail_smtp_login,
-            self.__gmail_smtp_password,
-        ) as smtp:
+        # A pooled connection is logged in already, so a consecutive send
+        # doesn't wait for a handshake and a login
+        def send(smtp: SMTP) -> None:
             email_sender: EmailSender = EmailSender(
                 smtp,
                 self.__email_from_addr,
@@ -97,6 +114,25 @@ class Helpers:
             )
             email_sender.send(text)
 
+        await self.__run_send(send)
+
+    async def send_email_digest(
+        self: Self,
+        entries: Sequence[DigestEntry],
+    ) -> None:
+        def send(smtp: SMTP) -> None:
+            email_digest_sender: EmailDigestSender = EmailDigestSender(
+                smtp,
+                self.__email_from_addr,
+                self.__email_to_addr,
+            )
+            email_digest_sender.send(entries)
+
+        # A digest is sent like a separate email, so it shares the
+        # connections, a limit of the concurrent sends and a policy with
+        # them
+        await self.__run_send(send)
+
     async def show_message_confirmation_panel(
         self: Self,
         chat: Chat,
@@ -112,9 +148,17 @@ class Helpers:
             callback_data=f"message_confirmation,false,{message_id}",
         )
 
-        reply_markup: InlineKeyboardMarkup = InlineKeyboardMarkup(
-            ((yes_button, no_button),)
-        )
+        buttons: tuple[InlineKeyboardButton, ...] = (yes_button, no_button)
+
+        # An urgent message is sent without waiting for a digest
+        if self.__is_urgency_offered:
+            urgent_button: InlineKeyboardButton = InlineKeyboardButton(
+                ButtonTexts.URGENT,
+                callback_data=f"message_confirmation,urgent,{message_id}",
+            )
+            buttons = (yes_button, urgent_button, no_button)
+
+        reply_markup: InlineKeyboardMarkup = InlineKeyboardMarkup((buttons,))
         await chat.send_message(
             Answers.SEND_MESSAGE_QUESTION,
             reply_markup=reply_markup,
@@ -122,12 +166,8 @@ class Helpers:
 
     async def check_cooldown(
         self: Self,
-        db_user: User,
+        last_send_date: datetime | None,
     ) -> CooldownCheckResult:
-        with self.__compiled_session() as session:
-            session.add(db_user)
-            last_send_date: datetime | None = db_user.last_send_date
-
         if last_send_date is None:
             return CooldownCheckResult(True, timedelta())
 
@@ -147,14 +187,40 @@ class Helpers:
         return CooldownCheckResult(False, remaining_cooldown)
 
     async def is_user_owner(self: Self, user_id: int) -> bool:
-        with self.__compiled_session() as session:
-            db_user_manipulator: DBUserManipulator = DBUserManipulator(
-                session,
-                user_id=user_id,
+        db_user_manipulator: DBUserManipulator = DBUserManipulator(
+            self.__session_scope.session,
+            user_id=user_id,
+            auth_state_cache=self.__user_auth_state_cache,
+        )
+        # An owner status is a part of an authorization state, so the
+        # status can be got from a cache without a load of a DB user
+        auth_state: (
+            types.UserAuthState | None
+        ) = await db_user_manipulator.get_auth_state()
+
+        # An unknown user can't be an owner
+        if auth_state is None:
+            return False
+
+        return auth_state.is_owner
+
+    async def __run_send(self: Self, send: Callable[[SMTP], None]) -> None:
+        # A SMTP client blocks on a network, so a send is run in a
+        # thread of an executor, and the other updates are handled while
+        # a SMTP server answers. A number of the threads of the executor
+        # limits a number of the concurrent sends
+        async def attempt() -> None:
+            await asyncio.get_running_loop().run_in_executor(
+                self.__email_executor,
+                self.__smtp_pool.run,
+                send,
             )
-            # A `get` method adding a found user to the instance and,
-            # therefore, the program aren't assigning a variable
-            db_user_manipulator.get()
-            is_user_owner: bool = db_user_manipulator.get_owner_status()
 
-        return is_user_owner
+        if self.__delivery_policy is None:
+            await attempt()
+
+            return None
+
+        # A policy retries a failed attempt and fails fast, while a SMTP
+        # server is down
+        await self.__delivery_policy.run(attempt)
@@ -7,9 +7,11 @@ from .db_item_creator import DBItemCreator
 from .db_item_getter import DBItemGetter
 from .sender import Sender
 from .smtp_creator import SMTPCreator
+from .user_auth_state_cache import AbstractUserAuthStateCache
 
 __all__ = [
     "AbstractDBUserManipulator",
+    "AbstractUserAuthStateCache",
     "Authorization",
     "CooldownChecker",
     "DBItemCreator",
@@ -8,10 +8,15 @@ from .db_item_creator import DBItemCreator
 from .db_item_getter import DBItemGetter
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from datetime import datetime
     from logging import Logger
     from typing import Self
 
+    from sqlalchemy.ext.asyncio import AsyncSession
+
     from ..rdb.database_tables import Token, User
+    from ..types import UserAuthState
 
 logger: Logger = getLogger(__name__)
 
@@ -23,7 +28,7 @@ class AbstractDBUserManipulator(
 
     @abstractmethod
     @override
-    def get(self: Self) -> User | None:
+    async def get(self: Self) -> User | None:
         """
         Gets a DB user.
 
@@ -73,6 +78,96 @@ class AbstractDBUserManipulator(
             )
         )
 
+    @classmethod
+    @abstractmethod
+    @override
+    async def get_many(
+        cls: type[Self],
+        db_session: AsyncSession,
+        keys: Sequence[int],
+    ) -> list[User]:
+        """
+        Gets the DB users by their user IDs in one query.
+
+        :param db_session: A DB session.
+        :type db_session: AsyncSession
+        :param keys: The user IDs.
+        :type keys: Sequence[int]
+        :return: The found DB users. The not found user IDs are skipped.
+        :rtype: list[User]
+        :raises NotImplementedError: Must be implemented.
+        """
+        logger.critical(
+            (
+                "A `%s` method of the `%s` interface in invoked. Raising a "
+                "`NotImplementedError` exception..."
+            ),
+            __name__,
+            cls.__name__,
+            exc_info=True,
+        )
+        raise NotImplementedError(
+            (
+                f"A `{__name__}` method of the `{cls.__name__}` interface "
+                f"must be implemented"
+            )
+        )
+
+    @classmethod
+    @abstractmethod
+    @override
+    def create_many(cls: type[Self], values: Sequence[int]) -> list[User]:
+        """
+        Creates the new DB users by their user IDs.
+
+        :param values: The user IDs.
+        :type values: Sequence[int]
+        :return: The new DB users.
+        :rtype: list[User]
+        :raises NotImplementedError: Must be implemented.
+        """
+        logger.critical(
+            (
+                "A `%s` method of the `%s` interface in invoked. Raising a "
+                "`NotImplementedError` exception..."
+            ),
+            __name__,
+            cls.__name__,
+            exc_info=True,
+        )
+        raise NotImplementedError(
+            (
+                f"A `{__name__}` method of the `{cls.__name__}` interface "
+                f"must be implemented"
+            )
+        )
+
+    @abstractmethod
+    async def get_auth_state(self: Self) -> UserAuthState | None:
+        """
+        Gets an authorization state of a DB user.
+
+        :return: An authorization state of a DB user or None, if the DB
+                 user is not found.
+        :rtype: UserAuthState | None
+        :raises NotImplementedError: Must be implemented.
+        """
+        logger.critical(
+            (
+                "A `%s` method of the `%s` interface in invoked. Raising a "
+                "`NotImplementedError` exception..."
+            ),
+            __name__,
+            self.__class__.__name__,
+            exc_info=True,
+        )
+        raise NotImplementedError(
+            (
+                f"A `{__name__}` method of the `{self.__class__.__name__}` "
+                f"interface must be implemented"
+            )
+        )
+
     @abstractmethod
     def get_authorizing_status(self: Self) -> bool:
         """
@@ -199,6 +294,57 @@ class AbstractDBUserManipulator(
             )
         )
 
+    @abstractmethod
+    async def update_last_send_date(
+        self: Self,
+        last_send_date: datetime,
+    ) -> None:
+        """
+        Updates a DB user's last send date.
+
+        :param last_send_date: A last send date to set.
+        :type last_send_date: datetime
+        :raises NotImplementedError: Must be implemented.
+        """
+        logger.critical(
+            (
+                "A `%s` method of the `%s` interface in invoked. Raising a "
+                "`NotImplementedError` exception..."
+            ),
+            __name__,
+            self.__class__.__name__,
+            exc_info=True,
+        )
+        raise NotImplementedError(
+            (
+                f"A `{__name__}` method of the `{self.__class__.__name__}` "
+                f"interface must be implemented"
+            )
+        )
+
+    @abstractmethod
+    async def delete(self: Self) -> None:
+        """
+        Deletes a DB user.
+
+        :raises NotImplementedError: Must be implemented.
+        """
+        logger.critical(
+            (
+                "A `%s` method of the `%s` interface in invoked. Raising a "
+                "`NotImplementedError` exception..."
+            ),
+            __name__,
+            self.__class__.__name__,
+            exc_info=True,
+        )
+        raise NotImplementedError(
+            (
+                f"A `{__name__}` method of the `{self.__class__.__name__}` "
+                f"interface must be implemented"
+            )
+        )
+
     @abstractmethod
     def get_owner_status(self: Self) -> bool:
         """
@@ -5,8 +5,9 @@ from logging import getLogger
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
     from logging import Logger
-    from typing import Self
+    from typing import Any, Self
 
     from ..rdb.database_tables import Base
 
@@ -40,3 +41,38 @@ class DBItemCreator(metaclass=ABCMeta):
                 f"interface must be implemented"
             )
         )
+
+    @classmethod
+    @abstractmethod
+    def create_many(
+        cls: type[Self],
+        values: Sequence[Any],
+    ) -> Sequence[Base]:
+        """
+        Creates the new DB items.
+
+        The new DB items of one table have their primary keys, so a
+        flush of a session inserts them by one batched statement instead
+        of an insert per a DB item.
+
+        :param values: The values of the new DB items.
+        :type values: Sequence[Any]
+        :return: The new DB items.
+        :rtype: Sequence[Base]
+        :raises NotImplementedError: Must be implemented.
+        """
+        logger.critical(
+            (
+                "A `%s` method of the `%s` interface is invoked. Raising a "
+                "`NotImplementedError` exception..."
+            ),
+            __name__,
+            cls.__name__,
+            exc_info=True,
+        )
+        raise NotImplementedError(
+            (
+                f"A `{__name__}` method of the `{cls.__name__}` interface "
+                f"must be implemented"
+            )
+        )
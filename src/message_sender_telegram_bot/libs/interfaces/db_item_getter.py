@@ -5,8 +5,11 @@ from logging import getLogger
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
     from logging import Logger
-    from typing import Self
+    from typing import Any, Self
+
+    from sqlalchemy.ext.asyncio import AsyncSession
 
     from ..rdb.database_tables import Base
 
@@ -17,7 +20,7 @@ class DBItemGetter(metaclass=ABCMeta):
     """A DB item getter interface."""
 
     @abstractmethod
-    def get(self: Self) -> Base | None:
+    async def get(self: Self) -> Base | None:
         """
         Gets a DB item.
 
@@ -40,3 +43,37 @@ class DBItemGetter(metaclass=ABCMeta):
                 f"interface must be implemented"
             )
         )
+
+    @classmethod
+    @abstractmethod
+    async def get_many(
+        cls: type[Self],
+        db_session: AsyncSession,
+        keys: Sequence[Any],
+    ) -> Sequence[Base]:
+        """
+        Gets the DB items by their keys in one query.
+
+        :param db_session: A DB session.
+        :type db_session: AsyncSession
+        :param keys: The keys of the DB items.
+        :type keys: Sequence[Any]
+        :return: The found DB items. The not found keys are skipped.
+        :rtype: Sequence[Base]
+        :raises NotImplementedError: Must be implemented.
+        """
+        logger.critical(
+            (
+                "A `%s` method of the `%s` interface is invoked. Raising a "
+                "`NotImplementedError` exception..."
+            ),
+            __name__,
+            cls.__name__,
+            exc_info=True,
+        )
+        raise NotImplementedError(
+            (
+                f"A `{__name__}` method of the `{cls.__name__}` interface "
+                f"must be implemented"
+            )
+        )
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from abc import ABCMeta, abstractmethod
+from logging import getLogger
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from logging import Logger
+    from typing import Self
+
+    from ..types import UserAuthState
+
+logger: Logger = getLogger(__name__)
+
+
+class AbstractUserAuthStateCache(metaclass=ABCMeta):
+    """A user's authorization state cache interface."""
+
+    @abstractmethod
+    def get(self: Self, user_id: int) -> UserAuthState | None:
+        """
+        Gets a cached authorization state of a user.
+
+        :param user_id: A user ID.
+        :type user_id: int
+        :return: A cached authorization state of a user or None, if the
+                 state is not cached.
+        :rtype: UserAuthState | None
+        :raises NotImplementedError: Must be implemented.
+        """
+        logger.critical(
+            (
+                "A `%s` method of the `%s` interface is invoked. Raising a "
+                "`NotImplementedError` exception..."
+            ),
+            __name__,
+            self.__class__.__name__,
+            exc_info=True,
+        )
+        raise NotImplementedError(
+            (
+                f"A `{__name__}` method of the `{self.__class__.__name__}` "
+                f"interface must be implemented"
+            )
+        )
+
+    @abstractmethod
+    def set(self: Self, user_id: int, auth_state: UserAuthState) -> None:
+        """
+        Caches an authorization state of a user.
+
+        :param user_id: A user ID.
+        :type user_id: int
+        :param auth_state: An authorization state of a user.
+        :type auth_state: UserAuthState
+        :raises NotImplementedError: Must be implemented.
+        """
+        logger.critical(
+            (
+                "A `%s` method of the `%s` interface is invoked. Raising a "
+                "`NotImplementedError` exception..."
+            ),
+            __name__,
+            self.__class__.__name__,
+            exc_info=True,
+        )
+        raise NotImplementedError(
+            (
+                f"A `{__name__}` method of the `{self.__class__.__name__}` "
+                f"interface must be implemented"
+            )
+        )
+
+    @abstractmethod
+    def invalidate(self: Self, user_id: int) -> None:
+        """
+        Removes a cached authorization state of a user.
+
+        :param user_id: A user ID.
+        :type user_id: int
+        :raises NotImplementedError: Must be implemented.
+        """
+        logger.critical(
+            (
+                "A `%s` method of the `%s` interface is invoked. Raising a "
+                "`NotImplementedError` exception..."
+            ),
+            __name__,
+            self.__class__.__name__,
+            exc_info=True,
+        )
+        raise NotImplementedError(
+            (
+                f"A `{__name__}` method of the `{self.__class__.__name__}` "
+                f"interface must be implemented"
+            )
+        )
@@ -1,15 +1,34 @@
-from .database_tables import Message, Token, User
+from .database_tables import EmailOutbox, Message, MessageDraft, Token, User
 from .manipulators import (
     DBMessageManipulator,
     DBTokenManipulator,
     DBUserManipulator,
 )
+from .email_outbox_worker import EmailOutboxWorker
+from .lazy_load_guard import LazyLoadGuard
+from .pool_telemetry import PoolTelemetry, TelemetryAsyncAdaptedQueuePool
+from .query_telemetry import QueryTelemetry
+from .retention_purger import RetentionPurger
+from .routing_session import RoutingSession
+from .session_scope import SessionScope
+from .sqlite_pragmas import SQLitePragmas
 
 __all__ = [
+    "EmailOutbox",
     "Message",
+    "MessageDraft",
     "Token",
     "User",
     "DBMessageManipulator",
     "DBTokenManipulator",
     "DBUserManipulator",
+    "EmailOutboxWorker",
+    "LazyLoadGuard",
+    "PoolTelemetry",
+    "TelemetryAsyncAdaptedQueuePool",
+    "QueryTelemetry",
+    "RetentionPurger",
+    "RoutingSession",
+    "SessionScope",
+    "SQLitePragmas",
 ]
@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from logging import getLogger
+from time import perf_counter, sleep
+from typing import TYPE_CHECKING
+
+from alembic import op
+from sqlalchemy import TableClause, func, select
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+    from logging import Logger
+    from typing import Any, Self
+
+    from alembic.runtime.migration import MigrationContext
+    from sqlalchemy import (
+        ColumnClause,
+        ColumnElement,
+        Connection,
+        CursorResult,
+        Delete,
+        Executable,
+        FromClause,
+        Select,
+        Update,
+    )
+
+logger: Logger = getLogger(__name__)
+
+
+class ChunkedMigration:
+    """
+    A runner of the data changes of a migration in bounded batches. That
+    is, updates, copies and deletes the rows of a table by the batches of
+    the primary keys, commits every batch separately and pauses between
+    the batches.
+
+    A batch locks only its own rows for a time of one short statement,
+    so the bot keeps writing to a table during a migration of the table.
+    A next batch starts after a last key of a previous one instead of an
+    offset, so every batch reads only an index of the primary key.
+
+    The batches are committed outside of a transaction of a migration,
+    so a failed migration keeps the committed batches. Therefore, a
+    change of a revision must skip the already changed rows, so the
+    failed migration is resumed by running it again. In an offline
+    mode, the keys can't be read, so every change is rendered as one
+    statement.
+    """
+
+    def __init__(
+        self: Self,
+        batch_size: int = 1000,
+        batch_pause: timedelta = timedelta(milliseconds=100),
+    ) -> None:
+        """
+        Creates a runner of the data changes of a migration.
+
+        :param batch_size: A maximum number of the rows, which are
+                           changed in one transaction, defaults to 1000.
+        :type batch_size: int, optional
+        :param batch_pause: A pause between the batches, defaults to
+                            `timedelta(milliseconds=100)`. Lets the
+                            updates of the bot and a replication catch
+                            up during a long migration.
+        :type batch_pause: timedelta, optional
+        :raises ValueError: A size of a batch isn't positive.
+        """
+        logger.debug("Initializing `%s`...", self.__class__.__name__)
+
+        logger.debug("Checking a size of a batch...")
+        if batch_size < 1:
+            logger.critical(
+                (
+                    "A size of a batch isn't positive. Raising a `ValueError` "
+                    "exception..."
+                ),
+            )
+            raise ValueError("A size of a batch must be positive")
+        logger.debug("Checked")
+
+        logger.debug(
+            "Setting the arguments to the corresponding instance attributes..."
+        )
+        self.__batch_size: int = batch_size
+        self.__batch_pause: timedelta = batch_pause
+        logger.debug("Set")
+
+        logger.debug("Initialized")
+
+    def update(
+        self: Self,
+        table: TableClause,
+        key_column: ColumnClause[Any],
+        values: dict[str, Any],
+        whereclause: ColumnElement[bool] | None = None,
+    ) -> int:
+        """
+        Updates the rows of a table in batches.
+
+        :param table: A table.
+        :type table: TableClause
+        :param key_column: A primary key column of the table.
+        :type key_column: ColumnClause[Any]
+        :param values: The new values of the columns by the names of the
+                       columns.
+        :type values: dict[str, Any]
+        :param whereclause: A condition of the updated rows, defaults to
+                            None. If None, all the rows are updated.
+        :type whereclause: ColumnElement[bool] | None, optional
+        :return: A number of the updated rows.
+        :rtype: int
+        :raises ValueError: A key column doesn't belong to a table.
+        """
+        update_stmt: Update = table.update().values(values)
+        if whereclause is not None:
+            update_stmt = update_stmt.where(whereclause)
+
+        return self.__run(
+            "Updating",
+            key_column,
+            whereclause,
+            update_stmt,
+            update_stmt.where,
+        )
+
+    def copy(
+        self: Self,
+        target_table: TableClause,
+        columns: Sequence[str],
+        source_select: Select[Any],
+        key_column: ColumnClause[Any],
+    ) -> int:
+        """
+        Copies the selected rows of a table to an another table in
+        batches.
+
+        :param target_table: A table, to which the rows are copied.
+        :type target_table: TableClause
+        :param columns: The names of the columns of the target table,
+                        which are filled by the selected columns.
+        :type columns: Sequence[str]
+        :param source_select: A select of the copied rows. A condition
+                              of the select limits the copied rows.
+        :type source_select: Select[Any]
+        :param key_column: A primary key column of a table of the
+                           select.
+        :type key_column: ColumnClause[Any]
+        :return: A number of the copied rows.
+        :rtype: int
+        :raises ValueError: A key column doesn't belong to a table.
+        """
+        return self.__run(
+            "Copying",
+            key_column,
+            source_select.whereclause,
+            target_table.insert().from_select(columns, source_select),
+            lambda keys_condition: target_table.insert().from_select(
+                columns,
+                source_select.where(keys_condition),
+            ),
+        )
+
+    def delete(
+        self: Self,
+        table: TableClause,
+        key_column: ColumnClause[Any],
+        whereclause: ColumnElement[bool] | None = None,
+    ) -> int:
+        """
+        Deletes the rows of a table in batches.
+
+        :param table: A table.
+        :type table: TableClause
+        :param key_column: A primary key column of the table.
+        :type key_column: ColumnClause[Any]
+        :param whereclause: A condition of the deleted rows, defaults to
+                            None. If None, all the rows are deleted.
+        :type whereclause: ColumnElement[bool] | None, optional
+        :return: A number of the deleted rows.
+        :rtype: int
+        :raises ValueError: A key column doesn't belong to a table.
+        """
+        delete_stmt: Delete = table.delete()
+        if whereclause is not None:
+            delete_stmt = delete_stmt.where(whereclause)
+
+        return self.__run(
+            "Deleting",
+            key_column,
+            whereclause,
+            delete_stmt,
+            delete_stmt.where,
+        )
+
+    def __run(
+        self: Self,
+        action: str,
+        key_column: ColumnClause[Any],
+        whereclause: ColumnElement[bool] | None,
+        stmt: Executable,
+        build_batch_stmt: Callable[[ColumnElement[bool]], Executable],
+    ) -> int:
+        table: FromClause | None = key_column.table
+
+        logger.debug("Checking a table of a key column...")
+        if not isinstance(table, TableClause):
+            logger.critical(
+                (
+                    "A key column doesn't belong to a table. Raising a "
+                    "`ValueError` exception..."
+                ),
+            )
+            raise ValueError("A key column must belong to a table")
+        logger.debug("Checked")
+
+        table_name: str = table.name
+        migration_context: MigrationContext = op.get_context()
+
+        if migration_context.as_sql:
+            logger.debug(
+                "Rendering a change of `%s` as one statement", table_name
+            )
+            op.execute(stmt)
+
+            return 0
+
+        select_count_stmt: Select[tuple[int]] = select(
+            func.count()
+        ).select_from(table)
+        select_first_keys_stmt: Select[tuple[Any]] = (
+            select(key_column).order_by(key_column).limit(self.__batch_size)
+        )
+        if whereclause is not None:
+            select_count_stmt = select_count_stmt.where(whereclause)
+            select_first_keys_stmt = select_first_keys_stmt.where(whereclause)
+
+        processed_count: int = 0
+        batch_count: int = 0
+        started: float = perf_counter()
+
+        # Every statement is committed on its own, so a batch holds its
+        # locks only till the end of its statement
+        with migration_context.autocommit_block():
+            connection: Connection = op.get_bind()
+            total_count: int = connection.scalar(select_count_stmt) or 0
+            logger.info(
+                "%s %s rows of `%s` in batches of %s rows...",
+                action,
+                total_count,
+                table_name,
+                self.__batch_size,
+            )
+
+            last_key: Any = None
+            while True:
+                keys: list[Any] = list(
+                    connection.scalars(
+                        select_first_keys_stmt
+                        if last_key is None
+                        else select_first_keys_stmt.where(
+                            key_column > last_key
+                        )
+                    )
+                )
+
+                if not keys:
+                    break
+
+                # A change is executed by a cursor, so its result has a
+                # count of the changed rows
+                result: CursorResult[Any] = connection.execute(
+                    build_batch_stmt(key_column.in_(keys))
+                )
+                processed_count += result.rowcount
+                batch_count += 1
+
+                elapsed: float = perf_counter() - started
+                logger.info(
+                    "%s `%s`: %s/%s rows in %s batches, %.0f rows/s",
+                    action,
+                    table_name,
+                    processed_count,
+                    total_count,
+                    batch_count,
+                    processed_count / elapsed if elapsed else 0.0,
+                )
+
+                # A short batch is a last one, so a next select is skipped
+                if len(keys) < self.__batch_size:
+                    break
+
+                last_key = keys[-1]
+                sleep(self.__batch_pause.total_seconds())
+
+        logger.info(
+            "%s `%s` is done: %s rows in %.2f s",
+            action,
+            table_name,
+            processed_count,
+            perf_counter() - started,
+        )
+
+        return processed_count
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import zlib
+from typing import TYPE_CHECKING, override
+from uuid import UUID
+
+from sqlalchemy import BINARY, LargeBinary, TypeDecorator, Uuid
+
+if TYPE_CHECKING:
+    from typing import Any, Self
+
+    from sqlalchemy import Dialect
+    from sqlalchemy.types import TypeEngine
+
+# The dialects without a native UUID type, which store a UUID in a
+# `CHAR(32)` column by default
+BINARY_UUID_DIALECTS: frozenset[str] = frozenset({"mysql", "mariadb"})
+
+# A byte, which marks a compressed text. The byte never occurs in UTF-8,
+# so a not compressed text is stored as is and can't be mistaken for a
+# compressed one
+COMPRESSED_TEXT_MARKER: bytes = b"\xff"
+
+
+class BinaryUUID(TypeDecorator[UUID]):
+    """
+    A UUID type, which is stored in a `BINARY(16)` column in MySQL and
+    MariaDB instead of a `CHAR(32)` one. A binary UUID takes a half of
+    the space of a hexadecimal one, so more keys fit into an index page.
+
+    Other dialects use a `Uuid` type.
+    """
+
+    impl = Uuid
+    cache_ok = True
+
+    @override
+    def load_dialect_impl(self: Self, dialect: Dialect) -> TypeEngine[Any]:
+        if dialect.name in BINARY_UUID_DIALECTS:
+            return dialect.type_descriptor(BINARY(16))
+
+        return dialect.type_descriptor(Uuid())
+
+    @override
+    def process_bind_param(
+        self: Self,
+        value: UUID | None,
+        dialect: Dialect,
+    ) -> UUID | bytes | None:
+        if value is None or dialect.name not in BINARY_UUID_DIALECTS:
+            return value
+
+        return value.bytes
+
+    @override
+    def process_result_value(
+        self: Self,
+        value: UUID | bytes | None,
+        dialect: Dialect,
+    ) -> UUID | None:
+        if isinstance(value, bytes):
+            return UUID(bytes=value)
+
+        return value
+
+
+class CompressedText(TypeDecorator[str]):
+    """
+    A text type, which is stored in a binary column and is compressed by
+    zlib, if its size reaches a threshold. A text is compressed only if
+    it becomes smaller, so a short or a random text is stored as plain
+    UTF-8.
+
+    A text is decompressed eagerly on every fetch of its column, so a
+    column of the type should be deferred, and only the queries, which
+    need a text, should select it.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def __init__(
+        self: Self,
+        threshold: int = 256,
+        level: int = 6,
+    ) -> None:
+        """
+        Creates a compressed text type.
+
+        :param threshold: A minimum size of a text in bytes, which is
+                          compressed, defaults to 256. A shorter text
+                          doesn't shrink enough to pay for a
+                          decompression.
+        :type threshold: int, optional
+        :param level: A level of a zlib compression from 0 to 9,
+                      defaults to 6.
+        :type level: int, optional
+        """
+        super().__init__()
+
+        self.threshold: int = threshold
+        self.level: int = level
+
+    @override
+    def process_bind_param(
+        self: Self,
+        value: str | None,
+        dialect: Dialect,
+    ) -> bytes | None:
+        if value is None:
+            return None
+
+        data: bytes = value.encode()
+        if len(data) < self.threshold:
+            return data
+
+        compressed_data: bytes = COMPRESSED_TEXT_MARKER + zlib.compress(
+            data,
+            self.level,
+        )
+        if len(compressed_data) >= len(data):
+            return data
+
+        return compressed_data
+
+    @override
+    def process_result_value(
+        self: Self,
+        value: bytes | str | None,
+        dialect: Dialect,
+    ) -> str | None:
+        # A text column, which isn't converted to a binary one yet,
+        # returns a string
+        if value is None or isinstance(value, str):
+            return value
+
+        if value.startswith(COMPRESSED_TEXT_MARKER):
+            return zlib.decompress(
+                value[len(COMPRESSED_TEXT_MARKER) :]
+            ).decode()
+
+        return value.decode()
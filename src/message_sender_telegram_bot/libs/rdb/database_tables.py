@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import final
 from uuid import UUID
 
-from sqlalchemy import BigInteger, ForeignKey, MetaData, String
+from sqlalchemy import BigInteger, ForeignKey, Index, MetaData, String
 from sqlalchemy.orm import (
     DeclarativeBase,
     Mapped,
@@ -11,6 +11,8 @@ from sqlalchemy.orm import (
     relationship,
 )
 
+from .column_types import BinaryUUID, CompressedText
+
 # Reference: https://docs.sqlalchemy.org/en/20/core/constraints.html#configuring-a-naming-convention-for-a-metadata-collection
 convention: dict[str, str] = {
     "ix": "ix_%(column_0_label)s",
@@ -23,11 +25,14 @@ convention: dict[str, str] = {
 
 class Base(MappedAsDataclass, DeclarativeBase):
     metadata = MetaData(naming_convention=convention)
+    type_annotation_map = {UUID: BinaryUUID}
 
 
 @final
 class User(Base):
     __tablename__ = "user"
+    # A DB user is got by a user ID on every update
+    __table_args__ = (Index("ix_user_user_id", "user_id", unique=True),)
 
     id_: Mapped[UUID] = mapped_column("id", primary_key=True)
     user_id: Mapped[int] = mapped_column(BigInteger)
@@ -39,24 +44,85 @@ class User(Base):
             ondelete="SET NULL",
         )
     )
-    token: Mapped["Token | None"] = relationship(back_populates="user")
+    # A DB token is checked on every authorization, so it's loaded with
+    # a DB user in the same query
+    token: Mapped["Token | None"] = relationship(
+        back_populates="user",
+        lazy="joined",
+    )
     is_owner: Mapped[bool]
     last_send_date: Mapped[datetime | None]
-    messages: Mapped[list["Message"]] = relationship(back_populates="sender")
+    # A whole history of the messages must never be loaded into a memory,
+    # so an access to the collection raises an exception instead of a
+    # query, and a deletion of a DB user leaves the DB messages to the
+    # foreign key instead of a load of them
+    messages: Mapped[list["Message"]] = relationship(
+        back_populates="sender",
+        lazy="raise",
+        passive_deletes=True,
+    )
 
 
 @final
 class Token(Base):
     __tablename__ = "token"
+    # A DB token is got by a token on an authorization
+    __table_args__ = (Index("ix_token_token", "token", unique=True),)
 
     id_: Mapped[UUID] = mapped_column("id", primary_key=True)
     token: Mapped[str] = mapped_column(String(64))
-    user: Mapped["User | None"] = relationship(back_populates="token")
+    # A claim of a DB token is checked on an authorization, so a DB user
+    # is loaded with the DB token in the same query
+    user: Mapped["User | None"] = relationship(
+        back_populates="token",
+        lazy="joined",
+    )
+
+
+@final
+class MessageDraft(Base):
+    __tablename__ = "message_draft"
+    # A DB message draft is got by a message ID on a confirmation. A
+    # message ID is unique only inside a chat, so the index isn't unique
+    # and includes a sender ID to find a draft of a certain sender
+    __table_args__ = (
+        Index(
+            "ix_message_draft_message_id_sender_id",
+            "message_id",
+            "sender_id",
+        ),
+        # The abandoned DB message drafts are purged by a creation date
+        Index("ix_message_draft_created_date", "created_date"),
+    )
+
+    id_: Mapped[UUID] = mapped_column("id", primary_key=True)
+    message_id: Mapped[int] = mapped_column(BigInteger)
+    # A draft isn't needed without its sender, so it's deleted with the
+    # sender
+    sender_id: Mapped[UUID] = mapped_column(
+        ForeignKey(
+            "user.id",
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+    )
+    text: Mapped[str] = mapped_column(String(4096))
+    created_date: Mapped[datetime]
 
 
 @final
 class Message(Base):
     __tablename__ = "message"
+    # A sent DB message is moved from the `message_draft` table to this
+    # append-only archive, so the drafts, which are looked up on every
+    # confirmation, stay in a small table regardless of a size of the
+    # history. A message ID is unique only inside a chat, so the index
+    # isn't unique and includes a sender ID
+    __table_args__ = (
+        Index("ix_message_message_id_sender_id", "message_id", "sender_id"),
+        # The expired DB messages are purged by a send date
+        Index("ix_message_sent_date", "sent_date"),
+    )
 
     id_: Mapped[UUID] = mapped_column("id", primary_key=True)
     message_id: Mapped[int] = mapped_column(BigInteger)
@@ -71,6 +137,54 @@ class Message(Base):
         ),
         nullable=False,
     )
-    sender: Mapped[User] = relationship(back_populates="messages")
-    text: Mapped[str] = mapped_column(String(4096))
-    is_sent: Mapped[bool]
+    # A DB message is compared with a sender by a sender ID, so a sender
+    # is never loaded with a DB message
+    sender: Mapped[User] = relationship(
+        back_populates="messages",
+        lazy="raise",
+    )
+    # The archive keeps a whole history of the texts, so a long text is
+    # compressed. A text is limited to 4096 characters by Telegram. A
+    # text is decompressed on every fetch, so it's deferred and is loaded
+    # only by a query, which selects it explicitly. An access to a not
+    # loaded text raises an exception instead of a lazy load, which an
+    # async session can't emit
+    text: Mapped[str] = mapped_column(
+        CompressedText(),
+        deferred=True,
+        deferred_raiseload=True,
+    )
+    sent_date: Mapped[datetime]
+
+
+@final
+class EmailOutbox(Base):
+    __tablename__ = "email_outbox"
+    # A confirmation of a message only appends a delivery of its email
+    # here in the same transaction, and a worker sends the emails later.
+    # So, a confirmation doesn't wait for a SMTP server, and a crash
+    # after the commit can't lose a delivery. A worker gets the due
+    # deliveries by a date of a next attempt
+    __table_args__ = (
+        Index("ix_email_outbox_next_attempt_date", "next_attempt_date"),
+    )
+
+    # A delivery shares a primary key with its sent DB message, so a
+    # message is delivered once and a text isn't copied. A delivery is
+    # purged with its DB message
+    id_: Mapped[UUID] = mapped_column(
+        "id",
+        ForeignKey(
+            "message.id",
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        primary_key=True,
+    )
+    sender_name: Mapped[str] = mapped_column(String(255))
+    # An urgent email is sent separately instead of waiting for a digest
+    is_urgent: Mapped[bool]
+    attempt_count: Mapped[int]
+    # A date is None, if the delivery is done or abandoned
+    next_attempt_date: Mapped[datetime | None]
+    delivered_date: Mapped[datetime | None]
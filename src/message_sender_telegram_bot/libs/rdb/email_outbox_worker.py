@@ -0,0 +1,543 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+from logging import getLogger
+from typing import TYPE_CHECKING
+
+from sqlalchemy import (
+    DateTime,
+    Integer,
+    bindparam,
+    false,
+    func,
+    select,
+    true,
+    update,
+)
+
+from ..senders import CircuitOpenError
+from ..types import DigestEntry, EmailOutboxStats
+from .database_tables import EmailOutbox, Message
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Sequence
+    from logging import Logger
+    from typing import Any, Self
+    from uuid import UUID
+
+    from sqlalchemy import Result, Row, Select, Update
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+    from ..senders import DeliveryPolicy
+
+logger: Logger = getLogger(__name__)
+
+# The due deliveries are got by an index of a date of a next attempt
+# with a text of their DB messages. The concurrent workers skip the
+# deliveries, which are claimed by an another worker, instead of waiting
+# for them
+select_due_deliveries_stmt: Select[tuple[UUID, str, int, str]] = (
+    select(
+        EmailOutbox.id_,
+        EmailOutbox.sender_name,
+        EmailOutbox.attempt_count,
+        Message.text,
+    )
+    .join(Message, Message.id_ == EmailOutbox.id_)
+    .where(EmailOutbox.next_attempt_date <= bindparam("now", type_=DateTime))
+    .order_by(EmailOutbox.next_attempt_date)
+    .limit(bindparam("batch_size", type_=Integer))
+    .with_for_update(of=EmailOutbox, skip_locked=True)
+    .execution_options(bind="primary")
+)
+# In a digest mode, only the urgent deliveries are sent separately
+select_due_urgent_deliveries_stmt: Select[tuple[UUID, str, int, str]] = (
+    select_due_deliveries_stmt.where(EmailOutbox.is_urgent == true())
+)
+select_due_digest_deliveries_stmt: Select[tuple[UUID, str, int, str]] = (
+    select_due_deliveries_stmt.where(EmailOutbox.is_urgent == false())
+)
+# A digest is sent, when its oldest delivery waited for a window or when
+# it's full, so a number and a date of the oldest due delivery are got
+# first without a lock
+select_digest_state_stmt: Select[tuple[int, datetime | None]] = select(
+    func.count(),
+    func.min(EmailOutbox.next_attempt_date),
+).where(
+    EmailOutbox.is_urgent == false(),
+    EmailOutbox.next_attempt_date <= bindparam("now", type_=DateTime),
+)
+# The deliveries are updated by their primary keys in one executemany
+# statement
+update_deliveries_stmt: Update = update(EmailOutbox)
+
+
+class EmailOutboxWorker:
+    """
+    A worker of the email outbox. That is, sends the emails of the due
+    deliveries in batches, marks the sent ones delivered and retries the
+    failed ones later.
+
+    In a digest mode, the not urgent deliveries wait, till the oldest of
+    them waited for a window or their number reaches a maximum size of a
+    digest, and are sent in one email. The urgent ones are sent
+    separately without a wait.
+
+    A batch is claimed by one short transaction, which moves a next
+    attempt of every delivery forward by a retry delay, but not less
+    than by a lease. So, the emails are sent outside of a transaction,
+    and a delivery of a crashed worker is retried, when the lease is
+    passed. A claimed delivery is claimed again, if its sends outlast
+    the lease, so the lease must be longer than the sends of a batch.
+    A failed delivery is rescheduled by its retry delay after a send.
+    A delivery can be sent twice, if a worker crashes after a send and
+    before a mark.
+
+    While a circuit of a delivery policy rejects the sends, the
+    deliveries aren't claimed, and while it recovers, only one delivery
+    is claimed for a trial send. A send, which is rejected by the
+    circuit, releases its claim without counting an attempt.
+    """
+
+    def __init__(
+        self: Self,
+        compiled_session: async_sessionmaker[AsyncSession],
+        send_email: Callable[[str, str], Awaitable[None]],
+        batch_size: int = 100,
+        max_attempt_count: int = 5,
+        retry_delay: timedelta = timedelta(seconds=30),
+        *,
+        send_email_digest: (
+            Callable[[Sequence[DigestEntry]], Awaitable[None]] | None
+        ) = None,
+        digest_window: timedelta | None = None,
+        digest_max_count: int = 50,
+        lease: timedelta = timedelta(),
+        delivery_policy: DeliveryPolicy | None = None,
+    ) -> None:
+        """
+        Creates a worker of the email outbox.
+
+        :param compiled_session: A compiled async session.
+        :type compiled_session: async_sessionmaker[AsyncSession]
+        :param send_email: A function, which sends an email with a name
+                           of a sender and a text.
+        :type send_email: Callable[[str, str], Awaitable[None]]
+        :param batch_size: A maximum number of the deliveries, which are
+                           claimed by one transaction, defaults to 100.
+        :type batch_size: int, optional
+        :param max_attempt_count: A number of the attempts, after which
+                                  a failed delivery is abandoned,
+                                  defaults to 5.
+        :type max_attempt_count: int, optional
+        :param retry_delay: A delay before a second attempt, defaults to
+                            `timedelta(seconds=30)`. The delay is
+                            doubled for every next attempt.
+        :type retry_delay: timedelta, optional
+        :param send_email_digest: A function, which sends a digest of
+                                  the messages, defaults to None. Must
+                                  be provided with a window of a digest.
+        :type send_email_digest: Callable[[Sequence[DigestEntry]],
+                                 Awaitable[None]] | None, optional
+        :param digest_window: A time, during which a not urgent delivery
+                              waits for the others, defaults to None. If
+                              None, every email is sent separately.
+        :type digest_window: timedelta | None, optional
+        :param digest_max_count: A maximum number of the messages in a
+                                 digest, defaults to 50. A full digest
+                                 is sent without a wait.
+        :type digest_max_count: int, optional
+        :param lease: A minimum time, during which a claimed delivery
+                      isn't claimed again, defaults to
+                      `timedelta()`. Must be longer than the sends of a
+                      batch, including their retries.
+        :type lease: timedelta, optional
+        :param delivery_policy: A policy, which runs the sends, defaults
+                                to None. If it's provided, the deliveries
+                                are claimed by a state of its circuit.
+        :type delivery_policy: DeliveryPolicy | None, optional
+        :raises ValueError: A size of a batch, a maximum number of the
+                            attempts or a maximum size of a digest isn't
+                            positive, or a window of a digest is
+                            provided without a function, which sends a
+                            digest.
+        """
+        logger.debug("Initializing `%s`...", self.__class__.__name__)
+
+        logger.debug("Checking a size of a batch...")
+        if batch_size < 1:
+            logger.critical(
+                (
+                    "A size of a batch isn't positive. Raising a `ValueError` "
+                    "exception..."
+                ),
+            )
+            raise ValueError("A size of a batch must be positive")
+        logger.debug("Checked")
+
+        logger.debug("Checking a maximum number of the attempts...")
+        if max_attempt_count < 1:
+            logger.critical(
+                (
+                    "A maximum number of the attempts isn't positive. Raising "
+                    "a `ValueError` exception..."
+                ),
+            )
+            raise ValueError(
+                "A maximum number of the attempts must be positive"
+            )
+        logger.debug("Checked")
+
+        logger.debug("Checking the parameters of a digest...")
+        if digest_max_count < 1:
+            logger.critical(
+                (
+                    "A maximum size of a digest isn't positive. Raising a "
+                    "`ValueError` exception..."
+                ),
+            )
+            raise ValueError("A maximum size of a digest must be positive")
+        if digest_window is not None and send_email_digest is None:
+            logger.critical(
+                (
+                    "A function, which sends a digest, is absent. Raising a "
+                    "`ValueError` exception..."
+                ),
+            )
+            raise ValueError("A function, which sends a digest, is absent")
+        logger.debug("Checked")
+
+        logger.debug(
+            "Setting the arguments to the corresponding instance attributes..."
+        )
+        self.__compiled_session: async_sessionmaker[AsyncSession] = (
+            compiled_session
+        )
+        self.__send_email: Callable[[str, str], Awaitable[None]] = send_email
+        self.__batch_size: int = batch_size
+        self.__max_attempt_count: int = max_attempt_count
+        self.__retry_delay: timedelta = retry_delay
+        self.__send_email_digest: (
+            Callable[[Sequence[DigestEntry]], Awaitable[None]] | None
+        ) = send_email_digest
+        self.__digest_window: timedelta | None = digest_window
+        self.__digest_max_count: int = digest_max_count
+        self.__lease: timedelta = lease
+        self.__delivery_policy: DeliveryPolicy | None = delivery_policy
+        logger.debug("Set")
+
+        self.__delivered_count: int = 0
+        self.__digest_count: int = 0
+        self.__failed_attempt_count: int = 0
+        self.__abandoned_count: int = 0
+
+        logger.debug("Initialized")
+
+    async def deliver(self: Self) -> int:
+        """
+        Sends the emails of the due deliveries, till the outbox has
+        them. In a digest mode, sends the urgent emails and the ready
+        digests.
+
+        :return: A number of the delivered messages.
+        :rtype: int
+        """
+        logger.debug("Starting a delivery of the emails...")
+
+        digest_window: timedelta | None = self.__digest_window
+        send_email_digest: (
+            Callable[[Sequence[DigestEntry]], Awaitable[None]] | None
+        ) = self.__send_email_digest
+
+        if digest_window is None or send_email_digest is None:
+            delivered_count: int = await self.__deliver_separately(
+                select_due_deliveries_stmt
+            )
+        else:
+            delivered_count = await self.__deliver_separately(
+                select_due_urgent_deliveries_stmt
+            ) + await self.__deliver_digests(digest_window, send_email_digest)
+
+        logger.debug("Delivered %s messages", delivered_count)
+
+        return delivered_count
+
+    def get_stats(self: Self) -> EmailOutboxStats:
+        """
+        Gets the collected metrics of the deliveries.
+
+        :return: The collected metrics of the deliveries.
+        :rtype: EmailOutboxStats
+        """
+        return EmailOutboxStats(
+            delivered_count=self.__delivered_count,
+            digest_count=self.__digest_count,
+            failed_attempt_count=self.__failed_attempt_count,
+            abandoned_count=self.__abandoned_count,
+        )
+
+    async def __deliver_separately(
+        self: Self,
+        select_stmt: Select[tuple[UUID, str, int, str]],
+    ) -> int:
+        delivered_count: int = 0
+
+        while True:
+            if self.__is_short_circuited():
+                break
+
+            # Only one trial send checks a recovering SMTP server, so the
+            # other deliveries aren't claimed for the rejected sends
+            batch_size: int = (
+                1
+                if self.__delivery_policy is not None
+                and self.__delivery_policy.is_recovering()
+                else self.__batch_size
+            )
+            deliveries: Sequence[
+                Row[tuple[UUID, str, int, str]]
+            ] = await self.__claim(select_stmt, batch_size)
+
+            if not deliveries:
+                break
+
+            # The emails of a batch are sent concurrently, and a number
+            # of the concurrent sends is limited by a sending function
+            results: list[object] = await asyncio.gather(
+                *(
+                    self.__send_email(delivery.sender_name, delivery.text)
+                    for delivery in deliveries
+                ),
+                return_exceptions=True,
+            )
+            delivered_count += await self.__finish(deliveries, results)
+
+            # A short batch is a last one, so a next select is skipped
+            if len(deliveries) < batch_size:
+                break
+
+        return delivered_count
+
+    async def __deliver_digests(
+        self: Self,
+        digest_window: timedelta,
+        send_email_digest: Callable[[Sequence[DigestEntry]], Awaitable[None]],
+    ) -> int:
+        delivered_count: int = 0
+
+        while True:
+            # A digest is one send, so it's a trial send of a recovering
+            # SMTP server itself
+            if self.__is_short_circuited():
+                break
+
+            now: datetime = datetime.now()
+            async with self.__compiled_session() as session:
+                result: Result[
+                    tuple[int, datetime | None]
+                ] = await session.execute(
+                    select_digest_state_stmt,
+                    {"now": now},
+                )
+                count, oldest_date = result.one()
+
+            if oldest_date is None:
+                break
+
+            if (
+                count < self.__digest_max_count
+                and oldest_date > now - digest_window
+            ):
+                logger.debug(
+                    "A digest of %s messages waits for a window", count
+                )
+                break
+
+            deliveries: Sequence[
+                Row[tuple[UUID, str, int, str]]
+            ] = await self.__claim(
+                select_due_digest_deliveries_stmt,
+                self.__digest_max_count,
+            )
+
+            if not deliveries:
+                break
+
+            # A digest is sent or fails as a whole
+            digest_result: object = None
+            try:
+                await send_email_digest(
+                    [
+                        DigestEntry(delivery.sender_name, delivery.text)
+                        for delivery in deliveries
+                    ]
+                )
+            except Exception as error:
+                digest_result = error
+            else:
+                self.__digest_count += 1
+
+            delivered_count += await self.__finish(
+                deliveries,
+                [digest_result] * len(deliveries),
+            )
+
+            # A failed digest is retried after a delay, and a short
+            # digest takes all the due deliveries
+            if (
+                digest_result is not None
+                or len(deliveries) < self.__digest_max_count
+            ):
+                break
+
+        return delivered_count
+
+    def __is_short_circuited(self: Self) -> bool:
+        # A claim counts an attempt of a delivery, so the deliveries
+        # aren't claimed, while an open circuit rejects their sends
+        return (
+            self.__delivery_policy is not None
+            and self.__delivery_policy.is_short_circuited()
+        )
+
+    async def __claim(
+        self: Self,
+        select_stmt: Select[tuple[UUID, str, int, str]],
+        batch_size: int,
+    ) -> Sequence[Row[tuple[UUID, str, int, str]]]:
+        now: datetime = datetime.now()
+
+        async with self.__compiled_session.begin() as session:
+            result: Result[tuple[UUID, str, int, str]] = await session.execute(
+                select_stmt,
+                {"now": now, "batch_size": batch_size},
+            )
+            deliveries: Sequence[Row[tuple[UUID, str, int, str]]] = (
+                result.all()
+            )
+
+            if not deliveries:
+                return deliveries
+
+            # A next attempt is scheduled before a send, so a delivery of
+            # a crashed worker is retried. A delivery, which is being
+            # sent, isn't claimed again during a lease
+            await session.execute(
+                update_deliveries_stmt,
+                [
+                    {
+                        "id_": delivery.id_,
+                        "attempt_count": delivery.attempt_count + 1,
+                        "next_attempt_date": now
+                        + max(
+                            self.__retry_delay * 2**delivery.attempt_count,
+                            self.__lease,
+                        ),
+                    }
+                    for delivery in deliveries
+                ],
+            )
+
+        logger.debug("Claimed %s deliveries", len(deliveries))
+
+        return deliveries
+
+    async def __finish(
+        self: Self,
+        deliveries: Sequence[Row[tuple[UUID, str, int, str]]],
+        results: Sequence[object],
+    ) -> int:
+        now: datetime = datetime.now()
+        delivered_ids: list[UUID] = []
+        abandoned_ids: list[UUID] = []
+        retried_deliveries: dict[UUID, datetime] = {}
+        released_deliveries: list[Row[tuple[UUID, str, int, str]]] = []
+        for delivery, result in zip(deliveries, results, strict=True):
+            if not isinstance(result, BaseException):
+                delivered_ids.append(delivery.id_)
+                continue
+
+            # A rejected send doesn't reach a SMTP server, so it isn't an
+            # attempt of a delivery
+            if isinstance(result, CircuitOpenError):
+                logger.warning(
+                    "A send of a delivery %s is rejected. Releasing",
+                    delivery.id_,
+                )
+                released_deliveries.append(delivery)
+                continue
+
+            # A claim scheduled a next attempt after a lease, which
+            # covers a crash during a send, so a failed delivery is
+            # rescheduled by a retry delay
+            self.__failed_attempt_count += 1
+            if delivery.attempt_count + 1 < self.__max_attempt_count:
+                logger.warning(
+                    "A delivery %s failed on an attempt %s",
+                    delivery.id_,
+                    delivery.attempt_count + 1,
+                    exc_info=result,
+                )
+                retried_deliveries[delivery.id_] = (
+                    now + self.__retry_delay * 2**delivery.attempt_count
+                )
+            else:
+                logger.error(
+                    "A delivery %s failed on a last attempt. Abandoning",
+                    delivery.id_,
+                    exc_info=result,
+                )
+                abandoned_ids.append(delivery.id_)
+
+        if delivered_ids or abandoned_ids or retried_deliveries:
+            params: list[dict[str, Any]] = (
+                [
+                    {
+                        "id_": id_,
+                        "next_attempt_date": None,
+                        "delivered_date": now,
+                    }
+                    for id_ in delivered_ids
+                ]
+                + [
+                    {
+                        "id_": id_,
+                        "next_attempt_date": None,
+                        "delivered_date": None,
+                    }
+                    for id_ in abandoned_ids
+                ]
+                + [
+                    {
+                        "id_": id_,
+                        "next_attempt_date": next_attempt_date,
+                        "delivered_date": None,
+                    }
+                    for id_, next_attempt_date in retried_deliveries.items()
+                ]
+            )
+
+            async with self.__compiled_session.begin() as session:
+                await session.execute(update_deliveries_stmt, params)
+
+        # A released delivery gets back its attempt and is due again, so
+        # it's claimed, when a circuit lets its send through
+        if released_deliveries:
+            async with self.__compiled_session.begin() as session:
+                await session.execute(
+                    update_deliveries_stmt,
+                    [
+                        {
+                            "id_": delivery.id_,
+                            "attempt_count": delivery.attempt_count,
+                            "next_attempt_date": now,
+                        }
+                        for delivery in released_deliveries
+                    ],
+                )
+
+        self.__delivered_count += len(delivered_ids)
+        self.__abandoned_count += len(abandoned_ids)
+
+        return len(delivered_ids)
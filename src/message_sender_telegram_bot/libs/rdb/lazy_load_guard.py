@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from logging import getLogger
+from typing import TYPE_CHECKING
+
+from sqlalchemy import event
+
+if TYPE_CHECKING:
+    from logging import Logger
+    from typing import Self
+
+    from sqlalchemy.orm import ORMExecuteState, Session, sessionmaker
+
+logger: Logger = getLogger(__name__)
+
+
+class LazyLoadGuard:
+    """
+    A guard of the implicit loads of a DB session. That is, counts the
+    lazy loads of the relationships and the refreshes of the expired
+    attributes, which are emitted on an attribute access, and, if the
+    guard forbids them, raises an exception instead of the load.
+
+    An async session can't emit a query on an attribute access, so an
+    implicit load in it fails with an unclear error. The guard reports
+    such a load at its source.
+    """
+
+    def __init__(self: Self, is_forbidding: bool = False) -> None:
+        """
+        Creates a guard of the implicit loads.
+
+        :param is_forbidding: A forbiddance of the implicit loads,
+                              defaults to False. If True, an implicit
+                              load raises a `RuntimeError` exception.
+        :type is_forbidding: bool, optional
+        """
+        logger.debug("Initializing `%s`...", self.__class__.__name__)
+
+        self.__is_forbidding: bool = is_forbidding
+        self.__implicit_load_count: int = 0
+
+        logger.debug("Initialized")
+
+    def attach(
+        self: Self,
+        target: Session | sessionmaker[Session] | type[Session],
+    ) -> None:
+        """
+        Listens the executes of a DB session, of the sessions of a
+        session maker or of the sessions of a session class.
+
+        An async session executes its statements through a sync session,
+        so the guard is attached to a sync session maker, which is
+        passed to an `async_sessionmaker` as a `sync_session_class`
+        argument.
+
+        :param target: A DB session, a session maker or a session class.
+        :type target: Session | sessionmaker[Session] | type[Session]
+        """
+        logger.debug("Attaching the guard to a DB session...")
+        event.listen(target, "do_orm_execute", self.__on_do_orm_execute)
+        logger.debug("Attached")
+
+    def get_implicit_load_count(self: Self) -> int:
+        """
+        Gets a number of the implicit loads.
+
+        :return: A number of the implicit loads.
+        :rtype: int
+        """
+        return self.__implicit_load_count
+
+    def __on_do_orm_execute(
+        self: Self,
+        orm_execute_state: ORMExecuteState,
+    ) -> None:
+        # A relationship, which is loaded by a `joinedload` option or a
+        # `joined` strategy, is loaded in the same query, so only a lazy
+        # load and a refresh of the expired attributes are counted. An
+        # `INSERT`, an `UPDATE` or a `DELETE` has no load options, so it
+        # is skipped
+        if (
+            not orm_execute_state.is_select
+            or orm_execute_state.lazy_loaded_from is None
+            and not orm_execute_state.is_column_load
+        ):
+            return None
+
+        self.__implicit_load_count += 1
+        logger.warning(
+            "An implicit load of the %s mapper is emitted",
+            orm_execute_state.bind_mapper,
+        )
+
+        if self.__is_forbidding:
+            logger.critical(
+                "An implicit load is forbidden. Raising a `RuntimeError` "
+                "exception..."
+            )
+            raise RuntimeError("An implicit load is forbidden")
+
+        return None
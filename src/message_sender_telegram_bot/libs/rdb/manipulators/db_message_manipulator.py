@@ -1,27 +1,108 @@
 from __future__ import annotations
 
+from datetime import datetime
 from logging import getLogger
-from typing import TYPE_CHECKING, override
-from uuid import uuid4
+from typing import TYPE_CHECKING, cast, override
+from uuid import uuid7
 
-from sqlalchemy import select
+from sqlalchemy import (
+    bindparam,
+    delete,
+    false,
+    insert,
+    select,
+    true,
+    tuple_,
+)
 
 from ...interfaces import DBItemCreator, DBItemGetter
-from ..database_tables import Message, User
+from ...types import MessageState
+from ..database_tables import EmailOutbox, Message, MessageDraft
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
     from logging import Logger
     from typing import Self
+    from uuid import UUID
 
-    from sqlalchemy import Result, Select
-    from sqlalchemy.orm import Session
+    from sqlalchemy import CursorResult, Delete, Insert, Result, Row, Select
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from ..database_tables import User
 
 logger: Logger = getLogger(__name__)
 
+# The statements are constructed once and executed with the bound
+# parameters, so SQLAlchemy reuses their memoized cache keys. A message
+# ID is unique only in a chat, so the DB messages of the different
+# senders can share it, and the lookups are narrowed by a sender ID
+select_draft_stmt: Select[tuple[MessageDraft]] = select(MessageDraft).where(
+    MessageDraft.message_id == bindparam("message_id"),
+    MessageDraft.sender_id == bindparam("sender_id"),
+)
+# An expanding parameter renders one `IN` clause for any number of the
+# pairs of a message ID and a sender ID
+select_drafts_stmt: Select[tuple[MessageDraft]] = select(MessageDraft).where(
+    tuple_(MessageDraft.message_id, MessageDraft.sender_id).in_(
+        bindparam("keys", expanding=True)
+    )
+)
+# A state of a DB message is read without a load of an ORM instance, so
+# a session doesn't track it in an identity map. A draft is looked up
+# first in the small hot table, and the archive is looked up only, if
+# the draft is absent. A sender ID is bound, so it isn't selected. A
+# state is read on a confirmation or a cancel right after a draft was
+# created by a previous update, so it's read on the primary, which
+# doesn't lag behind like a replica
+select_draft_state_stmt: Select[tuple[UUID, int, str, bool]] = (
+    select(
+        MessageDraft.id_,
+        MessageDraft.message_id,
+        MessageDraft.text,
+        false(),
+    )
+    .where(
+        MessageDraft.message_id == bindparam("message_id"),
+        MessageDraft.sender_id == bindparam("sender_id"),
+    )
+    .execution_options(bind="primary")
+)
+select_sent_state_stmt: Select[tuple[UUID, int, str, bool]] = (
+    select(
+        Message.id_,
+        Message.message_id,
+        Message.text,
+        true(),
+    )
+    .where(
+        Message.message_id == bindparam("message_id"),
+        Message.sender_id == bindparam("sender_id"),
+    )
+    .execution_options(bind="primary")
+)
+# The names of the columns are reserved for the parameters of a `SET`
+# clause, so the bound parameters of a statement are prefixed. The DB
+# message drafts aren't loaded before a deletion, so a session doesn't
+# need to synchronize them
+delete_draft_stmt: Delete = (
+    delete(MessageDraft)
+    .where(
+        MessageDraft.message_id == bindparam("b_message_id"),
+        MessageDraft.sender_id == bindparam("b_sender_id"),
+    )
+    .execution_options(synchronize_session=False)
+)
+# A sent DB message is only appended to the archive
+insert_sent_stmt: Insert = insert(Message)
+# A delivery of an email is appended to the outbox
+insert_outbox_stmt: Insert = insert(EmailOutbox)
+
 
 class DBMessageManipulator(DBItemGetter, DBItemCreator):
     """
-    A DB message manipulator.
+    A DB message manipulator. That is, creates a DB message draft, moves
+    it to the archive of the sent DB messages on a send and deletes it on
+    a cancel.
 
     :param DBItemGetter: A DB item getter interface.
     :type DBItemGetter: class
@@ -31,24 +112,31 @@ class DBMessageManipulator(DBItemGetter, DBItemCreator):
 
     def __init__(
         self: Self,
-        db_session: Session,
+        db_session: AsyncSession,
         message_id: int,
         *,
         sender: User | None = None,
+        sender_id: UUID | None = None,
         text: str | None = None,
     ) -> None:
         """
         Creates a DB message manipulator.
 
         :param db_session: A DB session.
-        :type db_session: Session
+        :type db_session: AsyncSession
         :param message_id: A message ID.
         :type message_id: str
-        :param sender: A sender, defaults to None. Must be provided if
-                       a program will be creating a new DB message.
+        :param sender: A sender, defaults to None. A sender or a sender
+                       ID must be provided if a program will be creating
+                       a new DB message draft.
         :type sender: User | None
+        :param sender_id: A sender ID, defaults to None. Allows to create
+                          a new DB message draft without a load of a
+                          sender.
+        :type sender_id: UUID | None
         :param text: A message text, defaults to None. Must be provided
-                     if a program will be creating a new DB message.
+                     if a program will be creating a new DB message
+                     draft.
         :type text: str | None
         """
         logger.debug("Initializing `%s`...", self.__class__.__name__)
@@ -56,50 +144,224 @@ class DBMessageManipulator(DBItemGetter, DBItemCreator):
         logger.debug(
             "Setting the arguments to the corresponding instance attributes..."
         )
-        self.__db_session: Session = db_session
+        self.__db_session: AsyncSession = db_session
         self.__message_id: int = message_id
         self.__sender: User | None = sender
+        self.__sender_id: UUID | None = sender_id
         self.__text: str | None = text
         logger.debug("Set")
 
+        self.__message_state: MessageState | None = None
+
         logger.debug("Initialized")
 
     @override
-    def get(self: Self) -> Message | None:
+    async def get(self: Self) -> MessageDraft | None:
         """
-        Gets a DB message.
+        Gets a DB message draft of a sender.
 
-        :return: A DB message or None, if the DB message is not found.
-        :rtype: Message | None
+        :return: A DB message draft or None, if the DB message draft is
+                 not found.
+        :rtype: MessageDraft | None
+        :raises ValueError: A sender and a sender ID are absent.
         """
-        logger.debug("Starting a getting of the DB message...")
+        logger.debug("Starting a getting of the DB message draft...")
+        sender_id: UUID = self.__get_sender_id()
 
-        logger.debug("Constructing a statement...")
-        select_message_stmt: Select[tuple[Message]] = select(Message).where(
-            Message.message_id == self.__message_id
+        logger.debug("Executing a statement...")
+        result: Result[tuple[MessageDraft]] = await self.__db_session.execute(
+            select_draft_stmt,
+            {"message_id": self.__message_id, "sender_id": sender_id},
         )
-        logger.debug("Constructed")
+        logger.debug("Executed")
+
+        logger.debug("Getting the DB message draft...")
+        draft: MessageDraft | None = result.scalar_one_or_none()
+        logger.debug("Got")
+
+        return draft
+
+    async def get_state(self: Self) -> MessageState | None:
+        """
+        Gets a state of a DB message of a sender. That is, selects the
+        columns of a DB message draft or, if the draft is absent, of a
+        sent DB message without a load of it.
+
+        Unlike the `get` method, the method returns a detached immutable
+        state, so a session doesn't track it and an access to its
+        attributes never emits a query.
+
+        :return: A state of a DB message or None, if the DB message is
+                 not found.
+        :rtype: MessageState | None
+        :raises ValueError: A sender and a sender ID are absent.
+        """
+        logger.debug("Starting a getting of a state of the DB message...")
+        sender_id: UUID = self.__get_sender_id()
+
+        for stmt in (select_draft_state_stmt, select_sent_state_stmt):
+            logger.debug("Executing a statement...")
+            result: Result[
+                tuple[UUID, int, str, bool]
+            ] = await self.__db_session.execute(
+                stmt,
+                {"message_id": self.__message_id, "sender_id": sender_id},
+            )
+            logger.debug("Executed")
+
+            logger.debug("Getting a row of the state...")
+            row: Row[tuple[UUID, int, str, bool]] | None = result.one_or_none()
+            logger.debug("Got")
+
+            if row is not None:
+                id_, message_id, text, is_sent = row
+                self.__message_state = MessageState(
+                    id_=id_,
+                    message_id=message_id,
+                    sender_id=sender_id,
+                    text=text,
+                    is_sent=is_sent,
+                )
+                return self.__message_state
+
+        logger.debug("The DB message is not found")
+        return None
+
+    async def claim_send(self: Self) -> bool:
+        """
+        Claims a send of a DB message. That is, deletes a DB message
+        draft of a sender by one conditional delete and appends it to
+        the archive of the sent DB messages.
+
+        Only one of the concurrent claims of the same DB message draft
+        deletes it, so a client, which gets True, owns the send. The
+        move is rolled back with a transaction, if the send fails.
 
-        logger.debug("Executing the statement...")
-        result: Result[tuple[Message]] = self.__db_session.execute(
-            select_message_stmt
+        :return: True, if the DB message is claimed, or False, if the DB
+                 message draft is not found, is sent already or belongs
+                 to an another sender.
+        :rtype: bool
+        :raises ValueError: A sender and a sender ID are absent.
+        """
+        logger.debug("Starting a claim of a send of the DB message...")
+        sender_id: UUID = self.__get_sender_id()
+
+        # A state, which is got before the claim, provides a text of the
+        # draft without an another query
+        message_state: MessageState | None = self.__message_state
+
+        if message_state is None or message_state.is_sent:
+            message_state = await self.get_state()
+
+        if (
+            message_state is None
+            or message_state.is_sent
+            or message_state.sender_id != sender_id
+        ):
+            logger.debug("Claimed: False")
+            return False
+
+        # The deletion locks the draft, so a concurrent claim waits for
+        # the transaction and deletes nothing after the commit
+        if not await self.__delete_draft(sender_id):
+            logger.debug("Claimed: False")
+            return False
+
+        logger.debug("Executing a statement...")
+        await self.__db_session.execute(
+            insert_sent_stmt,
+            {
+                "id_": message_state.id_,
+                "message_id": message_state.message_id,
+                "sender_id": sender_id,
+                "text": message_state.text,
+                "sent_date": datetime.now(),
+            },
         )
         logger.debug("Executed")
 
-        logger.debug("Getting the DB message...")
-        message: Message | None = result.scalar_one_or_none()
-        logger.debug("Got")
+        self.__message_state = message_state._replace(is_sent=True)
+        logger.debug("Claimed: True")
 
-        return message
+        return True
+
+    async def enqueue_email(
+        self: Self,
+        sender_name: str,
+        *,
+        is_urgent: bool = False,
+    ) -> None:
+        """
+        Enqueues a delivery of an email of a claimed DB message. That is,
+        appends the delivery to the outbox, from which a worker sends it.
+
+        The delivery is committed with a claim of the DB message, so the
+        message is either sent and delivered later, or isn't sent at
+        all.
+
+        :param sender_name: A name of a sender, which is set in the
+                            email.
+        :type sender_name: str
+        :param is_urgent: Is the email sent separately instead of waiting
+                          for a digest, defaults to False.
+        :type is_urgent: bool, optional
+        :raises ValueError: The DB message isn't claimed.
+        """
+        logger.debug("Starting an enqueuing of an email...")
+        message_state: MessageState | None = self.__message_state
+
+        logger.debug("Checking for a claim of the DB message...")
+        if message_state is None or not message_state.is_sent:
+            logger.critical(
+                (
+                    "The DB message isn't claimed. Raising a `ValueError` "
+                    "exception..."
+                )
+            )
+            raise ValueError("The DB message isn't claimed")
+        logger.debug("The DB message is claimed")
+
+        logger.debug("Executing a statement...")
+        await self.__db_session.execute(
+            insert_outbox_stmt,
+            {
+                "id_": message_state.id_,
+                "sender_name": sender_name,
+                "is_urgent": is_urgent,
+                "attempt_count": 0,
+                "next_attempt_date": datetime.now(),
+                "delivered_date": None,
+            },
+        )
+        logger.debug("Executed")
+
+    async def delete_unsent(self: Self) -> bool:
+        """
+        Deletes a DB message draft of a sender by one conditional delete.
+        That is, deletes a not sent DB message without a load of it.
+
+        :return: True, if the DB message draft is deleted, or False, if
+                 the DB message draft is not found, is sent already or
+                 belongs to an another sender.
+        :rtype: bool
+        :raises ValueError: A sender and a sender ID are absent.
+        """
+        logger.debug("Starting a deletion of the DB message draft...")
+        sender_id: UUID = self.__get_sender_id()
+
+        return await self.__delete_draft(sender_id)
 
     @override
-    def create(self: Self) -> Message:
-        logger.debug("Starting a creation of the DB message...")
+    def create(self: Self) -> MessageDraft:
+        logger.debug("Starting a creation of the DB message draft...")
         sender: User | None = self.__sender
+        sender_id: UUID | None = self.__sender_id
         text: str | None = self.__text
 
         logger.debug("Checking for a presence of a sender...")
-        if sender is None:
+        if sender_id is None and sender is not None:
+            sender_id = sender.id_
+        if sender_id is None:
             logger.critical(
                 "A sender is absent. Raising a `ValueError` exception..."
             )
@@ -115,19 +377,126 @@ class DBMessageManipulator(DBItemGetter, DBItemCreator):
         logger.debug(
             (
                 "A message text is present. Continuing the creationg of the "
-                "DB message..."
+                "DB message draft..."
             )
         )
 
-        logger.debug("Creating a DB message...")
-        new_message: Message = Message(
-            id_=uuid4(),
+        logger.debug("Creating a DB message draft...")
+        new_draft: MessageDraft = MessageDraft(
+            # A time-ordered UUID is appended to the end of a primary
+            # key index instead of a random place in it, so the
+            # growing table doesn't split the index pages
+            id_=uuid7(),
             message_id=self.__message_id,
-            sender_id=None,
-            sender=sender,
+            sender_id=sender_id,
             text=text,
-            is_sent=False,
+            created_date=datetime.now(),
         )
         logger.debug("Created")
 
-        return new_message
+        return new_draft
+
+    @classmethod
+    @override
+    async def get_many(
+        cls: type[Self],
+        db_session: AsyncSession,
+        keys: Sequence[tuple[int, UUID]],
+    ) -> list[MessageDraft]:
+        """
+        Gets the DB message drafts by their message IDs and sender IDs in
+        one query.
+
+        :param db_session: A DB session.
+        :type db_session: AsyncSession
+        :param keys: The pairs of a message ID and a sender ID.
+        :type keys: Sequence[tuple[int, UUID]]
+        :return: The found DB message drafts. The not found pairs are
+                 skipped.
+        :rtype: list[MessageDraft]
+        """
+        logger.debug("Starting a getting of the DB message drafts...")
+
+        if not keys:
+            logger.debug("The keys are absent")
+            return []
+
+        logger.debug("Executing a statement...")
+        result: Result[tuple[MessageDraft]] = await db_session.execute(
+            select_drafts_stmt,
+            {"keys": list(keys)},
+        )
+        logger.debug("Executed")
+
+        logger.debug("Getting the DB message drafts...")
+        drafts: list[MessageDraft] = list(result.scalars().all())
+        logger.debug("Got %s DB message drafts", len(drafts))
+
+        return drafts
+
+    @classmethod
+    @override
+    def create_many(
+        cls: type[Self],
+        values: Sequence[tuple[int, UUID, str]],
+    ) -> list[MessageDraft]:
+        """
+        Creates the new DB message drafts.
+
+        :param values: The message IDs, the sender IDs and the texts of
+                       the new DB message drafts.
+        :type values: Sequence[tuple[int, UUID, str]]
+        :return: The new DB message drafts.
+        :rtype: list[MessageDraft]
+        """
+        logger.debug("Starting a creation of the DB message drafts...")
+        created_date: datetime = datetime.now()
+
+        logger.debug("Creating the DB message drafts...")
+        new_drafts: list[MessageDraft] = [
+            MessageDraft(
+                id_=uuid7(),
+                message_id=message_id,
+                sender_id=sender_id,
+                text=text,
+                created_date=created_date,
+            )
+            for message_id, sender_id, text in values
+        ]
+        logger.debug("Created %s DB message drafts", len(new_drafts))
+
+        return new_drafts
+
+    def __get_sender_id(self: Self) -> UUID:
+        sender_id: UUID | None = self.__sender_id
+
+        if sender_id is None and self.__sender is not None:
+            sender_id = self.__sender.id_
+
+        logger.debug("Checking for a presence of a sender ID...")
+        if sender_id is None:
+            logger.critical(
+                "A sender ID is absent. Raising a `ValueError` exception..."
+            )
+            raise ValueError("A sender ID is absent")
+        logger.debug("A sender ID is present")
+
+        return sender_id
+
+    async def __delete_draft(self: Self, sender_id: UUID) -> bool:
+        logger.debug("Executing a statement...")
+        # A delete is executed by a cursor, so its result has a count of
+        # the deleted rows
+        result: CursorResult = cast(
+            "CursorResult",
+            await self.__db_session.execute(
+                delete_draft_stmt,
+                {"b_message_id": self.__message_id, "b_sender_id": sender_id},
+            ),
+        )
+        logger.debug("Executed")
+
+        is_deleted: bool = result.rowcount == 1
+        logger.debug("Deleted: %s", is_deleted)
+
+        return is_deleted
@@ -2,22 +2,49 @@ from __future__ import annotations
 
 from logging import getLogger
 from typing import TYPE_CHECKING, override
-from uuid import uuid4
+from uuid import uuid7
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
+from sqlalchemy.orm import joinedload
 
 from ...interfaces import DBItemCreator, DBItemGetter
 from ..database_tables import Token
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
     from logging import Logger
     from typing import Self
 
     from sqlalchemy import Result, Select
-    from sqlalchemy.orm import Session
+    from sqlalchemy.ext.asyncio import AsyncSession
 
 logger: Logger = getLogger(__name__)
 
+# The statement is constructed once and executed with a bound parameter,
+# so SQLAlchemy reuses its memoized cache key
+#
+# A DB user is loaded with the DB token in the same query, because an
+# async session can't load it implicitly on an attribute access
+select_token_stmt: Select[tuple[Token]] = (
+    select(Token)
+    .options(joinedload(Token.user))
+    .where(Token.token == bindparam("token"))
+)
+# Two users can enter the same token concurrently, so an authorization
+# locks a DB token with its DB user, and a concurrent authorization
+# waits for a commit and reads the claim of the token after it. A lock
+# is taken on the primary only
+select_token_for_update_stmt: Select[tuple[Token]] = (
+    select_token_stmt.with_for_update().execution_options(bind="primary")
+)
+# An expanding parameter renders one `IN` clause for any number of the
+# tokens
+select_tokens_stmt: Select[tuple[Token]] = (
+    select(Token)
+    .options(joinedload(Token.user))
+    .where(Token.token.in_(bindparam("tokens", expanding=True)))
+)
+
 
 class DBTokenManipulator(DBItemGetter, DBItemCreator):
     """
@@ -29,12 +56,12 @@ class DBTokenManipulator(DBItemGetter, DBItemCreator):
     :type DBItemCreator: class
     """
 
-    def __init__(self: Self, db_session: Session, token: str) -> None:
+    def __init__(self: Self, db_session: AsyncSession, token: str) -> None:
         """
         Creates a DB token manipulator.
 
         :param db_session: A DB session.
-        :type db_session: Session
+        :type db_session: AsyncSession
         :param token: A token.
         :type token: str
         """
@@ -43,14 +70,14 @@ class DBTokenManipulator(DBItemGetter, DBItemCreator):
         logger.debug(
             "Setting the arguments to the corresponding instance attributes..."
         )
-        self.__db_session: Session = db_session
+        self.__db_session: AsyncSession = db_session
         self.__token: str = token
         logger.debug("Set")
 
         logger.debug("Initialized")
 
     @override
-    def get(self: Self) -> Token | None:
+    async def get(self: Self) -> Token | None:
         """
         Gets a DB token.
 
@@ -59,15 +86,33 @@ class DBTokenManipulator(DBItemGetter, DBItemCreator):
         """
         logger.debug("Starting a getting of the DB token...")
 
-        logger.debug("Constructing a statement...")
-        select_token_stmt: Select[tuple[Token]] = select(Token).where(
-            Token.token == self.__token
+        logger.debug("Executing a statement...")
+        result: Result[tuple[Token]] = await self.__db_session.execute(
+            select_token_stmt,
+            {"token": self.__token},
         )
-        logger.debug("Constructed")
+        logger.debug("Executed")
 
-        logger.debug("Executing the statement...")
-        result: Result[tuple[Token]] = self.__db_session.execute(
-            select_token_stmt
+        logger.debug("Getting the DB token...")
+        token: Token | None = result.scalar_one_or_none()
+        logger.debug("Got")
+
+        return token
+
+    async def get_for_update(self: Self) -> Token | None:
+        """
+        Gets a DB token and locks it with its DB user till an end of a
+        transaction.
+
+        :return: A DB token or None, if the DB token is not found.
+        :rtype: Token | None
+        """
+        logger.debug("Starting a getting of the DB token for an update...")
+
+        logger.debug("Executing a statement...")
+        result: Result[tuple[Token]] = await self.__db_session.execute(
+            select_token_for_update_stmt,
+            {"token": self.__token},
         )
         logger.debug("Executed")
 
@@ -83,10 +128,67 @@ class DBTokenManipulator(DBItemGetter, DBItemCreator):
 
         logger.debug("Creating a DB token...")
         new_token: Token = Token(
-            id_=uuid4(),
+            id_=uuid7(),
             token=self.__token,
             user=None,
         )
         logger.debug("Created")
 
         return new_token
+
+    @classmethod
+    @override
+    async def get_many(
+        cls: type[Self],
+        db_session: AsyncSession,
+        keys: Sequence[str],
+    ) -> list[Token]:
+        """
+        Gets the DB tokens by their tokens in one query.
+
+        :param db_session: A DB session.
+        :type db_session: AsyncSession
+        :param keys: The tokens.
+        :type keys: Sequence[str]
+        :return: The found DB tokens. The not found tokens are skipped.
+        :rtype: list[Token]
+        """
+        logger.debug("Starting a getting of the DB tokens...")
+
+        if not keys:
+            logger.debug("The tokens are absent")
+            return []
+
+        logger.debug("Executing a statement...")
+        result: Result[tuple[Token]] = await db_session.execute(
+            select_tokens_stmt,
+            {"tokens": list(keys)},
+        )
+        logger.debug("Executed")
+
+        logger.debug("Getting the DB tokens...")
+        tokens: list[Token] = list(result.scalars().all())
+        logger.debug("Got %s DB tokens", len(tokens))
+
+        return tokens
+
+    @classmethod
+    @override
+    def create_many(cls: type[Self], values: Sequence[str]) -> list[Token]:
+        """
+        Creates the new DB tokens by their tokens.
+
+        :param values: The tokens.
+        :type values: Sequence[str]
+        :return: The new DB tokens.
+        :rtype: list[Token]
+        """
+        logger.debug("Starting a creation of the DB tokens...")
+
+        logger.debug("Creating the DB tokens...")
+        new_tokens: list[Token] = [
+            Token(id_=uuid7(), token=token, user=None) for token in values
+        ]
+        logger.debug("Created %s DB tokens", len(new_tokens))
+
+        return new_tokens
@@ -2,22 +2,74 @@ from __future__ import annotations
 
 from logging import getLogger
 from typing import TYPE_CHECKING, overload, override
-from uuid import uuid4
+from uuid import uuid7
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, event, select, update
+from sqlalchemy.orm import Session, joinedload
 
 from ...interfaces import AbstractDBUserManipulator
+from ...types import UserAuthState
 from ..database_tables import Token, User
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from datetime import datetime
     from logging import Logger
     from typing import Self
+    from uuid import UUID
 
-    from sqlalchemy import Result, Select
-    from sqlalchemy.orm import Session
+    from sqlalchemy import Result, Row, Select, Update
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from ...interfaces import AbstractUserAuthStateCache
 
 logger: Logger = getLogger(__name__)
 
+# A key of a session's info, under which the caches and the user IDs,
+# whose cached authorization states are invalidated after a commit, are
+# kept
+PENDING_INVALIDATIONS_KEY: str = "pending_auth_state_invalidations"
+
+# The statements are constructed once and executed with the bound
+# parameters, so SQLAlchemy reuses their memoized cache keys instead of
+# rebuilding and hashing a new construct on every call
+#
+# A DB token is loaded with the DB user in the same query, because an
+# async session can't load it implicitly on an attribute access
+select_user_stmt: Select[tuple[User]] = (
+    select(User)
+    .options(joinedload(User.token))
+    .where(User.user_id == bindparam("user_id"))
+)
+# An expanding parameter renders one `IN` clause for any number of the
+# user IDs
+select_users_stmt: Select[tuple[User]] = (
+    select(User)
+    .options(joinedload(User.token))
+    .where(User.user_id.in_(bindparam("user_ids", expanding=True)))
+)
+select_auth_state_stmt: Select[
+    tuple[UUID, bool, bool, bool, datetime | None]
+] = (
+    select(
+        User.id_,
+        User.is_authorizing,
+        Token.id_.is_not(None).label("has_token"),
+        User.is_owner,
+        User.last_send_date,
+    )
+    .outerjoin(User.token)
+    .where(User.user_id == bindparam("user_id"))
+)
+# The names of the columns are reserved for the parameters of a `SET`
+# clause, so the bound parameters of an update are prefixed
+update_last_send_date_stmt: Update = (
+    update(User)
+    .where(User.user_id == bindparam("b_user_id"))
+    .values(last_send_date=bindparam("b_last_send_date"))
+    .execution_options(synchronize_session=False)
+)
+
 
 class DBUserManipulator(AbstractDBUserManipulator):
     """
@@ -30,37 +82,47 @@ class DBUserManipulator(AbstractDBUserManipulator):
     @overload
     def __init__(
         self: Self,
-        db_session: Session,
+        db_session: AsyncSession,
         *,
         user_id: int,
+        auth_state_cache: AbstractUserAuthStateCache | None = None,
     ) -> None: ...
 
     @overload
     def __init__(
         self: Self,
-        db_session: Session,
+        db_session: AsyncSession,
         *,
         db_user: User,
+        auth_state_cache: AbstractUserAuthStateCache | None = None,
     ) -> None: ...
 
     def __init__(
         self: Self,
-        db_session: Session,
+        db_session: AsyncSession,
         *,
         user_id: int | None = None,
         db_user: User | None = None,
+        auth_state_cache: AbstractUserAuthStateCache | None = None,
     ) -> None:
         """
         Creates a DB user manipulator.
 
         :param db_session: A DB session.
-        :type db_session: Session
+        :type db_session: AsyncSession
         :param user_id: A user ID, defaults to None. Either a user ID or
                         a DB user must be provided but not both.
         :type user_id: int | None, optional
         :param db_user: A DB user, defaults to None. Either a user ID or
                         a DB user must be provided but not both.
         :type db_user: User | None, optional
+        :param auth_state_cache: A cache of the users' authorization
+                                 states, defaults to None. If provided,
+                                 an authorization state is read through
+                                 the cache, and the cached state is
+                                 invalidated on a change of a DB user.
+        :type auth_state_cache: AbstractUserAuthStateCache | None,
+                                optional
         :raises ValueError: Either nothing or both user ID and DB user
                             are provided.
         """
@@ -108,14 +170,50 @@ class DBUserManipulator(AbstractDBUserManipulator):
                 "attributes..."
             )
         )
-        self.__db_session: Session = db_session
+        self.__db_session: AsyncSession = db_session
         self.__user_id: int | None = user_id
         self.__db_user: User | None = db_user
+        self.__auth_state_cache: AbstractUserAuthStateCache | None = (
+            auth_state_cache
+        )
         logger.debug("Assigned")
         logger.debug("Initialized")
 
+    def __invalidate_auth_state(self: Self) -> None:
+        """
+        Invalidates a cached authorization state of a DB user now and
+        after a commit of a session, if a cache is provided.
+        """
+        auth_state_cache: AbstractUserAuthStateCache | None = (
+            self.__auth_state_cache
+        )
+
+        if auth_state_cache is None:
+            return None
+
+        user_id: int | None = self.__user_id
+        if user_id is None and self.__db_user is not None:
+            user_id = self.__db_user.user_id
+
+        if user_id is None:
+            return None
+
+        logger.debug("Invalidating a cached authorization state...")
+        auth_state_cache.invalidate(user_id)
+        logger.debug("Invalidated")
+
+        # A concurrent update can read a DB user before a commit and cache
+        # its old state, so the state is invalidated again after the
+        # commit
+        logger.debug("Scheduling an invalidation after a commit...")
+        pending_invalidations: list[tuple[AbstractUserAuthStateCache, int]] = (
+            self.__db_session.info.setdefault(PENDING_INVALIDATIONS_KEY, [])
+        )
+        pending_invalidations.append((auth_state_cache, user_id))
+        logger.debug("Scheduled")
+
     @override
-    def get(self: Self) -> User | None:
+    async def get(self: Self) -> User | None:
         """
         Gets a DB user by a user ID. That is, selects a DB user where a
         DB user's ID equals to a provided user ID.
@@ -139,14 +237,10 @@ class DBUserManipulator(AbstractDBUserManipulator):
             "A user ID is present. Continuing the getting of the DB user..."
         )
 
-        logger.debug("Constructing a DB statement...")
-        select_user_stmt: Select[tuple[User]] = select(User).where(
-            User.user_id == self.__user_id
-        )
-        logger.debug("Constructed")
-        logger.debug("Executing the statement...")
-        result: Result[tuple[User]] = self.__db_session.execute(
-            select_user_stmt
+        logger.debug("Executing a DB statement...")
+        result: Result[tuple[User]] = await self.__db_session.execute(
+            select_user_stmt,
+            {"user_id": user_id},
         )
         logger.debug("Executed")
         logger.debug("Getting the DB user....")
@@ -161,6 +255,78 @@ class DBUserManipulator(AbstractDBUserManipulator):
 
         return db_user
 
+    @override
+    async def get_auth_state(self: Self) -> UserAuthState | None:
+        """
+        Gets an authorization state of a DB user by a user ID. That is,
+        selects the columns, which are needed to handle a user's
+        message, and a presence of a DB user's DB token in one query.
+
+        Unlike the `get` method, the method doesn't load a DB user and,
+        therefore, doesn't set the `db_user`. If a cache is provided, a
+        cached state is returned without a query.
+
+        :return: An authorization state of a DB user or None, if the DB
+                 user is not found.
+        :rtype: UserAuthState | None
+        """
+        logger.debug("Starting a getting of an authorization state...")
+        user_id: int | None = self.__user_id
+
+        logger.debug("Checking for a presence of a user ID...")
+        if user_id is None:
+            logger.critical(
+                "A user ID is absent. Raising a `ValueError` exception..."
+            )
+            raise ValueError("A user ID is absent")
+        logger.debug(
+            (
+                "A user ID is present. Continuing the getting of the "
+                "authorization state..."
+            )
+        )
+
+        auth_state_cache: AbstractUserAuthStateCache | None = (
+            self.__auth_state_cache
+        )
+
+        if auth_state_cache is not None:
+            logger.debug("Getting a cached authorization state...")
+            cached_auth_state: UserAuthState | None = auth_state_cache.get(
+                user_id
+            )
+            if cached_auth_state is not None:
+                logger.debug("Got")
+                return cached_auth_state
+            logger.debug("The authorization state is not cached")
+
+        logger.debug("Executing a DB statement...")
+        result: Result[
+            tuple[UUID, bool, bool, bool, datetime | None]
+        ] = await self.__db_session.execute(
+            select_auth_state_stmt,
+            {"user_id": user_id},
+        )
+        logger.debug("Executed")
+        logger.debug("Getting a row of the authorization state...")
+        row: Row[tuple[UUID, bool, bool, bool, datetime | None]] | None = (
+            result.one_or_none()
+        )
+        logger.debug("Got")
+
+        if row is None:
+            logger.debug("The DB user is not found")
+            return None
+
+        auth_state: UserAuthState = UserAuthState(*row)
+
+        if auth_state_cache is not None:
+            logger.debug("Caching the authorization state...")
+            auth_state_cache.set(user_id, auth_state)
+            logger.debug("Cached")
+
+        return auth_state
+
     @override
     def create(self: Self) -> User:
         """
@@ -188,7 +354,7 @@ class DBUserManipulator(AbstractDBUserManipulator):
 
         logger.debug("Creating a DB user...")
         new_db_user: User = User(
-            id_=uuid4(),
+            id_=uuid7(),
             user_id=user_id,
             is_authorizing=True,
             token_id=None,
@@ -207,6 +373,78 @@ class DBUserManipulator(AbstractDBUserManipulator):
 
         return new_db_user
 
+    @classmethod
+    @override
+    async def get_many(
+        cls: type[Self],
+        db_session: AsyncSession,
+        keys: Sequence[int],
+    ) -> list[User]:
+        """
+        Gets the DB users by their user IDs in one query.
+
+        Unlike the `get` method, the method doesn't bind a DB user to a
+        manipulator, so a DB user is changed by a manipulator, which is
+        created with the `db_user` argument.
+
+        :param db_session: A DB session.
+        :type db_session: AsyncSession
+        :param keys: The user IDs.
+        :type keys: Sequence[int]
+        :return: The found DB users. The not found user IDs are skipped.
+        :rtype: list[User]
+        """
+        logger.debug("Starting a getting of the DB users...")
+
+        if not keys:
+            logger.debug("The user IDs are absent")
+            return []
+
+        logger.debug("Executing a DB statement...")
+        result: Result[tuple[User]] = await db_session.execute(
+            select_users_stmt,
+            {"user_ids": list(keys)},
+        )
+        logger.debug("Executed")
+
+        logger.debug("Getting the DB users...")
+        db_users: list[User] = list(result.scalars().all())
+        logger.debug("Got %s DB users", len(db_users))
+
+        return db_users
+
+    @classmethod
+    @override
+    def create_many(cls: type[Self], values: Sequence[int]) -> list[User]:
+        """
+        Creates the new DB users without a token and with an authorizing
+        status — True by their user IDs.
+
+        :param values: The user IDs.
+        :type values: Sequence[int]
+        :return: The new DB users.
+        :rtype: list[User]
+        """
+        logger.debug("Starting a creation of the new DB users...")
+
+        logger.debug("Creating the DB users...")
+        new_db_users: list[User] = [
+            User(
+                id_=uuid7(),
+                user_id=user_id,
+                is_authorizing=True,
+                token_id=None,
+                token=None,
+                is_owner=False,
+                last_send_date=None,
+                messages=[],
+            )
+            for user_id in values
+        ]
+        logger.debug("Created %s DB users", len(new_db_users))
+
+        return new_db_users
+
     @override
     def get_authorizing_status(self: Self) -> bool:
         """
@@ -296,6 +534,8 @@ class DBUserManipulator(AbstractDBUserManipulator):
         db_user.is_authorizing = is_authorizing
         logger.debug("Set")
 
+        self.__invalidate_auth_state()
+
     @override
     def set_token(self: Self, token: Token) -> None:
         """
@@ -323,6 +563,8 @@ class DBUserManipulator(AbstractDBUserManipulator):
         db_user.token = token
         logger.debug("Set")
 
+        self.__invalidate_auth_state()
+
     @override
     def clear_token(self: Self) -> None:
         """
@@ -350,6 +592,69 @@ class DBUserManipulator(AbstractDBUserManipulator):
         db_user.token = None
         logger.debug("Cleared")
 
+        self.__invalidate_auth_state()
+
+    @override
+    async def update_last_send_date(
+        self: Self, last_send_date: datetime
+    ) -> None:
+        """
+        Updates a last send date of a DB user by a user ID. That is,
+        updates a `last_send_date` column without a load of a DB user.
+
+        :param last_send_date: A last send date to set.
+        :type last_send_date: datetime
+        """
+        logger.debug("Starting an update of a last send date...")
+        user_id: int | None = self.__user_id
+
+        logger.debug("Checking for a presence of a user ID...")
+        if user_id is None:
+            logger.critical(
+                "A user ID is absent. Raising a `ValueError` exception..."
+            )
+            raise ValueError("A user ID is absent")
+        logger.debug(
+            (
+                "A user ID is present. Continuing the update of the last "
+                "send date..."
+            )
+        )
+
+        logger.debug("Executing a DB statement...")
+        await self.__db_session.execute(
+            update_last_send_date_stmt,
+            {"b_user_id": user_id, "b_last_send_date": last_send_date},
+        )
+        logger.debug("Executed")
+
+        self.__invalidate_auth_state()
+
+    @override
+    async def delete(self: Self) -> None:
+        """
+        Deletes a DB user. That is, marks a DB user as deleted in a DB
+        session.
+        """
+        logger.debug("Starting a deletion of a DB user...")
+        db_user: User | None = self.__db_user
+
+        logger.debug("Checking for a presence of a DB user...")
+        if db_user is None:
+            logger.critical(
+                "A DB user is absent. Raising a `ValueError` exception..."
+            )
+            raise ValueError("A DB user is absent")
+        logger.debug(
+            "A DB user is present. Continuing the deletion of the DB user..."
+        )
+
+        logger.debug("Deleting the DB user...")
+        await self.__db_session.delete(db_user)
+        logger.debug("Deleted")
+
+        self.__invalidate_auth_state()
+
     @override
     def get_owner_status(self: Self) -> bool:
         """
@@ -380,3 +685,37 @@ class DBUserManipulator(AbstractDBUserManipulator):
         logger.debug("Got")
 
         return is_user_owner
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_auth_states_after_commit(session: Session) -> None:
+    """
+    Invalidates the cached authorization states of the DB users, which
+    were changed in a committed transaction.
+
+    :param session: A committed session.
+    :type session: Session
+    """
+    pending_invalidations: (
+        list[tuple[AbstractUserAuthStateCache, int]] | None
+    ) = session.info.pop(PENDING_INVALIDATIONS_KEY, None)
+
+    if pending_invalidations is None:
+        return None
+
+    logger.debug("Invalidating the cached authorization states...")
+    for auth_state_cache, user_id in pending_invalidations:
+        auth_state_cache.invalidate(user_id)
+    logger.debug("Invalidated")
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_auth_state_invalidations(session: Session) -> None:
+    """
+    Discards the invalidations of a rolled back transaction, because
+    its changes never reach a DB.
+
+    :param session: A rolled back session.
+    :type session: Session
+    """
+    session.info.pop(PENDING_INVALIDATIONS_KEY, None)
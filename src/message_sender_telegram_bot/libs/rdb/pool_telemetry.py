@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+from logging import getLogger
+from time import perf_counter
+from typing import TYPE_CHECKING, cast, override
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from ..types import PoolStats
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from logging import Logger
+    from typing import Any, Self
+
+    from sqlalchemy.pool import (
+        ConnectionPoolEntry,
+        PoolProxiedConnection,
+        QueuePool,
+    )
+
+logger: Logger = getLogger(__name__)
+
+
+class PoolTelemetry:
+    """
+    A telemetry of a DB connection pool. That is, collects a time of a
+    checkout of a connection, a number of the checked out connections
+    and a number of the connections, which are opened over a size of a
+    pool, through the pool events.
+    """
+
+    def __init__(self: Self) -> None:
+        """
+        Creates a telemetry of a DB connection pool.
+        """
+        logger.debug("Initializing `%s`...", self.__class__.__name__)
+
+        self.__pool_size: int = 0
+        self.__checkout_count: int = 0
+        self.__checkout_wait_count: int = 0
+        self.__checkout_wait_sum: float = 0.0
+        self.__checkout_wait_max: float = 0.0
+        self.__in_use: int = 0
+        self.__in_use_max: int = 0
+        self.__overflow_count: int = 0
+
+        logger.debug("Initialized")
+
+    def attach(self: Self, pool: QueuePool) -> None:
+        """
+        Listens the events of a pool.
+
+        :param pool: A DB connection pool.
+        :type pool: QueuePool
+        """
+        logger.debug("Attaching the telemetry to a pool...")
+        self.__pool_size = pool.size()
+        event.listen(pool, "connect", self.__on_connect)
+        event.listen(pool, "checkout", self.__on_checkout)
+        event.listen(pool, "checkin", self.__on_checkin)
+        logger.debug("Attached")
+
+    def record_checkout_wait(self: Self, wait: float) -> None:
+        """
+        Records a time, during which a client waited for a connection.
+
+        :param wait: A time of a wait in seconds.
+        :type wait: float
+        """
+        self.__checkout_wait_count += 1
+        self.__checkout_wait_sum += wait
+        self.__checkout_wait_max = max(self.__checkout_wait_max, wait)
+
+    def get_stats(self: Self) -> PoolStats:
+        """
+        Gets the collected metrics of a pool.
+
+        :return: The collected metrics of a pool.
+        :rtype: PoolStats
+        """
+        checkout_wait_avg: float = (
+            self.__checkout_wait_sum / self.__checkout_wait_count
+            if self.__checkout_wait_count
+            else 0.0
+        )
+
+        return PoolStats(
+            checkout_count=self.__checkout_count,
+            checkout_wait_avg=checkout_wait_avg,
+            checkout_wait_max=self.__checkout_wait_max,
+            in_use=self.__in_use,
+            in_use_max=self.__in_use_max,
+            overflow_count=self.__overflow_count,
+        )
+
+    def __on_connect(
+        self: Self,
+        dbapi_connection: Any,
+        connection_record: ConnectionPoolEntry,
+    ) -> None:
+        # A new connection is checked out right after an opening, so a
+        # connection is opened over a size of a pool, if all the pool's
+        # connections are in use
+        if self.__in_use >= self.__pool_size:
+            self.__overflow_count += 1
+            logger.debug("A connection is opened over a size of a pool")
+
+    def __on_checkout(
+        self: Self,
+        dbapi_connection: Any,
+        connection_record: ConnectionPoolEntry,
+        connection_proxy: PoolProxiedConnection,
+    ) -> None:
+        self.__checkout_count += 1
+        self.__in_use += 1
+        self.__in_use_max = max(self.__in_use_max, self.__in_use)
+
+    def __on_checkin(
+        self: Self,
+        dbapi_connection: Any,
+        connection_record: ConnectionPoolEntry,
+    ) -> None:
+        self.__in_use -= 1
+
+
+class TelemetryAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    An async adapted queue pool, which reports its metrics to a pool
+    telemetry.
+
+    An engine passes a `telemetry` argument of the `create_async_engine`
+    function to the pool.
+
+    :param AsyncAdaptedQueuePool: An async adapted queue pool.
+    :type AsyncAdaptedQueuePool: class
+    """
+
+    def __init__(
+        self: Self,
+        creator: Callable[..., Any],
+        telemetry: PoolTelemetry | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Creates an async adapted queue pool with a telemetry.
+
+        :param creator: A function, which creates a DBAPI connection.
+        :type creator: Callable[..., Any]
+        :param telemetry: A telemetry of a pool, defaults to None. If
+                          None, the pool is not instrumented.
+        :type telemetry: PoolTelemetry | None, optional
+        """
+        super().__init__(creator, **kwargs)
+
+        self.__telemetry: PoolTelemetry | None = telemetry
+
+        if telemetry is not None:
+            telemetry.attach(self)
+
+    @override
+    def connect(self: Self) -> PoolProxiedConnection:
+        telemetry: PoolTelemetry | None = self.__telemetry
+
+        if telemetry is None:
+            return super().connect()
+
+        # A checkout waits for a free connection, if all the connections
+        # are in use, and pings a connection, if a pre-ping is enabled.
+        # A time is recorded even on a timeout of the wait
+        started: float = perf_counter()
+        try:
+            return super().connect()
+        finally:
+            telemetry.record_checkout_wait(perf_counter() - started)
+
+    @override
+    def recreate(self: Self) -> TelemetryAsyncAdaptedQueuePool:
+        # A recreated pool takes over the event listeners, so the
+        # telemetry is only passed to it without an another attaching
+        pool: TelemetryAsyncAdaptedQueuePool = cast(
+            "TelemetryAsyncAdaptedQueuePool",
+            super().recreate(),
+        )
+        pool.__telemetry = self.__telemetry
+
+        return pool
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+from contextvars import ContextVar
+from datetime import timedelta
+from functools import wraps
+from logging import getLogger
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from sqlalchemy import event
+
+from ..types import HandlerQueryStats
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Coroutine
+    from contextvars import Token
+    from logging import Logger
+    from typing import Any, Concatenate, Self
+
+    from sqlalchemy import Connection, Engine
+    from sqlalchemy.engine import ExceptionContext, ExecutionContext
+    from telegram import Update
+
+logger: Logger = getLogger(__name__)
+
+# A key of a connection's info, under which the start times of the
+# executed statements are kept
+QUERY_STARTED_KEY: str = "query_started"
+
+
+class QueryScope:
+    """
+    The queries of a handle of one update.
+    """
+
+    def __init__(self: Self, handler_name: str, update_id: int) -> None:
+        """
+        Creates the queries of a handle of one update.
+
+        :param handler_name: A name of a handler's callback.
+        :type handler_name: str
+        :param update_id: An ID of an update.
+        :type update_id: int
+        """
+        self.handler_name: str = handler_name
+        self.update_id: int = update_id
+        self.query_count: int = 0
+        self.query_time: float = 0.0
+
+
+# Every update is handled in its own task, and an async session runs the
+# statements in a greenlet, which shares a context of the task, so the
+# cursor events see the queries of a current update
+current_query_scope: ContextVar[QueryScope | None] = ContextVar(
+    "current_query_scope",
+    default=None,
+)
+
+
+class QueryTelemetry:
+    """
+    A telemetry of the SQL queries. That is, counts the executed
+    statements and their time per a handle of an update, sums them per
+    a handler and logs the slow statements.
+    """
+
+    def __init__(
+        self: Self,
+        slow_query_threshold: timedelta = timedelta(milliseconds=100),
+    ) -> None:
+        """
+        Creates a telemetry of the SQL queries.
+
+        :param slow_query_threshold: A time of a statement, after which
+                                     the statement is logged as a slow
+                                     one, defaults to
+                                     `timedelta(milliseconds=100)`.
+        :type slow_query_threshold: timedelta, optional
+        """
+        logger.debug("Initializing `%s`...", self.__class__.__name__)
+
+        logger.debug(
+            "Setting the arguments to the corresponding instance attributes..."
+        )
+        self.__slow_query_threshold: float = (
+            slow_query_threshold.total_seconds()
+        )
+        logger.debug("Set")
+
+        self.__handler_stats: dict[str, HandlerQueryStats] = {}
+        self.__slow_query_count: int = 0
+
+        logger.debug("Initialized")
+
+    def attach(self: Self, engine: Engine) -> None:
+        """
+        Listens the statements of an engine.
+
+        An async engine executes its statements through a sync engine,
+        so the telemetry is attached to a `sync_engine` attribute of it.
+
+        :param engine: A DB engine.
+        :type engine: Engine
+        """
+        logger.debug("Attaching the telemetry to an engine...")
+        event.listen(engine, "before_cursor_execute", self.__on_before)
+        event.listen(engine, "after_cursor_execute", self.__on_after)
+        event.listen(engine, "handle_error", self.__on_error)
+        logger.debug("Attached")
+
+    def wrap[**P, R](
+        self: Self,
+        callback: Callable[Concatenate[Update, P], Coroutine[Any, Any, R]],
+    ) -> Callable[Concatenate[Update, P], Coroutine[Any, Any, R]]:
+        """
+        Wraps a handler's callback into a query scope. That is, counts
+        the statements, which are executed during the callback, and adds
+        them to the totals of the handler.
+
+        If the callback is invoked inside an another query scope, then
+        the statements are counted in the outer scope.
+
+        :param callback: A handler's callback.
+        :type callback: Callable[Concatenate[Update, P],
+                        Coroutine[Any, Any, R]]
+        :return: A wrapped callback.
+        :rtype: Callable[Concatenate[Update, P], Coroutine[Any, Any, R]]
+        """
+        handler_name: str = getattr(callback, "__qualname__", repr(callback))
+
+        @wraps(callback)
+        async def wrapper(
+            update: Update,
+            *args: P.args,
+            **kwargs: P.kwargs,
+        ) -> R:
+            if current_query_scope.get() is not None:
+                return await callback(update, *args, **kwargs)
+
+            query_scope: QueryScope = QueryScope(
+                handler_name,
+                update.update_id,
+            )
+            token: Token[QueryScope | None] = current_query_scope.set(
+                query_scope
+            )
+            try:
+                return await callback(update, *args, **kwargs)
+            finally:
+                current_query_scope.reset(token)
+                self.__record(query_scope)
+
+        return wrapper
+
+    def get_handler_stats(self: Self) -> dict[str, HandlerQueryStats]:
+        """
+        Gets the totals of the queries per a handler.
+
+        :return: The totals of the queries by the names of the handlers.
+        :rtype: dict[str, HandlerQueryStats]
+        """
+        return dict(self.__handler_stats)
+
+    def get_slow_query_count(self: Self) -> int:
+        """
+        Gets a number of the slow statements.
+
+        :return: A number of the slow statements.
+        :rtype: int
+        """
+        return self.__slow_query_count
+
+    def __record(self: Self, query_scope: QueryScope) -> None:
+        logger.debug(
+            "An update %s is handled by `%s` with %s queries in %.4f s",
+            query_scope.update_id,
+            query_scope.handler_name,
+            query_scope.query_count,
+            query_scope.query_time,
+        )
+
+        handler_stats: HandlerQueryStats = self.__handler_stats.get(
+            query_scope.handler_name,
+            HandlerQueryStats(0, 0, 0.0, 0),
+        )
+        self.__handler_stats[query_scope.handler_name] = HandlerQueryStats(
+            update_count=handler_stats.update_count + 1,
+            query_count=handler_stats.query_count + query_scope.query_count,
+            query_time=handler_stats.query_time + query_scope.query_time,
+            query_count_max=max(
+                handler_stats.query_count_max,
+                query_scope.query_count,
+            ),
+        )
+
+    def __on_before(
+        self: Self,
+        connection: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        connection.info.setdefault(QUERY_STARTED_KEY, []).append(
+            perf_counter()
+        )
+
+    def __on_after(
+        self: Self,
+        connection: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        elapsed: float = (
+            perf_counter() - connection.info[QUERY_STARTED_KEY].pop()
+        )
+        query_scope: QueryScope | None = current_query_scope.get()
+
+        if query_scope is not None:
+            query_scope.query_count += 1
+            query_scope.query_time += elapsed
+
+        if elapsed < self.__slow_query_threshold:
+            return None
+
+        self.__slow_query_count += 1
+        # The parameters contain the texts of the messages and the
+        # tokens, so only a statement is logged
+        if query_scope is not None:
+            logger.warning(
+                "A slow query of an update %s in `%s` took %.4f s: %s",
+                query_scope.update_id,
+                query_scope.handler_name,
+                elapsed,
+                statement,
+            )
+        else:
+            logger.warning(
+                "A slow query outside of an update took %.4f s: %s",
+                elapsed,
+                statement,
+            )
+
+    def __on_error(self: Self, exception_context: ExceptionContext) -> None:
+        # A failed statement doesn't emit an after event, so its start
+        # time is dropped here
+        connection: Connection | None = exception_context.connection
+        if connection is None:
+            return None
+
+        query_started: list[float] = connection.info.get(
+            QUERY_STARTED_KEY,
+            [],
+        )
+        if query_started:
+            query_started.pop()
@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+from logging import getLogger
+from time import perf_counter
+from typing import TYPE_CHECKING, cast
+
+from sqlalchemy import DateTime, Integer, bindparam, delete, select, tuple_
+
+from ..types import RetentionStats
+from .column_types import BinaryUUID
+from .database_tables import Message, MessageDraft
+
+if TYPE_CHECKING:
+    from logging import Logger
+    from typing import Self
+    from uuid import UUID
+
+    from sqlalchemy import CursorResult, Delete, Result, Select
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+    from sqlalchemy.orm import InstrumentedAttribute
+
+    from .database_tables import Base
+
+logger: Logger = getLogger(__name__)
+
+
+def build_select_expired_stmts(
+    date_column: InstrumentedAttribute[datetime],
+    id_column: InstrumentedAttribute[UUID],
+) -> tuple[Select[tuple[datetime, UUID]], Select[tuple[datetime, UUID]]]:
+    # A batch is got by an index of a date, and a next batch starts after
+    # a last key of a previous one instead of an offset. So, every batch
+    # reads only its own rows, even if the deleted rows aren't purged
+    # from the index yet
+    select_first_stmt: Select[tuple[datetime, UUID]] = (
+        select(date_column, id_column)
+        .where(date_column < bindparam("cutoff", type_=DateTime))
+        .order_by(date_column, id_column)
+        .limit(bindparam("batch_size", type_=Integer))
+    )
+    select_next_stmt: Select[tuple[datetime, UUID]] = select_first_stmt.where(
+        tuple_(date_column, id_column)
+        > tuple_(
+            bindparam("last_date", type_=DateTime),
+            bindparam("last_id", type_=BinaryUUID),
+        )
+    )
+
+    return select_first_stmt, select_next_stmt
+
+
+def build_delete_stmt(
+    table: type[Base],
+    id_column: InstrumentedAttribute[UUID],
+) -> Delete:
+    # The deleted rows aren't loaded, so a session doesn't need to
+    # synchronize them
+    return (
+        delete(table)
+        .where(id_column.in_(bindparam("b_ids", expanding=True)))
+        .execution_options(synchronize_session=False)
+    )
+
+
+select_first_expired_message_stmt, select_next_expired_message_stmt = (
+    build_select_expired_stmts(Message.sent_date, Message.id_)
+)
+delete_messages_stmt: Delete = build_delete_stmt(Message, Message.id_)
+select_first_expired_draft_stmt, select_next_expired_draft_stmt = (
+    build_select_expired_stmts(MessageDraft.created_date, MessageDraft.id_)
+)
+delete_drafts_stmt: Delete = build_delete_stmt(MessageDraft, MessageDraft.id_)
+
+
+class RetentionPurger:
+    """
+    A purger of the expired DB messages. That is, deletes the sent DB
+    messages and the abandoned DB message drafts, which are older than
+    their retention, in bounded batches. The sent DB messages are an
+    archive, so they are kept forever, unless their retention is set.
+
+    Every batch is deleted in its own short transaction, so a purge
+    never holds the locks of a whole table and a size of a transaction
+    log doesn't depend on a number of the expired rows.
+    """
+
+    def __init__(
+        self: Self,
+        compiled_session: async_sessionmaker[AsyncSession],
+        sent_message_retention: timedelta | None = None,
+        draft_retention: timedelta = timedelta(days=1),
+        batch_size: int = 1000,
+        batch_pause: timedelta = timedelta(milliseconds=100),
+    ) -> None:
+        """
+        Creates a purger of the expired DB messages.
+
+        :param compiled_session: A compiled async session.
+        :type compiled_session: async_sessionmaker[AsyncSession]
+        :param sent_message_retention: A time, during which a sent DB
+                                       message is kept, defaults to
+                                       None. If None, the sent DB
+                                       messages aren't deleted.
+        :type sent_message_retention: timedelta | None, optional
+        :param draft_retention: A time, during which a not confirmed DB
+                                message draft is kept, defaults to
+                                `timedelta(days=1)`.
+        :type draft_retention: timedelta, optional
+        :param batch_size: A maximum number of the rows, which are
+                           deleted in one transaction, defaults to 1000.
+        :type batch_size: int, optional
+        :param batch_pause: A pause between the batches, defaults to
+                            `timedelta(milliseconds=100)`. Lets the
+                            updates and a replication catch up during a
+                            long purge.
+        :type batch_pause: timedelta, optional
+        :raises ValueError: A size of a batch isn't positive.
+        """
+        logger.debug("Initializing `%s`...", self.__class__.__name__)
+
+        logger.debug("Checking a size of a batch...")
+        if batch_size < 1:
+            logger.critical(
+                (
+                    "A size of a batch isn't positive. Raising a `ValueError` "
+                    "exception..."
+                ),
+            )
+            raise ValueError("A size of a batch must be positive")
+        logger.debug("Checked")
+
+        logger.debug(
+            "Setting the arguments to the corresponding instance attributes..."
+        )
+        self.__compiled_session: async_sessionmaker[AsyncSession] = (
+            compiled_session
+        )
+        self.__sent_message_retention: timedelta | None = (
+            sent_message_retention
+        )
+        self.__draft_retention: timedelta = draft_retention
+        self.__batch_size: int = batch_size
+        self.__batch_pause: timedelta = batch_pause
+        logger.debug("Set")
+
+        self.__batch_count: int = 0
+        self.__deleted_message_count: int = 0
+        self.__deleted_draft_count: int = 0
+        self.__batch_time_sum: float = 0.0
+        self.__batch_time_max: float = 0.0
+
+        logger.debug("Initialized")
+
+    async def purge(self: Self) -> int:
+        """
+        Deletes the expired sent DB messages and DB message drafts.
+
+        :return: A number of the deleted rows.
+        :rtype: int
+        """
+        logger.debug("Starting a purge of the expired DB messages...")
+        now: datetime = datetime.now()
+
+        deleted_message_count: int = 0
+        if self.__sent_message_retention is not None:
+            deleted_message_count = await self.__purge_table(
+                select_first_expired_message_stmt,
+                select_next_expired_message_stmt,
+                delete_messages_stmt,
+                now - self.__sent_message_retention,
+            )
+            self.__deleted_message_count += deleted_message_count
+
+        deleted_draft_count: int = await self.__purge_table(
+            select_first_expired_draft_stmt,
+            select_next_expired_draft_stmt,
+            delete_drafts_stmt,
+            now - self.__draft_retention,
+        )
+        self.__deleted_draft_count += deleted_draft_count
+
+        logger.debug(
+            "Purged %s DB messages and %s DB message drafts",
+            deleted_message_count,
+            deleted_draft_count,
+        )
+
+        return deleted_message_count + deleted_draft_count
+
+    def get_stats(self: Self) -> RetentionStats:
+        """
+        Gets the collected metrics of the purges.
+
+        :return: The collected metrics of the purges.
+        :rtype: RetentionStats
+        """
+        batch_time_avg: float = (
+            self.__batch_time_sum / self.__batch_count
+            if self.__batch_count
+            else 0.0
+        )
+
+        return RetentionStats(
+            batch_count=self.__batch_count,
+            deleted_message_count=self.__deleted_message_count,
+            deleted_draft_count=self.__deleted_draft_count,
+            batch_time_avg=batch_time_avg,
+            batch_time_max=self.__batch_time_max,
+        )
+
+    async def __purge_table(
+        self: Self,
+        select_first_stmt: Select[tuple[datetime, UUID]],
+        select_next_stmt: Select[tuple[datetime, UUID]],
+        delete_stmt: Delete,
+        cutoff: datetime,
+    ) -> int:
+        deleted_count: int = 0
+        last_key: tuple[datetime, UUID] | None = None
+
+        while True:
+            started: float = perf_counter()
+
+            # The keys are read from a replica, if it's provided, so only
+            # the deletes load the primary
+            async with self.__compiled_session.begin() as session:
+                result: Result[tuple[datetime, UUID]]
+                if last_key is None:
+                    result = await session.execute(
+                        select_first_stmt,
+                        {"cutoff": cutoff, "batch_size": self.__batch_size},
+                    )
+                else:
+                    result = await session.execute(
+                        select_next_stmt,
+                        {
+                            "cutoff": cutoff,
+                            "batch_size": self.__batch_size,
+                            "last_date": last_key[0],
+                            "last_id": last_key[1],
+                        },
+                    )
+                keys: list[tuple[datetime, UUID]] = [
+                    (date, id_) for date, id_ in result.all()
+                ]
+
+                if not keys:
+                    break
+
+                # A delete is executed by a cursor, so its result has a
+                # count of the deleted rows
+                delete_result: CursorResult = cast(
+                    "CursorResult",
+                    await session.execute(
+                        delete_stmt,
+                        {"b_ids": [id_ for _, id_ in keys]},
+                    ),
+                )
+                batch_deleted_count: int = delete_result.rowcount
+
+            elapsed: float = perf_counter() - started
+            self.__batch_count += 1
+            self.__batch_time_sum += elapsed
+            self.__batch_time_max = max(self.__batch_time_max, elapsed)
+            deleted_count += batch_deleted_count
+            logger.debug(
+                "Deleted a batch of %s rows in %.4f s",
+                batch_deleted_count,
+                elapsed,
+            )
+
+            # A short batch is a last one, so a next select is skipped
+            if len(keys) < self.__batch_size:
+                break
+
+            last_key = keys[-1]
+            await asyncio.sleep(self.__batch_pause.total_seconds())
+
+        return deleted_count
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from logging import getLogger
+from typing import TYPE_CHECKING, override
+
+from sqlalchemy import Select
+from sqlalchemy.orm import Session
+
+if TYPE_CHECKING:
+    from logging import Logger
+    from typing import Any, Self
+
+    from sqlalchemy import Connection, Engine
+    from sqlalchemy.orm import Mapper
+
+
+logger: Logger = getLogger(__name__)
+
+
+class RoutingSession(Session):
+    """
+    A DB session, which routes the plain `SELECT` statements to a
+    replica and the rest of the statements and the flushes to a
+    primary. A `SELECT` statement, which locks the rows or must see the
+    latest writes, is routed to the primary by a `bind="primary"`
+    execution option.
+
+    After a first write, the session routes all the statements to the
+    primary, so the reads, which follow the write, see its changes. A
+    session is opened per an update, so the reads go to the replica
+    again on a next update.
+
+    An async session passes its unknown arguments to a sync session, so
+    a replica is provided by an `async_sessionmaker` with a
+    `sync_session_class` argument.
+
+    :param Session: A SQLAlchemy's session.
+    :type Session: class
+    """
+
+    def __init__(
+        self: Self,
+        *args: Any,
+        replica_bind: Engine | Connection | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Creates a routing DB session.
+
+        :param replica_bind: A replica's engine, defaults to None. If
+                             None, all the statements are routed to the
+                             primary.
+        :type replica_bind: Engine | Connection | None, optional
+        """
+        super().__init__(*args, **kwargs)
+
+        self.__replica_bind: Engine | Connection | None = replica_bind
+        self.__is_written: bool = False
+
+    @override
+    def get_bind(
+        self: Self,
+        mapper: Mapper[Any] | type[Any] | None = None,
+        **kwargs: Any,
+    ) -> Engine | Connection:
+        replica_bind: Engine | Connection | None = self.__replica_bind
+
+        if replica_bind is None or self.__is_written:
+            return super().get_bind(mapper, **kwargs)
+
+        clause: Any = kwargs.get("clause")
+
+        # A flush gets a bind without a `SELECT` statement, and a read,
+        # which must see the latest writes, is marked by an option
+        if (
+            isinstance(clause, Select)
+            and clause.get_execution_options().get("bind") != "primary"
+        ):
+            logger.debug("Routing a statement to the replica...")
+            return replica_bind
+
+        logger.debug("Routing the statements of the session to the primary...")
+        self.__is_written = True
+
+        return super().get_bind(mapper, **kwargs)
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from contextvars import ContextVar
+from functools import wraps
+from logging import getLogger
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Coroutine
+    from contextvars import Token
+    from logging import Logger
+    from typing import Any, Self
+
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+logger: Logger = getLogger(__name__)
+
+# Every update is handled in its own task, and every task has its own
+# context, so the variable holds a separate DB session for every update
+current_session: ContextVar[AsyncSession | None] = ContextVar(
+    "current_session",
+    default=None,
+)
+
+
+class SessionScope:
+    """
+    A unit of work of a DB session. That is, a scope, in which one DB
+    session is shared by the handlers and the helpers during a handle of
+    one update and committed once at the end of the handle.
+    """
+
+    def __init__(
+        self: Self,
+        compiled_session: async_sessionmaker[AsyncSession],
+    ) -> None:
+        """
+        Creates a session scope.
+
+        :param compiled_session: A compiled async session.
+        :type compiled_session: async_sessionmaker[AsyncSession]
+        """
+        logger.debug("Initializing `%s`...", self.__class__.__name__)
+
+        logger.debug(
+            "Setting the arguments to the corresponding instance attributes..."
+        )
+        self.__compiled_session: async_sessionmaker[AsyncSession] = (
+            compiled_session
+        )
+        logger.debug("Set")
+
+        logger.debug("Initialized")
+
+    @property
+    def session(self: Self) -> AsyncSession:
+        """
+        Gets a DB session of a current update.
+
+        :return: A DB session of a current update.
+        :rtype: AsyncSession
+        :raises RuntimeError: The property is got outside of a session
+                              scope.
+        """
+        session: AsyncSession | None = current_session.get()
+
+        if session is None:
+            logger.critical(
+                (
+                    "A DB session is requested outside of a session scope. "
+                    "Raising a `RuntimeError` exception..."
+                ),
+            )
+            raise RuntimeError("A DB session is absent outside of a scope")
+
+        return session
+
+    async def commit(self: Self) -> None:
+        """
+        Commits a DB session of a current update before the end of a
+        scope. That is, releases the locks of the changed rows before
+        the slow calls of a handler, e.g. the calls of a Telegram API.
+
+        A next statement of the session begins a new transaction, which
+        is committed at the end of the scope.
+
+        :raises RuntimeError: The method is invoked outside of a session
+                              scope.
+        """
+        logger.debug("Committing a session scope early...")
+        await self.session.commit()
+        logger.debug("Committed")
+
+    def wrap[**P, R](
+        self: Self,
+        callback: Callable[P, Coroutine[Any, Any, R]],
+    ) -> Callable[P, Coroutine[Any, Any, R]]:
+        """
+        Wraps a handler's callback into a session scope. That is, opens
+        a DB session before the callback, commits it after the callback
+        and rolls it back, if the callback raises an exception.
+
+        If the callback is invoked inside an another session scope, then
+        the callback uses the DB session of the outer scope.
+
+        :param callback: A handler's callback.
+        :type callback: Callable[P, Coroutine[Any, Any, R]]
+        :return: A wrapped callback.
+        :rtype: Callable[P, Coroutine[Any, Any, R]]
+        """
+
+        @wraps(callback)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            if current_session.get() is not None:
+                return await callback(*args, **kwargs)
+
+            async with self.__compiled_session() as session:
+                logger.debug("Opening a session scope...")
+                token: Token[AsyncSession | None] = current_session.set(
+                    session
+                )
+                logger.debug("Opened")
+
+                try:
+                    result: R = await callback(*args, **kwargs)
+
+                    logger.debug("Committing the session scope...")
+                    await session.commit()
+                    logger.debug("Committed")
+                finally:
+                    # A not committed transaction is rolled back by
+                    # a session on a close
+                    logger.debug("Closing the session scope...")
+                    current_session.reset(token)
+                    logger.debug("Closed")
+
+            return result
+
+        return wrapper
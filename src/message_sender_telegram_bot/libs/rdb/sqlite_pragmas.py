@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from logging import getLogger
+from typing import TYPE_CHECKING
+
+from sqlalchemy import event
+
+if TYPE_CHECKING:
+    from logging import Logger
+    from typing import Any, Self
+
+    from sqlalchemy import Engine
+    from sqlalchemy.pool import ConnectionPoolEntry
+
+logger: Logger = getLogger(__name__)
+
+# The values of a `synchronous` pragma, which SQLite accepts
+SYNCHRONOUS_MODES: frozenset[str] = frozenset(
+    {"OFF", "NORMAL", "FULL", "EXTRA"}
+)
+
+
+class SQLitePragmas:
+    """
+    The pragmas of a SQLite connection. That is, switches a journal of a
+    connection to a write-ahead log and sets a `synchronous` mode, a
+    `busy_timeout` and an enforcement of the foreign keys on every new
+    connection of an engine.
+
+    In a write-ahead log, the readers don't block a writer and the
+    writer doesn't block the readers, and a commit appends to the log
+    instead of a rewrite of the DB file.
+    """
+
+    def __init__(
+        self: Self,
+        synchronous: str = "NORMAL",
+        busy_timeout: timedelta = timedelta(seconds=5),
+    ) -> None:
+        """
+        Creates the pragmas of a SQLite connection.
+
+        :param synchronous: A `synchronous` mode, defaults to "NORMAL".
+                            In the "NORMAL" mode, a write-ahead log
+                            syncs a DB file only on a checkpoint, so a
+                            power loss can roll back the last commits,
+                            but can't corrupt the DB.
+        :type synchronous: str, optional
+        :param busy_timeout: A time, during which a connection waits for
+                             a lock of an another writer, defaults to
+                             `timedelta(seconds=5)`.
+        :type busy_timeout: timedelta, optional
+        :raises ValueError: A `synchronous` mode is unknown.
+        """
+        logger.debug("Initializing `%s`...", self.__class__.__name__)
+
+        logger.debug("Checking a `synchronous` mode...")
+        synchronous = synchronous.upper()
+        if synchronous not in SYNCHRONOUS_MODES:
+            logger.critical(
+                (
+                    "A `synchronous` mode is unknown. Raising a `ValueError` "
+                    "exception..."
+                ),
+            )
+            raise ValueError("A `synchronous` mode is unknown")
+        logger.debug("Checked")
+
+        self.__synchronous: str = synchronous
+        self.__busy_timeout: timedelta = busy_timeout
+
+        logger.debug("Initialized")
+
+    def attach(self: Self, engine: Engine) -> None:
+        """
+        Listens the new connections of an engine.
+
+        An async engine opens its connections through a sync engine, so
+        the pragmas are attached to a `sync_engine` attribute of it.
+
+        :param engine: A SQLite engine.
+        :type engine: Engine
+        """
+        logger.debug("Attaching the pragmas to an engine...")
+        event.listen(engine, "connect", self.__on_connect)
+        logger.debug("Attached")
+
+    def __on_connect(
+        self: Self,
+        dbapi_connection: Any,
+        connection_record: ConnectionPoolEntry,
+    ) -> None:
+        busy_timeout: int = int(self.__busy_timeout.total_seconds() * 1000)
+
+        # A pragma can't be bound, so the checked values are formatted
+        # into the statements
+        cursor: Any = dbapi_connection.cursor()
+        try:
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute(f"PRAGMA synchronous={self.__synchronous}")
+            cursor.execute(f"PRAGMA busy_timeout={busy_timeout}")
+            cursor.execute("PRAGMA foreign_keys=ON")
+        finally:
+            cursor.close()
+        logger.debug("Set the pragmas of a new connection")
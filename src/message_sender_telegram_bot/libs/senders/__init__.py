@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+from .delivery_policy import CircuitOpenError, DeliveryPolicy
+from .email_digest_sender import EmailDigestSender
 from .email_sender import EmailSender
 
 __all__ = [
+    "CircuitOpenError",
+    "DeliveryPolicy",
+    "EmailDigestSender",
     "EmailSender",
 ]
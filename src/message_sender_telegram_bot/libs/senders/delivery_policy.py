@@ -0,0 +1,352 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from logging import getLogger
+from random import random
+from smtplib import SMTPResponseException
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from ..consts import CircuitStates
+from ..types import DeliveryPolicyStats
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+    from logging import Logger
+    from typing import Self
+
+logger: Logger = getLogger(__name__)
+
+# A first reply code of the permanent SMTP errors
+PERMANENT_ERROR_CODE: int = 500
+
+
+class CircuitOpenError(ConnectionError):
+    """
+    An error of a send, which is rejected by an open circuit without
+    reaching a SMTP server.
+
+    :param ConnectionError: A base class of the connection errors.
+    :type ConnectionError: class
+    """
+
+
+class DeliveryPolicy:
+    """
+    A policy of the sends. That is, retries a failed send with a capped
+    exponential backoff and a jitter, limits a time of every attempt and
+    short-circuits the sends by a circuit breaker, while a SMTP server
+    is down.
+
+    A circuit is opened after a number of the consecutive failed
+    attempts, so the sends fail fast instead of waiting for the timeouts
+    of a dead server. After an open duration, one trial send is let
+    through. If it succeeds, then the circuit is closed, otherwise, it's
+    opened again.
+    """
+
+    def __init__(
+        self: Self,
+        max_attempt_count: int = 3,
+        base_delay: timedelta = timedelta(seconds=1),
+        max_delay: timedelta = timedelta(seconds=30),
+        attempt_timeout: timedelta | None = timedelta(seconds=30),
+        failure_threshold: int = 5,
+        open_duration: timedelta = timedelta(seconds=60),
+        clock: Callable[[], float] = monotonic,
+        jitter: Callable[[], float] = random,
+    ) -> None:
+        """
+        Creates a policy of the sends.
+
+        :param max_attempt_count: A maximum number of the attempts of a
+                                  send, defaults to 3.
+        :type max_attempt_count: int, optional
+        :param base_delay: A delay before a first retry, defaults to 1
+                           second. The delay is doubled before every next
+                           retry.
+        :type base_delay: timedelta, optional
+        :param max_delay: A maximum delay before a retry, defaults to 30
+                          seconds.
+        :type max_delay: timedelta, optional
+        :param attempt_timeout: A maximum time of an attempt, defaults to
+                                30 seconds. If None, an attempt isn't
+                                timed out by the policy and must time out
+                                itself. E.g., an attempt in a thread
+                                can't be cancelled by a timeout.
+        :type attempt_timeout: timedelta | None, optional
+        :param failure_threshold: A number of the consecutive failed
+                                  attempts, after which a circuit is
+                                  opened, defaults to 5.
+        :type failure_threshold: int, optional
+        :param open_duration: A time, during which an open circuit
+                              rejects the sends, defaults to 60 seconds.
+        :type open_duration: timedelta, optional
+        :param clock: A function, which returns a current time in
+                      seconds, defaults to `time.monotonic`.
+        :type clock: Callable[[], float], optional
+        :param jitter: A function, which returns a random factor of a
+                       delay from 0 to 1, defaults to `random.random`.
+        :type jitter: Callable[[], float], optional
+        :raises ValueError: A maximum number of the attempts or a
+                            threshold of the failures isn't positive.
+        """
+        logger.debug("Initializing `%s`...", self.__class__.__name__)
+
+        logger.debug("Checking a maximum number of the attempts...")
+        if max_attempt_count < 1:
+            logger.critical(
+                (
+                    "A maximum number of the attempts isn't positive. "
+                    "Raising a `ValueError` exception..."
+                ),
+            )
+            raise ValueError(
+                "A maximum number of the attempts must be positive"
+            )
+        logger.debug("Checked")
+
+        logger.debug("Checking a threshold of the failures...")
+        if failure_threshold < 1:
+            logger.critical(
+                (
+                    "A threshold of the failures isn't positive. Raising a "
+                    "`ValueError` exception..."
+                ),
+            )
+            raise ValueError("A threshold of the failures must be positive")
+        logger.debug("Checked")
+
+        logger.debug(
+            "Setting the arguments to the corresponding instance attributes..."
+        )
+        self.__max_attempt_count: int = max_attempt_count
+        self.__base_delay: float = base_delay.total_seconds()
+        self.__max_delay: float = max_delay.total_seconds()
+        self.__attempt_timeout: float | None = (
+            attempt_timeout.total_seconds()
+            if attempt_timeout is not None
+            else None
+        )
+        self.__failure_threshold: int = failure_threshold
+        self.__open_duration: float = open_duration.total_seconds()
+        self.__clock: Callable[[], float] = clock
+        self.__jitter: Callable[[], float] = jitter
+        logger.debug("Set")
+
+        # A policy is used from an event loop only, so a state is changed
+        # between the awaits and isn't guarded by a lock
+        self.__state: str = CircuitStates.CLOSED
+        self.__failure_count: int = 0
+        self.__opened_at: float = 0.0
+        self.__is_trial_running: bool = False
+        self.__attempt_count: int = 0
+        self.__retry_count: int = 0
+        self.__timeout_count: int = 0
+        self.__rejected_count: int = 0
+        self.__opened_count: int = 0
+        self.__half_opened_count: int = 0
+        self.__closed_count: int = 0
+
+        logger.debug("Initialized")
+
+    async def run[T](self: Self, operation: Callable[[], Awaitable[T]]) -> T:
+        """
+        Runs a send by the policy.
+
+        A send is retried on a network error, a timeout or a temporary
+        SMTP error. A permanent SMTP error is an answer of a working
+        server, so it's raised without a retry.
+
+        :param operation: A function, which starts an attempt of a send.
+        :type operation: Callable[[], Awaitable[T]]
+        :return: A result of the send.
+        :rtype: T
+        :raises CircuitOpenError: A circuit is open, so a send is rejected
+                                  without an attempt.
+        """
+        attempt: int = 0
+        while True:
+            is_trial: bool = self.__acquire()
+            attempt += 1
+            self.__attempt_count += 1
+
+            try:
+                # A timeout of None makes `wait_for` only await an attempt
+                result: T = await asyncio.wait_for(
+                    operation(),
+                    self.__attempt_timeout,
+                )
+            except OSError as error:
+                if (
+                    isinstance(error, SMTPResponseException)
+                    and error.smtp_code >= PERMANENT_ERROR_CODE
+                ):
+                    self.__record_success()
+                    raise
+
+                if isinstance(error, TimeoutError):
+                    logger.warning("An attempt of a send is timed out")
+                    self.__timeout_count += 1
+                self.__record_failure()
+
+                # An open circuit will reject a retry anyway
+                if (
+                    attempt >= self.__max_attempt_count
+                    or self.__state == CircuitStates.OPEN
+                ):
+                    raise
+            else:
+                self.__record_success()
+                return result
+            finally:
+                if is_trial:
+                    self.__is_trial_running = False
+
+            self.__retry_count += 1
+            await asyncio.sleep(self.__get_delay(attempt))
+
+    def is_short_circuited(self: Self) -> bool:
+        """
+        Checks, if a send will be rejected by a circuit now.
+
+        :return: A short circuit flag.
+        :rtype: bool
+        """
+        if self.__state == CircuitStates.OPEN:
+            return self.__clock() - self.__opened_at < self.__open_duration
+
+        return (
+            self.__state == CircuitStates.HALF_OPEN and self.__is_trial_running
+        )
+
+    def is_recovering(self: Self) -> bool:
+        """
+        Checks, if a circuit lets only one trial send through now.
+
+        :return: A recovery flag.
+        :rtype: bool
+        """
+        if self.__state == CircuitStates.OPEN:
+            return self.__clock() - self.__opened_at >= self.__open_duration
+
+        return self.__state == CircuitStates.HALF_OPEN
+
+    def get_max_duration(
+        self: Self,
+        attempt_duration: timedelta | None = None,
+    ) -> timedelta:
+        """
+        Gets a maximum duration of a send, which is run by the policy.
+        That is, a time of all the attempts and of the longest delays
+        between them.
+
+        :param attempt_duration: A maximum duration of an attempt,
+                                 defaults to None. If None, a timeout of
+                                 an attempt is used. Must be provided, if
+                                 the attempts aren't timed out by the
+                                 policy.
+        :type attempt_duration: timedelta | None, optional
+        :return: A maximum duration of a send.
+        :rtype: timedelta
+        :raises ValueError: A maximum duration of an attempt is unknown.
+        """
+        attempt_timeout: float | None = (
+            attempt_duration.total_seconds()
+            if attempt_duration is not None
+            else self.__attempt_timeout
+        )
+
+        logger.debug("Checking a maximum duration of an attempt...")
+        if attempt_timeout is None:
+            logger.critical(
+                (
+                    "A maximum duration of an attempt is unknown. Raising a "
+                    "`ValueError` exception..."
+                ),
+            )
+            raise ValueError("A maximum duration of an attempt is unknown")
+        logger.debug("Checked")
+
+        return timedelta(
+            seconds=self.__max_attempt_count * attempt_timeout
+            + sum(
+                min(self.__max_delay, self.__base_delay * 2 ** (attempt - 1))
+                for attempt in range(1, self.__max_attempt_count)
+            )
+        )
+
+    def get_stats(self: Self) -> DeliveryPolicyStats:
+        """
+        Gets the collected metrics of a policy.
+
+        :return: The collected metrics of a policy.
+        :rtype: DeliveryPolicyStats
+        """
+        return DeliveryPolicyStats(
+            state=self.__state,
+            attempt_count=self.__attempt_count,
+            retry_count=self.__retry_count,
+            timeout_count=self.__timeout_count,
+            rejected_count=self.__rejected_count,
+            opened_count=self.__opened_count,
+            half_opened_count=self.__half_opened_count,
+            closed_count=self.__closed_count,
+        )
+
+    def __acquire(self: Self) -> bool:
+        if (
+            self.__state == CircuitStates.OPEN
+            and self.__clock() - self.__opened_at >= self.__open_duration
+        ):
+            self.__transit(CircuitStates.HALF_OPEN)
+
+        # Only one trial send checks a server, while a circuit is half
+        # open
+        if self.__state == CircuitStates.HALF_OPEN:
+            if not self.__is_trial_running:
+                self.__is_trial_running = True
+                return True
+        elif self.__state == CircuitStates.CLOSED:
+            return False
+
+        self.__rejected_count += 1
+        raise CircuitOpenError("A circuit of the sends is open")
+
+    def __record_success(self: Self) -> None:
+        self.__failure_count = 0
+        if self.__state != CircuitStates.CLOSED:
+            self.__transit(CircuitStates.CLOSED)
+
+    def __record_failure(self: Self) -> None:
+        self.__failure_count += 1
+        if self.__state == CircuitStates.HALF_OPEN or (
+            self.__state == CircuitStates.CLOSED
+            and self.__failure_count >= self.__failure_threshold
+        ):
+            self.__opened_at = self.__clock()
+            self.__transit(CircuitStates.OPEN)
+
+    def __transit(self: Self, state: str) -> None:
+        logger.warning(
+            "A circuit of the sends is changed from %s to %s",
+            self.__state,
+            state,
+        )
+        self.__state = state
+
+        if state == CircuitStates.OPEN:
+            self.__opened_count += 1
+        elif state == CircuitStates.HALF_OPEN:
+            self.__half_opened_count += 1
+        else:
+            self.__closed_count += 1
+
+    def __get_delay(self: Self, attempt: int) -> float:
+        # A full jitter spreads the retries of the concurrent sends, so
+        # they don't hit a recovering server at once
+        return (
+            min(self.__max_delay, self.__base_delay * 2 ** (attempt - 1))
+            * self.__jitter()
+        )
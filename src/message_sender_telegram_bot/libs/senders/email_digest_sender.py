@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from logging import getLogger
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from logging import Logger
+    from smtplib import SMTP
+    from typing import Self
+
+    from ..types import DigestEntry
+
+logger: Logger = getLogger(__name__)
+
+# A separator of the messages of one sender
+MESSAGE_SEPARATOR: str = "\n\n---\n\n"
+
+
+class EmailDigestSender:
+    """
+    An email digest sender. That is, sends many messages in one email,
+    in which the messages are grouped into a section of every sender.
+    """
+
+    def __init__(
+        self: Self,
+        smtp: SMTP,
+        from_addr: str,
+        to_addr: str,
+    ) -> None:
+        """
+        Creates an email digest sender.
+
+        :param smtp: An SMTP object.
+        :type smtp: SMTP
+        :param from_addr: A "From:" email address.
+        :type from_addr: str
+        :param to_addr: A "To:" email address.
+        :type to_addr: str
+        """
+        logger.debug("Initializing `%s`...", self.__class__.__name__)
+
+        logger.debug(
+            "Setting the arguments to the corresponding instance attributes..."
+        )
+        self.__smtp: SMTP = smtp
+        self.__from_addr: str = from_addr
+        self.__to_addr: str = to_addr
+        logger.debug("Set")
+
+        logger.debug("Initialized")
+
+    def send(self: Self, entries: Sequence[DigestEntry]) -> None:
+        """
+        Sends a digest of the messages.
+
+        :param entries: The messages with the names of their senders.
+                        The sections and the messages inside them keep
+                        an order of the entries.
+        :type entries: Sequence[DigestEntry]
+        :raises ValueError: The entries are absent.
+        """
+        logger.debug("Starting a send of a digest...")
+
+        logger.debug("Checking for a presence of the entries...")
+        if not entries:
+            logger.critical(
+                "The entries are absent. Raising a `ValueError` exception..."
+            )
+            raise ValueError("The entries are absent")
+        logger.debug("The entries are present")
+
+        logger.debug("Grouping the messages by the senders...")
+        texts_by_sender_name: dict[str, list[str]] = {}
+        for sender_name, text in entries:
+            texts_by_sender_name.setdefault(sender_name, []).append(text)
+        logger.debug("Grouped")
+
+        logger.debug("Composing a digest...")
+        sections: list[str] = [
+            "== {sender_name} ({count}) ==\n\n{texts}".format(
+                sender_name=sender_name,
+                count=(
+                    "1 message"
+                    if len(texts) == 1
+                    else f"{len(texts)} messages"
+                ),
+                texts=MESSAGE_SEPARATOR.join(texts),
+            )
+            for sender_name, texts in texts_by_sender_name.items()
+        ]
+        message: bytes = (
+            "Subject: A digest of {count} messages from Telegram\n\n"
+            "{sections}".format(
+                count=len(entries), sections="\n\n".join(sections)
+            ).encode()
+        )
+        logger.debug("Composed")
+
+        logger.debug("Sending a digest...")
+        _ = self.__smtp.sendmail(
+            self.__from_addr,
+            self.__to_addr,
+            message,
+        )
+        logger.debug("Sent")
@@ -1,3 +1,7 @@
+from datetime import timedelta
+from typing import Any, Self
+
+from pydantic import ValidationInfo, field_validator, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -7,12 +11,88 @@ class Settings(BaseSettings):
     )
 
     telegram_token: str
-    db_user: str
-    db_password: str
-    db_host: str
-    db_port: int
-    db_name: str
+    # A full DB URL is used instead of the DB parts, if it's provided
+    db_url: str | None = None
+    db_user: str | None = None
+    db_password: str | None = None
+    db_host: str | None = None
+    db_port: int | None = None
+    db_name: str | None = None
+    db_pool_size: int = 5
+    db_pool_max_overflow: int = 10
+    db_pool_recycle: timedelta = timedelta(hours=1)
+    db_pool_timeout: timedelta = timedelta(seconds=30)
+    db_pool_pre_ping: bool = True
+    db_replica_url: str | None = None
+    db_forbid_implicit_loads: bool = False
+    db_sqlite_synchronous: str = "NORMAL"
+    db_sqlite_busy_timeout: timedelta = timedelta(seconds=5)
+    db_slow_query_threshold: timedelta = timedelta(milliseconds=100)
+    # A size of the DB pool is used, if a concurrency isn't provided
+    update_concurrency: int | None = None
     gmail_smtp_login: str
     gmail_smtp_password: str
+    smtp_pool_size: int = 2
+    smtp_keepalive_interval: timedelta = timedelta(seconds=60)
+    email_send_concurrency: int = 2
+    email_send_timeout: timedelta = timedelta(seconds=30)
+    email_send_max_attempt_count: int = 3
+    email_send_retry_base_delay: timedelta = timedelta(seconds=1)
+    email_send_retry_max_delay: timedelta = timedelta(seconds=30)
+    smtp_circuit_failure_threshold: int = 5
+    smtp_circuit_open_duration: timedelta = timedelta(seconds=60)
+    email_outbox_poll_interval: timedelta = timedelta(seconds=1)
+    email_outbox_batch_size: int = 100
+    email_outbox_max_attempt_count: int = 5
+    email_outbox_retry_delay: timedelta = timedelta(seconds=30)
+    # The emails are sent in digests, if a window is provided
+    email_digest_window: timedelta | None = None
+    email_digest_max_count: int = 50
     email_from_addr: str
     email_to_addr: str
+    user_auth_state_cache_size: int = 1024
+    user_auth_state_cache_ttl: timedelta = timedelta(seconds=30)
+    metrics_log_interval: timedelta = timedelta(minutes=5)
+    # The sent messages are kept forever, if a retention isn't provided
+    sent_message_retention: timedelta | None = None
+    message_draft_retention: timedelta = timedelta(days=1)
+    retention_purge_interval: timedelta = timedelta(hours=1)
+    retention_batch_size: int = 1000
+    retention_batch_pause: timedelta = timedelta(milliseconds=100)
+
+    @field_validator("*", mode="before")
+    @classmethod
+    def parse_seconds(cls, value: Any, info: ValidationInfo) -> Any:
+        # A value of an environment variable is a string, and pydantic
+        # doesn't parse a duration from a number of seconds in a string
+        if (
+            not isinstance(value, str)
+            or info.field_name is None
+            or cls.model_fields[info.field_name].annotation
+            not in (timedelta, timedelta | None)
+        ):
+            return value
+
+        try:
+            return float(value)
+        except ValueError:
+            return value
+
+    @model_validator(mode="after")
+    def check_db_url_presence(self: Self) -> Self:
+        if self.db_url is not None:
+            return self
+
+        if None in (
+            self.db_user,
+            self.db_password,
+            self.db_host,
+            self.db_port,
+            self.db_name,
+        ):
+            raise ValueError(
+                "A DB URL or a DB user, password, host, port and name must "
+                "be provided"
+            )
+
+        return self
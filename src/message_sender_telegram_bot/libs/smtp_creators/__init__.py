@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 from .gmail_smtp_creator import GmailSMTPCreator
+from .smtp_connection_pool import SMTPConnectionPool
 
 __all__ = [
     "GmailSMTPCreator",
+    "SMTPConnectionPool",
 ]
@@ -8,6 +8,7 @@ from ..consts import GmailSMTPServer
 from ..interfaces import SMTPCreator
 
 if TYPE_CHECKING:
+    from datetime import timedelta
     from logging import Logger
     from smtplib import SMTP
     from typing import Self
@@ -23,7 +24,12 @@ class GmailSMTPCreator(SMTPCreator):
     :type SMTPCreator: class
     """
 
-    def __init__(self: Self, login: str, password: str) -> None:
+    def __init__(
+        self: Self,
+        login: str,
+        password: str,
+        timeout: timedelta | None = None,
+    ) -> None:
         """
         Creates a gmail SMTP creator.
 
@@ -32,6 +38,10 @@ class GmailSMTPCreator(SMTPCreator):
         :param password: An app password that represents a SMTP password
                          for gmail.
         :type password: str
+        :param timeout: A timeout of a connection and of every command of
+                        a SMTP instance, defaults to None. If it's absent,
+                        a default timeout of the sockets is used.
+        :type timeout: timedelta | None, optional
         """
         logger.debug("Initializing `%s`...", self.__class__.__name__)
         self.__smtp: SMTP | None = None
@@ -41,6 +51,9 @@ class GmailSMTPCreator(SMTPCreator):
         )
         self.__login: str = login
         self.__password: str = password
+        self.__timeout: float | None = (
+            timeout.total_seconds() if timeout is not None else None
+        )
         logger.debug("Set")
 
         logger.debug("Initialized")
@@ -63,10 +76,19 @@ class GmailSMTPCreator(SMTPCreator):
         logger.debug("Starting a creation of a SMTP instance...")
 
         logger.debug("Creating a SMTP instance...")
-        self.__smtp: SMTP_SSL = SMTP_SSL(
-            host=GmailSMTPServer.HOST,
-            port=GmailSMTPServer.PORT,
-        )
+        # An absent timeout isn't passed, so a default timeout of the
+        # sockets is used
+        if self.__timeout is None:
+            self.__smtp: SMTP_SSL = SMTP_SSL(
+                host=GmailSMTPServer.HOST,
+                port=GmailSMTPServer.PORT,
+            )
+        else:
+            self.__smtp = SMTP_SSL(
+                host=GmailSMTPServer.HOST,
+                port=GmailSMTPServer.PORT,
+                timeout=self.__timeout,
+            )
         logger.debug("Created")
 
         logger.debug("Logging in to the gmail SMTP server...")
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+from collections import deque
+from datetime import timedelta
+from logging import getLogger
+from smtplib import SMTPException, SMTPServerDisconnected
+from threading import BoundedSemaphore, Lock
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from ..types import SMTPPoolStats
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from logging import Logger
+    from smtplib import SMTP
+    from typing import Self
+
+    from ..interfaces import SMTPCreator
+
+logger: Logger = getLogger(__name__)
+
+# A reply code of a successful `NOOP` command
+NOOP_OK_CODE: int = 250
+
+
+class SMTPConnectionPool:
+    """
+    A pool of the logged in SMTP connections. That is, keeps the
+    connections of a SMTP creator open between the sends, so a
+    consecutive send reuses an authenticated session instead of a new
+    TCP and TLS handshake and a login.
+
+    A number of the connections is bounded, so a burst of the sends
+    waits for a free connection instead of exceeding the limits of a
+    SMTP server. The pool is thread-safe, so the connections can be used
+    by the sends in the threads of an executor.
+    """
+
+    def __init__(
+        self: Self,
+        smtp_creator: SMTPCreator,
+        max_size: int = 2,
+        keepalive_interval: timedelta = timedelta(seconds=60),
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        """
+        Creates a pool of the SMTP connections.
+
+        :param smtp_creator: A SMTP creator, which opens and logs in the
+                             new connections.
+        :type smtp_creator: SMTPCreator
+        :param max_size: A maximum number of the open connections,
+                         defaults to 2.
+        :type max_size: int, optional
+        :param keepalive_interval: A time, after which an idle
+                                   connection is checked by a `NOOP`
+                                   command, defaults to 60 seconds. The
+                                   SMTP servers close the idle
+                                   connections after a few minutes.
+        :type keepalive_interval: timedelta, optional
+        :param clock: A function, which returns a current time in
+                      seconds, defaults to `time.monotonic`.
+        :type clock: Callable[[], float], optional
+        :raises ValueError: A maximum size is less than one.
+        """
+        logger.debug("Initializing `%s`...", self.__class__.__name__)
+
+        logger.debug("Checking a maximum size...")
+        if max_size < 1:
+            logger.critical(
+                (
+                    "A maximum size is less than one. Raising a `ValueError` "
+                    "exception..."
+                ),
+            )
+            raise ValueError("A maximum size must be at least one")
+        logger.debug("Checked")
+
+        logger.debug(
+            "Setting the arguments to the corresponding instance attributes..."
+        )
+        self.__smtp_creator: SMTPCreator = smtp_creator
+        self.__keepalive_interval: float = keepalive_interval.total_seconds()
+        self.__clock: Callable[[], float] = clock
+        logger.debug("Set")
+
+        # A semaphore bounds a number of the open connections, and a lock
+        # guards a queue of the idle ones
+        self.__semaphore: BoundedSemaphore = BoundedSemaphore(max_size)
+        self.__lock: Lock = Lock()
+        # An idle connection with a time of its last use. A most recently
+        # used connection is taken first, so the extra connections of a
+        # burst stay idle and are closed by a server
+        self.__idle: deque[tuple[SMTP, float]] = deque()
+        self.__open_count: int = 0
+        self.__created_count: int = 0
+        self.__reuse_count: int = 0
+        self.__reconnect_count: int = 0
+
+        logger.debug("Initialized")
+
+    def run[T](self: Self, operation: Callable[[SMTP], T]) -> T:
+        """
+        Runs an operation with a pooled connection.
+
+        If a reused connection is closed by a server, then the operation
+        is run again with a new connection once. A connection, on which
+        the operation fails, is closed, because its session can be left
+        in the middle of a mail transaction.
+
+        :param operation: An operation, which uses a SMTP connection.
+        :type operation: Callable[[SMTP], T]
+        :return: A result of the operation.
+        :rtype: T
+        """
+        with self.__semaphore:
+            smtp, is_reused = self.__checkout()
+
+            try:
+                result: T = operation(smtp)
+            except SMTPServerDisconnected:
+                self.__close(smtp)
+
+                if not is_reused:
+                    raise
+
+                logger.info(
+                    "A pooled SMTP connection is closed. Reconnecting..."
+                )
+                with self.__lock:
+                    self.__reconnect_count += 1
+                smtp = self.__create()
+
+                try:
+                    result = operation(smtp)
+                except BaseException:
+                    self.__close(smtp)
+                    raise
+            except BaseException:
+                self.__close(smtp)
+                raise
+
+            with self.__lock:
+                self.__idle.append((smtp, self.__clock()))
+
+        return result
+
+    def keep_alive(self: Self) -> None:
+        """
+        Checks the idle connections, which weren't used during a
+        keepalive interval, by a `NOOP` command and closes the dead
+        ones. So, a server doesn't close an idle connection and a send
+        doesn't wait for a reconnect.
+
+        A checked connection is out of a queue of the idle ones, so it
+        holds a slot of the pool like a send. Otherwise, a concurrent
+        send doesn't find it and opens an extra connection. If all the
+        slots are taken, then the connections are used and the check
+        stops.
+        """
+        logger.debug("Keeping the idle SMTP connections alive...")
+
+        with self.__lock:
+            idle_count: int = len(self.__idle)
+
+        alive_count: int = 0
+        # A checked connection is returned as a most recently used one,
+        # so it can be taken again only after the other idle ones
+        for _ in range(idle_count):
+            if not self.__semaphore.acquire(blocking=False):
+                logger.debug("All the SMTP connections are used")
+                break
+
+            try:
+                with self.__lock:
+                    # The idle connections are ordered by a time of their
+                    # last use, so a least recently used one is checked
+                    # first
+                    if (
+                        not self.__idle
+                        or self.__clock() - self.__idle[0][1]
+                        < self.__keepalive_interval
+                    ):
+                        break
+                    smtp, _ = self.__idle.popleft()
+
+                if not self.__is_alive(smtp):
+                    self.__close(smtp)
+                    continue
+
+                with self.__lock:
+                    self.__idle.append((smtp, self.__clock()))
+                alive_count += 1
+            finally:
+                self.__semaphore.release()
+
+        logger.debug("Kept %s connections alive", alive_count)
+
+    def close(self: Self) -> None:
+        """
+        Closes the idle connections.
+        """
+        logger.debug("Closing the idle SMTP connections...")
+
+        with self.__lock:
+            idle: list[tuple[SMTP, float]] = list(self.__idle)
+            self.__idle.clear()
+
+        for smtp, _ in idle:
+            self.__close(smtp, is_quitting=True)
+
+        logger.debug("Closed")
+
+    def get_stats(self: Self) -> SMTPPoolStats:
+        """
+        Gets the collected metrics of a pool.
+
+        :return: The collected metrics of a pool.
+        :rtype: SMTPPoolStats
+        """
+        with self.__lock:
+            return SMTPPoolStats(
+                open_count=self.__open_count,
+                created_count=self.__created_count,
+                reuse_count=self.__reuse_count,
+                reconnect_count=self.__reconnect_count,
+            )
+
+    def __checkout(self: Self) -> tuple[SMTP, bool]:
+        while True:
+            with self.__lock:
+                if not self.__idle:
+                    break
+                smtp, last_used = self.__idle.pop()
+
+            # A connection, which was idle for long, can be closed by a
+            # server, so it's checked before a use
+            if (
+                self.__clock() - last_used < self.__keepalive_interval
+                or self.__is_alive(smtp)
+            ):
+                with self.__lock:
+                    self.__reuse_count += 1
+                return smtp, True
+
+            self.__close(smtp)
+
+        return self.__create(), False
+
+    def __create(self: Self) -> SMTP:
+        logger.debug("Opening a new SMTP connection...")
+        smtp: SMTP = self.__smtp_creator.create()
+        logger.debug("Opened")
+
+        with self.__lock:
+            self.__open_count += 1
+            self.__created_count += 1
+
+        return smtp
+
+    def __is_alive(self: Self, smtp: SMTP) -> bool:
+        try:
+            code, _ = smtp.noop()
+        except SMTPException, OSError:
+            return False
+
+        return code == NOOP_OK_CODE
+
+    def __close(self: Self, smtp: SMTP, is_quitting: bool = False) -> None:
+        with self.__lock:
+            self.__open_count -= 1
+
+        # A dead connection can't answer a `QUIT` command, so it's only
+        # closed
+        try:
+            if is_quitting:
+                smtp.quit()
+            else:
+                smtp.close()
+        except SMTPException, OSError:
+            logger.debug("A SMTP connection is closed with an error")
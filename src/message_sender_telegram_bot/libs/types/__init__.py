@@ -1,9 +1,27 @@
 from __future__ import annotations
 
 from .cooldown_check_result import CooldownCheckResult
+from .delivery_policy_stats import DeliveryPolicyStats
+from .digest_entry import DigestEntry
+from .email_outbox_stats import EmailOutboxStats
+from .handler_query_stats import HandlerQueryStats
+from .message_state import MessageState
+from .pool_stats import PoolStats
+from .retention_stats import RetentionStats
+from .smtp_pool_stats import SMTPPoolStats
 from .token import Token
+from .user_auth_state import UserAuthState
 
 __all__ = [
     "CooldownCheckResult",
+    "DeliveryPolicyStats",
+    "DigestEntry",
+    "EmailOutboxStats",
+    "HandlerQueryStats",
+    "MessageState",
+    "PoolStats",
+    "RetentionStats",
+    "SMTPPoolStats",
     "Token",
+    "UserAuthState",
 ]
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from typing import NamedTuple
+
+
+class DeliveryPolicyStats(NamedTuple):
+    state: str
+    attempt_count: int
+    retry_count: int
+    timeout_count: int
+    rejected_count: int
+    opened_count: int
+    half_opened_count: int
+    closed_count: int
@@ -0,0 +1,8 @@
+from __future__ import annotations
+
+from typing import NamedTuple
+
+
+class DigestEntry(NamedTuple):
+    sender_name: str
+    text: str
@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+from typing import NamedTuple
+
+
+class EmailOutboxStats(NamedTuple):
+    delivered_count: int
+    digest_count: int
+    failed_attempt_count: int
+    abandoned_count: int
@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+from typing import NamedTuple
+
+
+class HandlerQueryStats(NamedTuple):
+    update_count: int
+    query_count: int
+    query_time: float
+    query_count_max: int
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from uuid import UUID
+
+
+class MessageState(NamedTuple):
+    id_: UUID
+    message_id: int
+    sender_id: UUID
+    text: str
+    is_sent: bool
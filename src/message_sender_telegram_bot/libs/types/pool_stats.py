@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from typing import NamedTuple
+
+
+class PoolStats(NamedTuple):
+    checkout_count: int
+    checkout_wait_avg: float
+    checkout_wait_max: float
+    in_use: int
+    in_use_max: int
+    overflow_count: int
@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from typing import NamedTuple
+
+
+class RetentionStats(NamedTuple):
+    batch_count: int
+    deleted_message_count: int
+    deleted_draft_count: int
+    batch_time_avg: float
+    batch_time_max: float
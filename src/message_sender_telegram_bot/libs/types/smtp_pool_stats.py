@@ -0,0 +1,10 @@
+from __future__ import annotations
+
+from typing import NamedTuple
+
+
+class SMTPPoolStats(NamedTuple):
+    open_count: int
+    created_count: int
+    reuse_count: int
+    reconnect_count: int
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from datetime import datetime
+    from uuid import UUID
+
+
+class UserAuthState(NamedTuple):
+    id_: UUID
+    is_authorizing: bool
+    has_token: bool
+    is_owner: bool
+    last_send_date: datetime | None
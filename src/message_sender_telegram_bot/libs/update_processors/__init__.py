@@ -0,0 +1,7 @@
+from __future__ import annotations
+
+from .user_update_processor import UserUpdateProcessor
+
+__all__ = [
+    "UserUpdateProcessor",
+]
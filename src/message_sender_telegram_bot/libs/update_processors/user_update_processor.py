@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+from logging import getLogger
+from typing import TYPE_CHECKING, override
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable
+    from logging import Logger
+    from typing import Any, Self
+
+logger: Logger = getLogger(__name__)
+
+
+class UserUpdateProcessor(BaseUpdateProcessor):
+    """
+    An update processor, which processes the updates of the different
+    users concurrently and the updates of one user one by one in their
+    order.
+
+    The handlers of a user read a DB user and then change it, so the
+    concurrent updates of one user, e.g. two `start` commands, could
+    pass the same checks. An update without a user is processed without
+    a wait.
+
+    :param BaseUpdateProcessor: A base class of the update processors.
+    :type BaseUpdateProcessor: class
+    """
+
+    def __init__(self: Self, max_concurrent_updates: int) -> None:
+        """
+        Creates a user update processor.
+
+        :param max_concurrent_updates: A maximum number of the updates,
+                                       which are processed concurrently.
+                                       An update, which waits for an
+                                       another update of its user, is
+                                       counted too.
+        :type max_concurrent_updates: int
+        :raises ValueError: A maximum number of the concurrent updates
+                            isn't positive.
+        """
+        logger.debug("Initializing `%s`...", self.__class__.__name__)
+
+        super().__init__(max_concurrent_updates)
+
+        # A lock of a user is kept, only while the user has the updates,
+        # so a number of the locks doesn't grow with a number of the
+        # users
+        self.__user_locks: dict[int, asyncio.Lock] = {}
+        self.__user_update_counts: dict[int, int] = {}
+
+        logger.debug("Initialized")
+
+    @override
+    async def do_process_update(
+        self: Self,
+        update: object,
+        coroutine: Awaitable[Any],
+    ) -> None:
+        """
+        Processes an update after the previous updates of its user.
+
+        :param update: An update.
+        :type update: object
+        :param coroutine: A coroutine, which processes the update.
+        :type coroutine: Awaitable[Any]
+        """
+        if not isinstance(update, Update) or update.effective_user is None:
+            await coroutine
+
+            return None
+
+        user_id: int = update.effective_user.id
+        user_lock: asyncio.Lock = self.__user_locks.setdefault(
+            user_id,
+            asyncio.Lock(),
+        )
+        self.__user_update_counts[user_id] = (
+            self.__user_update_counts.get(user_id, 0) + 1
+        )
+
+        try:
+            async with user_lock:
+                await coroutine
+        finally:
+            self.__user_update_counts[user_id] -= 1
+            if not self.__user_update_counts[user_id]:
+                del self.__user_update_counts[user_id]
+                del self.__user_locks[user_id]
+
+        return None
+
+    @override
+    async def initialize(self: Self) -> None:
+        # The locks are created on demand, so nothing is allocated
+        return None
+
+    @override
+    async def shutdown(self: Self) -> None:
+        # An application finishes the updates before a shutdown, so no
+        # lock is held
+        return None
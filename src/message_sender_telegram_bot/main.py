@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import asyncio
 import re
+from math import ceil
+from concurrent.futures import ThreadPoolExecutor
 from logging import INFO, StreamHandler, getLogger
 from typing import TYPE_CHECKING
 from urllib.parse import SplitResult
 
-from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from telegram.ext import (
     ApplicationBuilder,
@@ -19,23 +22,74 @@ from telegram.ext import (
 # work, so the program will use relative imports, if the bot is run from
 # a package and will use absolute imports otherwise
 if __package__ is not None:
-    from .libs import Handlers, Helpers, Settings
+    from .libs import (
+        DeliveryPolicy,
+        EmailOutboxWorker,
+        GmailSMTPCreator,
+        Handlers,
+        Helpers,
+        LazyLoadGuard,
+        PoolTelemetry,
+        QueryTelemetry,
+        RetentionPurger,
+        RoutingSession,
+        SessionScope,
+        Settings,
+        SMTPConnectionPool,
+        SQLitePragmas,
+        TelemetryAsyncAdaptedQueuePool,
+        UserAuthStateCache,
+        UserUpdateProcessor,
+    )
     from .libs.consts import Commands
+    from .libs.types import (
+        DeliveryPolicyStats,
+        EmailOutboxStats,
+        HandlerQueryStats,
+        PoolStats,
+        RetentionStats,
+        SMTPPoolStats,
+    )
 else:
     from pathlib import Path
 
     from libs import (  # type: ignore[unresolved-import]
+        DeliveryPolicy,
+        EmailOutboxWorker,
+        GmailSMTPCreator,
         Handlers,
         Helpers,
+        LazyLoadGuard,
+        PoolTelemetry,
+        QueryTelemetry,
+        RetentionPurger,
+        RoutingSession,
+        SessionScope,
         Settings,
+        SMTPConnectionPool,
+        SQLitePragmas,
+        TelemetryAsyncAdaptedQueuePool,
+        UserAuthStateCache,
+        UserUpdateProcessor,
     )
     from libs.consts import Commands  # type: ignore[unresolved-import]
+    from libs.types import (  # type: ignore[unresolved-import]
+        DeliveryPolicyStats,
+        EmailOutboxStats,
+        HandlerQueryStats,
+        PoolStats,
+        RetentionStats,
+        SMTPPoolStats,
+    )
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Coroutine
     from logging import Logger
+    from typing import Any
 
-    from sqlalchemy import Engine
-    from sqlalchemy.orm import Session
+    from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+    from telegram import Update
+    from telegram.ext import ContextTypes
 
 # If the bot is run from the `main.py` file, then `__package__` will be
 # `None`. Also, `__name__` contains `__main__` and, therefore, it won't
@@ -61,65 +115,412 @@ logger.setLevel(INFO)
 # suppressed
 settings = Settings()  # type: ignore[missing-argument]
 
-db_url = SplitResult(
-    "mysql+pymysql",
-    (
-        f"{settings.db_user}:{settings.db_password}@"
-        f"{settings.db_host}:{settings.db_port}"
+# A full DB URL allows to use an another backend, e.g. a SQLite file for
+# a single-node deployment or a benchmark. Otherwise, a MySQL URL is
+# built from the DB parts
+db_url: str = (
+    settings.db_url
+    if settings.db_url is not None
+    else SplitResult(
+        "mysql+aiomysql",
+        (
+            f"{settings.db_user}:{settings.db_password}@"
+            f"{settings.db_host}:{settings.db_port}"
+        ),
+        settings.db_name or "",
+        "",
+        "",
+    ).geturl()
+)
+
+# The statements of every engine are counted per an update and a
+# handler, and the slow ones are logged
+query_telemetry: QueryTelemetry = QueryTelemetry(
+    settings.db_slow_query_threshold
+)
+
+sqlite_pragmas: SQLitePragmas = SQLitePragmas(
+    settings.db_sqlite_synchronous,
+    settings.db_sqlite_busy_timeout,
+)
+
+
+def create_database_engine(url: str, telemetry: PoolTelemetry) -> AsyncEngine:
+    # A pool reports a checkout wait time, a number of the connections
+    # in use and the overflows to the telemetry through the pool events
+    database_engine: AsyncEngine = create_async_engine(
+        url,
+        poolclass=TelemetryAsyncAdaptedQueuePool,
+        telemetry=telemetry,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_pool_max_overflow,
+        pool_recycle=int(settings.db_pool_recycle.total_seconds()),
+        pool_timeout=settings.db_pool_timeout.total_seconds(),
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+
+    query_telemetry.attach(database_engine.sync_engine)
+
+    # A SQLite connection is switched to a write-ahead log, so the
+    # lookups of the concurrent updates don't wait for a write
+    if database_engine.dialect.name == "sqlite":
+        sqlite_pragmas.attach(database_engine.sync_engine)
+
+    return database_engine
+
+
+pool_telemetries: dict[str, PoolTelemetry] = {"primary": PoolTelemetry()}
+database_engine: AsyncEngine = create_database_engine(
+    db_url,
+    pool_telemetries["primary"],
+)
+
+# The plain `SELECT` statements are routed to a replica, if it's
+# provided, until a first write of a session
+replica_database_engine: AsyncEngine | None = None
+if settings.db_replica_url is not None:
+    pool_telemetries["replica"] = PoolTelemetry()
+    replica_database_engine = create_database_engine(
+        settings.db_replica_url,
+        pool_telemetries["replica"],
+    )
+# An async session can't load a relationship or an expired attribute
+# implicitly, so such loads are counted and, if it's configured, are
+# forbidden with a clear error. An async session executes its statements
+# through a sync session, so the guard listens a sync session maker
+lazy_load_guard: LazyLoadGuard = LazyLoadGuard(
+    settings.db_forbid_implicit_loads
+)
+sync_compiled_session: sessionmaker[RoutingSession] = sessionmaker(
+    class_=RoutingSession,
+)
+lazy_load_guard.attach(sync_compiled_session)
+# A session is committed once at the end of a handle of an update, so
+# its objects mustn't be expired after the commit. Otherwise, an access
+# to an attribute will emit a refresh query, which can't be done
+# implicitly in an async session
+compiled_session: async_sessionmaker[AsyncSession] = async_sessionmaker(
+    database_engine,
+    expire_on_commit=False,
+    sync_session_class=sync_compiled_session,  # type: ignore[invalid-argument-type]
+    replica_bind=(
+        replica_database_engine.sync_engine
+        if replica_database_engine is not None
+        else None
     ),
-    settings.db_name,
-    "",
-    "",
-).geturl()
+)
+
+# Every handler, which uses a DB, shares one DB session per an update
+session_scope: SessionScope = SessionScope(compiled_session)
 
-database_engine: Engine = create_engine(db_url, pool_pre_ping=True)
-compiled_session: sessionmaker[Session] = sessionmaker(database_engine)
+# An authorization state of a user is read on every message, so it's
+# cached in front of a DB and is invalidated on a change of a DB user
+user_auth_state_cache: UserAuthStateCache = UserAuthStateCache(
+    settings.user_auth_state_cache_size,
+    settings.user_auth_state_cache_ttl,
+)
+
+# The logged in SMTP connections are kept open between the sends, so
+# a send doesn't open a new TLS session and log in every time
+smtp_pool: SMTPConnectionPool = SMTPConnectionPool(
+    # A connection to a stalled SMTP server is timed out, so it doesn't
+    # hold a thread of a send forever
+    GmailSMTPCreator(
+        settings.gmail_smtp_login,
+        settings.gmail_smtp_password,
+        settings.email_send_timeout,
+    ),
+    settings.smtp_pool_size,
+    settings.smtp_keepalive_interval,
+)
+
+# The emails are sent in the threads, so a slow SMTP server doesn't stop
+# a handling of the other updates
+email_executor: ThreadPoolExecutor = ThreadPoolExecutor(
+    max_workers=settings.email_send_concurrency,
+    thread_name_prefix="email-sender",
+)
+
+# A failed send is retried with a backoff, and the sends fail fast, while
+# a SMTP server is down. A send in a thread can't be cancelled, so it's
+# timed out by a timeout of a SMTP connection instead of the policy. The
+# timeout starts, when a thread takes a send, and a timed out send ends
+# before a retry
+delivery_policy: DeliveryPolicy = DeliveryPolicy(
+    settings.email_send_max_attempt_count,
+    settings.email_send_retry_base_delay,
+    settings.email_send_retry_max_delay,
+    None,
+    settings.smtp_circuit_failure_threshold,
+    settings.smtp_circuit_open_duration,
+)
 
 helpers = Helpers(
-    settings.gmail_smtp_login,
-    settings.gmail_smtp_password,
+    smtp_pool,
+    email_executor,
     settings.email_from_addr,
     settings.email_to_addr,
+    session_scope,
+    user_auth_state_cache,
+    # An urgency is offered, only if the emails wait for a digest
+    is_urgency_offered=settings.email_digest_window is not None,
+    delivery_policy=delivery_policy,
+)
+handlers = Handlers(session_scope, helpers, user_auth_state_cache)
+
+
+def wrap[R](
+    callback: Callable[
+        [Update, ContextTypes.DEFAULT_TYPE], Coroutine[Any, Any, R]
+    ],
+) -> Callable[[Update, ContextTypes.DEFAULT_TYPE], Coroutine[Any, Any, R]]:
+    # A query scope is outside of a session scope, so the statements of
+    # a commit are counted too
+    return query_telemetry.wrap(session_scope.wrap(callback))
+
+
+# A confirmation only enqueues an email, and the worker sends it later
+email_outbox_worker: EmailOutboxWorker = EmailOutboxWorker(
+    compiled_session,
+    helpers.send_email,
+    settings.email_outbox_batch_size,
+    settings.email_outbox_max_attempt_count,
+    settings.email_outbox_retry_delay,
+    send_email_digest=helpers.send_email_digest,
+    digest_window=settings.email_digest_window,
+    digest_max_count=settings.email_digest_max_count,
+    # A claimed delivery isn't claimed again, till the sends of a batch
+    # with all the retries could end. The sends of a batch wait for the
+    # threads and the connections in turn
+    lease=delivery_policy.get_max_duration(settings.email_send_timeout)
+    * ceil(
+        settings.email_outbox_batch_size
+        / min(settings.email_send_concurrency, settings.smtp_pool_size)
+    ),
+    delivery_policy=delivery_policy,
+)
+
+# The abandoned drafts and, if their retention is set, the sent messages
+# are deleted after their retention, so a size of the tables and a time
+# of a backup stay flat
+retention_purger: RetentionPurger = RetentionPurger(
     compiled_session,
+    settings.sent_message_retention,
+    settings.message_draft_retention,
+    settings.retention_batch_size,
+    settings.retention_batch_pause,
 )
-handlers = Handlers(compiled_session, helpers)
+
+
+def log_metrics() -> None:
+    for name, pool_telemetry in pool_telemetries.items():
+        pool_stats: PoolStats = pool_telemetry.get_stats()
+        logger.info(
+            (
+                "A %s DB pool: %s checkouts, %.4f s average wait, %.4f s "
+                "maximum wait, %s in use, %s maximum in use, %s overflows"
+            ),
+            name,
+            pool_stats.checkout_count,
+            pool_stats.checkout_wait_avg,
+            pool_stats.checkout_wait_max,
+            pool_stats.in_use,
+            pool_stats.in_use_max,
+            pool_stats.overflow_count,
+        )
+    logger.info(
+        "A DB session: %s implicit loads, %s slow queries",
+        lazy_load_guard.get_implicit_load_count(),
+        query_telemetry.get_slow_query_count(),
+    )
+    handler_stats: dict[str, HandlerQueryStats] = (
+        query_telemetry.get_handler_stats()
+    )
+    for handler_name, handler_query_stats in handler_stats.items():
+        logger.info(
+            (
+                "A `%s` handler: %s updates, %s queries, %.4f s of queries, "
+                "%s maximum queries per update"
+            ),
+            handler_name,
+            handler_query_stats.update_count,
+            handler_query_stats.query_count,
+            handler_query_stats.query_time,
+            handler_query_stats.query_count_max,
+        )
+    logger.info(
+        "A user auth state cache: %s hits, %s misses",
+        user_auth_state_cache.get_hit_count(),
+        user_auth_state_cache.get_miss_count(),
+    )
+    smtp_pool_stats: SMTPPoolStats = smtp_pool.get_stats()
+    logger.info(
+        (
+            "A SMTP pool: %s open connections, %s created, %s reused, "
+            "%s reconnects"
+        ),
+        smtp_pool_stats.open_count,
+        smtp_pool_stats.created_count,
+        smtp_pool_stats.reuse_count,
+        smtp_pool_stats.reconnect_count,
+    )
+    delivery_policy_stats: DeliveryPolicyStats = delivery_policy.get_stats()
+    logger.info(
+        (
+            "A SMTP circuit: %s, %s attempts, %s retries, %s timeouts, %s "
+            "rejected sends, %s opens, %s half opens, %s closes"
+        ),
+        delivery_policy_stats.state,
+        delivery_policy_stats.attempt_count,
+        delivery_policy_stats.retry_count,
+        delivery_policy_stats.timeout_count,
+        delivery_policy_stats.rejected_count,
+        delivery_policy_stats.opened_count,
+        delivery_policy_stats.half_opened_count,
+        delivery_policy_stats.closed_count,
+    )
+    email_outbox_stats: EmailOutboxStats = email_outbox_worker.get_stats()
+    logger.info(
+        (
+            "An email outbox: %s messages delivered, %s digests sent, %s "
+            "attempts failed, %s deliveries abandoned"
+        ),
+        email_outbox_stats.delivered_count,
+        email_outbox_stats.digest_count,
+        email_outbox_stats.failed_attempt_count,
+        email_outbox_stats.abandoned_count,
+    )
+    retention_stats: RetentionStats = retention_purger.get_stats()
+    logger.info(
+        (
+            "A retention purge: %s batches, %s messages deleted, %s drafts "
+            "deleted, %.4f s average batch time, %.4f s maximum batch time"
+        ),
+        retention_stats.batch_count,
+        retention_stats.deleted_message_count,
+        retention_stats.deleted_draft_count,
+        retention_stats.batch_time_avg,
+        retention_stats.batch_time_max,
+    )
+
+
+async def log_metrics_periodically() -> None:
+    while True:
+        await asyncio.sleep(settings.metrics_log_interval.total_seconds())
+        log_metrics()
+
+
+async def deliver_emails_periodically() -> None:
+    while True:
+        try:
+            await email_outbox_worker.deliver()
+        except Exception:
+            logger.exception("A delivery of the emails failed")
+        await asyncio.sleep(
+            settings.email_outbox_poll_interval.total_seconds()
+        )
+
+
+async def purge_periodically() -> None:
+    while True:
+        # A failed purge is retried on a next run, so an error doesn't
+        # stop the next purges
+        try:
+            await retention_purger.purge()
+        except Exception:
+            logger.exception("A retention purge failed")
+        await asyncio.sleep(settings.retention_purge_interval.total_seconds())
+
+
+async def keep_smtp_alive_periodically() -> None:
+    while True:
+        await asyncio.sleep(settings.smtp_keepalive_interval.total_seconds())
+        # A `NOOP` command blocks on a network, so it's sent from a
+        # thread
+        try:
+            await asyncio.to_thread(smtp_pool.keep_alive)
+        except Exception:
+            logger.exception("A keepalive of the SMTP connections failed")
+
+
+background_tasks: set[asyncio.Task[None]] = set()
 
 
 async def post_init(_) -> None:
+    background_tasks.add(asyncio.create_task(log_metrics_periodically()))
+    background_tasks.add(asyncio.create_task(deliver_emails_periodically()))
+    background_tasks.add(asyncio.create_task(purge_periodically()))
+    background_tasks.add(asyncio.create_task(keep_smtp_alive_periodically()))
     logger.info("Started")
 
 
+async def post_shutdown(_) -> None:
+    for task in background_tasks:
+        task.cancel()
+    # The started sends are finished before their connections are closed
+    await asyncio.to_thread(email_executor.shutdown)
+    await asyncio.to_thread(smtp_pool.close)
+    await database_engine.dispose()
+    if replica_database_engine is not None:
+        await replica_database_engine.dispose()
+    log_metrics()
+    logger.info("Stopped")
+
+
 # Creating an app and adding handlers
 app = (
     ApplicationBuilder()
     .token(settings.telegram_token)
     .post_init(post_init)
+    .post_shutdown(post_shutdown)
+    # The updates of the different users are handled concurrently, so a
+    # slow query of one chat doesn't stall the others. An update holds
+    # one DB connection, so a number of the concurrent updates is sized
+    # to the DB pool by default
+    .concurrent_updates(
+        UserUpdateProcessor(
+            settings.update_concurrency
+            if settings.update_concurrency is not None
+            else settings.db_pool_size
+        )
+    )
     .build()
 )
 
-start_command_handler = CommandHandler(Commands.START, handlers.start)
+start_command_handler = CommandHandler(
+    Commands.START,
+    wrap(handlers.start),
+)
 admin_command_handler = CommandHandler(
     Commands.ADMIN,
-    handlers.show_admin_panel,
+    wrap(handlers.show_admin_panel),
+)
+cancel_command_handler = CommandHandler(
+    Commands.CANCEL,
+    wrap(handlers.cancel),
 )
-cancel_command_handler = CommandHandler(Commands.CANCEL, handlers.cancel)
 unknown_command_handler = MessageHandler(
     filters.COMMAND,
     handlers.notify_about_unknown_command,
 )
 token_generation_request_handler = CallbackQueryHandler(
-    handlers.generate_token,
+    wrap(handlers.generate_token),
     re.compile(r"^generate_token$"),
 )
+# A send only enqueues an email, and a worker delivers it in the
+# background
 send_message_handler = CallbackQueryHandler(
-    handlers.send,
-    re.compile(r"^message_confirmation,true,[0-9]{0,19}$"),
+    wrap(handlers.send),
+    re.compile(r"^message_confirmation,(true|urgent),[0-9]{0,19}$"),
 )
 cancel_message_handler = CallbackQueryHandler(
-    handlers.cancel,
+    wrap(handlers.cancel),
     re.compile(r"^message_confirmation,false,[0-9]{0,19}$"),
 )
-message_handler = MessageHandler(filters.TEXT, handlers.handle_message)
+message_handler = MessageHandler(
+    filters.TEXT,
+    wrap(handlers.handle_message),
+)
 
 app.add_handler(start_command_handler)
 app.add_handler(admin_command_handler)
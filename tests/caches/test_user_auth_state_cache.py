@@ -0,0 +1,113 @@
+from datetime import timedelta
+from uuid import UUID
+
+from pytest import fixture, raises
+
+from message_sender_telegram_bot.libs import UserAuthStateCache
+from message_sender_telegram_bot.libs.types import UserAuthState
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@fixture
+def auth_state() -> UserAuthState:
+    return UserAuthState(
+        UUID("2050c8a2-2dd3-4801-a56f-bc6cf7d5e59e"),
+        is_authorizing=False,
+        has_token=True,
+        is_owner=False,
+        last_send_date=None,
+    )
+
+
+@fixture
+def user_auth_state_cache(clock: FakeClock) -> UserAuthStateCache:
+    return UserAuthStateCache(
+        max_size=2,
+        ttl=timedelta(seconds=30),
+        clock=clock,
+    )
+
+
+def test_reject_of_init_with_non_positive_max_size() -> None:
+    with raises(ValueError, match="A maximum size must be at least one"):
+        UserAuthStateCache(max_size=0)
+
+
+def test_miss_of_absent_state(
+    user_auth_state_cache: UserAuthStateCache,
+) -> None:
+    assert user_auth_state_cache.get(1) is None
+    assert user_auth_state_cache.get_hit_count() == 0
+    assert user_auth_state_cache.get_miss_count() == 1
+
+
+def test_hit_of_cached_state(
+    user_auth_state_cache: UserAuthStateCache,
+    auth_state: UserAuthState,
+) -> None:
+    user_auth_state_cache.set(1, auth_state)
+
+    assert user_auth_state_cache.get(1) == auth_state
+    assert user_auth_state_cache.get_hit_count() == 1
+    assert user_auth_state_cache.get_miss_count() == 0
+
+
+def test_miss_of_expired_state(
+    clock: FakeClock,
+    user_auth_state_cache: UserAuthStateCache,
+    auth_state: UserAuthState,
+) -> None:
+    user_auth_state_cache.set(1, auth_state)
+
+    clock.now = 29.0
+    assert user_auth_state_cache.get(1) == auth_state
+
+    clock.now = 30.0
+    assert user_auth_state_cache.get(1) is None
+    assert user_auth_state_cache.get_miss_count() == 1
+
+
+def test_miss_of_invalidated_state(
+    user_auth_state_cache: UserAuthStateCache,
+    auth_state: UserAuthState,
+) -> None:
+    user_auth_state_cache.set(1, auth_state)
+    user_auth_state_cache.invalidate(1)
+
+    assert user_auth_state_cache.get(1) is None
+
+
+def test_invalidation_of_absent_state(
+    user_auth_state_cache: UserAuthStateCache,
+) -> None:
+    user_auth_state_cache.invalidate(1)
+
+    assert user_auth_state_cache.get(1) is None
+
+
+def test_eviction_of_least_recently_used_state(
+    user_auth_state_cache: UserAuthStateCache,
+    auth_state: UserAuthState,
+) -> None:
+    user_auth_state_cache.set(1, auth_state)
+    user_auth_state_cache.set(2, auth_state)
+    # The get makes the first state recently used, so the second one is
+    # evicted on an overflow
+    user_auth_state_cache.get(1)
+    user_auth_state_cache.set(3, auth_state)
+
+    assert user_auth_state_cache.get(1) == auth_state
+    assert user_auth_state_cache.get(2) is None
+    assert user_auth_state_cache.get(3) == auth_state
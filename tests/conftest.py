@@ -1,22 +1,60 @@
 from collections.abc import Generator
 from typing import cast
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from pytest_mock import MockerFixture
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import Result
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from message_sender_telegram_bot.libs import SessionScope, UserAuthStateCache
 
 
 @pytest.fixture
 def compiled_session_mock(
     mocker: MockerFixture,
-) -> Generator[sessionmaker[Session]]:
+) -> Generator[async_sessionmaker[AsyncSession]]:
     sessionmaker_mock = cast(
-        type[sessionmaker],
+        type[async_sessionmaker],
         mocker.patch(
-            "sqlalchemy.orm.sessionmaker",
+            "sqlalchemy.ext.asyncio.async_sessionmaker",
             autospec=True,
         ),
     )
-    compiled_session_mock: sessionmaker[Session] = sessionmaker_mock()
+    compiled_session_mock: async_sessionmaker[AsyncSession] = (
+        sessionmaker_mock()
+    )
+    # async with async_sessionmaker()() as session
+    db_session_mock = MagicMock(
+        spec=AsyncSession,
+        # AsyncSession().execute
+        execute=AsyncMock(
+            # await AsyncSession().execute()
+            return_value=MagicMock(spec=Result),
+        ),
+    )
+    compiled_session_mock.return_value.__aenter__.return_value = (  # type: ignore[unresolved-attribute]
+        db_session_mock
+    )
     yield compiled_session_mock
     del compiled_session_mock
+
+
+@pytest.fixture
+def session_scope_mock(
+    compiled_session_mock: async_sessionmaker[AsyncSession],
+) -> Generator[SessionScope]:
+    session_scope_mock = MagicMock(
+        spec=SessionScope,
+        # SessionScope().session
+        session=compiled_session_mock.return_value.__aenter__.return_value,  # type: ignore[unresolved-attribute]
+    )
+    yield session_scope_mock
+    del session_scope_mock
+
+
+@pytest.fixture
+def user_auth_state_cache_mock() -> Generator[UserAuthStateCache]:
+    user_auth_state_cache_mock = MagicMock(spec=UserAuthStateCache)
+    yield user_auth_state_cache_mock
+    del user_auth_state_cache_mock
@@ -1,26 +1,48 @@
+from collections.abc import Sequence
+from datetime import datetime
 from typing import Self, cast, override
 from uuid import UUID
 
-from pytest import fixture, raises
+from pytest import fixture, mark, raises
 from pytest_mock import MockerFixture
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from message_sender_telegram_bot.libs import Token, User
 from message_sender_telegram_bot.libs.interfaces import (
     AbstractDBUserManipulator,
 )
+from message_sender_telegram_bot.libs.types import UserAuthState
 
 
 @fixture
 def abstract_db_user_manipulator_wrapper() -> AbstractDBUserManipulator:
     class AbstractDBUserManipulatorWrapper(AbstractDBUserManipulator):
         @override
-        def get(self: Self) -> User | None:
-            return super().get()
+        async def get(self: Self) -> User | None:
+            return await super().get()
 
         @override
         def create(self: Self) -> User:
             return super().create()
 
+        @classmethod
+        @override
+        async def get_many(
+            cls: type[Self],
+            db_session: AsyncSession,
+            keys: Sequence[int],
+        ) -> list[User]:
+            return await super().get_many(db_session, keys)
+
+        @classmethod
+        @override
+        def create_many(cls: type[Self], values: Sequence[int]) -> list[User]:
+            return super().create_many(values)
+
+        @override
+        async def get_auth_state(self: Self) -> UserAuthState | None:
+            return await super().get_auth_state()
+
         @override
         def get_authorizing_status(self: Self) -> bool:
             return super().get_authorizing_status()
@@ -41,6 +63,17 @@ def abstract_db_user_manipulator_wrapper() -> AbstractDBUserManipulator:
         def clear_token(self: Self) -> None:
             return super().clear_token()
 
+        @override
+        async def update_last_send_date(
+            self: Self,
+            last_send_date: datetime,
+        ) -> None:
+            return await super().update_last_send_date(last_send_date)
+
+        @override
+        async def delete(self: Self) -> None:
+            return await super().delete()
+
         @override
         def get_owner_status(self: Self) -> bool:
             return super().get_owner_status()
@@ -55,11 +88,12 @@ def test_disallow_of_creation_of_abstract_db_user_manipulator_interface_instance
         _ = AbstractDBUserManipulator()
 
 
-def test_disallow_of_direct_using_of_get_method(
+@mark.asyncio
+async def test_disallow_of_direct_using_of_get_method(
     abstract_db_user_manipulator_wrapper: AbstractDBUserManipulator,
 ) -> None:
     with raises(NotImplementedError):
-        _ = abstract_db_user_manipulator_wrapper.get()
+        _ = await abstract_db_user_manipulator_wrapper.get()
 
 
 def test_disallow_of_direct_using_of_create_method(
@@ -69,6 +103,32 @@ def test_disallow_of_direct_using_of_create_method(
         _ = abstract_db_user_manipulator_wrapper.create()
 
 
+@mark.asyncio
+async def test_disallow_of_direct_using_of_get_many_method(
+    abstract_db_user_manipulator_wrapper: AbstractDBUserManipulator,
+) -> None:
+    with raises(NotImplementedError):
+        _ = await abstract_db_user_manipulator_wrapper.get_many(
+            AsyncSession(),
+            [],
+        )
+
+
+def test_disallow_of_direct_using_of_create_many_method(
+    abstract_db_user_manipulator_wrapper: AbstractDBUserManipulator,
+) -> None:
+    with raises(NotImplementedError):
+        _ = abstract_db_user_manipulator_wrapper.create_many([])
+
+
+@mark.asyncio
+async def test_disallow_of_direct_using_of_get_auth_state_method(
+    abstract_db_user_manipulator_wrapper: AbstractDBUserManipulator,
+) -> None:
+    with raises(NotImplementedError):
+        _ = await abstract_db_user_manipulator_wrapper.get_auth_state()
+
+
 def test_disallow_of_direct_using_of_get_authorizing_status_method(
     abstract_db_user_manipulator_wrapper: AbstractDBUserManipulator,
 ) -> None:
@@ -115,6 +175,24 @@ def test_disallow_of_direct_using_of_clear_token_method(
         _ = abstract_db_user_manipulator_wrapper.clear_token()
 
 
+@mark.asyncio
+async def test_disallow_of_direct_using_of_update_last_send_date_method(
+    abstract_db_user_manipulator_wrapper: AbstractDBUserManipulator,
+) -> None:
+    with raises(NotImplementedError):
+        _ = await abstract_db_user_manipulator_wrapper.update_last_send_date(
+            datetime(2026, 3, 3, 15, 41, 25),
+        )
+
+
+@mark.asyncio
+async def test_disallow_of_direct_using_of_delete_method(
+    abstract_db_user_manipulator_wrapper: AbstractDBUserManipulator,
+) -> None:
+    with raises(NotImplementedError):
+        _ = await abstract_db_user_manipulator_wrapper.delete()
+
+
 def test_disallow_of_direct_using_of_get_owner_status_method(
     abstract_db_user_manipulator_wrapper: AbstractDBUserManipulator,
 ) -> None:
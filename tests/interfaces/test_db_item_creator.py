@@ -1,4 +1,5 @@
-from typing import Self, override
+from collections.abc import Sequence
+from typing import Any, Self, override
 
 from pytest import fixture, raises
 
@@ -13,6 +14,11 @@ def db_item_creator_wrapper() -> DBItemCreator:
         def create(self: Self) -> Base:
             return super().create()
 
+        @classmethod
+        @override
+        def create_many(cls: type[Self], values: Sequence[Any]) -> list[Base]:
+            return super().create_many(values)
+
     return DBItemCreatorWrapper()
 
 
@@ -26,3 +32,10 @@ def test_disallow_of_direct_using_of_create_method(
 ) -> None:
     with raises(NotImplementedError):
         _ = db_item_creator_wrapper.create()
+
+
+def test_disallow_of_direct_using_of_create_many_method(
+    db_item_creator_wrapper: DBItemCreator,
+) -> None:
+    with raises(NotImplementedError):
+        _ = db_item_creator_wrapper.create_many([])
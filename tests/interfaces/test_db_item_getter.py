@@ -1,6 +1,8 @@
-from typing import Self, override
+from collections.abc import Sequence
+from typing import Any, Self, override
 
-from pytest import fixture, raises
+from pytest import fixture, mark, raises
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from message_sender_telegram_bot.libs.interfaces import DBItemGetter
 from message_sender_telegram_bot.libs.rdb.database_tables import Base
@@ -10,8 +12,17 @@ from message_sender_telegram_bot.libs.rdb.database_tables import Base
 def db_item_getter_wrapper() -> DBItemGetter:
     class DBItemGetterWrapper(DBItemGetter):
         @override
-        def get(self: Self) -> Base | None:
-            return super().get()
+        async def get(self: Self) -> Base | None:
+            return await super().get()
+
+        @classmethod
+        @override
+        async def get_many(
+            cls: type[Self],
+            db_session: AsyncSession,
+            keys: Sequence[Any],
+        ) -> list[Base]:
+            return await super().get_many(db_session, keys)
 
     return DBItemGetterWrapper()
 
@@ -21,8 +32,17 @@ def test_disallow_of_creation_of_db_item_getter_interface_instance() -> None:
         _ = DBItemGetter()
 
 
-def test_disallow_of_direct_using_of_get_method(
+@mark.asyncio
+async def test_disallow_of_direct_using_of_get_method(
+    db_item_getter_wrapper: DBItemGetter,
+) -> None:
+    with raises(NotImplementedError):
+        _ = await db_item_getter_wrapper.get()
+
+
+@mark.asyncio
+async def test_disallow_of_direct_using_of_get_many_method(
     db_item_getter_wrapper: DBItemGetter,
 ) -> None:
     with raises(NotImplementedError):
-        _ = db_item_getter_wrapper.get()
+        _ = await db_item_getter_wrapper.get_many(AsyncSession(), [])
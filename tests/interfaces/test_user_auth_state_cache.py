@@ -0,0 +1,65 @@
+from datetime import datetime
+from typing import Self, override
+from uuid import UUID
+
+from pytest import fixture, raises
+
+from message_sender_telegram_bot.libs.interfaces import (
+    AbstractUserAuthStateCache,
+)
+from message_sender_telegram_bot.libs.types import UserAuthState
+
+
+@fixture
+def user_auth_state_cache_wrapper() -> AbstractUserAuthStateCache:
+    class UserAuthStateCacheWrapper(AbstractUserAuthStateCache):
+        @override
+        def get(self: Self, user_id: int) -> UserAuthState | None:
+            return super().get(user_id)
+
+        @override
+        def set(self: Self, user_id: int, auth_state: UserAuthState) -> None:
+            return super().set(user_id, auth_state)
+
+        @override
+        def invalidate(self: Self, user_id: int) -> None:
+            return super().invalidate(user_id)
+
+    return UserAuthStateCacheWrapper()
+
+
+def test_disallow_of_creation_of_user_auth_state_cache_interface_instance() -> (
+    None
+):
+    with raises(TypeError):
+        _ = AbstractUserAuthStateCache()
+
+
+def test_disallow_of_direct_using_of_get_method(
+    user_auth_state_cache_wrapper: AbstractUserAuthStateCache,
+) -> None:
+    with raises(NotImplementedError):
+        _ = user_auth_state_cache_wrapper.get(6573920184)
+
+
+def test_disallow_of_direct_using_of_set_method(
+    user_auth_state_cache_wrapper: AbstractUserAuthStateCache,
+) -> None:
+    with raises(NotImplementedError):
+        _ = user_auth_state_cache_wrapper.set(
+            6573920184,
+            UserAuthState(
+                UUID("2050c8a2-2dd3-4801-a56f-bc6cf7d5e59e"),
+                is_authorizing=False,
+                has_token=True,
+                is_owner=False,
+                last_send_date=datetime(2026, 3, 3, 15, 41, 25),
+            ),
+        )
+
+
+def test_disallow_of_direct_using_of_invalidate_method(
+    user_auth_state_cache_wrapper: AbstractUserAuthStateCache,
+) -> None:
+    with raises(NotImplementedError):
+        _ = user_auth_state_cache_wrapper.invalidate(6573920184)
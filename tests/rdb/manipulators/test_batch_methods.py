@@ -0,0 +1,149 @@
+from typing import Any
+from uuid import uuid7
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+)
+
+from message_sender_telegram_bot.libs import (
+    DBMessageManipulator,
+    DBTokenManipulator,
+    DBUserManipulator,
+    User,
+)
+from message_sender_telegram_bot.libs.rdb.database_tables import Base
+
+# The numbers of the DB items, for which a number of the statements must
+# stay the same
+ITEM_COUNTS: tuple[int, ...] = (1, 10, 100)
+
+
+async def create_database_engine(statements: list[str]) -> AsyncEngine:
+    database_engine: AsyncEngine = create_async_engine("sqlite+aiosqlite://")
+
+    async with database_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    def on_before(_: Any, __: Any, statement: str, *___: Any) -> None:
+        statements.append(statement)
+
+    event.listen(
+        database_engine.sync_engine, "before_cursor_execute", on_before
+    )
+
+    return database_engine
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("item_count", ITEM_COUNTS)
+async def test_statement_count_of_batch_methods_of_db_token_manipulator(
+    item_count: int,
+) -> None:
+    statements: list[str] = []
+    database_engine: AsyncEngine = await create_database_engine(statements)
+    tokens: list[str] = [f"TOKEN_{index}" for index in range(item_count)]
+
+    async with AsyncSession(database_engine) as session:
+        session.add_all(DBTokenManipulator.create_many(tokens))
+        statements.clear()
+        await session.flush()
+        assert len(statements) == 1
+
+        statements.clear()
+        db_tokens = await DBTokenManipulator.get_many(session, tokens)
+        assert len(statements) == 1
+        assert sorted(db_token.token for db_token in db_tokens) == sorted(
+            tokens
+        )
+
+    await database_engine.dispose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("item_count", ITEM_COUNTS)
+async def test_statement_count_of_batch_methods_of_db_user_manipulator(
+    item_count: int,
+) -> None:
+    statements: list[str] = []
+    database_engine: AsyncEngine = await create_database_engine(statements)
+    user_ids: list[int] = list(range(item_count))
+
+    async with AsyncSession(database_engine) as session:
+        session.add_all(DBUserManipulator.create_many(user_ids))
+        statements.clear()
+        await session.flush()
+        assert len(statements) == 1
+
+        statements.clear()
+        db_users = await DBUserManipulator.get_many(session, user_ids)
+        assert len(statements) == 1
+        assert sorted(db_user.user_id for db_user in db_users) == user_ids
+        assert all(db_user.is_authorizing for db_user in db_users)
+
+    await database_engine.dispose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("item_count", ITEM_COUNTS)
+async def test_statement_count_of_batch_methods_of_db_message_manipulator(
+    item_count: int,
+) -> None:
+    statements: list[str] = []
+    database_engine: AsyncEngine = await create_database_engine(statements)
+    message_ids: list[int] = list(range(item_count))
+
+    async with AsyncSession(database_engine) as session:
+        db_user: User = DBUserManipulator.create_many([6573920184])[0]
+        session.add(db_user)
+        await session.flush()
+
+        session.add_all(
+            DBMessageManipulator.create_many(
+                [
+                    (message_id, db_user.id_, "Hello")
+                    for message_id in message_ids
+                ]
+            )
+        )
+        statements.clear()
+        await session.flush()
+        assert len(statements) == 1
+
+        statements.clear()
+        drafts = await DBMessageManipulator.get_many(
+            session,
+            [(message_id, db_user.id_) for message_id in message_ids],
+        )
+        assert len(statements) == 1
+        assert sorted(draft.message_id for draft in drafts) == message_ids
+
+    await database_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_get_many_without_keys() -> None:
+    statements: list[str] = []
+    database_engine: AsyncEngine = await create_database_engine(statements)
+
+    async with AsyncSession(database_engine) as session:
+        statements.clear()
+        assert await DBTokenManipulator.get_many(session, []) == []
+        assert await DBUserManipulator.get_many(session, []) == []
+        assert await DBMessageManipulator.get_many(session, []) == []
+
+    assert statements == []
+    await database_engine.dispose()
+
+
+def test_create_many_of_unique_primary_keys() -> None:
+    sender_id = uuid7()
+    drafts = DBMessageManipulator.create_many(
+        [(1, sender_id, "Hello"), (2, sender_id, "Hi")]
+    )
+
+    assert len({draft.id_ for draft in drafts}) == 2
+    assert {draft.sender_id for draft in drafts} == {sender_id}
@@ -1,39 +1,38 @@
 from collections.abc import Generator
 from datetime import datetime
 from typing import cast
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock, call
 from uuid import UUID
 
 import pytest
 from pytest_mock import MockerFixture
-from sqlalchemy import Result, Select
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import CursorResult, Result
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 
 from message_sender_telegram_bot.libs import (
     DBMessageManipulator,
-    Message,
+    DBUserManipulator,
+    MessageDraft,
     User,
 )
-
-# select()
-select_instance_mock: MagicMock = MagicMock(
-    spec=Select,
-    # select().where
-    where=MagicMock(
-        # select().where()
-        return_value=MagicMock(
-            spec=Select,
-        )
-    ),
+from message_sender_telegram_bot.libs.rdb.database_tables import Base
+from message_sender_telegram_bot.libs.rdb.manipulators import (
+    db_message_manipulator,
 )
+from message_sender_telegram_bot.libs.types import MessageState
 
 
 @pytest.fixture
 def db_session_mock(
-    compiled_session_mock: sessionmaker[Session],
-) -> Generator[Session]:
+    compiled_session_mock: async_sessionmaker[AsyncSession],
+) -> Generator[AsyncSession]:
     # Session().execute
-    db_session_execute_function_mock: MagicMock = MagicMock(
+    db_session_execute_function_mock: AsyncMock = AsyncMock(
         # Session().execute()
         return_value=MagicMock(
             spec=Result,
@@ -41,7 +40,7 @@ def db_session_mock(
             scalar_one_or_none=MagicMock(
                 # Session().execute().scalar_one_or_none()
                 return_value=MagicMock(
-                    spec=Message,
+                    spec=MessageDraft,
                 ),
             ),
         ),
@@ -90,7 +89,7 @@ def db_user_mock(
 
 @pytest.fixture
 def db_message_manipulator_with_req_params(
-    db_session_mock: Session,
+    db_session_mock: AsyncSession,
 ) -> Generator[DBMessageManipulator]:
     message_id = 1074323464
 
@@ -101,7 +100,7 @@ def db_message_manipulator_with_req_params(
 
 @pytest.fixture
 def db_message_manipulator_with_req_params_and_sender(
-    db_session_mock: Session,
+    db_session_mock: AsyncSession,
     db_user_mock: User,
 ) -> Generator[DBMessageManipulator]:
     message_id = 1074323464
@@ -117,7 +116,7 @@ def db_message_manipulator_with_req_params_and_sender(
 
 @pytest.fixture
 def db_message_manipulator_with_all_params(
-    db_session_mock: Session,
+    db_session_mock: AsyncSession,
     db_user_mock: User,
 ) -> Generator[DBMessageManipulator]:
     message_id = 1074323464
@@ -133,29 +132,148 @@ def db_message_manipulator_with_all_params(
     del db_message_manipulator
 
 
-def test_get_method_db_message_manipulator_with_req_params(
-    mocker: MockerFixture,
-    db_session_mock: Session,
+@pytest.fixture
+def db_message_manipulator_with_sender_id(
+    db_session_mock: AsyncSession,
+) -> Generator[DBMessageManipulator]:
+    message_id = 1074323464
+    sender_id = UUID("5c0a4f4e-8f2b-4d8e-9a51-0d3b7e6a1c22")
+    text = "Hello, World!"
+
+    db_message_manipulator = DBMessageManipulator(
+        db_session_mock,
+        message_id,
+        sender_id=sender_id,
+        text=text,
+    )
+    yield db_message_manipulator
+    del db_message_manipulator
+
+
+@pytest.mark.asyncio
+async def test_get_method_db_message_manipulator_with_sender_id(
+    db_session_mock: AsyncSession,
+    db_message_manipulator_with_sender_id: DBMessageManipulator,
+) -> None:
+    db_message_draft: (
+        MessageDraft | None
+    ) = await db_message_manipulator_with_sender_id.get()
+
+    assert isinstance(db_message_draft, MessageDraft)
+    # The precompiled statement is executed with a bound message ID and
+    # a bound sender ID
+    db_session_mock.execute.assert_awaited_once_with(  # type: ignore[unresolved-attribute]
+        db_message_manipulator.select_draft_stmt,
+        {
+            "message_id": 1074323464,
+            "sender_id": UUID("5c0a4f4e-8f2b-4d8e-9a51-0d3b7e6a1c22"),
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_method_db_message_manipulator_with_req_params(
     db_message_manipulator_with_req_params: DBMessageManipulator,
 ) -> None:
-    mocker.patch(
-        (
-            "message_sender_telegram_bot.libs.rdb.manipulators."
-            "db_message_manipulator.Message"
-        ),
-        autospec=True,
+    with pytest.raises(ValueError, match="A sender ID is absent"):
+        await db_message_manipulator_with_req_params.get()
+
+
+@pytest.mark.asyncio
+async def test_get_state_method_db_message_manipulator_with_sender_id(
+    db_session_mock: AsyncSession,
+    db_message_manipulator_with_sender_id: DBMessageManipulator,
+) -> None:
+    row: tuple[UUID, int, str, bool] = (
+        UUID("01938f2e-7c4a-7b8e-9d3f-2a6b5c4d3e2f"),
+        1074323464,
+        "Hello, World!",
+        False,
     )
-    mocker.patch(
-        (
-            "message_sender_telegram_bot.libs.rdb.manipulators."
-            "db_message_manipulator.select"
-        ),
-        autospec=True,
-        return_value=select_instance_mock,
+    db_session_mock.execute.return_value.one_or_none.return_value = row  # type: ignore[unresolved-attribute]
+
+    message_state: (
+        MessageState | None
+    ) = await db_message_manipulator_with_sender_id.get_state()
+
+    assert message_state == MessageState(
+        id_=UUID("01938f2e-7c4a-7b8e-9d3f-2a6b5c4d3e2f"),
+        message_id=1074323464,
+        sender_id=UUID("5c0a4f4e-8f2b-4d8e-9a51-0d3b7e6a1c22"),
+        text="Hello, World!",
+        is_sent=row[3],
+    )
+    # A found draft doesn't need a lookup in the archive
+    db_session_mock.execute.assert_awaited_once_with(  # type: ignore[unresolved-attribute]
+        db_message_manipulator.select_draft_state_stmt,
+        {
+            "message_id": 1074323464,
+            "sender_id": UUID("5c0a4f4e-8f2b-4d8e-9a51-0d3b7e6a1c22"),
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_state_method_db_message_manipulator_with_sent_db_message(
+    db_session_mock: AsyncSession,
+    db_message_manipulator_with_sender_id: DBMessageManipulator,
+) -> None:
+    row: tuple[UUID, int, str, bool] = (
+        UUID("01938f2e-7c4a-7b8e-9d3f-2a6b5c4d3e2f"),
+        1074323464,
+        "Hello, World!",
+        True,
+    )
+    db_session_mock.execute.return_value.one_or_none.side_effect = (  # type: ignore[unresolved-attribute]
+        None,
+        row,
+    )
+
+    message_state: (
+        MessageState | None
+    ) = await db_message_manipulator_with_sender_id.get_state()
+
+    assert message_state == MessageState(
+        id_=UUID("01938f2e-7c4a-7b8e-9d3f-2a6b5c4d3e2f"),
+        message_id=1074323464,
+        sender_id=UUID("5c0a4f4e-8f2b-4d8e-9a51-0d3b7e6a1c22"),
+        text="Hello, World!",
+        is_sent=row[3],
     )
-    db_message: Message | None = db_message_manipulator_with_req_params.get()
+    assert db_session_mock.execute.await_args_list == [  # type: ignore[unresolved-attribute]
+        call(
+            db_message_manipulator.select_draft_state_stmt,
+            {
+                "message_id": 1074323464,
+                "sender_id": UUID("5c0a4f4e-8f2b-4d8e-9a51-0d3b7e6a1c22"),
+            },
+        ),
+        call(
+            db_message_manipulator.select_sent_state_stmt,
+            {
+                "message_id": 1074323464,
+                "sender_id": UUID("5c0a4f4e-8f2b-4d8e-9a51-0d3b7e6a1c22"),
+            },
+        ),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_state_method_db_message_manipulator_without_db_message(
+    db_session_mock: AsyncSession,
+    db_message_manipulator_with_sender_id: DBMessageManipulator,
+) -> None:
+    db_session_mock.execute.return_value.one_or_none.return_value = None  # type: ignore[unresolved-attribute]
+
+    assert await db_message_manipulator_with_sender_id.get_state() is None
 
-    assert isinstance(db_message, Message)
+
+@pytest.mark.asyncio
+async def test_get_state_method_db_message_manipulator_with_req_params(
+    db_message_manipulator_with_req_params: DBMessageManipulator,
+) -> None:
+    with pytest.raises(ValueError, match="A sender ID is absent"):
+        await db_message_manipulator_with_req_params.get_state()
 
 
 def test_create_method_db_message_manipulator_with_req_params(
@@ -179,10 +297,260 @@ def test_create_method_db_message_manipulator_with_all_params(
     mocker.patch(
         (
             "message_sender_telegram_bot.libs.rdb.manipulators."
-            "db_message_manipulator.Message"
+            "db_message_manipulator.MessageDraft"
         ),
         autospec=True,
     )
-    db_message: Message = db_message_manipulator_with_all_params.create()
+    db_message_draft: MessageDraft = (
+        db_message_manipulator_with_all_params.create()
+    )
+
+    assert isinstance(db_message_draft, MessageDraft)
+
+
+def test_create_method_db_message_manipulator_with_sender_id(
+    db_message_manipulator_with_sender_id: DBMessageManipulator,
+) -> None:
+    db_message_draft: MessageDraft = (
+        db_message_manipulator_with_sender_id.create()
+    )
+
+    assert isinstance(db_message_draft, MessageDraft)
+    assert db_message_draft.sender_id == UUID(
+        "5c0a4f4e-8f2b-4d8e-9a51-0d3b7e6a1c22"
+    )
+    assert db_message_draft.created_date is not None
+
+
+@pytest.mark.asyncio
+async def test_claim_send_method_db_message_manipulator_with_sender_id(
+    db_session_mock: AsyncSession,
+    db_message_manipulator_with_sender_id: DBMessageManipulator,
+) -> None:
+    db_session_mock.execute.return_value = MagicMock(  # type: ignore[unresolved-attribute]
+        spec=CursorResult,
+        rowcount=1,
+        one_or_none=MagicMock(
+            return_value=(
+                UUID("01938f2e-7c4a-7b8e-9d3f-2a6b5c4d3e2f"),
+                1074323464,
+                "Hello, World!",
+                False,
+            ),
+        ),
+    )
+
+    assert await db_message_manipulator_with_sender_id.claim_send() is True
+    # The draft is read, deleted and appended to the archive
+    assert db_session_mock.execute.await_count == 3  # type: ignore[unresolved-attribute]
+    assert db_session_mock.execute.await_args_list[1] == call(  # type: ignore[unresolved-attribute]
+        db_message_manipulator.delete_draft_stmt,
+        {
+            "b_message_id": 1074323464,
+            "b_sender_id": UUID("5c0a4f4e-8f2b-4d8e-9a51-0d3b7e6a1c22"),
+        },
+    )
+    insert_stmt, insert_params = db_session_mock.execute.await_args_list[  # type: ignore[unresolved-attribute]
+        2
+    ].args
+    assert insert_stmt is db_message_manipulator.insert_sent_stmt
+    assert insert_params["text"] == "Hello, World!"
+
+
+@pytest.mark.asyncio
+async def test_enqueue_email_method_db_message_manipulator_after_claim(
+    db_session_mock: AsyncSession,
+    db_message_manipulator_with_sender_id: DBMessageManipulator,
+) -> None:
+    db_session_mock.execute.return_value = MagicMock(  # type: ignore[unresolved-attribute]
+        spec=CursorResult,
+        rowcount=1,
+        one_or_none=MagicMock(
+            return_value=(
+                UUID("01938f2e-7c4a-7b8e-9d3f-2a6b5c4d3e2f"),
+                1074323464,
+                "Hello, World!",
+                False,
+            ),
+        ),
+    )
+    await db_message_manipulator_with_sender_id.claim_send()
+
+    await db_message_manipulator_with_sender_id.enqueue_email("@user")
+
+    # A delivery shares a primary key with the sent DB message
+    insert_stmt, insert_params = db_session_mock.execute.await_args.args  # type: ignore[unresolved-attribute]
+    assert insert_stmt is db_message_manipulator.insert_outbox_stmt
+    assert insert_params["id_"] == UUID("01938f2e-7c4a-7b8e-9d3f-2a6b5c4d3e2f")
+    assert insert_params["sender_name"] == "@user"
+    assert insert_params["is_urgent"] is False
+    assert insert_params["attempt_count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_enqueue_email_method_db_message_manipulator_without_claim(
+    db_session_mock: AsyncSession,
+    db_message_manipulator_with_sender_id: DBMessageManipulator,
+) -> None:
+    with pytest.raises(ValueError, match="The DB message isn't claimed"):
+        await db_message_manipulator_with_sender_id.enqueue_email("@user")
+
+    db_session_mock.execute.assert_not_awaited()  # type: ignore[unresolved-attribute]
+
+
+@pytest.mark.asyncio
+async def test_claim_send_method_db_message_manipulator_with_claimed_draft(
+    db_session_mock: AsyncSession,
+    db_message_manipulator_with_sender_id: DBMessageManipulator,
+) -> None:
+    # A concurrent claim has deleted the draft after it is read
+    db_session_mock.execute.return_value = MagicMock(  # type: ignore[unresolved-attribute]
+        spec=CursorResult,
+        rowcount=0,
+        one_or_none=MagicMock(
+            return_value=(
+                UUID("01938f2e-7c4a-7b8e-9d3f-2a6b5c4d3e2f"),
+                1074323464,
+                "Hello, World!",
+                False,
+            ),
+        ),
+    )
+
+    assert await db_message_manipulator_with_sender_id.claim_send() is False
+    # Nothing is appended to the archive
+    assert db_session_mock.execute.await_count == 2  # type: ignore[unresolved-attribute]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "row",
+    (
+        None,
+        (
+            UUID("01938f2e-7c4a-7b8e-9d3f-2a6b5c4d3e2f"),
+            1074323464,
+            "Hello, World!",
+            True,
+        ),
+    ),
+)
+async def test_claim_send_method_db_message_manipulator_without_own_draft(
+    db_session_mock: AsyncSession,
+    db_message_manipulator_with_sender_id: DBMessageManipulator,
+    row: tuple[UUID, int, str, bool] | None,
+) -> None:
+    db_session_mock.execute.return_value.one_or_none.return_value = row  # type: ignore[unresolved-attribute]
+
+    assert await db_message_manipulator_with_sender_id.claim_send() is False
+    # The draft isn't deleted
+    for await_args in db_session_mock.execute.await_args_list:  # type: ignore[unresolved-attribute]
+        assert (
+            await_args.args[0] is not db_message_manipulator.delete_draft_stmt
+        )
+
+
+@pytest.mark.asyncio
+async def test_claim_send_method_db_message_manipulator_with_req_params(
+    db_message_manipulator_with_req_params: DBMessageManipulator,
+) -> None:
+    with pytest.raises(ValueError, match="A sender ID is absent"):
+        await db_message_manipulator_with_req_params.claim_send()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("rowcount", "is_deleted"), ((1, True), (0, False)))
+async def test_delete_unsent_method_db_message_manipulator_with_sender_id(
+    db_session_mock: AsyncSession,
+    db_message_manipulator_with_sender_id: DBMessageManipulator,
+    rowcount: int,
+    is_deleted: bool,
+) -> None:
+    db_session_mock.execute.return_value = MagicMock(  # type: ignore[unresolved-attribute]
+        spec=CursorResult,
+        rowcount=rowcount,
+    )
+
+    assert (
+        await db_message_manipulator_with_sender_id.delete_unsent()
+        is is_deleted
+    )
+    db_session_mock.execute.assert_awaited_once_with(  # type: ignore[unresolved-attribute]
+        db_message_manipulator.delete_draft_stmt,
+        {
+            "b_message_id": 1074323464,
+            "b_sender_id": UUID("5c0a4f4e-8f2b-4d8e-9a51-0d3b7e6a1c22"),
+        },
+    )
+
+
+@pytest.mark.asyncio
+async def test_delete_unsent_method_db_message_manipulator_with_req_params(
+    db_message_manipulator_with_req_params: DBMessageManipulator,
+) -> None:
+    with pytest.raises(ValueError, match="A sender ID is absent"):
+        await db_message_manipulator_with_req_params.delete_unsent()
+
+
+@pytest.mark.asyncio
+async def test_lookups_of_db_message_manipulator_with_shared_message_id() -> (
+    None
+):
+    database_engine: AsyncEngine = create_async_engine("sqlite+aiosqlite://")
+    async with database_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    async with AsyncSession(database_engine) as session:
+        first_user, second_user = DBUserManipulator.create_many(
+            [6573920184, 4018562937]
+        )
+        session.add_all([first_user, second_user])
+        # A message ID is unique only in a chat, so the messages of the
+        # different users share it
+        session.add_all(
+            DBMessageManipulator.create_many(
+                [
+                    (1074323464, first_user.id_, "Hello from the first"),
+                    (1074323464, second_user.id_, "Hello from the second"),
+                ]
+            )
+        )
+        await session.flush()
+
+        second_draft: MessageDraft | None = await DBMessageManipulator(
+            session,
+            1074323464,
+            sender_id=second_user.id_,
+        ).get()
+        assert second_draft is not None
+        assert second_draft.text == "Hello from the second"
+
+        drafts: list[MessageDraft] = await DBMessageManipulator.get_many(
+            session,
+            [(1074323464, first_user.id_)],
+        )
+        assert [draft.text for draft in drafts] == ["Hello from the first"]
+
+        # A send of the first message doesn't touch the second one
+        first_manipulator: DBMessageManipulator = DBMessageManipulator(
+            session,
+            1074323464,
+            sender_id=first_user.id_,
+        )
+        assert await first_manipulator.claim_send() is True
+
+        second_manipulator: DBMessageManipulator = DBMessageManipulator(
+            session,
+            1074323464,
+            sender_id=second_user.id_,
+        )
+        second_state: (
+            MessageState | None
+        ) = await second_manipulator.get_state()
+        assert second_state is not None
+        assert second_state.sender_id == second_user.id_
+        assert second_state.text == "Hello from the second"
+        assert second_state.is_sent is False
+        assert await second_manipulator.claim_send() is True
 
-    assert isinstance(db_message, Message)
+    await database_engine.dispose()
@@ -1,27 +1,25 @@
-from collections.abc import Generator
+from collections.abc import Awaitable, Callable, Generator
 from datetime import datetime
 from typing import cast
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 from uuid import UUID
 
 import pytest
 from pytest_mock import MockerFixture
-from sqlalchemy import Result, Select
-from sqlalchemy.orm import Session, sessionmaker
-
-from message_sender_telegram_bot.libs import DBUserManipulator, Token, User
-
-# select()
-select_instance_mock: MagicMock = MagicMock(
-    spec=Select,
-    # select().where
-    where=MagicMock(
-        # select().where()
-        return_value=MagicMock(
-            spec=Select,
-        )
-    ),
+from sqlalchemy import Result, Row
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from message_sender_telegram_bot.libs import (
+    DBUserManipulator,
+    Token,
+    User,
+    UserAuthStateCache,
+)
+from message_sender_telegram_bot.libs.rdb.manipulators import (
+    db_user_manipulator,
 )
+from message_sender_telegram_bot.libs.types import UserAuthState
 
 
 @pytest.fixture
@@ -71,8 +69,9 @@ def db_user_mock(
         messages=[],
     )
     # Patched `__init__` can't assign objects to variables by default,
-    # so, the fixture assigns `is_owner` and `last_send_date` by
-    # attributes
+    # so, the fixture assigns `user_id`, `is_owner` and
+    # `last_send_date` by attributes
+    db_user_mock.user_id = user_id
     db_user_mock.token = token_mock
     db_user_mock.is_owner = False
     db_user_mock.last_send_date = datetime(2026, 3, 3, 15, 41, 25)
@@ -82,10 +81,10 @@ def db_user_mock(
 
 @pytest.fixture
 def db_session_mock(
-    compiled_session_mock: sessionmaker[Session],
-) -> Generator[Session]:
+    compiled_session_mock: async_sessionmaker[AsyncSession],
+) -> Generator[AsyncSession]:
     # Session().execute
-    db_session_execute_function_mock: MagicMock = MagicMock(
+    db_session_execute_function_mock: AsyncMock = AsyncMock(
         # Session().execute()
         return_value=MagicMock(
             spec=Result,
@@ -100,12 +99,14 @@ def db_session_mock(
     )
     db_session_mock = compiled_session_mock()
     db_session_mock.execute = db_session_execute_function_mock  # type: ignore[invalid-assignment]
+    # Session().delete
+    db_session_mock.delete = AsyncMock()  # type: ignore[invalid-assignment]
     yield db_session_mock
     del db_session_mock
 
 
 def test_reject_of_db_user_manipulator_init_without_user_id_and_db_user(
-    db_session_mock: Session,
+    db_session_mock: AsyncSession,
 ) -> None:
     with pytest.raises(
         ValueError,
@@ -115,7 +116,7 @@ def test_reject_of_db_user_manipulator_init_without_user_id_and_db_user(
 
 
 def test_reject_of_db_user_manipulator_init_with_user_id_and_db_user(
-    db_session_mock: Session,
+    db_session_mock: AsyncSession,
     db_user_mock: User,
 ) -> None:
     with pytest.raises(
@@ -130,7 +131,7 @@ def test_reject_of_db_user_manipulator_init_with_user_id_and_db_user(
 
 @pytest.fixture
 def db_user_manipulator_with_user_id(
-    db_session_mock: Session,
+    db_session_mock: AsyncSession,
     user_id: int,
 ) -> Generator[DBUserManipulator]:
     db_user_manipulator = DBUserManipulator(db_session_mock, user_id=user_id)
@@ -141,7 +142,7 @@ def db_user_manipulator_with_user_id(
 @pytest.fixture
 def db_user_manipulator_with_db_user(
     mocker: MockerFixture,
-    db_session_mock: Session,
+    db_session_mock: AsyncSession,
     db_user_mock: User,
 ) -> Generator[DBUserManipulator]:
     db_user_manipulator = DBUserManipulator(
@@ -152,25 +153,55 @@ def db_user_manipulator_with_db_user(
     del db_user_manipulator
 
 
-def test_get_method_of_db_user_manipulator_with_user_id(
-    mocker: MockerFixture,
+@pytest.fixture
+def cached_db_user_manipulator_with_user_id(
+    db_session_mock: AsyncSession,
+    user_id: int,
+    user_auth_state_cache_mock: UserAuthStateCache,
+) -> Generator[DBUserManipulator]:
+    db_user_manipulator = DBUserManipulator(
+        db_session_mock,
+        user_id=user_id,
+        auth_state_cache=user_auth_state_cache_mock,
+    )
+    yield db_user_manipulator
+    del db_user_manipulator
+
+
+@pytest.fixture
+def cached_db_user_manipulator_with_db_user(
+    db_session_mock: AsyncSession,
+    db_user_mock: User,
+    user_auth_state_cache_mock: UserAuthStateCache,
+) -> Generator[DBUserManipulator]:
+    db_user_manipulator = DBUserManipulator(
+        db_session_mock,
+        db_user=db_user_mock,
+        auth_state_cache=user_auth_state_cache_mock,
+    )
+    yield db_user_manipulator
+    del db_user_manipulator
+
+
+@pytest.mark.asyncio
+async def test_get_method_of_db_user_manipulator_with_user_id(
+    db_session_mock: AsyncSession,
+    user_id: int,
     db_user_mock: User,
     db_user_manipulator_with_user_id: DBUserManipulator,
 ) -> None:
-    mocker.patch(
-        (
-            "message_sender_telegram_bot.libs.rdb.manipulators."
-            "db_user_manipulator.select"
-        ),
-        autospec=True,
-        return_value=select_instance_mock,
-    )
-    db_user: User | None = db_user_manipulator_with_user_id.get()
+    db_user: User | None = await db_user_manipulator_with_user_id.get()
 
     assert isinstance(db_user, User)
+    # The precompiled statement is executed with a bound user ID
+    db_session_mock.execute.assert_awaited_once_with(  # type: ignore[unresolved-attribute]
+        db_user_manipulator.select_user_stmt,
+        {"user_id": user_id},
+    )
 
 
-def test_get_method_of_db_user_manipulator_with_db_user(
+@pytest.mark.asyncio
+async def test_get_method_of_db_user_manipulator_with_db_user(
     db_user_manipulator_with_db_user: DBUserManipulator,
     db_user_mock: User,
 ) -> None:
@@ -178,7 +209,142 @@ def test_get_method_of_db_user_manipulator_with_db_user(
         ValueError,
         match="A user ID is absent",
     ):
-        db_user_manipulator_with_db_user.get()
+        await db_user_manipulator_with_db_user.get()
+
+
+@pytest.mark.asyncio
+async def test_get_auth_state_method_of_db_user_manipulator_with_user_id(
+    db_session_mock: AsyncSession,
+    db_user_manipulator_with_user_id: DBUserManipulator,
+) -> None:
+    auth_state_row: tuple[UUID, bool, bool, bool, datetime | None] = (
+        UUID("2050c8a2-2dd3-4801-a56f-bc6cf7d5e59e"),
+        False,
+        True,
+        False,
+        datetime(2026, 3, 3, 15, 41, 25),
+    )
+    db_session_mock.execute.return_value.one_or_none = MagicMock(  # type: ignore[unresolved-attribute]
+        return_value=MagicMock(
+            spec=Row,
+            __iter__=MagicMock(return_value=iter(auth_state_row)),
+        ),
+    )
+
+    auth_state: (
+        UserAuthState | None
+    ) = await db_user_manipulator_with_user_id.get_auth_state()
+
+    assert auth_state == UserAuthState(*auth_state_row)
+    # The state is got in one query
+    db_session_mock.execute.assert_awaited_once()  # type: ignore[unresolved-attribute]
+
+
+@pytest.mark.asyncio
+async def test_get_auth_state_method_of_db_user_manipulator_without_db_user(
+    db_session_mock: AsyncSession,
+    db_user_manipulator_with_user_id: DBUserManipulator,
+) -> None:
+    db_session_mock.execute.return_value.one_or_none = MagicMock(  # type: ignore[unresolved-attribute]
+        return_value=None,
+    )
+
+    auth_state: (
+        UserAuthState | None
+    ) = await db_user_manipulator_with_user_id.get_auth_state()
+
+    assert auth_state is None
+
+
+@pytest.mark.asyncio
+async def test_get_auth_state_method_of_db_user_manipulator_with_db_user(
+    db_user_manipulator_with_db_user: DBUserManipulator,
+) -> None:
+    with pytest.raises(
+        ValueError,
+        match="A user ID is absent",
+    ):
+        await db_user_manipulator_with_db_user.get_auth_state()
+
+
+@pytest.mark.asyncio
+async def test_get_auth_state_method_of_db_user_manipulator_with_cache_hit(
+    db_session_mock: AsyncSession,
+    user_id: int,
+    user_auth_state_cache_mock: UserAuthStateCache,
+    cached_db_user_manipulator_with_user_id: DBUserManipulator,
+) -> None:
+    cached_auth_state: UserAuthState = UserAuthState(
+        UUID("2050c8a2-2dd3-4801-a56f-bc6cf7d5e59e"),
+        is_authorizing=False,
+        has_token=True,
+        is_owner=False,
+        last_send_date=None,
+    )
+    user_auth_state_cache_mock.get.return_value = cached_auth_state  # type: ignore[unresolved-attribute]
+
+    auth_state: (
+        UserAuthState | None
+    ) = await cached_db_user_manipulator_with_user_id.get_auth_state()
+
+    assert auth_state == cached_auth_state
+    user_auth_state_cache_mock.get.assert_called_once_with(user_id)  # type: ignore[unresolved-attribute]
+    db_session_mock.execute.assert_not_awaited()  # type: ignore[unresolved-attribute]
+
+
+@pytest.mark.asyncio
+async def test_get_auth_state_method_of_db_user_manipulator_with_cache_miss(
+    db_session_mock: AsyncSession,
+    user_id: int,
+    user_auth_state_cache_mock: UserAuthStateCache,
+    cached_db_user_manipulator_with_user_id: DBUserManipulator,
+) -> None:
+    auth_state_row: tuple[UUID, bool, bool, bool, datetime | None] = (
+        UUID("2050c8a2-2dd3-4801-a56f-bc6cf7d5e59e"),
+        False,
+        True,
+        False,
+        None,
+    )
+    user_auth_state_cache_mock.get.return_value = None  # type: ignore[unresolved-attribute]
+    db_session_mock.execute.return_value.one_or_none = MagicMock(  # type: ignore[unresolved-attribute]
+        return_value=MagicMock(
+            spec=Row,
+            __iter__=MagicMock(return_value=iter(auth_state_row)),
+        ),
+    )
+
+    auth_state: (
+        UserAuthState | None
+    ) = await cached_db_user_manipulator_with_user_id.get_auth_state()
+
+    assert auth_state == UserAuthState(*auth_state_row)
+    db_session_mock.execute.assert_awaited_once()  # type: ignore[unresolved-attribute]
+    user_auth_state_cache_mock.set.assert_called_once_with(  # type: ignore[unresolved-attribute]
+        user_id,
+        auth_state,
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_auth_state_method_of_db_user_manipulator_with_cache_miss_without_db_user(
+    db_session_mock: AsyncSession,
+    user_auth_state_cache_mock: UserAuthStateCache,
+    cached_db_user_manipulator_with_user_id: DBUserManipulator,
+) -> None:
+    user_auth_state_cache_mock.get.return_value = None  # type: ignore[unresolved-attribute]
+    db_session_mock.execute.return_value.one_or_none = MagicMock(  # type: ignore[unresolved-attribute]
+        return_value=None,
+    )
+
+    auth_state: (
+        UserAuthState | None
+    ) = await cached_db_user_manipulator_with_user_id.get_auth_state()
+
+    assert auth_state is None
+    # An absent DB user isn't cached, because the user can be created
+    # by a `start` command at any moment
+    user_auth_state_cache_mock.set.assert_not_called()  # type: ignore[unresolved-attribute]
 
 
 def test_create_method_of_db_user_manipulator_with_user_id(
@@ -289,6 +455,94 @@ def test_clear_token_method_of_db_user_manipulator_with_db_user(
     db_user_manipulator_with_db_user.clear_token()
 
 
+@pytest.mark.asyncio
+async def test_update_last_send_date_method_of_db_user_manipulator_with_user_id(
+    db_session_mock: AsyncSession,
+    db_user_manipulator_with_user_id: DBUserManipulator,
+) -> None:
+    await db_user_manipulator_with_user_id.update_last_send_date(
+        datetime(2026, 3, 3, 15, 41, 25),
+    )
+
+    db_session_mock.execute.assert_awaited_once()  # type: ignore[unresolved-attribute]
+
+
+@pytest.mark.asyncio
+async def test_update_last_send_date_method_of_db_user_manipulator_with_db_user(
+    db_user_manipulator_with_db_user: DBUserManipulator,
+) -> None:
+    with pytest.raises(
+        ValueError,
+        match="A user ID is absent",
+    ):
+        await db_user_manipulator_with_db_user.update_last_send_date(
+            datetime(2026, 3, 3, 15, 41, 25),
+        )
+
+
+@pytest.mark.asyncio
+async def test_delete_method_of_db_user_manipulator_with_user_id(
+    db_user_manipulator_with_user_id: DBUserManipulator,
+) -> None:
+    with pytest.raises(
+        ValueError,
+        match="A DB user is absent",
+    ):
+        await db_user_manipulator_with_user_id.delete()
+
+
+@pytest.mark.asyncio
+async def test_delete_method_of_db_user_manipulator_with_db_user(
+    db_session_mock: AsyncSession,
+    db_user_mock: User,
+    db_user_manipulator_with_db_user: DBUserManipulator,
+) -> None:
+    await db_user_manipulator_with_db_user.delete()
+
+    db_session_mock.delete.assert_awaited_once_with(db_user_mock)  # type: ignore[unresolved-attribute]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda manipulator, token: manipulator.set_authorizing_status(True),
+        lambda manipulator, token: manipulator.set_token(token),
+        lambda manipulator, token: manipulator.clear_token(),
+        lambda manipulator, token: manipulator.delete(),
+    ],
+    ids=["set_authorizing_status", "set_token", "clear_token", "delete"],
+)
+async def test_invalidation_of_cached_auth_state_on_change_of_db_user(
+    change: Callable[[DBUserManipulator, Token], Awaitable[None] | None],
+    user_id: int,
+    token_mock: Token,
+    user_auth_state_cache_mock: UserAuthStateCache,
+    cached_db_user_manipulator_with_db_user: DBUserManipulator,
+) -> None:
+    result: Awaitable[None] | None = change(
+        cached_db_user_manipulator_with_db_user,
+        token_mock,
+    )
+    if result is not None:
+        await result
+
+    user_auth_state_cache_mock.invalidate.assert_called_once_with(user_id)  # type: ignore[unresolved-attribute]
+
+
+@pytest.mark.asyncio
+async def test_invalidation_of_cached_auth_state_on_update_of_last_send_date(
+    user_id: int,
+    user_auth_state_cache_mock: UserAuthStateCache,
+    cached_db_user_manipulator_with_user_id: DBUserManipulator,
+) -> None:
+    await cached_db_user_manipulator_with_user_id.update_last_send_date(
+        datetime(2026, 3, 3, 15, 41, 25),
+    )
+
+    user_auth_state_cache_mock.invalidate.assert_called_once_with(user_id)  # type: ignore[unresolved-attribute]
+
+
 def test_get_owner_status_method_of_db_user_manipulator_with_user_id(
     db_user_manipulator_with_user_id: DBUserManipulator,
 ) -> None:
@@ -306,3 +560,49 @@ def test_get_owner_status_method_of_db_user_manipulator_with_db_user(
 
     assert isinstance(is_user_owner, bool)
     assert not is_user_owner
+
+
+@pytest.mark.asyncio
+async def test_invalidation_of_cached_auth_state_after_commit(
+    db_session_mock: AsyncSession,
+    user_id: int,
+    user_auth_state_cache_mock: UserAuthStateCache,
+    cached_db_user_manipulator_with_user_id: DBUserManipulator,
+) -> None:
+    sync_session: Session = Session()
+    db_session_mock.info = sync_session.info  # type: ignore[invalid-assignment]
+
+    await cached_db_user_manipulator_with_user_id.update_last_send_date(
+        datetime(2026, 3, 3, 15, 41, 25),
+    )
+    user_auth_state_cache_mock.invalidate.reset_mock()  # type: ignore[unresolved-attribute]
+
+    # A concurrent update could cache an old state before the commit
+    sync_session.commit()
+
+    user_auth_state_cache_mock.invalidate.assert_called_once_with(user_id)  # type: ignore[unresolved-attribute]
+
+    # An invalidation isn't repeated by a next commit
+    sync_session.commit()
+    user_auth_state_cache_mock.invalidate.assert_called_once_with(user_id)  # type: ignore[unresolved-attribute]
+
+
+@pytest.mark.asyncio
+async def test_discard_of_invalidation_of_cached_auth_state_on_rollback(
+    db_session_mock: AsyncSession,
+    user_auth_state_cache_mock: UserAuthStateCache,
+    cached_db_user_manipulator_with_user_id: DBUserManipulator,
+) -> None:
+    sync_session: Session = Session()
+    db_session_mock.info = sync_session.info  # type: ignore[invalid-assignment]
+    sync_session.begin()
+
+    await cached_db_user_manipulator_with_user_id.update_last_send_date(
+        datetime(2026, 3, 3, 15, 41, 25),
+    )
+    user_auth_state_cache_mock.invalidate.reset_mock()  # type: ignore[unresolved-attribute]
+
+    sync_session.rollback()
+    sync_session.commit()
+
+    user_auth_state_cache_mock.invalidate.assert_not_called()  # type: ignore[unresolved-attribute]
@@ -1,32 +1,23 @@
 from collections.abc import Generator
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
-from pytest_mock import MockerFixture
-from sqlalchemy import Result, Select
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import Result
+from sqlalchemy.dialects import mysql
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from message_sender_telegram_bot.libs import DBTokenManipulator, Token
-
-# select()
-select_instance_mock: MagicMock = MagicMock(
-    spec=Select,
-    # select().where
-    where=MagicMock(
-        # select().where()
-        return_value=MagicMock(
-            spec=Select,
-        )
-    ),
+from message_sender_telegram_bot.libs.rdb.manipulators import (
+    db_token_manipulator as db_token_manipulator_module,
 )
 
 
 @pytest.fixture
 def db_session_mock(
-    compiled_session_mock: sessionmaker[Session],
-) -> Generator[Session]:
+    compiled_session_mock: async_sessionmaker[AsyncSession],
+) -> Generator[AsyncSession]:
     # Session().execute
-    db_session_execute_function_mock: MagicMock = MagicMock(
+    db_session_execute_function_mock: AsyncMock = AsyncMock(
         # Session().execute()
         return_value=MagicMock(
             spec=Result,
@@ -47,34 +38,45 @@ def db_session_mock(
 
 @pytest.fixture
 def db_token_manipulator(
-    db_session_mock: Session,
+    db_session_mock: AsyncSession,
 ) -> DBTokenManipulator:
     token = "0123456789abcdef"
     return DBTokenManipulator(db_session_mock, token)
 
 
-def test_get_method_of_db_token_manipulator(
-    mocker: MockerFixture,
+@pytest.mark.asyncio
+async def test_get_method_of_db_token_manipulator(
+    db_session_mock: AsyncSession,
     db_token_manipulator: DBTokenManipulator,
 ) -> None:
-    mocker.patch(
-        (
-            "message_sender_telegram_bot.libs.rdb.manipulators."
-            "db_token_manipulator.Token"
-        ),
-        autospec=True,
-    )
-    mocker.patch(
-        (
-            "message_sender_telegram_bot.libs.rdb.manipulators."
-            "db_token_manipulator.select"
-        ),
-        autospec=True,
-        return_value=select_instance_mock,
+    db_token: Token | None = await db_token_manipulator.get()
+
+    assert isinstance(db_token, Token)
+    # The precompiled statement is executed with a bound token
+    db_session_mock.execute.assert_awaited_once_with(  # type: ignore[unresolved-attribute]
+        db_token_manipulator_module.select_token_stmt,
+        {"token": "0123456789abcdef"},
     )
-    db_token: Token | None = db_token_manipulator.get()
+
+
+@pytest.mark.asyncio
+async def test_get_for_update_method_of_db_token_manipulator(
+    db_session_mock: AsyncSession,
+    db_token_manipulator: DBTokenManipulator,
+) -> None:
+    db_token: Token | None = await db_token_manipulator.get_for_update()
 
     assert isinstance(db_token, Token)
+    # A DB token is locked by a locking statement
+    db_session_mock.execute.assert_awaited_once_with(  # type: ignore[unresolved-attribute]
+        db_token_manipulator_module.select_token_for_update_stmt,
+        {"token": "0123456789abcdef"},
+    )
+    assert "FOR UPDATE" in str(
+        db_token_manipulator_module.select_token_for_update_stmt.compile(
+            dialect=mysql.dialect()
+        )
+    )
 
 
 def test_create_method_of_db_token_manipulator(
@@ -0,0 +1,77 @@
+from collections.abc import Generator
+from typing import Any
+from uuid import UUID
+
+import pytest
+from sqlalchemy import Engine, Executable, create_engine
+from sqlalchemy.orm import Session
+
+from message_sender_telegram_bot.libs.rdb.database_tables import Base
+from message_sender_telegram_bot.libs.rdb.manipulators import (
+    db_message_manipulator,
+    db_token_manipulator,
+    db_user_manipulator,
+)
+
+# A timing of the precompiled statements is measured by
+# `benchmarks/statement_overhead.py`, so the unit tests check only a
+# reuse of the statements and their compiled forms
+
+SENDER_ID: UUID = UUID("5c0a4f4e-8f2b-4d8e-9a51-0d3b7e6a1c22")
+
+
+@pytest.fixture
+def engine() -> Generator[Engine]:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.parametrize(
+    ("precompiled_stmt", "parameters", "other_parameters"),
+    [
+        (
+            db_user_manipulator.select_user_stmt,
+            {"user_id": 6573920184},
+            {"user_id": 4018562937},
+        ),
+        (
+            db_token_manipulator.select_token_stmt,
+            {"token": "TOKEN"},
+            {"token": "OTHER_TOKEN"},
+        ),
+        (
+            db_message_manipulator.select_draft_stmt,
+            {"message_id": 1, "sender_id": SENDER_ID},
+            {"message_id": 2, "sender_id": SENDER_ID},
+        ),
+    ],
+    ids=["user", "token", "message"],
+)
+def test_reuse_of_precompiled_statement(
+    engine: Engine,
+    precompiled_stmt: Executable,
+    parameters: dict[str, Any],
+    other_parameters: dict[str, Any],
+) -> None:
+    # A cache key of a statement is generated once and is memoized on
+    # the statement
+    assert (
+        precompiled_stmt._generate_cache_key()  # type: ignore[attr-defined]
+        is precompiled_stmt._generate_cache_key()  # type: ignore[attr-defined]
+    )
+
+    with Session(engine) as db_session:
+        db_session.execute(precompiled_stmt, parameters).all()
+        compiled_cache_size: int = len(
+            engine._compiled_cache  # type: ignore[attr-defined]
+        )
+
+        db_session.execute(precompiled_stmt, other_parameters).all()
+
+        # The other parameters are bound to the same compiled form
+        assert (
+            len(engine._compiled_cache)  # type: ignore[attr-defined]
+            == compiled_cache_size
+        )
@@ -0,0 +1,273 @@
+from argparse import Namespace
+from collections.abc import Generator
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from uuid import UUID, uuid7
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+from pytest_mock import MockerFixture
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    Connection,
+    Engine,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    column,
+    create_engine,
+    false,
+    func,
+    select,
+    table,
+    true,
+)
+
+from message_sender_telegram_bot.libs.rdb.chunked_migration import (
+    ChunkedMigration,
+)
+from message_sender_telegram_bot.libs.rdb.column_types import BinaryUUID
+
+MIGRATIONS_PATH: Path = Path(__file__).parents[2] / "db_migration"
+
+metadata: MetaData = MetaData()
+message_table: Table = Table(
+    "message",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("is_sent", Boolean, nullable=False),
+)
+message_draft_table: Table = Table(
+    "message_draft",
+    metadata,
+    Column("id", Integer, primary_key=True),
+)
+
+
+@pytest.fixture
+def connection() -> Generator[Connection]:
+    database_engine: Engine = create_engine("sqlite://")
+    metadata.create_all(database_engine)
+
+    with database_engine.connect() as connection:
+        connection.execute(
+            message_table.insert(),
+            [{"id": id_, "is_sent": id_ % 2 == 0} for id_ in range(10)],
+        )
+        connection.commit()
+
+        with Operations.context(MigrationContext.configure(connection)):
+            yield connection
+
+    database_engine.dispose()
+
+
+@pytest.fixture
+def chunked_migration() -> ChunkedMigration:
+    return ChunkedMigration(batch_size=3, batch_pause=timedelta())
+
+
+def count_rows(connection: Connection, table: Table) -> int:
+    count: int | None = connection.scalar(
+        select(func.count()).select_from(table)
+    )
+
+    assert count is not None
+    return count
+
+
+def test_update_in_batches(
+    connection: Connection,
+    chunked_migration: ChunkedMigration,
+) -> None:
+    assert (
+        chunked_migration.update(
+            message_table,
+            message_table.c.id,
+            {"is_sent": true()},
+            message_table.c.is_sent == false(),
+        )
+        == 5
+    )
+
+    assert (
+        connection.scalar(
+            select(func.count()).where(message_table.c.is_sent == false())
+        )
+        == 0
+    )
+
+
+def test_copy_in_batches(
+    connection: Connection,
+    chunked_migration: ChunkedMigration,
+) -> None:
+    assert (
+        chunked_migration.copy(
+            message_draft_table,
+            ["id"],
+            select(message_table.c.id).where(
+                message_table.c.is_sent == false()
+            ),
+            message_table.c.id,
+        )
+        == 5
+    )
+
+    assert list(connection.scalars(select(message_draft_table.c.id))) == [
+        1,
+        3,
+        5,
+        7,
+        9,
+    ]
+
+
+def test_delete_of_all_rows_in_batches(
+    connection: Connection,
+    chunked_migration: ChunkedMigration,
+) -> None:
+    # 10 rows are deleted by 3, 3, 3 and 1 rows
+    assert chunked_migration.delete(message_table, message_table.c.id) == 10
+
+    assert count_rows(connection, message_table) == 0
+
+
+def test_commit_of_batches(
+    connection: Connection,
+    chunked_migration: ChunkedMigration,
+) -> None:
+    chunked_migration.delete(message_table, message_table.c.id)
+    # A rollback of a transaction of a migration doesn't restore the
+    # committed batches
+    connection.rollback()
+
+    assert count_rows(connection, message_table) == 0
+
+
+def test_render_of_one_statement_in_offline_mode(
+    chunked_migration: ChunkedMigration,
+) -> None:
+    output_buffer: StringIO = StringIO()
+    migration_context: MigrationContext = MigrationContext.configure(
+        dialect_name="sqlite",
+        opts={"as_sql": True, "output_buffer": output_buffer},
+    )
+
+    with Operations.context(migration_context):
+        assert (
+            chunked_migration.delete(
+                message_table,
+                message_table.c.id,
+                message_table.c.is_sent == false(),
+            )
+            == 0
+        )
+
+    assert output_buffer.getvalue().strip() == (
+        "DELETE FROM message WHERE message.is_sent = 0;"
+    )
+
+
+def test_raise_on_non_positive_batch_size() -> None:
+    with pytest.raises(ValueError, match="A size of a batch must be positive"):
+        ChunkedMigration(batch_size=0)
+
+
+def test_raise_on_key_column_without_table(
+    chunked_migration: ChunkedMigration,
+) -> None:
+    with pytest.raises(
+        ValueError,
+        match="A key column must belong to a table",
+    ):
+        chunked_migration.delete(message_table, column("id"))
+
+
+def test_resume_of_failed_move_of_message_drafts(
+    mocker: MockerFixture,
+    tmp_path: Path,
+) -> None:
+    database_url: str = f"sqlite:///{tmp_path / 'bot.db'}"
+    alembic_config: Config = Config()
+    alembic_config.set_main_option("script_location", str(MIGRATIONS_PATH))
+    alembic_config.set_main_option("sqlalchemy.url", database_url)
+    alembic_config.cmd_opts = Namespace(
+        x=["batch_size=2", "batch_pause=0"],
+    )
+    command.upgrade(alembic_config, "714afc81b705")
+
+    # The lightweight tables of the schema before the move of the drafts
+    user_table = table(
+        "user",
+        column("id", BinaryUUID),
+        column("user_id", BigInteger),
+        column("is_authorizing", Boolean),
+        column("is_owner", Boolean),
+    )
+    old_message_table = table(
+        "message",
+        column("id", BinaryUUID),
+        column("message_id", BigInteger),
+        column("sender_id", BinaryUUID),
+        column("text", String),
+        column("is_sent", Boolean),
+    )
+    sender_id: UUID = uuid7()
+    sent_message_id: UUID = uuid7()
+    draft_ids: list[UUID] = [uuid7() for _ in range(5)]
+    database_engine: Engine = create_engine(database_url)
+    with database_engine.begin() as connection:
+        connection.execute(
+            user_table.insert(),
+            {
+                "id": sender_id,
+                "user_id": 6573920184,
+                "is_authorizing": False,
+                "is_owner": False,
+            },
+        )
+        connection.execute(
+            old_message_table.insert(),
+            [
+                {
+                    "id": id_,
+                    "message_id": message_id,
+                    "sender_id": sender_id,
+                    "text": "Hello, World!",
+                    "is_sent": id_ == sent_message_id,
+                }
+                for message_id, id_ in enumerate([sent_message_id, *draft_ids])
+            ],
+        )
+
+    # An upgrade fails after a first batch of the copied drafts is
+    # committed
+    mocker.patch(
+        "message_sender_telegram_bot.libs.rdb.chunked_migration.sleep",
+        side_effect=OSError("A connection is lost"),
+    )
+    with pytest.raises(OSError, match="A connection is lost"):
+        command.upgrade(alembic_config, "3f1c9a7d2e84")
+    mocker.stopall()
+
+    command.upgrade(alembic_config, "3f1c9a7d2e84")
+
+    # Every draft is moved once, and only the sent message stays
+    message_draft_ids = table("message_draft", column("id", BinaryUUID)).c.id
+    with database_engine.connect() as connection:
+        assert sorted(connection.scalars(select(message_draft_ids))) == sorted(
+            draft_ids
+        )
+        assert list(connection.scalars(select(old_message_table.c.id))) == [
+            sent_message_id
+        ]
+
+    database_engine.dispose()
@@ -0,0 +1,188 @@
+import string
+from datetime import datetime
+from typing import Any
+from uuid import UUID, uuid7
+
+import pytest
+from sqlalchemy import (
+    BINARY,
+    Dialect,
+    Uuid,
+    create_engine,
+    event,
+    select,
+)
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session, undefer
+
+from message_sender_telegram_bot.libs import Message, User
+
+from message_sender_telegram_bot.libs.rdb.column_types import (
+    COMPRESSED_TEXT_MARKER,
+    BinaryUUID,
+    CompressedText,
+)
+from message_sender_telegram_bot.libs.rdb.database_tables import Base
+
+
+@pytest.fixture
+def uuid_value() -> UUID:
+    return UUID("019a0f3c-6a10-7d4e-8b2a-5f6c7d8e9f01")
+
+
+@pytest.mark.parametrize(
+    "dialect",
+    (mysql.pymysql.dialect(), mysql.aiomysql.dialect()),
+)
+def test_storing_of_uuid_as_binary_in_mysql(
+    dialect: Dialect,
+    uuid_value: UUID,
+) -> None:
+    binary_uuid = BinaryUUID()
+
+    assert isinstance(binary_uuid.load_dialect_impl(dialect), BINARY)
+    assert binary_uuid.process_bind_param(uuid_value, dialect) == (
+        uuid_value.bytes
+    )
+    assert (
+        binary_uuid.process_result_value(uuid_value.bytes, dialect)
+        == uuid_value
+    )
+
+
+@pytest.mark.parametrize(
+    "dialect",
+    (sqlite.dialect(), postgresql.dialect()),
+)
+def test_storing_of_uuid_as_uuid_in_other_dialects(
+    dialect: Dialect,
+    uuid_value: UUID,
+) -> None:
+    binary_uuid = BinaryUUID()
+
+    assert isinstance(binary_uuid.load_dialect_impl(dialect), Uuid)
+    assert binary_uuid.process_bind_param(uuid_value, dialect) == uuid_value
+    assert binary_uuid.process_result_value(uuid_value, dialect) == uuid_value
+
+
+@pytest.mark.parametrize(
+    "dialect",
+    (mysql.pymysql.dialect(), sqlite.dialect()),
+)
+def test_pass_of_none(dialect: Dialect) -> None:
+    binary_uuid = BinaryUUID()
+
+    assert binary_uuid.process_bind_param(None, dialect) is None
+    assert binary_uuid.process_result_value(None, dialect) is None
+
+
+@pytest.mark.parametrize(
+    "text",
+    (
+        "Hello, World!",
+        "Привіт, світе! " * 200,
+        "",
+    ),
+)
+def test_restoring_of_text_from_compressed_text(text: str) -> None:
+    compressed_text = CompressedText()
+    dialect: Dialect = sqlite.dialect()
+
+    stored_text = compressed_text.process_bind_param(text, dialect)
+
+    assert isinstance(stored_text, bytes)
+    assert compressed_text.process_result_value(stored_text, dialect) == text
+
+
+def test_compression_of_long_text() -> None:
+    compressed_text = CompressedText()
+    text: str = "The quick brown fox jumps over the lazy dog. " * 100
+
+    stored_text = compressed_text.process_bind_param(text, sqlite.dialect())
+
+    assert stored_text is not None
+    assert stored_text.startswith(COMPRESSED_TEXT_MARKER)
+    assert len(stored_text) < len(text) // 10
+
+
+@pytest.mark.parametrize(
+    "text",
+    (
+        # A text is shorter than a threshold
+        "Hello, World!",
+        # A text doesn't shrink after a compression
+        string.ascii_letters + string.digits + "-_",
+    ),
+)
+def test_storing_of_text_without_compression(text: str) -> None:
+    compressed_text = CompressedText(threshold=64)
+
+    assert compressed_text.process_bind_param(text, sqlite.dialect()) == (
+        text.encode()
+    )
+
+
+def test_reading_of_text_before_conversion_to_binary() -> None:
+    compressed_text = CompressedText()
+
+    assert (
+        compressed_text.process_result_value("Hello, World!", sqlite.dialect())
+        == "Hello, World!"
+    )
+
+
+def test_pass_of_none_by_compressed_text() -> None:
+    compressed_text = CompressedText()
+
+    assert compressed_text.process_bind_param(None, sqlite.dialect()) is None
+    assert compressed_text.process_result_value(None, sqlite.dialect()) is None
+
+
+def test_deferral_of_compressed_text_of_message() -> None:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    statements: list[str] = []
+
+    with Session(engine) as db_session:
+        db_user = User(
+            id_=uuid7(),
+            user_id=6573920184,
+            is_authorizing=False,
+            token_id=None,
+            token=None,
+            is_owner=False,
+            last_send_date=None,
+            messages=[],
+        )
+        db_session.add(
+            Message(
+                id_=uuid7(),
+                message_id=1074323464,
+                sender_id=db_user.id_,
+                sender=db_user,
+                text="Hello, World!" * 64,
+                sent_date=datetime(2026, 3, 3, 15, 41, 25),
+            )
+        )
+        db_session.commit()
+
+        def on_before(_: Any, __: Any, statement: str, *___: Any) -> None:
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", on_before)
+
+        # A text isn't selected and decompressed by a load of a message
+        db_message: Message = db_session.scalars(select(Message)).one()
+        assert "message.text" not in statements[-1]
+        # An access to a not loaded text doesn't emit a lazy load
+        with pytest.raises(InvalidRequestError):
+            db_message.text  # noqa: B018
+
+        db_session.expunge_all()
+        db_message = db_session.scalars(
+            select(Message).options(undefer(Message.text))
+        ).one()
+        assert db_message.text == "Hello, World!" * 64
+
+    engine.dispose()
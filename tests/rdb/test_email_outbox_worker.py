@@ -0,0 +1,520 @@
+from collections.abc import Generator
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import AsyncMock, call
+from uuid import uuid7
+
+import pytest
+from sqlalchemy import Engine, create_engine, select
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import sessionmaker
+
+from message_sender_telegram_bot.libs import (
+    CircuitOpenError,
+    DeliveryPolicy,
+    EmailOutbox,
+    EmailOutboxWorker,
+    Message,
+    User,
+)
+from message_sender_telegram_bot.libs.rdb.database_tables import Base
+from message_sender_telegram_bot.libs.types import (
+    DigestEntry,
+    EmailOutboxStats,
+)
+
+# The texts of the due deliveries and of a delivery, which is scheduled
+# later. A last due delivery is urgent
+DUE_TEXTS: tuple[str, ...] = ("First", "Second", "Third")
+URGENT_TEXT: str = "Third"
+LATER_TEXT: str = "Later"
+
+
+@pytest.fixture
+def database_url(tmp_path: Path) -> Generator[str]:
+    database_path: Path = tmp_path / "bot.db"
+    database_engine: Engine = create_engine(f"sqlite:///{database_path}")
+    Base.metadata.create_all(database_engine)
+
+    now: datetime = datetime.now()
+    with sessionmaker(database_engine).begin() as session:
+        db_user: User = User(
+            id_=uuid7(),
+            user_id=6573920184,
+            is_authorizing=False,
+            token_id=None,
+            token=None,
+            is_owner=False,
+            last_send_date=None,
+            messages=[],
+        )
+        session.add(db_user)
+        session.flush()
+        for message_id, (text, next_attempt_date) in enumerate(
+            (
+                *((text, now - timedelta(seconds=1)) for text in DUE_TEXTS),
+                (LATER_TEXT, now + timedelta(hours=1)),
+            )
+        ):
+            message: Message = Message(
+                id_=uuid7(),
+                message_id=message_id,
+                sender_id=db_user.id_,
+                sender=db_user,
+                text=text,
+                sent_date=now,
+            )
+            session.add(message)
+            session.flush()
+            session.add(
+                EmailOutbox(
+                    id_=message.id_,
+                    sender_name="@user",
+                    is_urgent=text == URGENT_TEXT,
+                    attempt_count=0,
+                    next_attempt_date=next_attempt_date,
+                    delivered_date=None,
+                )
+            )
+    database_engine.dispose()
+
+    yield f"sqlite+aiosqlite:///{database_path}"
+
+
+@pytest.fixture
+def compiled_session(
+    database_url: str,
+) -> Generator[async_sessionmaker[AsyncSession]]:
+    database_engine: AsyncEngine = create_async_engine(database_url)
+    yield async_sessionmaker(database_engine)
+    # An event loop of a test is closed already, so a pool is disposed
+    # through a sync engine
+    database_engine.sync_engine.dispose()
+
+
+async def get_deliveries(
+    compiled_session: async_sessionmaker[AsyncSession],
+) -> dict[str, EmailOutbox]:
+    async with compiled_session() as session:
+        rows = await session.execute(
+            select(Message.text, EmailOutbox).join(
+                EmailOutbox,
+                EmailOutbox.id_ == Message.id_,
+            )
+        )
+
+        return {text: delivery for text, delivery in rows.tuples()}
+
+
+@pytest.mark.asyncio
+async def test_delivery_of_due_emails_in_batches(
+    compiled_session: async_sessionmaker[AsyncSession],
+) -> None:
+    send_email_mock: AsyncMock = AsyncMock()
+    email_outbox_worker: EmailOutboxWorker = EmailOutboxWorker(
+        compiled_session,
+        send_email_mock,
+        batch_size=2,
+    )
+
+    assert await email_outbox_worker.deliver() == 3
+
+    assert send_email_mock.await_args_list == [
+        call("@user", text) for text in DUE_TEXTS
+    ]
+    deliveries: dict[str, EmailOutbox] = await get_deliveries(compiled_session)
+    for text in DUE_TEXTS:
+        assert deliveries[text].attempt_count == 1
+        assert deliveries[text].next_attempt_date is None
+        assert deliveries[text].delivered_date is not None
+    assert deliveries[LATER_TEXT].attempt_count == 0
+    assert deliveries[LATER_TEXT].delivered_date is None
+
+    # The delivered emails aren't sent again
+    assert await email_outbox_worker.deliver() == 0
+    assert send_email_mock.await_count == 3
+    assert email_outbox_worker.get_stats() == EmailOutboxStats(
+        delivered_count=3,
+        digest_count=0,
+        failed_attempt_count=0,
+        abandoned_count=0,
+    )
+
+
+@pytest.mark.asyncio
+async def test_retry_of_failed_delivery(
+    compiled_session: async_sessionmaker[AsyncSession],
+) -> None:
+    async def send_email(_: str, text: str) -> None:
+        if text == "Second":
+            raise OSError("A SMTP server is unavailable")
+
+    email_outbox_worker: EmailOutboxWorker = EmailOutboxWorker(
+        compiled_session,
+        send_email,
+        retry_delay=timedelta(minutes=1),
+    )
+    started: datetime = datetime.now()
+
+    assert await email_outbox_worker.deliver() == 2
+
+    deliveries: dict[str, EmailOutbox] = await get_deliveries(compiled_session)
+    failed_delivery: EmailOutbox = deliveries["Second"]
+    assert failed_delivery.attempt_count == 1
+    assert failed_delivery.delivered_date is None
+    assert failed_delivery.next_attempt_date is not None
+    assert failed_delivery.next_attempt_date >= started + timedelta(minutes=1)
+    assert email_outbox_worker.get_stats() == EmailOutboxStats(
+        delivered_count=2,
+        digest_count=0,
+        failed_attempt_count=1,
+        abandoned_count=0,
+    )
+
+
+@pytest.mark.asyncio
+async def test_retry_of_failed_delivery_before_lease(
+    compiled_session: async_sessionmaker[AsyncSession],
+) -> None:
+    email_outbox_worker: EmailOutboxWorker = EmailOutboxWorker(
+        compiled_session,
+        AsyncMock(side_effect=OSError("A SMTP server is unavailable")),
+        retry_delay=timedelta(minutes=1),
+        lease=timedelta(hours=1),
+    )
+    started: datetime = datetime.now()
+
+    assert await email_outbox_worker.deliver() == 0
+
+    # A lease covers only a crash during a send, so a failed delivery is
+    # due again after a retry delay
+    deliveries: dict[str, EmailOutbox] = await get_deliveries(compiled_session)
+    for text in DUE_TEXTS:
+        next_attempt_date: datetime | None = deliveries[text].next_attempt_date
+        assert next_attempt_date is not None
+        assert next_attempt_date >= started + timedelta(minutes=1)
+        assert next_attempt_date < started + timedelta(minutes=2)
+
+
+@pytest.mark.asyncio
+async def test_no_claim_of_delivery_during_lease(
+    compiled_session: async_sessionmaker[AsyncSession],
+) -> None:
+    other_send_email_mock: AsyncMock = AsyncMock()
+    other_email_outbox_worker: EmailOutboxWorker = EmailOutboxWorker(
+        compiled_session,
+        other_send_email_mock,
+    )
+
+    async def send_email(_: str, __: str) -> None:
+        # A send outlasts a retry delay, but a claimed delivery is
+        # leased, so an another worker doesn't send it again
+        assert await other_email_outbox_worker.deliver() == 0
+
+    email_outbox_worker: EmailOutboxWorker = EmailOutboxWorker(
+        compiled_session,
+        send_email,
+        retry_delay=timedelta(),
+        lease=timedelta(hours=1),
+    )
+
+    assert await email_outbox_worker.deliver() == 3
+
+    other_send_email_mock.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_release_of_rejected_delivery(
+    compiled_session: async_sessionmaker[AsyncSession],
+) -> None:
+    email_outbox_worker: EmailOutboxWorker = EmailOutboxWorker(
+        compiled_session,
+        AsyncMock(
+            side_effect=CircuitOpenError("A circuit of the sends is open"),
+        ),
+        lease=timedelta(hours=1),
+    )
+    started: datetime = datetime.now()
+
+    assert await email_outbox_worker.deliver() == 0
+
+    # A rejected send doesn't count an attempt, and its delivery is due
+    # again
+    deliveries: dict[str, EmailOutbox] = await get_deliveries(compiled_session)
+    for text in DUE_TEXTS:
+        assert deliveries[text].attempt_count == 0
+        assert deliveries[text].delivered_date is None
+        assert deliveries[text].next_attempt_date is not None
+        assert deliveries[text].next_attempt_date <= started + timedelta(
+            minutes=1
+        )
+    assert email_outbox_worker.get_stats().failed_attempt_count == 0
+
+
+@pytest.mark.asyncio
+async def test_retry_of_delivery_refused_by_server(
+    compiled_session: async_sessionmaker[AsyncSession],
+) -> None:
+    email_outbox_worker: EmailOutboxWorker = EmailOutboxWorker(
+        compiled_session,
+        AsyncMock(side_effect=ConnectionRefusedError()),
+        max_attempt_count=1,
+    )
+
+    assert await email_outbox_worker.deliver() == 0
+
+    # A refused connection reaches a SMTP server, so it counts an attempt
+    # and abandons a delivery after a last one
+    deliveries: dict[str, EmailOutbox] = await get_deliveries(compiled_session)
+    for text in DUE_TEXTS:
+        assert deliveries[text].attempt_count == 1
+        assert deliveries[text].next_attempt_date is None
+    assert email_outbox_worker.get_stats() == EmailOutboxStats(
+        delivered_count=0,
+        digest_count=0,
+        failed_attempt_count=3,
+        abandoned_count=3,
+    )
+
+
+@pytest.mark.asyncio
+async def test_no_claim_of_delivery_by_open_circuit(
+    compiled_session: async_sessionmaker[AsyncSession],
+) -> None:
+    delivery_policy: DeliveryPolicy = DeliveryPolicy(
+        max_attempt_count=1,
+        failure_threshold=1,
+    )
+    with pytest.raises(OSError, match="A SMTP server is unavailable"):
+        await delivery_policy.run(
+            AsyncMock(side_effect=OSError("A SMTP server is unavailable"))
+        )
+    send_email_mock: AsyncMock = AsyncMock()
+    email_outbox_worker: EmailOutboxWorker = EmailOutboxWorker(
+        compiled_session,
+        send_email_mock,
+        delivery_policy=delivery_policy,
+    )
+
+    assert await email_outbox_worker.deliver() == 0
+
+    send_email_mock.assert_not_awaited()
+    deliveries: dict[str, EmailOutbox] = await get_deliveries(compiled_session)
+    for text in DUE_TEXTS:
+        assert deliveries[text].attempt_count == 0
+
+
+@pytest.mark.asyncio
+async def test_claim_of_one_delivery_during_recovery(
+    compiled_session: async_sessionmaker[AsyncSession],
+) -> None:
+    now: float = 0.0
+    delivery_policy: DeliveryPolicy = DeliveryPolicy(
+        max_attempt_count=1,
+        failure_threshold=1,
+        open_duration=timedelta(seconds=60),
+        clock=lambda: now,
+    )
+    with pytest.raises(OSError, match="A SMTP server is unavailable"):
+        await delivery_policy.run(
+            AsyncMock(side_effect=OSError("A SMTP server is unavailable"))
+        )
+    now = 60.0
+    send_mock: AsyncMock = AsyncMock(
+        side_effect=OSError("A SMTP server is unavailable"),
+    )
+
+    async def send_email(_: str, __: str) -> None:
+        await delivery_policy.run(send_mock)
+
+    email_outbox_worker: EmailOutboxWorker = EmailOutboxWorker(
+        compiled_session,
+        send_email,
+        batch_size=2,
+        delivery_policy=delivery_policy,
+    )
+
+    assert await email_outbox_worker.deliver() == 0
+
+    # Only a trial send is claimed, and a failed trial opens a circuit
+    # again, so the other deliveries aren't claimed
+    send_mock.assert_awaited_once()
+    deliveries: dict[str, EmailOutbox] = await get_deliveries(compiled_session)
+    assert sorted(deliveries[text].attempt_count for text in DUE_TEXTS) == [
+        0,
+        0,
+        1,
+    ]
+    assert email_outbox_worker.get_stats().failed_attempt_count == 1
+
+
+@pytest.mark.asyncio
+async def test_abandon_of_delivery_after_last_attempt(
+    compiled_session: async_sessionmaker[AsyncSession],
+) -> None:
+    send_email_mock: AsyncMock = AsyncMock(
+        side_effect=OSError("A SMTP server is unavailable"),
+    )
+    email_outbox_worker: EmailOutboxWorker = EmailOutboxWorker(
+        compiled_session,
+        send_email_mock,
+        max_attempt_count=1,
+    )
+
+    assert await email_outbox_worker.deliver() == 0
+
+    deliveries: dict[str, EmailOutbox] = await get_deliveries(compiled_session)
+    for text in DUE_TEXTS:
+        assert deliveries[text].next_attempt_date is None
+        assert deliveries[text].delivered_date is None
+    assert email_outbox_worker.get_stats().abandoned_count == 3
+
+
+@pytest.mark.asyncio
+async def test_wait_of_digest_for_window(
+    compiled_session: async_sessionmaker[AsyncSession],
+) -> None:
+    send_email_mock: AsyncMock = AsyncMock()
+    send_email_digest_mock: AsyncMock = AsyncMock()
+    email_outbox_worker: EmailOutboxWorker = EmailOutboxWorker(
+        compiled_session,
+        send_email_mock,
+        send_email_digest=send_email_digest_mock,
+        digest_window=timedelta(hours=1),
+    )
+
+    assert await email_outbox_worker.deliver() == 1
+
+    # An urgent email is sent without a wait
+    send_email_mock.assert_awaited_once_with("@user", URGENT_TEXT)
+    send_email_digest_mock.assert_not_awaited()
+    deliveries: dict[str, EmailOutbox] = await get_deliveries(compiled_session)
+    assert deliveries["First"].attempt_count == 0
+    assert deliveries["Second"].attempt_count == 0
+
+
+@pytest.mark.asyncio
+async def test_send_of_digest_after_window(
+    compiled_session: async_sessionmaker[AsyncSession],
+) -> None:
+    send_email_digest_mock: AsyncMock = AsyncMock()
+    email_outbox_worker: EmailOutboxWorker = EmailOutboxWorker(
+        compiled_session,
+        AsyncMock(),
+        send_email_digest=send_email_digest_mock,
+        digest_window=timedelta(),
+    )
+
+    assert await email_outbox_worker.deliver() == 3
+
+    send_email_digest_mock.assert_awaited_once_with(
+        [DigestEntry("@user", "First"), DigestEntry("@user", "Second")]
+    )
+    deliveries: dict[str, EmailOutbox] = await get_deliveries(compiled_session)
+    assert deliveries["First"].delivered_date is not None
+    assert deliveries["Second"].delivered_date is not None
+    assert deliveries[LATER_TEXT].delivered_date is None
+    assert email_outbox_worker.get_stats() == EmailOutboxStats(
+        delivered_count=3,
+        digest_count=1,
+        failed_attempt_count=0,
+        abandoned_count=0,
+    )
+
+
+@pytest.mark.asyncio
+async def test_send_of_full_digest_before_window(
+    compiled_session: async_sessionmaker[AsyncSession],
+) -> None:
+    send_email_digest_mock: AsyncMock = AsyncMock()
+    email_outbox_worker: EmailOutboxWorker = EmailOutboxWorker(
+        compiled_session,
+        AsyncMock(),
+        send_email_digest=send_email_digest_mock,
+        digest_window=timedelta(hours=1),
+        digest_max_count=1,
+    )
+
+    # Every not urgent delivery fills a digest
+    assert await email_outbox_worker.deliver() == 3
+
+    assert send_email_digest_mock.await_args_list == [
+        call([DigestEntry("@user", "First")]),
+        call([DigestEntry("@user", "Second")]),
+    ]
+    assert email_outbox_worker.get_stats().digest_count == 2
+
+
+@pytest.mark.asyncio
+async def test_retry_of_failed_digest(
+    compiled_session: async_sessionmaker[AsyncSession],
+) -> None:
+    email_outbox_worker: EmailOutboxWorker = EmailOutboxWorker(
+        compiled_session,
+        AsyncMock(),
+        send_email_digest=AsyncMock(
+            side_effect=OSError("A SMTP server is unavailable"),
+        ),
+        digest_window=timedelta(),
+    )
+
+    assert await email_outbox_worker.deliver() == 1
+
+    # A digest fails as a whole, so all its deliveries are retried
+    deliveries: dict[str, EmailOutbox] = await get_deliveries(compiled_session)
+    for text in ("First", "Second"):
+        assert deliveries[text].attempt_count == 1
+        assert deliveries[text].next_attempt_date is not None
+        assert deliveries[text].delivered_date is None
+    assert email_outbox_worker.get_stats() == EmailOutboxStats(
+        delivered_count=1,
+        digest_count=0,
+        failed_attempt_count=2,
+        abandoned_count=0,
+    )
+
+
+def test_raise_on_non_positive_batch_size() -> None:
+    with pytest.raises(ValueError, match="A size of a batch must be positive"):
+        EmailOutboxWorker(async_sessionmaker(), AsyncMock(), batch_size=0)
+
+
+def test_raise_on_non_positive_max_attempt_count() -> None:
+    with pytest.raises(
+        ValueError,
+        match="A maximum number of the attempts must be positive",
+    ):
+        EmailOutboxWorker(
+            async_sessionmaker(),
+            AsyncMock(),
+            max_attempt_count=0,
+        )
+
+
+def test_raise_on_non_positive_digest_max_count() -> None:
+    with pytest.raises(
+        ValueError,
+        match="A maximum size of a digest must be positive",
+    ):
+        EmailOutboxWorker(
+            async_sessionmaker(),
+            AsyncMock(),
+            digest_max_count=0,
+        )
+
+
+def test_raise_on_digest_window_without_digest_sender() -> None:
+    with pytest.raises(
+        ValueError,
+        match="A function, which sends a digest, is absent",
+    ):
+        EmailOutboxWorker(
+            async_sessionmaker(),
+            AsyncMock(),
+            digest_window=timedelta(minutes=10),
+        )
@@ -0,0 +1,253 @@
+from collections.abc import Generator
+from datetime import datetime
+from uuid import UUID, uuid7
+
+import pytest
+from sqlalchemy import Engine, create_engine, delete, select, text, update
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session, lazyload, sessionmaker
+
+from message_sender_telegram_bot.libs import (
+    LazyLoadGuard,
+    Message,
+    Token,
+    User,
+)
+from message_sender_telegram_bot.libs.rdb.database_tables import Base
+
+user_id: int = 6573920184
+token: str = "TOKEN"
+
+
+def add_user_with_token_and_message(session: Session) -> None:
+    db_user: User = User(
+        id_=uuid7(),
+        user_id=user_id,
+        is_authorizing=False,
+        token_id=None,
+        token=Token(id_=uuid7(), token=token, user=None),
+        is_owner=False,
+        last_send_date=None,
+        messages=[],
+    )
+    session.add(db_user)
+    session.add(
+        Message(
+            id_=uuid7(),
+            message_id=1074323464,
+            sender_id=None,
+            sender=db_user,
+            text="Hello",
+            sent_date=datetime(2026, 3, 3, 15, 41, 25),
+        )
+    )
+
+
+@pytest.fixture
+def database_engine() -> Generator[Engine]:
+    database_engine: Engine = create_engine("sqlite://")
+    Base.metadata.create_all(database_engine)
+    with sessionmaker(database_engine).begin() as session:
+        add_user_with_token_and_message(session)
+    yield database_engine
+    database_engine.dispose()
+
+
+@pytest.fixture
+def lazy_load_guard() -> LazyLoadGuard:
+    return LazyLoadGuard(is_forbidding=True)
+
+
+@pytest.fixture
+def compiled_session(
+    database_engine: Engine,
+    lazy_load_guard: LazyLoadGuard,
+) -> sessionmaker[Session]:
+    compiled_session: sessionmaker[Session] = sessionmaker(
+        database_engine,
+        expire_on_commit=False,
+    )
+    lazy_load_guard.attach(compiled_session)
+
+    return compiled_session
+
+
+def test_load_of_token_with_user(
+    compiled_session: sessionmaker[Session],
+    lazy_load_guard: LazyLoadGuard,
+) -> None:
+    with compiled_session() as session:
+        db_user: User | None = session.scalar(
+            select(User).where(User.user_id == user_id)
+        )
+
+        assert db_user is not None
+        assert db_user.token is not None
+        assert db_user.token.token == token
+
+    assert lazy_load_guard.get_implicit_load_count() == 0
+
+
+def test_load_of_user_with_token(
+    compiled_session: sessionmaker[Session],
+    lazy_load_guard: LazyLoadGuard,
+) -> None:
+    with compiled_session() as session:
+        db_token: Token | None = session.scalar(
+            select(Token).where(Token.token == token)
+        )
+
+        assert db_token is not None
+        assert db_token.user is not None
+        assert db_token.user.user_id == user_id
+
+    assert lazy_load_guard.get_implicit_load_count() == 0
+
+
+def test_raise_on_access_to_messages_of_user(
+    compiled_session: sessionmaker[Session],
+) -> None:
+    with compiled_session() as session:
+        db_user: User | None = session.scalar(
+            select(User).where(User.user_id == user_id)
+        )
+
+        assert db_user is not None
+        with pytest.raises(InvalidRequestError):
+            db_user.messages
+
+
+def test_raise_on_access_to_sender_of_message(
+    compiled_session: sessionmaker[Session],
+) -> None:
+    with compiled_session() as session:
+        db_message: Message | None = session.scalar(select(Message))
+
+        assert db_message is not None
+        with pytest.raises(InvalidRequestError):
+            db_message.sender
+
+
+def test_deletion_of_user_without_load_of_messages(
+    compiled_session: sessionmaker[Session],
+    lazy_load_guard: LazyLoadGuard,
+) -> None:
+    with compiled_session() as session:
+        db_user: User | None = session.scalar(
+            select(User).where(User.user_id == user_id)
+        )
+        assert db_user is not None
+
+        # SQLite doesn't enforce the foreign keys by default, so the
+        # messages of the user are left as they are
+        session.delete(db_user)
+        session.flush()
+
+        sender_ids: list[UUID | None] = list(
+            session.scalars(select(Message.sender_id))
+        )
+
+        assert sender_ids == [db_user.id_]
+
+    assert lazy_load_guard.get_implicit_load_count() == 0
+
+
+def test_pass_of_bulk_statements(
+    compiled_session: sessionmaker[Session],
+    lazy_load_guard: LazyLoadGuard,
+) -> None:
+    with compiled_session() as session:
+        session.execute(
+            update(User)
+            .where(User.user_id == user_id)
+            .values(is_owner=True)
+            .execution_options(synchronize_session=False)
+        )
+        session.execute(
+            delete(Message).execution_options(synchronize_session=False)
+        )
+        session.execute(text("SELECT 1"))
+
+    assert lazy_load_guard.get_implicit_load_count() == 0
+
+
+def test_raise_on_refresh_of_expired_attribute(
+    compiled_session: sessionmaker[Session],
+    lazy_load_guard: LazyLoadGuard,
+) -> None:
+    with compiled_session() as session:
+        db_user: User | None = session.scalar(
+            select(User).where(User.user_id == user_id)
+        )
+        assert db_user is not None
+
+        session.expire(db_user)
+
+        with pytest.raises(RuntimeError):
+            db_user.is_owner
+
+    assert lazy_load_guard.get_implicit_load_count() == 1
+
+
+def test_count_of_lazy_loads_without_forbiddance(
+    database_engine: Engine,
+) -> None:
+    lazy_load_guard: LazyLoadGuard = LazyLoadGuard()
+    compiled_session: sessionmaker[Session] = sessionmaker(database_engine)
+    lazy_load_guard.attach(compiled_session)
+
+    with compiled_session() as session:
+        # A `raise` strategy is overridden by an option, so a sender is
+        # loaded lazily on an access
+        db_message: Message | None = session.scalar(
+            select(Message).options(lazyload(Message.sender))
+        )
+        assert db_message is not None
+
+        sender: User = db_message.sender
+
+    assert sender.user_id == user_id
+    assert lazy_load_guard.get_implicit_load_count() == 1
+
+
+@pytest.mark.asyncio
+async def test_raise_on_refresh_in_async_session(
+    lazy_load_guard: LazyLoadGuard,
+) -> None:
+    database_engine: AsyncEngine = create_async_engine("sqlite+aiosqlite://")
+    async with database_engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    # An async session executes its statements through a sync session,
+    # so the guard listens a sync session maker
+    sync_compiled_session: sessionmaker[Session] = sessionmaker()
+    lazy_load_guard.attach(sync_compiled_session)
+    compiled_session: async_sessionmaker[AsyncSession] = async_sessionmaker(
+        database_engine,
+        sync_session_class=sync_compiled_session,  # type: ignore[invalid-argument-type]
+    )
+
+    async with compiled_session() as session:
+        await session.run_sync(add_user_with_token_and_message)
+        await session.flush()
+
+        db_user: User | None = await session.scalar(
+            select(User).where(User.user_id == user_id)
+        )
+        assert db_user is not None
+        assert db_user.token is not None
+
+        session.expire(db_user)
+
+        with pytest.raises(RuntimeError):
+            await session.run_sync(lambda _: db_user.is_owner)
+
+    assert lazy_load_guard.get_implicit_load_count() == 1
+
+    await database_engine.dispose()
@@ -0,0 +1,136 @@
+import sqlite3
+from collections.abc import Generator
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import QueuePool
+
+from message_sender_telegram_bot.libs import (
+    PoolTelemetry,
+    TelemetryAsyncAdaptedQueuePool,
+)
+from message_sender_telegram_bot.libs.types import PoolStats
+
+
+@pytest.fixture
+def pool_telemetry() -> PoolTelemetry:
+    return PoolTelemetry()
+
+
+@pytest.fixture
+def pool(pool_telemetry: PoolTelemetry) -> Generator[QueuePool]:
+    pool = QueuePool(
+        lambda: sqlite3.connect(":memory:"),
+        pool_size=1,
+        max_overflow=1,
+    )
+    pool_telemetry.attach(pool)
+    yield pool
+    pool.dispose()
+
+
+def test_stats_of_pool_without_checkouts(
+    pool_telemetry: PoolTelemetry,
+) -> None:
+    assert pool_telemetry.get_stats() == PoolStats(
+        checkout_count=0,
+        checkout_wait_avg=0.0,
+        checkout_wait_max=0.0,
+        in_use=0,
+        in_use_max=0,
+        overflow_count=0,
+    )
+
+
+def test_count_of_connections_in_use(
+    pool_telemetry: PoolTelemetry,
+    pool: QueuePool,
+) -> None:
+    first_connection = pool.connect()
+    second_connection = pool.connect()
+
+    pool_stats: PoolStats = pool_telemetry.get_stats()
+    assert pool_stats.checkout_count == 2
+    assert pool_stats.in_use == 2
+
+    first_connection.close()
+    second_connection.close()
+
+    pool_stats = pool_telemetry.get_stats()
+    assert pool_stats.in_use == 0
+    assert pool_stats.in_use_max == 2
+
+
+def test_count_of_overflows(
+    pool_telemetry: PoolTelemetry,
+    pool: QueuePool,
+) -> None:
+    # The first connection fits into the pool, and the second one is
+    # opened over the pool's size
+    first_connection = pool.connect()
+    second_connection = pool.connect()
+    first_connection.close()
+    second_connection.close()
+
+    # The pooled connection is reused without an overflow
+    pool.connect().close()
+
+    assert pool_telemetry.get_stats().overflow_count == 1
+
+
+def test_record_of_checkout_wait(pool_telemetry: PoolTelemetry) -> None:
+    pool_telemetry.record_checkout_wait(0.1)
+    pool_telemetry.record_checkout_wait(0.3)
+
+    pool_stats: PoolStats = pool_telemetry.get_stats()
+    assert pool_stats.checkout_wait_avg == pytest.approx(0.2)
+    assert pool_stats.checkout_wait_max == pytest.approx(0.3)
+
+
+@pytest.fixture
+def database_engine(
+    pool_telemetry: PoolTelemetry,
+) -> Generator[AsyncEngine]:
+    database_engine: AsyncEngine = create_async_engine(
+        "sqlite+aiosqlite://",
+        poolclass=TelemetryAsyncAdaptedQueuePool,
+        telemetry=pool_telemetry,
+        pool_size=1,
+    )
+    yield database_engine
+
+
+@pytest.mark.asyncio
+async def test_record_of_checkout_wait_by_pool(
+    pool_telemetry: PoolTelemetry,
+    database_engine: AsyncEngine,
+) -> None:
+    async with database_engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+    pool_stats: PoolStats = pool_telemetry.get_stats()
+    assert pool_stats.checkout_count == 1
+    assert pool_stats.checkout_wait_max > 0.0
+
+    await database_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_keep_of_telemetry_by_recreated_pool(
+    pool_telemetry: PoolTelemetry,
+    database_engine: AsyncEngine,
+) -> None:
+    # A dispose of an engine replaces its pool with a recreated one
+    await database_engine.dispose()
+
+    async with database_engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+    assert isinstance(
+        database_engine.sync_engine.pool,
+        TelemetryAsyncAdaptedQueuePool,
+    )
+    assert pool_telemetry.get_stats().checkout_count == 1
+
+    await database_engine.dispose()
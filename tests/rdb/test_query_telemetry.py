@@ -0,0 +1,177 @@
+import logging
+from collections.abc import Generator
+from datetime import timedelta
+from functools import partial
+from typing import Any
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import Engine, create_engine, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from telegram import Update
+from telegram.ext import ContextTypes
+
+from message_sender_telegram_bot.libs import QueryTelemetry
+from message_sender_telegram_bot.libs.types import HandlerQueryStats
+
+
+@pytest.fixture
+def query_telemetry() -> QueryTelemetry:
+    return QueryTelemetry(timedelta(seconds=10))
+
+
+@pytest.fixture
+def database_engine(query_telemetry: QueryTelemetry) -> Generator[Engine]:
+    database_engine: Engine = create_engine("sqlite://")
+    query_telemetry.attach(database_engine)
+    yield database_engine
+    database_engine.dispose()
+
+
+@pytest.fixture
+def update_mock() -> Update:
+    return MagicMock(spec=Update, update_id=42)
+
+
+@pytest.fixture
+def ctx_mock() -> ContextTypes.DEFAULT_TYPE:
+    return MagicMock()
+
+
+@pytest.mark.asyncio
+async def test_count_of_queries_per_handler(
+    query_telemetry: QueryTelemetry,
+    database_engine: Engine,
+    update_mock: Update,
+    ctx_mock: ContextTypes.DEFAULT_TYPE,
+) -> None:
+    async def start(_: Update, __: ContextTypes.DEFAULT_TYPE) -> Any:
+        with database_engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+
+    wrapped_callback = query_telemetry.wrap(start)
+    await wrapped_callback(update_mock, ctx_mock)
+    await wrapped_callback(update_mock, ctx_mock)
+
+    handler_stats: HandlerQueryStats = query_telemetry.get_handler_stats()[
+        start.__qualname__
+    ]
+    assert handler_stats.update_count == 2
+    assert handler_stats.query_count == 4
+    assert handler_stats.query_count_max == 2
+    assert handler_stats.query_time > 0.0
+
+
+@pytest.mark.asyncio
+async def test_count_of_queries_of_callback_without_qualified_name(
+    query_telemetry: QueryTelemetry,
+    database_engine: Engine,
+    update_mock: Update,
+    ctx_mock: ContextTypes.DEFAULT_TYPE,
+) -> None:
+    async def start(
+        _: Update,
+        __: ContextTypes.DEFAULT_TYPE,
+        query: str,
+    ) -> Any:
+        with database_engine.connect() as connection:
+            connection.execute(text(query))
+
+    # A partial object has no qualified name, so it's named by its repr
+    callback = partial(start, query="SELECT 1")
+    await query_telemetry.wrap(callback)(update_mock, ctx_mock)
+
+    assert (
+        query_telemetry.get_handler_stats()[repr(callback)].update_count == 1
+    )
+
+
+@pytest.mark.asyncio
+async def test_count_of_queries_of_nested_scope_in_outer_scope(
+    query_telemetry: QueryTelemetry,
+    database_engine: Engine,
+    update_mock: Update,
+    ctx_mock: ContextTypes.DEFAULT_TYPE,
+) -> None:
+    async def inner(_: Update, __: ContextTypes.DEFAULT_TYPE) -> Any:
+        with database_engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+
+    wrapped_inner_callback = query_telemetry.wrap(inner)
+
+    async def outer(update: Update, ctx: ContextTypes.DEFAULT_TYPE) -> Any:
+        await wrapped_inner_callback(update, ctx)
+
+    await query_telemetry.wrap(outer)(update_mock, ctx_mock)
+
+    assert list(query_telemetry.get_handler_stats()) == [outer.__qualname__]
+
+
+def test_skip_of_queries_outside_of_scope(
+    query_telemetry: QueryTelemetry,
+    database_engine: Engine,
+) -> None:
+    with database_engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+    assert query_telemetry.get_handler_stats() == {}
+
+
+@pytest.mark.asyncio
+async def test_log_of_slow_query(
+    database_engine: Engine,
+    update_mock: Update,
+    ctx_mock: ContextTypes.DEFAULT_TYPE,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    query_telemetry: QueryTelemetry = QueryTelemetry(timedelta())
+    query_telemetry.attach(database_engine)
+
+    async def send(_: Update, __: ContextTypes.DEFAULT_TYPE) -> Any:
+        with database_engine.connect() as connection:
+            connection.execute(text("SELECT :secret"), {"secret": "TOKEN"})
+
+    with caplog.at_level(logging.WARNING):
+        await query_telemetry.wrap(send)(update_mock, ctx_mock)
+
+    assert query_telemetry.get_slow_query_count() == 1
+    assert "A slow query of an update 42" in caplog.text
+    # The parameters aren't logged
+    assert "TOKEN" not in caplog.text
+
+
+def test_drop_of_start_time_of_failed_query(
+    query_telemetry: QueryTelemetry,
+    database_engine: Engine,
+) -> None:
+    with database_engine.connect() as connection:
+        with pytest.raises(OperationalError):
+            connection.execute(text("SELECT * FROM absent"))
+
+        assert connection.info["query_started"] == []
+
+
+@pytest.mark.asyncio
+async def test_count_of_queries_of_async_engine(
+    query_telemetry: QueryTelemetry,
+    update_mock: Update,
+    ctx_mock: ContextTypes.DEFAULT_TYPE,
+) -> None:
+    database_engine: AsyncEngine = create_async_engine("sqlite+aiosqlite://")
+    # An async engine executes its statements through a sync engine in a
+    # greenlet, which shares a context of a task
+    query_telemetry.attach(database_engine.sync_engine)
+
+    async def start(_: Update, __: ContextTypes.DEFAULT_TYPE) -> Any:
+        async with database_engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    await query_telemetry.wrap(start)(update_mock, ctx_mock)
+    await database_engine.dispose()
+
+    assert (
+        query_telemetry.get_handler_stats()[start.__qualname__].query_count
+        == 1
+    )
@@ -0,0 +1,163 @@
+from collections.abc import Generator
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid7
+
+import pytest
+from sqlalchemy import Engine, create_engine, func, select
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import sessionmaker
+
+from message_sender_telegram_bot.libs import (
+    Message,
+    MessageDraft,
+    RetentionPurger,
+    User,
+)
+from message_sender_telegram_bot.libs.rdb.database_tables import Base
+from message_sender_telegram_bot.libs.types import RetentionStats
+
+
+@pytest.fixture
+def database_url(tmp_path: Path) -> Generator[str]:
+    database_path: Path = tmp_path / "bot.db"
+    database_engine: Engine = create_engine(f"sqlite:///{database_path}")
+    Base.metadata.create_all(database_engine)
+
+    now: datetime = datetime.now()
+    with sessionmaker(database_engine).begin() as session:
+        db_user: User = User(
+            id_=uuid7(),
+            user_id=6573920184,
+            is_authorizing=False,
+            token_id=None,
+            token=None,
+            is_owner=False,
+            last_send_date=None,
+            messages=[],
+        )
+        session.add(db_user)
+        session.flush()
+        # 5 expired and 2 kept sent messages and drafts
+        for message_id, age in enumerate((100, 95, 94, 93, 91, 89, 1)):
+            session.add(
+                Message(
+                    id_=uuid7(),
+                    message_id=message_id,
+                    sender_id=db_user.id_,
+                    sender=db_user,
+                    text="Hello",
+                    sent_date=now - timedelta(days=age),
+                )
+            )
+            session.add(
+                MessageDraft(
+                    id_=uuid7(),
+                    message_id=message_id,
+                    sender_id=db_user.id_,
+                    text="Hello",
+                    created_date=now - timedelta(hours=age),
+                )
+            )
+    database_engine.dispose()
+
+    yield f"sqlite+aiosqlite:///{database_path}"
+
+
+@pytest.fixture
+def compiled_session(
+    database_url: str,
+) -> Generator[async_sessionmaker[AsyncSession]]:
+    database_engine: AsyncEngine = create_async_engine(database_url)
+    yield async_sessionmaker(database_engine)
+    # An event loop of a test is closed already, so a pool is disposed
+    # through a sync engine
+    database_engine.sync_engine.dispose()
+
+
+async def count_rows(
+    compiled_session: async_sessionmaker[AsyncSession],
+    table: type[Base],
+) -> int:
+    async with compiled_session() as session:
+        count: int | None = await session.scalar(
+            select(func.count()).select_from(table)
+        )
+
+    assert count is not None
+    return count
+
+
+@pytest.mark.asyncio
+async def test_purge_of_expired_messages_in_batches(
+    compiled_session: async_sessionmaker[AsyncSession],
+) -> None:
+    retention_purger: RetentionPurger = RetentionPurger(
+        compiled_session,
+        sent_message_retention=timedelta(days=90),
+        draft_retention=timedelta(hours=90),
+        batch_size=2,
+        batch_pause=timedelta(),
+    )
+
+    assert await retention_purger.purge() == 10
+
+    assert await count_rows(compiled_session, Message) == 2
+    assert await count_rows(compiled_session, MessageDraft) == 2
+    retention_stats: RetentionStats = retention_purger.get_stats()
+    # 5 expired rows of every table are deleted by 2, 2 and 1 rows
+    assert retention_stats.batch_count == 6
+    assert retention_stats.deleted_message_count == 5
+    assert retention_stats.deleted_draft_count == 5
+    assert retention_stats.batch_time_max >= retention_stats.batch_time_avg
+
+
+@pytest.mark.asyncio
+async def test_purge_without_sent_message_retention(
+    compiled_session: async_sessionmaker[AsyncSession],
+) -> None:
+    retention_purger: RetentionPurger = RetentionPurger(
+        compiled_session,
+        draft_retention=timedelta(hours=90),
+    )
+
+    # The sent messages are kept without their retention
+    assert await retention_purger.purge() == 5
+
+    assert await count_rows(compiled_session, Message) == 7
+    assert await count_rows(compiled_session, MessageDraft) == 2
+    assert retention_purger.get_stats().deleted_message_count == 0
+
+
+@pytest.mark.asyncio
+async def test_purge_without_expired_messages(
+    compiled_session: async_sessionmaker[AsyncSession],
+) -> None:
+    retention_purger: RetentionPurger = RetentionPurger(
+        compiled_session,
+        sent_message_retention=timedelta(days=365),
+        draft_retention=timedelta(days=365),
+    )
+
+    assert await retention_purger.purge() == 0
+
+    assert retention_purger.get_stats() == RetentionStats(
+        batch_count=0,
+        deleted_message_count=0,
+        deleted_draft_count=0,
+        batch_time_avg=0.0,
+        batch_time_max=0.0,
+    )
+
+
+def test_raise_on_non_positive_batch_size() -> None:
+    with pytest.raises(ValueError, match="A size of a batch must be positive"):
+        RetentionPurger(
+            async_sessionmaker(),
+            batch_size=0,
+        )
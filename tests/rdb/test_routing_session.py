@@ -0,0 +1,259 @@
+from collections.abc import Generator
+from datetime import datetime
+from pathlib import Path
+from uuid import UUID, uuid7
+
+import pytest
+from sqlalchemy import Engine, create_engine, select, update
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import sessionmaker
+
+from message_sender_telegram_bot.libs import (
+    DBMessageManipulator,
+    RoutingSession,
+    User,
+)
+from message_sender_telegram_bot.libs.rdb.database_tables import (
+    Base,
+    MessageDraft,
+)
+from message_sender_telegram_bot.libs.rdb.manipulators.db_token_manipulator import (
+    select_token_for_update_stmt,
+)
+from message_sender_telegram_bot.libs.types import MessageState
+
+user_id: int = 6573920184
+
+
+@pytest.fixture
+def primary_engine(tmp_path: Path) -> Generator[Engine]:
+    primary_engine: Engine = create_engine(
+        f"sqlite:///{tmp_path / 'primary.db'}"
+    )
+    Base.metadata.create_all(primary_engine)
+    yield primary_engine
+    primary_engine.dispose()
+
+
+@pytest.fixture
+def replica_engine(tmp_path: Path) -> Generator[Engine]:
+    # The replica is left empty, so a statement, which finds a row, is
+    # routed to the primary
+    replica_engine: Engine = create_engine(
+        f"sqlite:///{tmp_path / 'replica.db'}"
+    )
+    Base.metadata.create_all(replica_engine)
+    yield replica_engine
+    replica_engine.dispose()
+
+
+@pytest.fixture
+def compiled_session(
+    primary_engine: Engine,
+    replica_engine: Engine,
+) -> sessionmaker[RoutingSession]:
+    with sessionmaker(primary_engine).begin() as session:
+        session.add(
+            User(
+                id_=uuid7(),
+                user_id=user_id,
+                is_authorizing=False,
+                token_id=None,
+                token=None,
+                is_owner=False,
+                last_send_date=None,
+                messages=[],
+            )
+        )
+
+    return sessionmaker(
+        primary_engine,
+        class_=RoutingSession,
+        replica_bind=replica_engine,
+    )
+
+
+def test_routing_of_select_to_replica(
+    compiled_session: sessionmaker[RoutingSession],
+) -> None:
+    with compiled_session() as session:
+        db_user: User | None = session.scalar(
+            select(User).where(User.user_id == user_id)
+        )
+
+    assert db_user is None
+
+
+def test_routing_of_select_with_primary_bind_to_primary(
+    compiled_session: sessionmaker[RoutingSession],
+) -> None:
+    with compiled_session() as session:
+        db_user: User | None = session.scalar(
+            select(User)
+            .where(User.user_id == user_id)
+            .with_for_update()
+            .execution_options(bind="primary")
+        )
+
+    assert db_user is not None
+
+
+def test_routing_of_select_for_update_of_token_to_primary(
+    compiled_session: sessionmaker[RoutingSession],
+) -> None:
+    with compiled_session() as session:
+        session.scalar(select_token_for_update_stmt, {"token": "TOKEN"})
+
+        # A lock of a token is a part of a write, so the statements
+        # after it follow it
+        db_user: User | None = session.scalar(
+            select(User).where(User.user_id == user_id)
+        )
+
+    assert db_user is not None
+
+
+def test_routing_of_select_after_update_to_primary(
+    compiled_session: sessionmaker[RoutingSession],
+) -> None:
+    with compiled_session() as session:
+        session.execute(
+            update(User)
+            .where(User.user_id == user_id)
+            .values(is_authorizing=True)
+            .execution_options(synchronize_session=False)
+        )
+        db_user: User | None = session.scalar(
+            select(User).where(User.user_id == user_id)
+        )
+
+        assert db_user is not None
+        assert db_user.is_authorizing
+
+
+def test_routing_of_select_after_flush_to_primary(
+    compiled_session: sessionmaker[RoutingSession],
+) -> None:
+    with compiled_session() as session:
+        session.add(
+            User(
+                id_=uuid7(),
+                user_id=user_id + 1,
+                is_authorizing=True,
+                token_id=None,
+                token=None,
+                is_owner=False,
+                last_send_date=None,
+                messages=[],
+            )
+        )
+        # The pending user is flushed before the query, so the query
+        # follows the write
+        db_user: User | None = session.scalar(
+            select(User).where(User.user_id == user_id)
+        )
+
+    assert db_user is not None
+
+
+def test_routing_of_select_to_primary_without_replica(
+    primary_engine: Engine,
+    compiled_session: sessionmaker[RoutingSession],
+) -> None:
+    with sessionmaker(primary_engine, class_=RoutingSession)() as session:
+        db_user: User | None = session.scalar(
+            select(User).where(User.user_id == user_id)
+        )
+
+    assert db_user is not None
+
+
+@pytest.mark.asyncio
+async def test_routing_of_select_to_replica_by_async_session(
+    tmp_path: Path,
+    compiled_session: sessionmaker[RoutingSession],
+) -> None:
+    primary_engine: AsyncEngine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}"
+    )
+    replica_engine: AsyncEngine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}"
+    )
+    # An async session passes an unknown argument to a sync session
+    async_compiled_session: async_sessionmaker[AsyncSession] = (
+        async_sessionmaker(
+            primary_engine,
+            sync_session_class=RoutingSession,
+            replica_bind=replica_engine.sync_engine,
+        )
+    )
+
+    async with async_compiled_session() as session:
+        db_user: User | None = await session.scalar(
+            select(User).where(User.user_id == user_id)
+        )
+
+    assert db_user is None
+
+    await primary_engine.dispose()
+    await replica_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_routing_of_message_state_to_primary_by_async_session(
+    tmp_path: Path,
+    primary_engine: Engine,
+    compiled_session: sessionmaker[RoutingSession],
+) -> None:
+    draft_id: UUID = uuid7()
+    # A draft is created by a previous update and isn't replicated yet
+    with sessionmaker(primary_engine).begin() as session:
+        sender_id: UUID = session.scalars(
+            select(User.id_).where(User.user_id == user_id)
+        ).one()
+        session.add(
+            MessageDraft(
+                id_=draft_id,
+                message_id=1,
+                sender_id=sender_id,
+                text="Text",
+                created_date=datetime.now(),
+            )
+        )
+
+    primary_engine: AsyncEngine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}"
+    )
+    replica_engine: AsyncEngine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}"
+    )
+    async_compiled_session: async_sessionmaker[AsyncSession] = (
+        async_sessionmaker(
+            primary_engine,
+            sync_session_class=RoutingSession,
+            replica_bind=replica_engine.sync_engine,
+        )
+    )
+
+    async with async_compiled_session() as session:
+        message_state: MessageState | None = await DBMessageManipulator(
+            session,
+            1,
+            sender_id=sender_id,
+        ).get_state()
+
+    assert message_state == MessageState(
+        id_=draft_id,
+        message_id=1,
+        sender_id=sender_id,
+        text="Text",
+        is_sent=False,
+    )
+
+    await primary_engine.dispose()
+    await replica_engine.dispose()
@@ -0,0 +1,164 @@
+from collections.abc import Generator
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from telegram import Update
+from telegram.ext import ContextTypes
+
+from message_sender_telegram_bot.libs import SessionScope
+
+
+@pytest.fixture
+def db_session_mock(
+    compiled_session_mock: async_sessionmaker[AsyncSession],
+) -> AsyncSession:
+    db_session_mock: AsyncSession = (
+        compiled_session_mock.return_value.__aenter__.return_value  # type: ignore[unresolved-attribute]
+    )
+    db_session_mock.commit = AsyncMock()  # type: ignore[invalid-assignment]
+    return db_session_mock
+
+
+@pytest.fixture
+def session_scope(
+    compiled_session_mock: async_sessionmaker[AsyncSession],
+) -> Generator[SessionScope]:
+    session_scope = SessionScope(compiled_session_mock)
+    yield session_scope
+    del session_scope
+
+
+@pytest.fixture
+def update_mock() -> Update:
+    return MagicMock(spec=Update)
+
+
+@pytest.fixture
+def ctx_mock() -> ContextTypes.DEFAULT_TYPE:
+    return MagicMock()
+
+
+def test_reject_of_getting_of_session_outside_of_scope(
+    session_scope: SessionScope,
+) -> None:
+    with pytest.raises(
+        RuntimeError,
+        match="A DB session is absent outside of a scope",
+    ):
+        _ = session_scope.session
+
+
+@pytest.mark.asyncio
+async def test_share_of_session_inside_of_scope(
+    session_scope: SessionScope,
+    db_session_mock: AsyncSession,
+    update_mock: Update,
+    ctx_mock: ContextTypes.DEFAULT_TYPE,
+) -> None:
+    async def callback(_: Update, __: ContextTypes.DEFAULT_TYPE) -> Any:
+        return session_scope.session
+
+    session: AsyncSession = await session_scope.wrap(callback)(
+        update_mock,
+        ctx_mock,
+    )
+
+    assert session is db_session_mock
+
+
+@pytest.mark.asyncio
+async def test_single_commit_of_session_after_callback(
+    session_scope: SessionScope,
+    db_session_mock: AsyncSession,
+    update_mock: Update,
+    ctx_mock: ContextTypes.DEFAULT_TYPE,
+) -> None:
+    callback_mock: AsyncMock = AsyncMock(return_value=None)
+
+    await session_scope.wrap(callback_mock)(update_mock, ctx_mock)
+
+    callback_mock.assert_awaited_once_with(update_mock, ctx_mock)
+    db_session_mock.commit.assert_awaited_once()  # type: ignore[unresolved-attribute]
+
+    # The session is released after the scope
+    with pytest.raises(RuntimeError):
+        _ = session_scope.session
+
+
+@pytest.mark.asyncio
+async def test_early_commit_of_session_inside_of_scope(
+    session_scope: SessionScope,
+    db_session_mock: AsyncSession,
+    update_mock: Update,
+    ctx_mock: ContextTypes.DEFAULT_TYPE,
+) -> None:
+    async def callback(_: Update, __: ContextTypes.DEFAULT_TYPE) -> Any:
+        await session_scope.commit()
+        db_session_mock.commit.assert_awaited_once()  # type: ignore[unresolved-attribute]
+
+    await session_scope.wrap(callback)(update_mock, ctx_mock)
+
+    # A session is committed again at the end of the scope
+    assert db_session_mock.commit.await_count == 2  # type: ignore[unresolved-attribute]
+
+
+@pytest.mark.asyncio
+async def test_reject_of_commit_outside_of_scope(
+    session_scope: SessionScope,
+) -> None:
+    with pytest.raises(
+        RuntimeError,
+        match="A DB session is absent outside of a scope",
+    ):
+        await session_scope.commit()
+
+
+@pytest.mark.asyncio
+async def test_absence_of_commit_of_session_after_failed_callback(
+    session_scope: SessionScope,
+    db_session_mock: AsyncSession,
+    update_mock: Update,
+    ctx_mock: ContextTypes.DEFAULT_TYPE,
+) -> None:
+    callback_mock: AsyncMock = AsyncMock(side_effect=ValueError)
+
+    with pytest.raises(ValueError):
+        await session_scope.wrap(callback_mock)(update_mock, ctx_mock)
+
+    db_session_mock.commit.assert_not_awaited()  # type: ignore[unresolved-attribute]
+
+    with pytest.raises(RuntimeError):
+        _ = session_scope.session
+
+
+@pytest.mark.asyncio
+async def test_reuse_of_outer_session_inside_of_nested_scope(
+    session_scope: SessionScope,
+    compiled_session_mock: async_sessionmaker[AsyncSession],
+    db_session_mock: AsyncSession,
+    update_mock: Update,
+    ctx_mock: ContextTypes.DEFAULT_TYPE,
+) -> None:
+    async def inner_callback(
+        _: Update,
+        __: ContextTypes.DEFAULT_TYPE,
+    ) -> Any:
+        return session_scope.session
+
+    async def outer_callback(
+        update: Update,
+        ctx: ContextTypes.DEFAULT_TYPE,
+    ) -> Any:
+        return await session_scope.wrap(inner_callback)(update, ctx)
+
+    session: AsyncSession = await session_scope.wrap(outer_callback)(
+        update_mock,
+        ctx_mock,
+    )
+
+    assert session is db_session_mock
+    # Only the outer scope opens and commits a session
+    compiled_session_mock.assert_called_once()  # type: ignore[unresolved-attribute]
+    db_session_mock.commit.assert_awaited_once()  # type: ignore[unresolved-attribute]
@@ -0,0 +1,57 @@
+from collections.abc import Generator
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from sqlalchemy import Engine, create_engine, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from message_sender_telegram_bot.libs import SQLitePragmas
+
+
+@pytest.fixture
+def sqlite_pragmas() -> SQLitePragmas:
+    return SQLitePragmas("normal", timedelta(seconds=2))
+
+
+@pytest.fixture
+def database_engine(
+    tmp_path: Path,
+    sqlite_pragmas: SQLitePragmas,
+) -> Generator[Engine]:
+    database_engine: Engine = create_engine(f"sqlite:///{tmp_path / 'bot.db'}")
+    sqlite_pragmas.attach(database_engine)
+    yield database_engine
+    database_engine.dispose()
+
+
+def test_set_of_pragmas_on_connect(database_engine: Engine) -> None:
+    with database_engine.connect() as connection:
+        assert connection.scalar(text("PRAGMA journal_mode")) == "wal"
+        # A `NORMAL` mode is stored as 1
+        assert connection.scalar(text("PRAGMA synchronous")) == 1
+        assert connection.scalar(text("PRAGMA busy_timeout")) == 2000
+        assert connection.scalar(text("PRAGMA foreign_keys")) == 1
+
+
+def test_raise_on_unknown_synchronous_mode() -> None:
+    with pytest.raises(ValueError, match="A `synchronous` mode is unknown"):
+        SQLitePragmas("NORMAL; DROP TABLE user")
+
+
+@pytest.mark.asyncio
+async def test_set_of_pragmas_on_connect_of_async_engine(
+    tmp_path: Path,
+    sqlite_pragmas: SQLitePragmas,
+) -> None:
+    database_engine: AsyncEngine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'bot.db'}"
+    )
+    # An async engine opens its connections through a sync engine
+    sqlite_pragmas.attach(database_engine.sync_engine)
+
+    async with database_engine.connect() as connection:
+        assert await connection.scalar(text("PRAGMA journal_mode")) == "wal"
+        assert await connection.scalar(text("PRAGMA busy_timeout")) == 2000
+
+    await database_engine.dispose()
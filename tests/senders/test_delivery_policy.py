@@ -0,0 +1,315 @@
+import asyncio
+from datetime import timedelta
+from smtplib import SMTPDataError, SMTPServerDisconnected
+from typing import Self
+from unittest.mock import AsyncMock, call
+
+import pytest
+from pytest_mock import MockerFixture
+
+from message_sender_telegram_bot.libs import CircuitOpenError, DeliveryPolicy
+from message_sender_telegram_bot.libs.consts import CircuitStates
+from message_sender_telegram_bot.libs.types import DeliveryPolicyStats
+
+
+class Clock:
+    def __init__(self: Self) -> None:
+        self.now: float = 0.0
+
+    def __call__(self: Self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> Clock:
+    return Clock()
+
+
+@pytest.fixture
+def sleep_mock(mocker: MockerFixture) -> AsyncMock:
+    return mocker.patch(
+        (
+            "message_sender_telegram_bot.libs.senders.delivery_policy."
+            "asyncio.sleep"
+        ),
+        new=AsyncMock(),
+    )
+
+
+@pytest.fixture
+def delivery_policy(clock: Clock) -> DeliveryPolicy:
+    return DeliveryPolicy(
+        max_attempt_count=1,
+        failure_threshold=2,
+        open_duration=timedelta(seconds=60),
+        clock=clock,
+    )
+
+
+async def open_circuit(delivery_policy: DeliveryPolicy) -> None:
+    for _ in range(2):
+        with pytest.raises(SMTPServerDisconnected):
+            await delivery_policy.run(
+                AsyncMock(side_effect=SMTPServerDisconnected())
+            )
+
+
+@pytest.mark.asyncio
+async def test_retry_of_failed_send_with_backoff(
+    sleep_mock: AsyncMock,
+) -> None:
+    delivery_policy: DeliveryPolicy = DeliveryPolicy(
+        max_attempt_count=5,
+        base_delay=timedelta(seconds=1),
+        max_delay=timedelta(seconds=3),
+        failure_threshold=10,
+        jitter=lambda: 1.0,
+    )
+    operation: AsyncMock = AsyncMock(
+        side_effect=[
+            OSError("A network is unreachable"),
+            SMTPServerDisconnected(),
+            OSError("A network is unreachable"),
+            OSError("A network is unreachable"),
+            "SENT",
+        ]
+    )
+
+    assert await delivery_policy.run(operation) == "SENT"
+
+    assert operation.await_count == 5
+    # A delay is doubled before every retry and is capped
+    assert sleep_mock.await_args_list == [
+        call(1.0),
+        call(2.0),
+        call(3.0),
+        call(3.0),
+    ]
+    assert delivery_policy.get_stats() == DeliveryPolicyStats(
+        state=CircuitStates.CLOSED,
+        attempt_count=5,
+        retry_count=4,
+        timeout_count=0,
+        rejected_count=0,
+        opened_count=0,
+        half_opened_count=0,
+        closed_count=0,
+    )
+
+
+@pytest.mark.asyncio
+async def test_jitter_of_delay(sleep_mock: AsyncMock) -> None:
+    delivery_policy: DeliveryPolicy = DeliveryPolicy(
+        max_attempt_count=2,
+        base_delay=timedelta(seconds=4),
+        jitter=lambda: 0.25,
+    )
+
+    with pytest.raises(OSError, match="A network is unreachable"):
+        await delivery_policy.run(
+            AsyncMock(side_effect=OSError("A network is unreachable"))
+        )
+
+    sleep_mock.assert_awaited_once_with(1.0)
+
+
+@pytest.mark.asyncio
+async def test_timeout_of_attempt() -> None:
+    delivery_policy: DeliveryPolicy = DeliveryPolicy(
+        max_attempt_count=1,
+        attempt_timeout=timedelta(milliseconds=10),
+    )
+
+    async def stall() -> None:
+        await asyncio.sleep(5)
+
+    with pytest.raises(TimeoutError):
+        await delivery_policy.run(stall)
+
+    assert delivery_policy.get_stats().timeout_count == 1
+
+
+@pytest.mark.asyncio
+async def test_no_timeout_of_attempt_without_attempt_timeout(
+    mocker: MockerFixture,
+) -> None:
+    wait_for_spy = mocker.spy(asyncio, "wait_for")
+    delivery_policy: DeliveryPolicy = DeliveryPolicy(attempt_timeout=None)
+
+    assert await delivery_policy.run(AsyncMock(return_value="SENT")) == "SENT"
+
+    # An attempt, which times out itself, is only awaited
+    assert wait_for_spy.call_args.args[1] is None
+
+
+@pytest.mark.asyncio
+async def test_no_retry_of_permanent_error(sleep_mock: AsyncMock) -> None:
+    delivery_policy: DeliveryPolicy = DeliveryPolicy(failure_threshold=1)
+    operation: AsyncMock = AsyncMock(
+        side_effect=SMTPDataError(554, b"5.6.0 A message is rejected"),
+    )
+
+    with pytest.raises(SMTPDataError):
+        await delivery_policy.run(operation)
+
+    # A server answers, so a circuit stays closed
+    operation.assert_awaited_once()
+    sleep_mock.assert_not_awaited()
+    assert delivery_policy.get_stats().state == CircuitStates.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_rejection_of_send_by_open_circuit(
+    delivery_policy: DeliveryPolicy,
+) -> None:
+    await open_circuit(delivery_policy)
+    operation: AsyncMock = AsyncMock()
+
+    with pytest.raises(
+        CircuitOpenError,
+        match="A circuit of the sends is open",
+    ):
+        await delivery_policy.run(operation)
+
+    operation.assert_not_awaited()
+    assert delivery_policy.is_short_circuited()
+    stats: DeliveryPolicyStats = delivery_policy.get_stats()
+    assert stats.state == CircuitStates.OPEN
+    assert stats.opened_count == 1
+    assert stats.rejected_count == 1
+
+
+@pytest.mark.asyncio
+async def test_attempt_of_send_refused_by_server(
+    delivery_policy: DeliveryPolicy,
+) -> None:
+    operation: AsyncMock = AsyncMock(side_effect=ConnectionRefusedError())
+
+    # A refused connection is a failed attempt, not a rejection by a
+    # circuit
+    with pytest.raises(ConnectionRefusedError) as exc_info:
+        await delivery_policy.run(operation)
+
+    assert not isinstance(exc_info.value, CircuitOpenError)
+    operation.assert_awaited_once()
+    stats: DeliveryPolicyStats = delivery_policy.get_stats()
+    assert stats.attempt_count == 1
+    assert stats.rejected_count == 0
+
+
+@pytest.mark.asyncio
+async def test_close_of_circuit_after_successful_trial(
+    delivery_policy: DeliveryPolicy,
+    clock: Clock,
+) -> None:
+    await open_circuit(delivery_policy)
+    clock.now = 60.0
+
+    assert not delivery_policy.is_short_circuited()
+    assert delivery_policy.is_recovering()
+    assert await delivery_policy.run(AsyncMock(return_value="SENT")) == "SENT"
+
+    assert not delivery_policy.is_recovering()
+
+    stats: DeliveryPolicyStats = delivery_policy.get_stats()
+    assert stats.state == CircuitStates.CLOSED
+    assert stats.half_opened_count == 1
+    assert stats.closed_count == 1
+
+
+@pytest.mark.asyncio
+async def test_reopen_of_circuit_after_failed_trial(
+    delivery_policy: DeliveryPolicy,
+    clock: Clock,
+) -> None:
+    await open_circuit(delivery_policy)
+    clock.now = 60.0
+
+    with pytest.raises(SMTPServerDisconnected):
+        await delivery_policy.run(
+            AsyncMock(side_effect=SMTPServerDisconnected())
+        )
+
+    # A circuit is opened by one failed trial
+    assert delivery_policy.is_short_circuited()
+    stats: DeliveryPolicyStats = delivery_policy.get_stats()
+    assert stats.state == CircuitStates.OPEN
+    assert stats.opened_count == 2
+    assert stats.half_opened_count == 1
+
+
+@pytest.mark.asyncio
+async def test_rejection_of_concurrent_send_during_trial(
+    delivery_policy: DeliveryPolicy,
+    clock: Clock,
+) -> None:
+    await open_circuit(delivery_policy)
+    clock.now = 60.0
+    is_trial_started: asyncio.Event = asyncio.Event()
+    is_server_answered: asyncio.Event = asyncio.Event()
+
+    async def send() -> None:
+        is_trial_started.set()
+        await is_server_answered.wait()
+
+    trial_task = asyncio.create_task(delivery_policy.run(send))
+    await is_trial_started.wait()
+
+    # Only one send checks a recovering server
+    assert delivery_policy.is_short_circuited()
+    with pytest.raises(CircuitOpenError):
+        await delivery_policy.run(AsyncMock())
+
+    is_server_answered.set()
+    await trial_task
+    assert delivery_policy.get_stats().state == CircuitStates.CLOSED
+
+
+def test_max_duration_of_send() -> None:
+    delivery_policy: DeliveryPolicy = DeliveryPolicy(
+        max_attempt_count=4,
+        base_delay=timedelta(seconds=1),
+        max_delay=timedelta(seconds=3),
+        attempt_timeout=timedelta(seconds=10),
+    )
+
+    # 4 attempts and the capped delays of 1, 2 and 3 seconds between them
+    assert delivery_policy.get_max_duration() == timedelta(seconds=46)
+
+
+def test_max_duration_of_send_with_attempt_duration() -> None:
+    delivery_policy: DeliveryPolicy = DeliveryPolicy(
+        max_attempt_count=2,
+        base_delay=timedelta(seconds=1),
+        attempt_timeout=None,
+    )
+
+    assert delivery_policy.get_max_duration(
+        timedelta(seconds=10)
+    ) == timedelta(seconds=21)
+
+
+def test_raise_on_unknown_max_duration_of_attempt() -> None:
+    delivery_policy: DeliveryPolicy = DeliveryPolicy(attempt_timeout=None)
+
+    with pytest.raises(
+        ValueError,
+        match="A maximum duration of an attempt is unknown",
+    ):
+        delivery_policy.get_max_duration()
+
+
+def test_raise_on_non_positive_max_attempt_count() -> None:
+    with pytest.raises(
+        ValueError,
+        match="A maximum number of the attempts must be positive",
+    ):
+        DeliveryPolicy(max_attempt_count=0)
+
+
+def test_raise_on_non_positive_failure_threshold() -> None:
+    with pytest.raises(
+        ValueError,
+        match="A threshold of the failures must be positive",
+    ):
+        DeliveryPolicy(failure_threshold=0)
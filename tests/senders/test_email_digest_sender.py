@@ -0,0 +1,55 @@
+from smtplib import SMTP
+from unittest.mock import MagicMock
+
+import pytest
+
+from message_sender_telegram_bot.libs import EmailDigestSender
+from message_sender_telegram_bot.libs.types import DigestEntry
+
+
+@pytest.fixture
+def smtp_mock() -> SMTP:
+    return MagicMock(spec=SMTP)
+
+
+@pytest.fixture
+def email_digest_sender(smtp_mock: SMTP) -> EmailDigestSender:
+    return EmailDigestSender(
+        smtp_mock,
+        "mail1@example.com",
+        "mail2@example.com",
+    )
+
+
+def test_send_of_digest_with_section_of_every_sender(
+    smtp_mock: SMTP,
+    email_digest_sender: EmailDigestSender,
+) -> None:
+    email_digest_sender.send(
+        [
+            DigestEntry("@john", "Hello, World!"),
+            DigestEntry("@mike", "Привет, Мир!"),
+            DigestEntry("@john", "Bye"),
+        ]
+    )
+
+    from_addr, to_addr, message = smtp_mock.sendmail.call_args.args  # type: ignore[unresolved-attribute]
+    assert (from_addr, to_addr) == ("mail1@example.com", "mail2@example.com")
+    # The messages of one sender are grouped in an order of the entries
+    assert message.decode() == (
+        "Subject: A digest of 3 messages from Telegram\n\n"
+        "== @john (2 messages) ==\n\n"
+        "Hello, World!\n\n---\n\nBye\n\n"
+        "== @mike (1 message) ==\n\n"
+        "Привет, Мир!"
+    )
+
+
+def test_raise_on_send_of_empty_digest(
+    smtp_mock: SMTP,
+    email_digest_sender: EmailDigestSender,
+) -> None:
+    with pytest.raises(ValueError, match="The entries are absent"):
+        email_digest_sender.send([])
+
+    smtp_mock.sendmail.assert_not_called()  # type: ignore[unresolved-attribute]
@@ -1,4 +1,5 @@
 from collections.abc import Generator
+from datetime import timedelta
 from smtplib import SMTP, SMTP_SSL, SMTPAuthenticationError
 from unittest.mock import MagicMock
 
@@ -87,3 +88,38 @@ def test_success_work_of_context_manager(
 ) -> None:
     with gmail_smtp_creator as smtp:
         assert isinstance(smtp, SMTP)
+
+
+def test_timeout_of_smtp(mocker: MockerFixture) -> None:
+    smtp_ssl_class_mock = mocker.patch(
+        (
+            "message_sender_telegram_bot.libs.smtp_creators."
+            "gmail_smtp_creator.SMTP_SSL"
+        ),
+        autospec=True,
+    )
+
+    GmailSMTPCreator(
+        CORRECT_SMTP_TEST_LOGIN,
+        CORRECT_SMTP_TEST_PASSWORD,
+        timedelta(seconds=30),
+    ).create()
+
+    assert smtp_ssl_class_mock.call_args.kwargs["timeout"] == 30.0
+
+
+def test_default_timeout_of_smtp(mocker: MockerFixture) -> None:
+    smtp_ssl_class_mock = mocker.patch(
+        (
+            "message_sender_telegram_bot.libs.smtp_creators."
+            "gmail_smtp_creator.SMTP_SSL"
+        ),
+        autospec=True,
+    )
+
+    GmailSMTPCreator(
+        CORRECT_SMTP_TEST_LOGIN,
+        CORRECT_SMTP_TEST_PASSWORD,
+    ).create()
+
+    assert "timeout" not in smtp_ssl_class_mock.call_args.kwargs
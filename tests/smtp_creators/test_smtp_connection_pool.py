@@ -0,0 +1,229 @@
+from datetime import timedelta
+from smtplib import SMTP, SMTPServerDisconnected
+from threading import Thread
+from typing import Self
+from unittest.mock import MagicMock
+
+import pytest
+
+from message_sender_telegram_bot.libs import SMTPConnectionPool
+from message_sender_telegram_bot.libs.interfaces import SMTPCreator
+from message_sender_telegram_bot.libs.types import SMTPPoolStats
+
+
+class Clock:
+    def __init__(self: Self) -> None:
+        self.now: float = 0.0
+
+    def __call__(self: Self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> Clock:
+    return Clock()
+
+
+@pytest.fixture
+def smtp_creator_mock() -> SMTPCreator:
+    return MagicMock(
+        spec=SMTPCreator,
+        create=MagicMock(
+            side_effect=lambda: MagicMock(
+                spec=SMTP,
+                noop=MagicMock(return_value=(250, b"2.0.0 OK")),
+            )
+        ),
+    )
+
+
+@pytest.fixture
+def smtp_pool(
+    smtp_creator_mock: SMTPCreator,
+    clock: Clock,
+) -> SMTPConnectionPool:
+    return SMTPConnectionPool(
+        smtp_creator_mock,
+        max_size=2,
+        keepalive_interval=timedelta(seconds=60),
+        clock=clock,
+    )
+
+
+def test_reuse_of_connection(
+    smtp_creator_mock: SMTPCreator,
+    smtp_pool: SMTPConnectionPool,
+) -> None:
+    first_smtp = smtp_pool.run(lambda smtp: smtp)
+    second_smtp = smtp_pool.run(lambda smtp: smtp)
+
+    assert first_smtp is second_smtp
+    smtp_creator_mock.create.assert_called_once()  # type: ignore[unresolved-attribute]
+    assert smtp_pool.get_stats() == SMTPPoolStats(
+        open_count=1,
+        created_count=1,
+        reuse_count=1,
+        reconnect_count=0,
+    )
+
+
+def test_reconnect_on_disconnect_of_reused_connection(
+    smtp_pool: SMTPConnectionPool,
+) -> None:
+    stale_smtp = smtp_pool.run(lambda smtp: smtp)
+    used_smtps: list[SMTP] = []
+
+    def send(smtp: SMTP) -> str:
+        used_smtps.append(smtp)
+        if smtp is stale_smtp:
+            raise SMTPServerDisconnected("Connection unexpectedly closed")
+        return "SENT"
+
+    assert smtp_pool.run(send) == "SENT"
+
+    assert used_smtps[0] is stale_smtp
+    assert used_smtps[1] is not stale_smtp
+    stale_smtp.close.assert_called_once()  # type: ignore[unresolved-attribute]
+    assert smtp_pool.get_stats() == SMTPPoolStats(
+        open_count=1,
+        created_count=2,
+        reuse_count=1,
+        reconnect_count=1,
+    )
+
+
+def test_raise_on_disconnect_of_new_connection(
+    smtp_pool: SMTPConnectionPool,
+) -> None:
+    def send(_: SMTP) -> None:
+        raise SMTPServerDisconnected("Connection unexpectedly closed")
+
+    with pytest.raises(SMTPServerDisconnected):
+        smtp_pool.run(send)
+
+    assert smtp_pool.get_stats().open_count == 0
+
+
+def test_close_of_connection_on_error(
+    smtp_pool: SMTPConnectionPool,
+) -> None:
+    def send(_: SMTP) -> None:
+        raise ValueError("A bad message")
+
+    with pytest.raises(ValueError, match="A bad message"):
+        smtp_pool.run(send)
+
+    assert smtp_pool.get_stats().open_count == 0
+    assert smtp_pool.get_stats().created_count == 1
+
+
+def test_check_of_stale_connection_before_use(
+    smtp_creator_mock: SMTPCreator,
+    smtp_pool: SMTPConnectionPool,
+    clock: Clock,
+) -> None:
+    stale_smtp = smtp_pool.run(lambda smtp: smtp)
+    stale_smtp.noop.side_effect = SMTPServerDisconnected()  # type: ignore[unresolved-attribute]
+    clock.now = 61.0
+
+    new_smtp = smtp_pool.run(lambda smtp: smtp)
+
+    assert new_smtp is not stale_smtp
+    assert smtp_creator_mock.create.call_count == 2  # type: ignore[unresolved-attribute]
+    assert smtp_pool.get_stats().open_count == 1
+
+
+def test_no_check_of_recently_used_connection(
+    smtp_pool: SMTPConnectionPool,
+    clock: Clock,
+) -> None:
+    smtp = smtp_pool.run(lambda smtp: smtp)
+    clock.now = 59.0
+
+    smtp_pool.run(lambda smtp: smtp)
+
+    smtp.noop.assert_not_called()  # type: ignore[unresolved-attribute]
+
+
+def test_keep_alive_of_idle_connections(
+    smtp_pool: SMTPConnectionPool,
+    clock: Clock,
+) -> None:
+    smtp = smtp_pool.run(lambda smtp: smtp)
+    clock.now = 61.0
+
+    smtp_pool.keep_alive()
+
+    smtp.noop.assert_called_once()  # type: ignore[unresolved-attribute]
+    # A connection is kept and isn't checked again before a use
+    assert smtp_pool.run(lambda smtp: smtp) is smtp
+    smtp.noop.assert_called_once()  # type: ignore[unresolved-attribute]
+
+
+def test_keep_alive_drops_dead_connections(
+    smtp_pool: SMTPConnectionPool,
+    clock: Clock,
+) -> None:
+    smtp = smtp_pool.run(lambda smtp: smtp)
+    smtp.noop.return_value = (421, b"4.4.2 Timeout")  # type: ignore[unresolved-attribute]
+    clock.now = 61.0
+
+    smtp_pool.keep_alive()
+
+    smtp.close.assert_called_once()  # type: ignore[unresolved-attribute]
+    assert smtp_pool.get_stats().open_count == 0
+
+
+def test_no_extra_connection_during_keep_alive(
+    smtp_creator_mock: SMTPCreator,
+    clock: Clock,
+) -> None:
+    smtp_pool: SMTPConnectionPool = SMTPConnectionPool(
+        smtp_creator_mock,
+        max_size=1,
+        keepalive_interval=timedelta(seconds=60),
+        clock=clock,
+    )
+    smtp = smtp_pool.run(lambda smtp: smtp)
+    clock.now = 61.0
+    used_smtps: list[SMTP] = []
+    send_thread: Thread = Thread(
+        target=lambda: used_smtps.append(smtp_pool.run(lambda smtp: smtp))
+    )
+
+    def noop() -> tuple[int, bytes]:
+        # A send during a check waits for the checked connection
+        # instead of opening a second one
+        send_thread.start()
+        send_thread.join(timeout=0.1)
+        assert send_thread.is_alive()
+        assert smtp_pool.get_stats().open_count == 1
+
+        return 250, b"2.0.0 OK"
+
+    smtp.noop.side_effect = noop  # type: ignore[unresolved-attribute]
+
+    smtp_pool.keep_alive()
+    send_thread.join()
+
+    assert used_smtps == [smtp]
+    smtp_creator_mock.create.assert_called_once()  # type: ignore[unresolved-attribute]
+
+
+def test_close_of_idle_connections(smtp_pool: SMTPConnectionPool) -> None:
+    smtp = smtp_pool.run(lambda smtp: smtp)
+
+    smtp_pool.close()
+
+    smtp.quit.assert_called_once()  # type: ignore[unresolved-attribute]
+    assert smtp_pool.get_stats().open_count == 0
+
+
+def test_raise_on_non_positive_max_size(
+    smtp_creator_mock: SMTPCreator,
+) -> None:
+    with pytest.raises(
+        ValueError,
+        match="A maximum size must be at least one",
+    ):
+        SMTPConnectionPool(smtp_creator_mock, max_size=0)
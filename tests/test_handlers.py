@@ -1,4 +1,5 @@
 from collections.abc import Generator
+from concurrent.futures import Executor
 from datetime import timedelta
 from typing import Self, cast
 from unittest.mock import AsyncMock, MagicMock
@@ -7,7 +8,7 @@ from uuid import UUID
 import pytest
 import telegram
 from pytest_mock import MockerFixture
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession
 from telegram import (
     CallbackQuery,
     Chat,
@@ -24,22 +25,30 @@ from message_sender_telegram_bot.libs import (
     DBUserManipulator,
     Handlers,
     Helpers,
+    SessionScope,
+    SMTPConnectionPool,
+    UserAuthStateCache,
     consts,
     fstrings,
     types,
 )
 from message_sender_telegram_bot.libs.consts import ButtonTexts
 from message_sender_telegram_bot.libs.rdb import database_tables
-from message_sender_telegram_bot.libs.types import CooldownCheckResult
+from message_sender_telegram_bot.libs.types import (
+    CooldownCheckResult,
+    MessageState,
+    UserAuthState,
+)
 
 
 @pytest.fixture
 def helpers_mock(
     mocker: MockerFixture,
-    compiled_session_mock: sessionmaker[Session],
+    session_scope_mock: SessionScope,
+    user_auth_state_cache_mock: UserAuthStateCache,
 ) -> Generator[Helpers]:
-    gmail_smtp_login = "GMAIL_SMTP_LOGIN"
-    gmail_smtp_password = "GMAIL_SMTP_PASSWORD"
+    smtp_pool_mock = MagicMock(spec=SMTPConnectionPool)
+    email_executor_mock = MagicMock(spec=Executor)
     email_from_addr = "EMAIL_FROM_ADDR"
     email_to_addr = "EMAIL_TO_ADDR"
 
@@ -63,11 +72,12 @@ def helpers_mock(
         ),
     )
     helpers_mock: Helpers = helpers_class_mock(
-        gmail_smtp_login,
-        gmail_smtp_password,
+        smtp_pool_mock,
+        email_executor_mock,
         email_from_addr,
         email_to_addr,
-        compiled_session_mock,
+        session_scope_mock,
+        user_auth_state_cache_mock,
     )
     yield helpers_mock
     del helpers_mock
@@ -76,9 +86,14 @@ def helpers_mock(
 @pytest.fixture
 def handlers(
     helpers_mock: Helpers,
-    compiled_session_mock: sessionmaker[Session],
+    session_scope_mock: SessionScope,
+    user_auth_state_cache_mock: UserAuthStateCache,
 ) -> Handlers:
-    return Handlers(compiled_session_mock, helpers_mock)
+    return Handlers(
+        session_scope_mock,
+        helpers_mock,
+        user_auth_state_cache_mock,
+    )
 
 
 @pytest.fixture
@@ -172,11 +187,22 @@ def db_user_manipulator_mock(
             "message_sender_telegram_bot.libs.handlers.DBUserManipulator",
             autospec=True,
             return_value=MagicMock(
-                get=MagicMock(return_value=db_user_mock),
+                get=AsyncMock(return_value=db_user_mock),
+                get_auth_state=AsyncMock(
+                    return_value=UserAuthState(
+                        user_uuid,
+                        is_authorizing=False,
+                        has_token=True,
+                        is_owner=False,
+                        last_send_date=None,
+                    ),
+                ),
                 get_authorizing_status=MagicMock(return_value=False),
                 get_token=MagicMock(
                     return_value=db_token_mock,
                 ),
+                update_last_send_date=AsyncMock(),
+                delete=AsyncMock(),
             ),
         ),
     )
@@ -190,7 +216,7 @@ def db_message_manipulator_mock(
     mocker: MockerFixture,
     user_uuid: UUID,
 ) -> Generator[DBMessageManipulator]:
-    db_session_mock = MagicMock(spec=Session)
+    db_session_mock = MagicMock(spec=AsyncSession)
     message_id = 436583812
     db_user_mock = MagicMock(spec=database_tables.User)
     text = "Text"
@@ -201,13 +227,18 @@ def db_message_manipulator_mock(
             "message_sender_telegram_bot.libs.handlers.DBMessageManipulator",
             autospec=True,
             return_value=MagicMock(
-                get=MagicMock(
-                    return_value=MagicMock(
-                        spec=database_tables.Message,
-                        sender_id=user_uuid,
+                get_state=AsyncMock(
+                    return_value=MessageState(
+                        UUID("01938f2e-7c4a-7b8e-9d3f-2a6b5c4d3e2f"),
+                        message_id,
+                        user_uuid,
+                        text,
                         is_sent=False,
                     ),
                 ),
+                claim_send=AsyncMock(return_value=True),
+                enqueue_email=AsyncMock(),
+                delete_unsent=AsyncMock(return_value=True),
             ),
         ),
     )
@@ -225,7 +256,7 @@ def db_message_manipulator_mock(
 def db_token_manipulator_mock(
     mocker: MockerFixture,
 ) -> Generator[DBTokenManipulator]:
-    db_session_mock = MagicMock(spec=Session)
+    db_session_mock = MagicMock(spec=AsyncSession)
     token = types.Token("TOKEN")
 
     db_token_manipulator_class_mock = cast(
@@ -281,7 +312,7 @@ class TestStart:
         ctx_mock: ContextTypes,
         db_user_manipulator_mock: DBUserManipulator,
     ) -> None:
-        db_user_manipulator_mock.get.return_value = None  # type: ignore[unresolved-attribute]
+        db_user_manipulator_mock.get_auth_state.return_value = None  # type: ignore[unresolved-attribute]
 
         await handlers.start(update_obj_mock, ctx_mock)
 
@@ -299,11 +330,15 @@ class TestStart:
         ctx_mock: ContextTypes,
         db_user_manipulator_mock: DBUserManipulator,
     ) -> None:
-        db_user_manipulator_mock.get_authorizing_status.return_value = True  # type: ignore[unresolved-attribute]
+        db_user_manipulator_mock.get_auth_state.return_value = (  # type: ignore[unresolved-attribute]
+            db_user_manipulator_mock.get_auth_state.return_value._replace(  # type: ignore[unresolved-attribute]
+                is_authorizing=True,
+            )
+        )
 
         await handlers.start(update_obj_mock, ctx_mock)
 
-        db_user_manipulator_mock.get_authorizing_status.assert_called_once()  # type: ignore[unresolved-attribute]
+        db_user_manipulator_mock.get.assert_not_called()  # type: ignore[unresolved-attribute]
 
         update_obj_mock.effective_chat.send_message.assert_called_once_with(  # type: ignore[unresolved-attribute]
             consts.Answers.ENTER_TOKEN,
@@ -317,7 +352,11 @@ class TestStart:
         ctx_mock: ContextTypes,
         db_user_manipulator_mock: DBUserManipulator,
     ) -> None:
-        db_user_manipulator_mock.get_token.return_value = None  # type: ignore[unresolved-attribute]
+        db_user_manipulator_mock.get_auth_state.return_value = (  # type: ignore[unresolved-attribute]
+            db_user_manipulator_mock.get_auth_state.return_value._replace(  # type: ignore[unresolved-attribute]
+                has_token=False,
+            )
+        )
 
         await handlers.start(update_obj_mock, ctx_mock)
 
@@ -327,11 +366,34 @@ class TestStart:
             db_user_manipulator_mock.set_authorizing_status
         )
         set_authorizing_status_func.assert_called_once_with(True)  # type: ignore[unresolved-attribute]
+        db_user_manipulator_mock.get.assert_awaited_once()  # type: ignore[unresolved-attribute]
 
         update_obj_mock.effective_chat.send_message.assert_called_once_with(  # type: ignore[unresolved-attribute]
             consts.Answers.TOKEN_EXPIRED_ENTER_NEW_TOKEN,
         )
 
+    @pytest.mark.asyncio
+    async def test_stop_of_handle_when_db_user_is_deleted_concurrently(
+        self: Self,
+        handlers: Handlers,
+        update_obj_mock: Update,
+        ctx_mock: ContextTypes,
+        db_user_manipulator_mock: DBUserManipulator,
+    ) -> None:
+        db_user_manipulator_mock.get_auth_state.return_value = (  # type: ignore[unresolved-attribute]
+            db_user_manipulator_mock.get_auth_state.return_value._replace(  # type: ignore[unresolved-attribute]
+                has_token=False,
+            )
+        )
+        db_user_manipulator_mock.get.return_value = None  # type: ignore[unresolved-attribute]
+
+        await handlers.start(update_obj_mock, ctx_mock)
+
+        db_user_manipulator_mock.set_authorizing_status.assert_not_called()  # type: ignore[unresolved-attribute]
+        update_obj_mock.effective_chat.send_message.assert_called_once_with(  # type: ignore[unresolved-attribute]
+            consts.Answers.UNKNOWN_ERROR_OCCURS,
+        )
+
     @pytest.mark.asyncio
     async def test_success_authorization(
         self: Self,
@@ -342,6 +404,9 @@ class TestStart:
     ) -> None:
         await handlers.start(update_obj_mock, ctx_mock)
 
+        # An authorized user is only read, so a DB user isn't loaded
+        db_user_manipulator_mock.get.assert_not_called()  # type: ignore[unresolved-attribute]
+
         update_obj_mock.effective_chat.send_message.assert_called_once_with(  # type: ignore[unresolved-attribute]
             consts.Answers.ALREADY_AUTHORIZED,
         )
@@ -417,7 +482,7 @@ class TestHandleMessage:
         ctx_mock: ContextTypes,
         db_user_manipulator_mock: DBUserManipulator,
     ) -> None:
-        db_user_manipulator_mock.get.return_value = None  # type: ignore[unresolved-attribute]
+        db_user_manipulator_mock.get_auth_state.return_value = None  # type: ignore[unresolved-attribute]
 
         await handlers.handle_message(update_obj_mock, ctx_mock)
 
@@ -434,7 +499,11 @@ class TestHandleMessage:
         db_user_manipulator_mock: DBUserManipulator,
         helpers_mock: Helpers,
     ) -> None:
-        db_user_manipulator_mock.get_authorizing_status.return_value = True  # type: ignore[unresolved-attribute]
+        db_user_manipulator_mock.get_auth_state.return_value = (  # type: ignore[unresolved-attribute]
+            db_user_manipulator_mock.get_auth_state.return_value._replace(  # type: ignore[unresolved-attribute]
+                is_authorizing=True,
+            )
+        )
 
         await handlers.handle_message(update_obj_mock, ctx_mock)
 
@@ -449,7 +518,11 @@ class TestHandleMessage:
         db_user_manipulator_mock: DBUserManipulator,
         helpers_mock: Helpers,
     ) -> None:
-        db_user_manipulator_mock.get.return_value.token = None  # type: ignore[unresolved-attribute]
+        db_user_manipulator_mock.get_auth_state.return_value = (  # type: ignore[unresolved-attribute]
+            db_user_manipulator_mock.get_auth_state.return_value._replace(  # type: ignore[unresolved-attribute]
+                has_token=False,
+            )
+        )
 
         await handlers.handle_message(update_obj_mock, ctx_mock)
 
@@ -557,7 +630,7 @@ class TestSend:
         ctx_mock: ContextTypes,
         db_user_manipulator_mock: DBUserManipulator,
     ) -> None:
-        db_user_manipulator_mock.get.return_value = None  # type: ignore[unresolved-attribute]
+        db_user_manipulator_mock.get_auth_state.return_value = None  # type: ignore[unresolved-attribute]
 
         await handlers.send(update_obj_mock, ctx_mock)
 
@@ -573,7 +646,11 @@ class TestSend:
         ctx_mock: ContextTypes,
         db_user_manipulator_mock: DBUserManipulator,
     ) -> None:
-        db_user_manipulator_mock.get_authorizing_status.return_value = True  # type: ignore[unresolved-attribute]
+        db_user_manipulator_mock.get_auth_state.return_value = (  # type: ignore[unresolved-attribute]
+            db_user_manipulator_mock.get_auth_state.return_value._replace(  # type: ignore[unresolved-attribute]
+                is_authorizing=True,
+            )
+        )
 
         await handlers.send(update_obj_mock, ctx_mock)
 
@@ -648,7 +725,7 @@ class TestSend:
         helpers_mock: Helpers,
         db_message_manipulator_mock: DBMessageManipulator,
     ) -> None:
-        db_message_manipulator_mock.get.return_value = None  # type: ignore[unresolved-attribute]
+        db_message_manipulator_mock.get_state.return_value = None  # type: ignore[unresolved-attribute]
 
         await handlers.send(update_obj_mock, ctx_mock)
 
@@ -667,16 +744,19 @@ class TestSend:
         db_message_manipulator_mock: DBMessageManipulator,
     ) -> None:
         another_sender_id = UUID("41895d87-92da-42d5-be9a-5a5663f45198")
-        db_message_mock: database_tables.Message = (
-            db_message_manipulator_mock.get.return_value  # type: ignore[unresolved-attribute]
+        message_state: MessageState = (
+            db_message_manipulator_mock.get_state.return_value  # type: ignore[unresolved-attribute]
+        )
+        db_message_manipulator_mock.get_state.return_value = (  # type: ignore[unresolved-attribute]
+            message_state._replace(sender_id=another_sender_id)
         )
-        db_message_mock.sender_id: UUID = another_sender_id
 
         await handlers.send(update_obj_mock, ctx_mock)
 
         update_obj_mock.effective_chat.send_message.assert_called_once_with(  # type: ignore[unresolved-attribute]
             consts.Answers.NOT_SENDER_OF_MESSAGE,
         )
+        db_message_manipulator_mock.claim_send.assert_not_awaited()  # type: ignore[unresolved-attribute]
 
     @pytest.mark.asyncio
     async def test_stop_of_handle_when_db_message_is_sent(
@@ -688,16 +768,43 @@ class TestSend:
         helpers_mock: Helpers,
         db_message_manipulator_mock: DBMessageManipulator,
     ) -> None:
-        db_message_mock: database_tables.Message = (
-            db_message_manipulator_mock.get.return_value  # type: ignore[unresolved-attribute]
+        message_state: MessageState = (
+            db_message_manipulator_mock.get_state.return_value  # type: ignore[unresolved-attribute]
+        )
+        db_message_manipulator_mock.get_state.return_value = (  # type: ignore[unresolved-attribute]
+            message_state._replace(is_sent=True)
         )
-        db_message_mock.is_sent = True
 
         await handlers.send(update_obj_mock, ctx_mock)
 
         update_obj_mock.effective_message.edit_text.assert_called_once_with(  # type: ignore[unresolved-attribute]
             consts.Answers.MESSAGE_ALREADY_WAS_SENT,
         )
+        # A state of the archived message is enough, so the draft isn't
+        # claimed
+        db_message_manipulator_mock.claim_send.assert_not_awaited()  # type: ignore[unresolved-attribute]
+        db_message_manipulator_mock.enqueue_email.assert_not_awaited()  # type: ignore[unresolved-attribute]
+
+    @pytest.mark.asyncio
+    async def test_stop_of_handle_when_db_message_is_claimed_concurrently(
+        self: Self,
+        handlers: Handlers,
+        update_obj_mock: Update,
+        ctx_mock: ContextTypes,
+        db_user_manipulator_mock: DBUserManipulator,
+        helpers_mock: Helpers,
+        db_message_manipulator_mock: DBMessageManipulator,
+    ) -> None:
+        # A concurrent confirmation has moved the draft to the archive
+        # after its state is got
+        db_message_manipulator_mock.claim_send.return_value = False  # type: ignore[unresolved-attribute]
+
+        await handlers.send(update_obj_mock, ctx_mock)
+
+        update_obj_mock.effective_message.edit_text.assert_called_once_with(  # type: ignore[unresolved-attribute]
+            consts.Answers.MESSAGE_ALREADY_WAS_SENT,
+        )
+        db_message_manipulator_mock.enqueue_email.assert_not_awaited()  # type: ignore[unresolved-attribute]
 
     @pytest.mark.asyncio
     async def test_success_send(
@@ -711,20 +818,67 @@ class TestSend:
     ) -> None:
         user: telegram.User | None = update_obj_mock.effective_user
         assert user is not None
-        db_message_mock: database_tables.Message = (
-            db_message_manipulator_mock.get.return_value  # type: ignore[unresolved-attribute]
-        )
 
         await handlers.send(update_obj_mock, ctx_mock)
 
-        helpers_mock.send_email.assert_called_once_with(  # type: ignore[unresolved-attribute]
+        db_message_manipulator_mock.claim_send.assert_awaited_once()  # type: ignore[unresolved-attribute]
+        # An email is only enqueued, so a confirmation doesn't wait for
+        # a SMTP server
+        db_message_manipulator_mock.enqueue_email.assert_awaited_once_with(  # type: ignore[unresolved-attribute]
             user.name,
-            db_message_mock.text,
+            is_urgent=False,
         )
+        helpers_mock.send_email.assert_not_called()  # type: ignore[unresolved-attribute]
+        db_user_manipulator_mock.update_last_send_date.assert_awaited_once()  # type: ignore[unresolved-attribute]
         update_obj_mock.effective_message.edit_text.assert_called_once_with(  # type: ignore[unresolved-attribute]
             consts.Answers.MESSAGE_SENT,
         )
 
+    @pytest.mark.asyncio
+    async def test_commit_of_send_before_report(
+        self: Self,
+        handlers: Handlers,
+        update_obj_mock: Update,
+        ctx_mock: ContextTypes,
+        session_scope_mock: SessionScope,
+        db_user_manipulator_mock: DBUserManipulator,
+        helpers_mock: Helpers,
+        db_message_manipulator_mock: DBMessageManipulator,
+    ) -> None:
+        edit_text_mock = update_obj_mock.effective_message.edit_text  # type: ignore[unresolved-attribute]
+
+        async def commit() -> None:
+            # A user doesn't see a report before a commit
+            edit_text_mock.assert_not_called()
+
+        session_scope_mock.commit.side_effect = commit  # type: ignore[unresolved-attribute]
+
+        await handlers.send(update_obj_mock, ctx_mock)
+
+        session_scope_mock.commit.assert_awaited_once()  # type: ignore[unresolved-attribute]
+        edit_text_mock.assert_called_once_with(consts.Answers.MESSAGE_SENT)
+
+    @pytest.mark.asyncio
+    async def test_success_urgent_send(
+        self: Self,
+        handlers: Handlers,
+        update_obj_mock: Update,
+        ctx_mock: ContextTypes,
+        db_user_manipulator_mock: DBUserManipulator,
+        helpers_mock: Helpers,
+        db_message_manipulator_mock: DBMessageManipulator,
+    ) -> None:
+        user: telegram.User | None = update_obj_mock.effective_user
+        assert user is not None
+        update_obj_mock.callback_query.data = "ACTION,urgent,10294756"  # type: ignore[invalid-assignment]
+
+        await handlers.send(update_obj_mock, ctx_mock)
+
+        db_message_manipulator_mock.enqueue_email.assert_awaited_once_with(  # type: ignore[unresolved-attribute]
+            user.name,
+            is_urgent=True,
+        )
+
 
 class TestCancel:
     @pytest.mark.asyncio
@@ -763,10 +917,12 @@ class TestCancel:
         update_obj_mock: Update,
         ctx_mock: ContextTypes,
         db_user_manipulator_mock: DBUserManipulator,
+        db_message_manipulator_mock: DBMessageManipulator,
     ) -> None:
         await handlers.cancel(update_obj_mock, ctx_mock)
 
-        db_user_manipulator_mock.get_authorizing_status.assert_called_once()  # type: ignore[unresolved-attribute]
+        db_user_manipulator_mock.get_auth_state.assert_awaited_once()  # type: ignore[unresolved-attribute]
+        db_user_manipulator_mock.delete.assert_not_called()  # type: ignore[unresolved-attribute]
 
     @pytest.mark.asyncio
     async def test_success_cancel_of_authorization(
@@ -776,10 +932,15 @@ class TestCancel:
         ctx_mock: ContextTypes,
         db_user_manipulator_mock: DBUserManipulator,
     ) -> None:
-        db_user_manipulator_mock.get_authorizing_status.return_value = True  # type: ignore[unresolved-attribute]
+        db_user_manipulator_mock.get_auth_state.return_value = (  # type: ignore[unresolved-attribute]
+            db_user_manipulator_mock.get_auth_state.return_value._replace(  # type: ignore[unresolved-attribute]
+                is_authorizing=True,
+            )
+        )
 
         await handlers.cancel(update_obj_mock, ctx_mock)
 
+        db_user_manipulator_mock.delete.assert_called_once()  # type: ignore[unresolved-attribute]
         update_obj_mock.effective_chat.send_message.assert_called_once_with(  # type: ignore[unresolved-attribute]
             consts.Answers.AUTHORIZATION_CANCELED,
         )
@@ -825,7 +986,7 @@ class TestCancel:
         db_user_manipulator_mock: DBUserManipulator,
         db_message_manipulator_mock: DBMessageManipulator,
     ) -> None:
-        db_message_manipulator_mock.get.return_value = None  # type: ignore[unresolved-attribute]
+        db_message_manipulator_mock.get_state.return_value = None  # type: ignore[unresolved-attribute]
 
         await handlers.cancel(update_obj_mock, ctx_mock)
 
@@ -842,7 +1003,7 @@ class TestCancel:
         db_user_manipulator_mock: DBUserManipulator,
         db_message_manipulator_mock: DBMessageManipulator,
     ) -> None:
-        db_user_manipulator_mock.get.return_value = None  # type: ignore[unresolved-attribute]
+        db_user_manipulator_mock.get_auth_state.return_value = None  # type: ignore[unresolved-attribute]
 
         await handlers.cancel(update_obj_mock, ctx_mock)
 
@@ -860,10 +1021,12 @@ class TestCancel:
         db_message_manipulator_mock: DBMessageManipulator,
     ) -> None:
         another_sender_id = UUID("41895d87-92da-42d5-be9a-5a5663f45198")
-        db_message_mock: database_tables.Message = (
-            db_message_manipulator_mock.get.return_value  # type: ignore[unresolved-attribute]
+        message_state: MessageState = (
+            db_message_manipulator_mock.get_state.return_value  # type: ignore[unresolved-attribute]
+        )
+        db_message_manipulator_mock.get_state.return_value = (  # type: ignore[unresolved-attribute]
+            message_state._replace(sender_id=another_sender_id)
         )
-        db_message_mock.sender_id: UUID = another_sender_id
 
         await handlers.cancel(update_obj_mock, ctx_mock)
 
@@ -880,10 +1043,30 @@ class TestCancel:
         db_user_manipulator_mock: DBUserManipulator,
         db_message_manipulator_mock: DBMessageManipulator,
     ) -> None:
-        db_message_mock: database_tables.Message = (
-            db_message_manipulator_mock.get.return_value  # type: ignore[unresolved-attribute]
+        message_state: MessageState = (
+            db_message_manipulator_mock.get_state.return_value  # type: ignore[unresolved-attribute]
+        )
+        db_message_manipulator_mock.get_state.return_value = (  # type: ignore[unresolved-attribute]
+            message_state._replace(is_sent=True)
         )
-        db_message_mock.is_sent = True
+
+        await handlers.cancel(update_obj_mock, ctx_mock)
+
+        update_obj_mock.effective_message.edit_text.assert_called_once_with(  # type: ignore[unresolved-attribute]
+            consts.Answers.MESSAGE_ALREADY_WAS_SENT,
+        )
+
+    @pytest.mark.asyncio
+    async def test_stop_of_handle_when_db_message_is_sent_concurrently(
+        self: Self,
+        handlers: Handlers,
+        update_obj_mock: Update,
+        ctx_mock: ContextTypes,
+        db_user_manipulator_mock: DBUserManipulator,
+        db_message_manipulator_mock: DBMessageManipulator,
+    ) -> None:
+        # A message, which is sent after the check, isn't deleted
+        db_message_manipulator_mock.delete_unsent.return_value = False  # type: ignore[unresolved-attribute]
 
         await handlers.cancel(update_obj_mock, ctx_mock)
 
@@ -902,10 +1085,35 @@ class TestCancel:
     ) -> None:
         await handlers.cancel(update_obj_mock, ctx_mock)
 
+        db_message_manipulator_mock.delete_unsent.assert_awaited_once()  # type: ignore[unresolved-attribute]
         update_obj_mock.effective_message.edit_text.assert_called_once_with(  # type: ignore[unresolved-attribute]
             consts.Answers.MESSAGE_SEND_CANCELED,
         )
 
+    @pytest.mark.asyncio
+    async def test_commit_of_cancel_before_report(
+        self: Self,
+        handlers: Handlers,
+        update_obj_mock: Update,
+        ctx_mock: ContextTypes,
+        session_scope_mock: SessionScope,
+        db_user_manipulator_mock: DBUserManipulator,
+        db_message_manipulator_mock: DBMessageManipulator,
+    ) -> None:
+        edit_text_mock = update_obj_mock.effective_message.edit_text  # type: ignore[unresolved-attribute]
+
+        async def commit() -> None:
+            # A lock of the deleted draft isn't held during a call of a
+            # Telegram API
+            edit_text_mock.assert_not_called()
+
+        session_scope_mock.commit.side_effect = commit  # type: ignore[unresolved-attribute]
+
+        await handlers.cancel(update_obj_mock, ctx_mock)
+
+        session_scope_mock.commit.assert_awaited_once()  # type: ignore[unresolved-attribute]
+        edit_text_mock.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_end_of_handle_when_none_of_cases_wasnt_invoked(
         self: Self,
@@ -915,7 +1123,7 @@ class TestCancel:
         db_user_manipulator_mock: DBUserManipulator,
         db_message_manipulator_mock: DBMessageManipulator,
     ) -> None:
-        db_user_manipulator_mock.get.return_value = None  # type: ignore[unresolved-attribute]
+        db_user_manipulator_mock.get_auth_state.return_value = None  # type: ignore[unresolved-attribute]
         update_obj_mock.callback_query = None
 
         await handlers.cancel(update_obj_mock, ctx_mock)
@@ -0,0 +1,384 @@
+"""
+The query budgets of the handlers. That is, the handlers are run against
+a SQLite DB with a schema of the Alembic revisions, and every scenario
+asserts a maximum number of the SQL statements and the connection
+checkouts, so an extra round trip fails the tests like a logic bug.
+"""
+
+from collections.abc import Awaitable, Callable, Generator
+from concurrent.futures import Executor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Self
+from unittest.mock import AsyncMock, MagicMock
+from uuid import UUID, uuid7
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from pytest_mock import MockerFixture
+from sqlalchemy import Engine, create_engine, func, select
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session, sessionmaker
+from telegram import CallbackQuery, Chat, Message, Update, User
+from telegram.constants import ChatType
+from telegram.ext import ContextTypes
+
+from message_sender_telegram_bot.libs import (
+    Handlers,
+    Helpers,
+    LazyLoadGuard,
+    PoolTelemetry,
+    QueryTelemetry,
+    RoutingSession,
+    SessionScope,
+    SMTPConnectionPool,
+    TelemetryAsyncAdaptedQueuePool,
+    UserAuthStateCache,
+    consts,
+)
+from message_sender_telegram_bot.libs.rdb import database_tables
+
+MIGRATIONS_PATH: Path = Path(__file__).parents[1] / "db_migration"
+
+NEW_USER_ID: int = 1001
+AUTHORIZING_USER_ID: int = 1002
+AUTHORIZED_USER_ID: int = 1003
+FREE_TOKEN: str = "FREE_TOKEN"
+DRAFT_MESSAGE_ID: int = 7
+
+
+class QueryBudget:
+    """
+    The telemetries of a DB engine, which are checked against the
+    budgets of the scenarios.
+    """
+
+    def __init__(self: Self) -> None:
+        self.query_telemetry: QueryTelemetry = QueryTelemetry()
+        self.pool_telemetry: PoolTelemetry = PoolTelemetry()
+
+    async def run(
+        self: Self,
+        callback: Callable[
+            [Update, ContextTypes.DEFAULT_TYPE], Awaitable[Any]
+        ],
+        update: Update,
+        max_query_count: int,
+        max_checkout_count: int,
+    ) -> None:
+        checkout_count: int = self.pool_telemetry.get_stats().checkout_count
+
+        await self.query_telemetry.wrap(callback)(update, MagicMock())
+
+        query_count: int = self.query_telemetry.get_handler_stats()[
+            callback.__qualname__
+        ].query_count_max
+        assert query_count <= max_query_count, (
+            f"`{callback.__qualname__}` executed {query_count} statements "
+            f"with a budget of {max_query_count}"
+        )
+        checkout_count = (
+            self.pool_telemetry.get_stats().checkout_count - checkout_count
+        )
+        assert checkout_count <= max_checkout_count, (
+            f"`{callback.__qualname__}` checked out {checkout_count} "
+            f"connections with a budget of {max_checkout_count}"
+        )
+
+
+@pytest.fixture
+def database_path(tmp_path: Path) -> Generator[Path]:
+    # A schema is created by the revisions instead of the metadata, so
+    # the budgets are checked against the indexes of a deployed DB. An
+    # in-memory DB doesn't outlive a connection of the migrations, so
+    # a DB is kept in a temporary file
+    database_path: Path = tmp_path / "bot.db"
+    alembic_config: Config = Config()
+    alembic_config.set_main_option("script_location", str(MIGRATIONS_PATH))
+    alembic_config.set_main_option(
+        "sqlalchemy.url",
+        f"sqlite:///{database_path}",
+    )
+    command.upgrade(alembic_config, "head")
+
+    database_engine: Engine = create_engine(f"sqlite:///{database_path}")
+    with sessionmaker(database_engine).begin() as session:
+        free_token: database_tables.Token = database_tables.Token(
+            id_=uuid7(),
+            token=FREE_TOKEN,
+            user=None,
+        )
+        used_token: database_tables.Token = database_tables.Token(
+            id_=uuid7(),
+            token="USED_TOKEN",
+            user=None,
+        )
+        session.add_all((free_token, used_token))
+        session.add(
+            database_tables.User(
+                id_=uuid7(),
+                user_id=AUTHORIZING_USER_ID,
+                is_authorizing=True,
+                token_id=None,
+                token=None,
+                is_owner=False,
+                last_send_date=None,
+                messages=[],
+            )
+        )
+        authorized_user_id: UUID = uuid7()
+        session.add(
+            database_tables.User(
+                id_=authorized_user_id,
+                user_id=AUTHORIZED_USER_ID,
+                is_authorizing=False,
+                token_id=None,
+                token=used_token,
+                is_owner=False,
+                last_send_date=None,
+                messages=[],
+            )
+        )
+        session.flush()
+        session.add(
+            database_tables.MessageDraft(
+                id_=uuid7(),
+                message_id=DRAFT_MESSAGE_ID,
+                sender_id=authorized_user_id,
+                text="Hello",
+                created_date=datetime.now(),
+            )
+        )
+    database_engine.dispose()
+
+    yield database_path
+
+
+@pytest.fixture
+def query_budget() -> QueryBudget:
+    return QueryBudget()
+
+
+@pytest.fixture
+def handlers(
+    mocker: MockerFixture,
+    database_path: Path,
+    query_budget: QueryBudget,
+) -> Generator[Handlers]:
+    # An engine and a session are configured like in the `main` module
+    database_engine: AsyncEngine = create_async_engine(
+        f"sqlite+aiosqlite:///{database_path}",
+        poolclass=TelemetryAsyncAdaptedQueuePool,
+        telemetry=query_budget.pool_telemetry,
+    )
+    query_budget.query_telemetry.attach(database_engine.sync_engine)
+
+    # An implicit load is an unbudgeted query, so it fails a scenario
+    sync_compiled_session: sessionmaker[RoutingSession] = sessionmaker(
+        class_=RoutingSession,
+    )
+    LazyLoadGuard(True).attach(sync_compiled_session)
+    compiled_session: async_sessionmaker[AsyncSession] = async_sessionmaker(
+        database_engine,
+        expire_on_commit=False,
+        sync_session_class=sync_compiled_session,  # type: ignore[invalid-argument-type]
+    )
+    session_scope: SessionScope = SessionScope(compiled_session)
+    user_auth_state_cache: UserAuthStateCache = UserAuthStateCache()
+
+    helpers: Helpers = Helpers(
+        MagicMock(spec=SMTPConnectionPool),
+        MagicMock(spec=Executor),
+        "EMAIL_FROM_ADDR",
+        "EMAIL_TO_ADDR",
+        session_scope,
+        user_auth_state_cache,
+    )
+    mocker.patch.object(helpers, "send_email", AsyncMock())
+
+    handlers: Handlers = Handlers(
+        session_scope,
+        helpers,
+        user_auth_state_cache,
+    )
+    # Every handler is wrapped into a session scope like in the `main`
+    # module
+    for name in ("start", "handle_message", "send", "cancel"):
+        setattr(handlers, name, session_scope.wrap(getattr(handlers, name)))
+
+    yield handlers
+    # An event loop of a test is closed already, so a pool is disposed
+    # through a sync engine
+    database_engine.sync_engine.dispose()
+
+
+def create_update(
+    user_id: int,
+    text: str | None = None,
+    callback_data: str | None = None,
+) -> Update:
+    user = MagicMock(spec=User, id=user_id)
+    # A `name` argument of a mock names the mock itself, so a name of a
+    # user is set as an attribute
+    user.name = "@user"
+    message = MagicMock(
+        spec=Message,
+        id=DRAFT_MESSAGE_ID + 1,
+        text=text,
+        edit_text=AsyncMock(),
+    )
+    return MagicMock(
+        spec=Update,
+        update_id=42,
+        effective_chat=MagicMock(
+            spec=Chat,
+            type=ChatType.PRIVATE,
+            send_message=AsyncMock(),
+        ),
+        effective_user=user,
+        effective_message=message,
+        callback_query=(
+            MagicMock(
+                spec=CallbackQuery,
+                data=callback_data,
+                answer=AsyncMock(),
+            )
+            if callback_data is not None
+            else None
+        ),
+    )
+
+
+def count_rows(
+    database_path: Path,
+    table: type[database_tables.Base],
+) -> int:
+    database_engine: Engine = create_engine(f"sqlite:///{database_path}")
+    with Session(database_engine) as session:
+        count: int | None = session.scalar(
+            select(func.count()).select_from(table)
+        )
+    database_engine.dispose()
+
+    assert count is not None
+    return count
+
+
+@pytest.mark.asyncio
+async def test_query_budget_of_start_of_new_user(
+    handlers: Handlers,
+    query_budget: QueryBudget,
+    database_path: Path,
+) -> None:
+    update: Update = create_update(NEW_USER_ID)
+
+    # A lookup of an authorization state and an insert of a DB user
+    await query_budget.run(handlers.start, update, 2, 1)
+
+    update.effective_chat.send_message.assert_awaited_once_with(  # type: ignore[union-attr]
+        consts.Answers.ENTER_TOKEN
+    )
+    assert count_rows(database_path, database_tables.User) == 3
+
+
+@pytest.mark.asyncio
+async def test_query_budget_of_authorization(
+    handlers: Handlers,
+    query_budget: QueryBudget,
+) -> None:
+    update: Update = create_update(AUTHORIZING_USER_ID, text=FREE_TOKEN)
+
+    # A lookup of an authorization state, a load of a DB user, a load of
+    # a DB token and an update of the DB user
+    await query_budget.run(handlers.handle_message, update, 4, 1)
+
+    update.effective_chat.send_message.assert_awaited_once_with(  # type: ignore[union-attr]
+        consts.Answers.AUTHORIZED
+    )
+
+
+@pytest.mark.asyncio
+async def test_query_budget_of_message_of_authorized_user(
+    handlers: Handlers,
+    query_budget: QueryBudget,
+    database_path: Path,
+) -> None:
+    update: Update = create_update(AUTHORIZED_USER_ID, text="Hello")
+
+    # A lookup of an authorization state and an insert of a DB message
+    # draft
+    await query_budget.run(handlers.handle_message, update, 2, 1)
+
+    assert count_rows(database_path, database_tables.MessageDraft) == 2
+
+
+@pytest.mark.asyncio
+async def test_query_budget_of_send(
+    handlers: Handlers,
+    query_budget: QueryBudget,
+    database_path: Path,
+) -> None:
+    update: Update = create_update(
+        AUTHORIZED_USER_ID,
+        callback_data=f"message_confirmation,true,{DRAFT_MESSAGE_ID}",
+    )
+
+    # A lookup of an authorization state, a lookup of a state of a DB
+    # message, a claim of a DB message draft, an insert of a sent DB
+    # message, an insert of a delivery of an email and an update of a
+    # last send date
+    await query_budget.run(handlers.send, update, 6, 1)
+
+    update.effective_message.edit_text.assert_awaited_once_with(  # type: ignore[union-attr]
+        consts.Answers.MESSAGE_SENT
+    )
+    assert count_rows(database_path, database_tables.MessageDraft) == 0
+    assert count_rows(database_path, database_tables.Message) == 1
+    assert count_rows(database_path, database_tables.EmailOutbox) == 1
+
+
+@pytest.mark.asyncio
+async def test_query_budget_of_cancel_of_send(
+    handlers: Handlers,
+    query_budget: QueryBudget,
+    database_path: Path,
+) -> None:
+    update: Update = create_update(
+        AUTHORIZED_USER_ID,
+        callback_data=f"message_confirmation,false,{DRAFT_MESSAGE_ID}",
+    )
+
+    # A lookup of an authorization state, a lookup of a state of a DB
+    # message and a delete of a DB message draft
+    await query_budget.run(handlers.cancel, update, 3, 1)
+
+    update.effective_message.edit_text.assert_awaited_once_with(  # type: ignore[union-attr]
+        consts.Answers.MESSAGE_SEND_CANCELED
+    )
+    assert count_rows(database_path, database_tables.MessageDraft) == 0
+
+
+@pytest.mark.asyncio
+async def test_query_budget_of_cached_authorization_state(
+    handlers: Handlers,
+    query_budget: QueryBudget,
+) -> None:
+    await handlers.handle_message(
+        create_update(AUTHORIZED_USER_ID, text="Hello"),
+        MagicMock(),
+    )
+
+    # An authorization state is got from a cache, so only a DB message
+    # draft is inserted
+    await query_budget.run(
+        handlers.handle_message,
+        create_update(AUTHORIZED_USER_ID, text="Hello"),
+        1,
+        1,
+    )
@@ -1,21 +1,30 @@
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from smtplib import SMTP
+from threading import Event, Lock
+from time import sleep
 from typing import Generator, Self, cast
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 from uuid import UUID
 
 import pytest
 from pytest_mock import MockerFixture
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from telegram import Chat, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.constants import ChatType
 
 from message_sender_telegram_bot.libs import (
     DBTokenManipulator,
     DBUserManipulator,
+    DeliveryPolicy,
+    EmailDigestSender,
     EmailSender,
     Helpers,
+    SessionScope,
+    SMTPConnectionPool,
     User,
+    UserAuthStateCache,
     types,
 )
 from message_sender_telegram_bot.libs.consts import Answers, ButtonTexts
@@ -23,13 +32,24 @@ from message_sender_telegram_bot.libs.rdb import database_tables
 
 
 @pytest.fixture
-def gmail_smtp_login() -> str:
-    return "GMAIL_SMTP_LOGIN"
+def smtp_mock() -> SMTP:
+    return MagicMock(spec=SMTP)
 
 
 @pytest.fixture
-def gmail_smtp_password() -> str:
-    return "GMAIL_SMTP_PASSWORD"
+def smtp_pool_mock(smtp_mock: SMTP) -> SMTPConnectionPool:
+    # A mock of a pool runs an operation with a SMTP mock
+    return MagicMock(
+        spec=SMTPConnectionPool,
+        run=MagicMock(side_effect=lambda operation: operation(smtp_mock)),
+    )
+
+
+@pytest.fixture
+def email_executor() -> Generator[Executor]:
+    email_executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1)
+    yield email_executor
+    email_executor.shutdown()
 
 
 @pytest.fixture
@@ -44,18 +64,20 @@ def email_to_addr() -> str:
 
 @pytest.fixture
 def helpers(
-    compiled_session_mock: sessionmaker[Session],
-    gmail_smtp_login: str,
-    gmail_smtp_password: str,
+    session_scope_mock: SessionScope,
+    smtp_pool_mock: SMTPConnectionPool,
+    email_executor: Executor,
     email_from_addr: str,
     email_to_addr: str,
+    user_auth_state_cache_mock: UserAuthStateCache,
 ) -> Helpers:
     return Helpers(
-        gmail_smtp_login,
-        gmail_smtp_password,
+        smtp_pool_mock,
+        email_executor,
         email_from_addr,
         email_to_addr,
-        compiled_session_mock,
+        session_scope_mock,
+        user_auth_state_cache_mock,
     )
 
 
@@ -126,6 +148,16 @@ def db_user_manipulator_mock(
             "message_sender_telegram_bot.libs.helpers.DBUserManipulator",
             autospec=True,
             return_value=MagicMock(
+                get=AsyncMock(),
+                get_auth_state=AsyncMock(
+                    return_value=types.UserAuthState(
+                        db_user_mock.id_,
+                        is_authorizing=False,
+                        has_token=False,
+                        is_owner=False,
+                        last_send_date=db_user_mock.last_send_date,
+                    ),
+                ),
                 get_owner_status=MagicMock(return_value=False),
             ),
         ),
@@ -138,7 +170,7 @@ def db_user_manipulator_mock(
 @pytest.fixture
 def db_token_manipulator_mock(
     mocker: MockerFixture,
-    compiled_session_mock: sessionmaker[Session],
+    compiled_session_mock: async_sessionmaker[AsyncSession],
 ) -> Generator[DBTokenManipulator]:
     db_token_manipulator_class_mock = cast(
         type[DBTokenManipulator],
@@ -146,7 +178,7 @@ def db_token_manipulator_mock(
             "message_sender_telegram_bot.libs.helpers.DBTokenManipulator",
             autospec=True,
             return_value=MagicMock(
-                get=MagicMock(
+                get_for_update=AsyncMock(
                     return_value=MagicMock(
                         spec=database_tables.Token,
                         user=None,
@@ -177,7 +209,7 @@ class TestAuthorize:
         db_user_mock: User,
         db_token_manipulator_mock: DBTokenManipulator,
     ) -> None:
-        db_token_manipulator_mock.get.return_value = None  # type: ignore[unresolved-attribute]
+        db_token_manipulator_mock.get_for_update.return_value = None  # type: ignore[unresolved-attribute]
 
         await helpers.authorize(chat_mock, message_text, db_user_mock)
 
@@ -194,7 +226,9 @@ class TestAuthorize:
         db_user_mock: User,
         db_token_manipulator_mock: DBTokenManipulator,
     ) -> None:
-        db_token_manipulator_mock.get.return_value.user = MagicMock(spec=User)  # type: ignore[unresolved-attribute]
+        db_token_manipulator_mock.get_for_update.return_value.user = MagicMock(
+            spec=User
+        )  # type: ignore[unresolved-attribute]
 
         await helpers.authorize(chat_mock, message_text, db_user_mock)
 
@@ -220,13 +254,11 @@ class TestSendEmail:
         self: Self,
         mocker: MockerFixture,
         helpers: Helpers,
+        smtp_mock: SMTP,
+        smtp_pool_mock: SMTPConnectionPool,
         email_from_addr: str,
         email_to_addr: str,
     ) -> None:
-        mocker.patch(
-            "message_sender_telegram_bot.libs.helpers.GmailSMTPCreator",
-            autospec=True,
-        )
         email_sender_class_mock = cast(
             type[EmailSender],
             mocker.patch(
@@ -234,17 +266,145 @@ class TestSendEmail:
                 autospec=True,
             ),
         )
-        email_sender_mock = email_sender_class_mock(
-            MagicMock(spec=SMTP),
-            email_from_addr,
-            email_to_addr,
-        )
         name = "NAME"
         text = "TEXT"
 
         await helpers.send_email(name, text)
 
-        email_sender_mock.send.assert_called_once_with(text)  # type: ignore[unresolved-attribute]
+        smtp_pool_mock.run.assert_called_once()  # type: ignore[unresolved-attribute]
+        email_sender_class_mock.assert_called_once_with(  # type: ignore[unresolved-attribute]
+            smtp_mock,
+            email_from_addr,
+            email_to_addr,
+            sender_name=name,
+        )
+        email_sender_class_mock.return_value.send.assert_called_once_with(  # type: ignore[unresolved-attribute]
+            text
+        )
+
+    @pytest.mark.asyncio
+    async def test_handling_of_other_update_during_slow_send(
+        self: Self,
+        chat_mock: Chat,
+        helpers: Helpers,
+        smtp_pool_mock: SMTPConnectionPool,
+    ) -> None:
+        is_send_started: Event = Event()
+        is_smtp_server_answered: Event = Event()
+
+        def stall(_: object) -> None:
+            is_send_started.set()
+            is_smtp_server_answered.wait(5)
+
+        smtp_pool_mock.run.side_effect = stall  # type: ignore[unresolved-attribute]
+
+        send_task = asyncio.create_task(helpers.send_email("NAME", "TEXT"))
+        try:
+            await asyncio.to_thread(is_send_started.wait, 5)
+
+            # An event loop isn't blocked by a stalled SMTP server, so an
+            # another update is handled before the send is finished
+            await helpers.show_message_confirmation_panel(chat_mock, 1)
+
+            chat_mock.send_message.assert_called_once()  # type: ignore[unresolved-attribute]
+            assert not send_task.done()
+        finally:
+            is_smtp_server_answered.set()
+        await send_task
+
+    @pytest.mark.asyncio
+    async def test_limit_of_concurrent_sends(
+        self: Self,
+        helpers: Helpers,
+        smtp_pool_mock: SMTPConnectionPool,
+    ) -> None:
+        lock: Lock = Lock()
+        in_flight_counts: list[int] = [0]
+        max_in_flight_counts: list[int] = [0]
+
+        def count(_: object) -> None:
+            with lock:
+                in_flight_counts[0] += 1
+                max_in_flight_counts[0] = max(
+                    max_in_flight_counts[0],
+                    in_flight_counts[0],
+                )
+            # A send waits for a SMTP server, so the other sends can
+            # overlap it
+            sleep(0.01)
+            with lock:
+                in_flight_counts[0] -= 1
+
+        smtp_pool_mock.run.side_effect = count  # type: ignore[unresolved-attribute]
+
+        await asyncio.gather(
+            *(helpers.send_email("NAME", "TEXT") for _ in range(5))
+        )
+
+        # An executor of the sends has only one thread
+        assert smtp_pool_mock.run.call_count == 5  # type: ignore[unresolved-attribute]
+        assert max_in_flight_counts[0] == 1
+
+    @pytest.mark.asyncio
+    async def test_retry_of_failed_send_by_delivery_policy(
+        self: Self,
+        session_scope_mock: SessionScope,
+        smtp_pool_mock: SMTPConnectionPool,
+        email_executor: Executor,
+        user_auth_state_cache_mock: UserAuthStateCache,
+    ) -> None:
+        delivery_policy = DeliveryPolicy(jitter=lambda: 0.0)
+        helpers = Helpers(
+            smtp_pool_mock,
+            email_executor,
+            "EMAIL_FROM_ADDR",
+            "EMAIL_TO_ADDR",
+            session_scope_mock,
+            user_auth_state_cache_mock,
+            delivery_policy=delivery_policy,
+        )
+        smtp_pool_mock.run.side_effect = [  # type: ignore[unresolved-attribute]
+            OSError("A network is unreachable"),
+            None,
+        ]
+
+        await helpers.send_email("NAME", "TEXT")
+
+        assert smtp_pool_mock.run.call_count == 2  # type: ignore[unresolved-attribute]
+        assert delivery_policy.get_stats().retry_count == 1
+
+
+class TestSendEmailDigest:
+    @pytest.mark.asyncio
+    async def test_send_of_email_digest(
+        self: Self,
+        mocker: MockerFixture,
+        helpers: Helpers,
+        smtp_mock: SMTP,
+        smtp_pool_mock: SMTPConnectionPool,
+        email_from_addr: str,
+        email_to_addr: str,
+    ) -> None:
+        email_digest_sender_class_mock = cast(
+            type[EmailDigestSender],
+            mocker.patch(
+                "message_sender_telegram_bot.libs.helpers.EmailDigestSender",
+                autospec=True,
+            ),
+        )
+        entries = [types.DigestEntry("NAME", "TEXT")]
+
+        await helpers.send_email_digest(entries)
+
+        smtp_pool_mock.run.assert_called_once()  # type: ignore[unresolved-attribute]
+        email_digest_sender_class_mock.assert_called_once_with(  # type: ignore[unresolved-attribute]
+            smtp_mock,
+            email_from_addr,
+            email_to_addr,
+        )
+        email_digest_sender_class_mock.return_value.send.assert_called_once_with(  # type: ignore[unresolved-attribute]
+            entries
+        )
 
 
 class TestShowMessageConfirmationPanel:
@@ -272,6 +432,40 @@ class TestShowMessageConfirmationPanel:
             reply_markup=reply_markup,
         )
 
+    @pytest.mark.asyncio
+    async def test_send_of_confirmation_panel_with_urgent_button(
+        self: Self,
+        chat_mock: Chat,
+        session_scope_mock: SessionScope,
+        smtp_pool_mock: SMTPConnectionPool,
+        email_executor: Executor,
+        user_auth_state_cache_mock: UserAuthStateCache,
+    ) -> None:
+        helpers = Helpers(
+            smtp_pool_mock,
+            email_executor,
+            "EMAIL_FROM_ADDR",
+            "EMAIL_TO_ADDR",
+            session_scope_mock,
+            user_auth_state_cache_mock,
+            is_urgency_offered=True,
+        )
+        message_id = 923840239
+
+        await helpers.show_message_confirmation_panel(chat_mock, message_id)
+
+        reply_markup = chat_mock.send_message.call_args.kwargs[  # type: ignore[unresolved-attribute]
+            "reply_markup"
+        ]
+        assert [
+            button.callback_data for button in reply_markup.inline_keyboard[0]
+        ] == [
+            f"message_confirmation,true,{message_id}",
+            f"message_confirmation,urgent,{message_id}",
+            f"message_confirmation,false,{message_id}",
+        ]
+        assert reply_markup.inline_keyboard[0][1].text == ButtonTexts.URGENT
+
 
 class TestCheckCooldown:
     @pytest.mark.asyncio
@@ -283,7 +477,7 @@ class TestCheckCooldown:
         db_user_mock.last_send_date = None
 
         is_cooldown_passed, remained_time = await helpers.check_cooldown(
-            db_user_mock,
+            db_user_mock.last_send_date,
         )
 
         assert isinstance(is_cooldown_passed, bool)
@@ -313,7 +507,7 @@ class TestCheckCooldown:
             now=MagicMock(return_value=datetime(2026, 3, 3, 15, 41, 30)),
         )
         is_cooldown_passed, remained_time = await helpers.check_cooldown(
-            db_user_mock,
+            db_user_mock.last_send_date,
         )
 
         assert isinstance(is_cooldown_passed, bool)
@@ -343,7 +537,7 @@ class TestCheckCooldown:
             now=MagicMock(return_value=datetime(2026, 3, 3, 15, 41, 56)),
         )
         is_cooldown_passed, remained_time = await helpers.check_cooldown(
-            db_user_mock,
+            db_user_mock.last_send_date,
         )
 
         assert isinstance(is_cooldown_passed, bool)
@@ -364,3 +558,16 @@ class TestIsUserOwner:
         is_user_owner: bool = await helpers.is_user_owner(user_id)
 
         assert not is_user_owner
+
+    @pytest.mark.asyncio
+    async def test_user_is_not_owner_when_db_user_is_absent(
+        self: Self,
+        helpers: Helpers,
+        user_id: int,
+        db_user_manipulator_mock: DBUserManipulator,
+    ) -> None:
+        db_user_manipulator_mock.get_auth_state.return_value = None  # type: ignore[unresolved-attribute]
+
+        is_user_owner: bool = await helpers.is_user_owner(user_id)
+
+        assert not is_user_owner
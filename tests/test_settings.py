@@ -0,0 +1,60 @@
+from datetime import timedelta
+
+import pytest
+
+from message_sender_telegram_bot.libs import Settings
+
+
+@pytest.fixture(autouse=True)
+def required_environment(monkeypatch: pytest.MonkeyPatch) -> None:
+    for name, value in {
+        "TELEGRAM_TOKEN": "TELEGRAM_TOKEN",
+        "DB_URL": "sqlite+aiosqlite:///bot.db",
+        "GMAIL_SMTP_LOGIN": "GMAIL_SMTP_LOGIN",
+        "GMAIL_SMTP_PASSWORD": "GMAIL_SMTP_PASSWORD",
+        "EMAIL_FROM_ADDR": "EMAIL_FROM_ADDR",
+        "EMAIL_TO_ADDR": "EMAIL_TO_ADDR",
+    }.items():
+        monkeypatch.setenv(f"MESSAGE_SENDER_TELEGRAM_BOT_{name}", value)
+
+
+@pytest.mark.parametrize(
+    ("value", "duration"),
+    (
+        ("300", timedelta(minutes=5)),
+        ("0.1", timedelta(milliseconds=100)),
+        ("PT5M", timedelta(minutes=5)),
+        ("00:05:00", timedelta(minutes=5)),
+    ),
+)
+def test_parse_of_duration(
+    monkeypatch: pytest.MonkeyPatch,
+    value: str,
+    duration: timedelta,
+) -> None:
+    monkeypatch.setenv(
+        "MESSAGE_SENDER_TELEGRAM_BOT_METRICS_LOG_INTERVAL", value
+    )
+
+    assert Settings().metrics_log_interval == duration  # type: ignore[missing-argument]
+
+
+def test_parse_of_optional_duration(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    assert Settings().email_digest_window is None  # type: ignore[missing-argument]
+
+    monkeypatch.setenv(
+        "MESSAGE_SENDER_TELEGRAM_BOT_EMAIL_DIGEST_WINDOW", "600"
+    )
+
+    assert Settings().email_digest_window == timedelta(minutes=10)  # type: ignore[missing-argument]
+
+
+def test_raise_on_absence_of_db_url_and_db_parts(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.delenv("MESSAGE_SENDER_TELEGRAM_BOT_DB_URL")
+
+    with pytest.raises(ValueError, match="A DB URL or a DB user"):
+        Settings()  # type: ignore[missing-argument]
@@ -0,0 +1,109 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from telegram import Update
+
+from message_sender_telegram_bot.libs import UserUpdateProcessor
+
+
+def make_update(user_id: int | None) -> Update:
+    return MagicMock(
+        spec=Update,
+        effective_user=None if user_id is None else MagicMock(id=user_id),
+    )
+
+
+@pytest.fixture
+def user_update_processor() -> UserUpdateProcessor:
+    return UserUpdateProcessor(4)
+
+
+@pytest.mark.asyncio
+async def test_order_of_updates_of_one_user(
+    user_update_processor: UserUpdateProcessor,
+) -> None:
+    events: list[str] = []
+    is_first_started: asyncio.Event = asyncio.Event()
+    is_first_released: asyncio.Event = asyncio.Event()
+
+    async def handle_first() -> None:
+        events.append("first started")
+        is_first_started.set()
+        await is_first_released.wait()
+        events.append("first finished")
+
+    async def handle_second() -> None:
+        events.append("second started")
+
+    first_task = asyncio.create_task(
+        user_update_processor.process_update(make_update(1), handle_first())
+    )
+    await is_first_started.wait()
+    second_task = asyncio.create_task(
+        user_update_processor.process_update(make_update(1), handle_second())
+    )
+    await asyncio.sleep(0)
+
+    # A second update of a user waits for a first one
+    assert events == ["first started"]
+
+    is_first_released.set()
+    await asyncio.gather(first_task, second_task)
+
+    assert events == ["first started", "first finished", "second started"]
+
+
+@pytest.mark.asyncio
+async def test_overlap_of_updates_of_different_users(
+    user_update_processor: UserUpdateProcessor,
+) -> None:
+    is_other_handled: asyncio.Event = asyncio.Event()
+
+    async def wait_for_other() -> None:
+        await is_other_handled.wait()
+
+    async def handle_other() -> None:
+        is_other_handled.set()
+
+    # A stalled update of a user doesn't stall an update of an another
+    # user or an update without a user
+    await asyncio.wait_for(
+        asyncio.gather(
+            user_update_processor.process_update(
+                make_update(1),
+                wait_for_other(),
+            ),
+            user_update_processor.process_update(
+                make_update(2),
+                handle_other(),
+            ),
+            user_update_processor.process_update(
+                make_update(None),
+                asyncio.sleep(0),
+            ),
+        ),
+        timeout=1,
+    )
+
+
+@pytest.mark.asyncio
+async def test_next_update_after_failed_update(
+    user_update_processor: UserUpdateProcessor,
+) -> None:
+    async def fail() -> None:
+        raise RuntimeError("A handler failed")
+
+    with pytest.raises(RuntimeError, match="A handler failed"):
+        await user_update_processor.process_update(make_update(1), fail())
+
+    # A lock of a failed update is released
+    await asyncio.wait_for(
+        user_update_processor.process_update(make_update(1), asyncio.sleep(0)),
+        timeout=1,
+    )
+
+
+def test_raise_on_non_positive_max_concurrent_updates() -> None:
+    with pytest.raises(ValueError):
+        UserUpdateProcessor(0)